@@ -23,6 +23,23 @@ from utils.notification_system import notification_manager, add_notification_to_
 # Import game monitoring
 from utils.game_monitor import add_picks_to_monitor, show_monitoring_status
 
+# Shared ESPN scoreboard client (pooled session + request coalescing)
+from utils.espn_scoreboard import espn_scoreboard
+from utils.http_cache import http_cache, http_session
+from utils.odds_history import (SIGNIFICANT_PROBABILITY_MOVE, SIGNIFICANT_SPREAD_MOVE, SIGNIFICANT_TOTAL_MOVE,
+                                STEAM_BOOK_SHARE, describe_movement, movement_signal, movement_summary)
+from utils.odds_ingestion import LEAGUE_SPORT_KEYS, odds_ingestion
+
+# Persistent LLM response cache shared across sessions
+from utils.llm_response_cache import llm_response_cache
+from utils.local_store import local_store
+from utils.reliability_curves import reliability_calibrator
+from utils.schedule_index import schedule_index
+from utils.team_registry import normalize_team_key, teams_match
+from utils.kelly_portfolio import kelly_portfolio
+from utils.parlay_optimizer import legs_from_value_bets, parlay_optimizer
+from utils.value_engine import value_engine
+
 # Database imports
 try:
     from supabase import create_client, Client
@@ -1287,7 +1304,44 @@ def get_api_usage_stats_from_db(date=None):
 # DAILY BETTING SYSTEM - Top 10 High-Confidence Picks Tracking
 # ============================================================================
 
-def save_daily_bet_to_db(game_data, ai_analysis, bet_rank):
+# Bankroll the daily picks are staked from (the flat 100 per pick used before was 1% of the default)
+DAILY_BANKROLL = float(os.environ.get('DAILY_BANKROLL', 10000))
+
+def backs_ai_pick(analysis, team):
+    """Whether a bet on `team` backs the AI's pick in `analysis`"""
+    pick = (analysis or {}).get('pick') or (analysis or {}).get('predicted_winner')
+    return bool(pick) and bool(team) and teams_match(pick, team)
+
+# Decimal odds assumed for graded bets saved without a price (the old flat -110 line, 1.9x back)
+DEFAULT_BET_DECIMAL = 1.9
+
+def allocate_daily_stakes(picks, bankroll=DAILY_BANKROLL):
+    """
+    Bet amounts for the day's picks from one simultaneous Kelly solve over
+    each pick's moneyline at its best price, as (stake, decimal odds, price)
+    per pick; picks without odds get (0, None, None)
+    """
+    stakes = [(0.0, None, None)] * len(picks)
+    try:
+        games = [pick['game_data'] for pick in picks]
+        analyses = [pick['ai_analysis'] for pick in picks]
+        refresh_slate_odds(games)
+        # Every priced outcome (a game has at most 7 across the three markets), then each pick's moneyline
+        bets = value_engine.top_bets(games, analyses=analyses, top_k=7 * len(games), min_expected_value=float('-inf'))
+        backed = {}
+        for bet in bets:
+            if bet['market'] == 'h2h' and backs_ai_pick(analyses[bet['game_index']], bet['team']):
+                backed[bet['game_index']] = bet
+        if backed:
+            indexes = sorted(backed)
+            allocated = kelly_portfolio.allocate_bets([backed[i] for i in indexes], bankroll)
+            for i, bet in zip(indexes, allocated):
+                stakes[i] = (bet['stake'], bet['decimal'], bet['price'])
+    except Exception as e:
+        print(f"Stake allocation failed: {str(e)}")
+    return stakes
+
+def save_daily_bet_to_db(game_data, ai_analysis, bet_rank, bet_amount=100):
     """Save daily bet to database"""
     supabase = init_supabase()
     if not supabase:
@@ -1304,7 +1358,7 @@ def save_daily_bet_to_db(game_data, ai_analysis, bet_rank):
             'ai_analysis': ai_analysis,
             'game_data': game_data,
             'bet_rank': bet_rank,
-            'bet_amount': 100,  # Standard bet amount
+            'bet_amount': bet_amount,
             'is_daily_bet': True,
             'bet_status': 'pending'
         }
@@ -1407,9 +1461,15 @@ def generate_daily_top_picks(target_date=None, min_confidence=0.75):
     all_predictions.sort(key=lambda x: x['confidence'], reverse=True)
     top_10_picks = all_predictions[:10]
     
+    # Stakes come from one portfolio solve: Kelly fractions summed pick by pick would over-bet the bankroll
+    stakes = allocate_daily_stakes(top_10_picks)
+    
     # Save to database and session
     daily_bets = []
-    for i, pick in enumerate(top_10_picks, 1):
+    for i, (pick, (stake, decimal, price)) in enumerate(zip(top_10_picks, stakes), 1):
+        # The price staked at rides along with the analysis, so graded bets pay out at their real odds
+        if decimal is not None:
+            pick['ai_analysis'] = dict(pick['ai_analysis'], bet_decimal=decimal, bet_price=price)
         # Add betting information
         bet_data = {
             'bet_rank': i,
@@ -1421,7 +1481,7 @@ def generate_daily_top_picks(target_date=None, min_confidence=0.75):
             'confidence': pick['confidence'],
             'ai_analysis': pick['ai_analysis'],
             'game_data': pick['game_data'],
-            'bet_amount': 100,
+            'bet_amount': stake,
             'is_daily_bet': True,
             'bet_status': 'pending',
             'actual_winner': None,
@@ -1431,7 +1491,7 @@ def generate_daily_top_picks(target_date=None, min_confidence=0.75):
         daily_bets.append(bet_data)
         
         # Save to database
-        save_daily_bet_to_db(pick['game_data'], pick['ai_analysis'], i)
+        save_daily_bet_to_db(pick['game_data'], pick['ai_analysis'], i, bet_amount=stake)
     
     # Save to session as backup
     save_daily_bets_to_session(date_str, daily_bets)
@@ -1440,8 +1500,8 @@ def generate_daily_top_picks(target_date=None, min_confidence=0.75):
     
     return daily_bets
 
-def update_bet_result(bet_id, actual_winner, was_correct):
-    """Update bet result in database"""
+def update_bet_result(bet_id, actual_winner, was_correct, confidence=None):
+    """Update bet result in database and feed the graded pick to the reliability curve"""
     supabase = init_supabase()
     if not supabase:
         return False
@@ -1455,11 +1515,22 @@ def update_bet_result(bet_id, actual_winner, was_correct):
             })\
             .eq('id', bet_id)\
             .execute()
+        
+        if confidence is not None:
+            reliability_calibrator.record_outcomes(float(confidence), bool(was_correct))
         return True
     except Exception as e:
         print(f"Failed to update bet result: {str(e)}")
         return False
 
+def bet_winnings(bet):
+    """Amount returned by a graded daily bet: its stake times the decimal odds it was placed at, 0 unless it won"""
+    if bet.get('was_correct') is not True:
+        return 0.0
+    analysis = bet.get('ai_analysis') or {}
+    decimal = analysis.get('bet_decimal') if isinstance(analysis, dict) else None
+    return float(bet.get('bet_amount', 100) or 0) * float(decimal or DEFAULT_BET_DECIMAL)
+
 def calculate_betting_stats(days_back=30):
     """Calculate betting performance statistics"""
     supabase = init_supabase()
@@ -1500,10 +1571,8 @@ def calculate_betting_stats(days_back=30):
         losses = len([b for b in bets if b.get('was_correct') == False])
         
         win_rate = wins / completed_bets if completed_bets > 0 else 0.0
-        total_wagered = sum(b.get('bet_amount', 100) for b in bets)
-        
-        # Assume 1.9x payout for wins (typical sports betting odds)
-        total_winnings = wins * 190  # $100 bet wins $90 profit + $100 back
+        total_wagered = sum(float(b.get('bet_amount', 100) or 0) for b in bets)
+        total_winnings = sum(bet_winnings(b) for b in bets)
         net_profit = total_winnings - total_wagered
         roi = (net_profit / total_wagered * 100) if total_wagered > 0 else 0.0
         
@@ -1562,8 +1631,8 @@ def get_session_betting_stats():
     losses = len([b for b in all_bets if b.get('was_correct') == False])
     
     win_rate = wins / completed_bets if completed_bets > 0 else 0.0
-    total_wagered = total_bets * 100  # $100 per bet
-    total_winnings = wins * 190
+    total_wagered = sum(float(b.get('bet_amount', 100) or 0) for b in all_bets)
+    total_winnings = sum(bet_winnings(b) for b in all_bets)
     net_profit = total_winnings - total_wagered
     roi = (net_profit / total_wagered * 100) if total_wagered > 0 else 0.0
     
@@ -1594,25 +1663,18 @@ def get_cache_key(date_str, sports_list):
     combined = f"{date_str}_{'-'.join(sorted(sports_list))}"
     return hashlib.md5(combined.encode()).hexdigest()
 
+PREDICTIONS_CACHE_TTL = 6 * 3600  # 6 hours
+ODDS_CACHE_TTL = 30 * 60  # 30 minutes
+
 def get_cached_predictions(date_str, sports_list):
     """Retrieve cached predictions for a specific date and sports"""
     try:
-        cache_dir = ".local/predictions_cache"
-        os.makedirs(cache_dir, exist_ok=True)
-        
         cache_key = get_cache_key(date_str, sports_list)
-        cache_file = os.path.join(cache_dir, f"{cache_key}.json")
-        
-        if os.path.exists(cache_file):
-            # Check if cache is still valid (less than 6 hours old)
-            file_age = time.time() - os.path.getmtime(cache_file)
-            if file_age < 6 * 3600:  # 6 hours
-                with open(cache_file, 'r') as f:
-                    cached_data = json.load(f)
-                    
-                # Validate cache structure
-                if 'predictions' in cached_data and 'timestamp' in cached_data:
-                    return cached_data['predictions']
+        cached_data = local_store.get('predictions', cache_key)
+        
+        # Validate cache structure
+        if cached_data and 'predictions' in cached_data and 'timestamp' in cached_data:
+            return cached_data['predictions']
         
         return None
         
@@ -1622,11 +1684,7 @@ def get_cached_predictions(date_str, sports_list):
 def save_predictions_to_cache(date_str, sports_list, predictions):
     """Save predictions to cache for future use"""
     try:
-        cache_dir = ".local/predictions_cache"
-        os.makedirs(cache_dir, exist_ok=True)
-        
         cache_key = get_cache_key(date_str, sports_list)
-        cache_file = os.path.join(cache_dir, f"{cache_key}.json")
         
         cache_data = {
             'predictions': predictions,
@@ -1636,10 +1694,8 @@ def save_predictions_to_cache(date_str, sports_list, predictions):
             'cache_key': cache_key
         }
         
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f, indent=2, default=str)
-            
-        return True
+        return local_store.set('predictions', cache_key, cache_data, PREDICTIONS_CACHE_TTL,
+                               date=date_str, sports=sports_list, item_count=len(predictions))
         
     except Exception as e:
         st.warning(f"Cache save error: {str(e)}")
@@ -1677,49 +1733,38 @@ def show_cache_status():
     """Show prediction cache status in admin panel"""
     st.markdown("### 💾 Prediction Cache Status")
     
-    cache_dir = ".local/predictions_cache"
+    cache_stats = local_store.get_stats('predictions')
     
-    if not os.path.exists(cache_dir):
+    if not cache_stats['entries']:
         st.warning("No prediction cache found")
-        return
-    
-    cache_files = [f for f in os.listdir(cache_dir) if f.endswith('.json')]
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Cached Days", len(cache_files))
+        st.metric("Cached Days", cache_stats['entries'])
     
     with col2:
-        total_size = sum(os.path.getsize(os.path.join(cache_dir, f)) for f in cache_files)
-        st.metric("Cache Size", f"{total_size / 1024:.1f} KB")
+        st.metric("Cache Size", f"{cache_stats['total_size'] / 1024:.1f} KB")
     
     with col3:
-        if cache_files:
-            newest_file = max(cache_files, key=lambda f: os.path.getmtime(os.path.join(cache_dir, f)))
-            newest_time = datetime.fromtimestamp(os.path.getmtime(os.path.join(cache_dir, newest_file)))
-            hours_ago = (datetime.now() - newest_time).seconds // 3600
+        if cache_stats['last_write']:
+            hours_ago = int((time.time() - cache_stats['last_write']) // 3600)
             st.metric("Last Generated", f"{hours_ago}h ago")
     
-    # Show cache details
-    if cache_files:
+    # Show cache details (metadata only - payloads are never loaded here)
+    if cache_stats['entries']:
         st.markdown("#### 📋 Cache Details")
         
-        cache_info = []
-        for cache_file in cache_files[:10]:  # Show last 10
-            try:
-                with open(os.path.join(cache_dir, cache_file), 'r') as f:
-                    data = json.load(f)
-                    
-                cache_info.append({
-                    'Date': data.get('date', 'Unknown'),
-                    'Sports': ', '.join(data.get('sports', [])),
-                    'Predictions': len(data.get('predictions', [])),
-                    'Generated': data.get('timestamp', 'Unknown')[:16],
-                    'File': cache_file
-                })
-            except:
-                continue
+        cache_info = [
+            {
+                'Date': entry['date'] or 'Unknown',
+                'Sports': entry['sports'] or '',
+                'Predictions': entry['item_count'],
+                'Generated': datetime.fromtimestamp(entry['created_at']).strftime('%Y-%m-%dT%H:%M'),
+                'Key': entry['key']
+            }
+            for entry in local_store.list_entries('predictions', limit=10)  # Show last 10
+        ]
         
         if cache_info:
             df = pd.DataFrame(cache_info)
@@ -1739,29 +1784,14 @@ def show_cache_status():
     
     with col2:
         if st.button("🧹 Clear Old Cache"):
-            try:
-                cutoff_time = time.time() - (7 * 24 * 3600)  # 7 days ago
-                removed = 0
-                
-                for cache_file in cache_files:
-                    file_path = os.path.join(cache_dir, cache_file)
-                    if os.path.getmtime(file_path) < cutoff_time:
-                        os.remove(file_path)
-                        removed += 1
-                
-                st.success(f"Removed {removed} old cache files")
-            except Exception as e:
-                st.error(f"Cache cleanup error: {str(e)}")
+            removed = local_store.clear('predictions', older_than_seconds=7 * 24 * 3600)  # 7 days
+            st.success(f"Removed {removed} old cache entries")
     
     with col3:
         if st.button("🗑️ Clear All Cache"):
-            try:
-                for cache_file in cache_files:
-                    os.remove(os.path.join(cache_dir, cache_file))
-                st.success("All cache cleared!")
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error clearing cache: {str(e)}")
+            local_store.clear('predictions')
+            st.success("All cache cleared!")
+            st.rerun()
 
 def use_cached_predictions_if_available(pick_date, sports):
     """Check if we have cached predictions for the requested date/sports"""
@@ -1861,40 +1891,20 @@ def check_odds_usage_limits():
 def get_cached_odds(game_key):
     """Get cached odds data to avoid API calls"""
     try:
-        cache_dir = ".local/odds_cache"
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        cache_file = os.path.join(cache_dir, f"{game_key}.json")
-        
-        if os.path.exists(cache_file):
-            # Check if cache is still valid (less than 30 minutes old)
-            file_age = time.time() - os.path.getmtime(cache_file)
-            if file_age < 30 * 60:  # 30 minutes
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
-        
-        return None
+        return local_store.get('odds', game_key)
     except Exception:
         return None
 
 def save_odds_to_cache(game_key, odds_data):
     """Save odds data to cache"""
     try:
-        cache_dir = ".local/odds_cache"
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        cache_file = os.path.join(cache_dir, f"{game_key}.json")
-        
         cache_data = {
             'odds': odds_data,
             'timestamp': datetime.now().isoformat(),
             'game_key': game_key
         }
         
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f, default=str)
-            
-        return True
+        return local_store.set('odds', game_key, cache_data, ODDS_CACHE_TTL)
     except Exception:
         return False
 
@@ -1934,28 +1944,12 @@ def get_optimized_odds(game, force_api=False):
             
             return cached_odds.get('odds')
     
-    # Second try: Check usage limits before API call
-    usage_check = check_odds_usage_limits()
-    
-    if not usage_check['allowed']:
-        st.warning(f"⚠️ API limit reached: {usage_check['message']}")
-        st.info("🆓 Falling back to free sources...")
-        return get_free_odds_with_fallback(game)
-    
-    # Third try: Make API call if within limits
+    # Second try: the ingestion index. The planner budgets API requests per sport
+    # from the quota headers, so per-game lookups don't count against usage limits
     try:
-        # Show remaining quota
-        remaining = usage_check.get('remaining_calls', 0)
-        if remaining <= 10:
-            st.warning(f"⚠️ Only {remaining} API calls remaining today")
-        
-        # Make the actual API call
         odds_data = get_odds_for_game_api_call(game)
         
         if odds_data:
-            # Update usage tracking
-            update_odds_usage(api_calls=1, cost=0.002)
-            
             # Cache the results
             save_odds_to_cache(game_key, odds_data)
             
@@ -1970,9 +1964,9 @@ def get_optimized_odds(game, force_api=False):
         return get_free_odds_with_fallback(game)
 
 def get_odds_for_game_api_call(game):
-    """Actual API call to odds service (separated for tracking)"""
-    # No mock data - return None if no real API available
-    return None
+    """Bookmaker odds for a game from the ingestion index - never a per-game request"""
+    event = odds_ingestion.lookup_game(game)
+    return event.get('bookmakers') if event else None
 
 def show_odds_usage_dashboard():
     """Show comprehensive odds API usage dashboard"""
@@ -2022,6 +2016,16 @@ def show_odds_usage_dashboard():
             f"{int(remaining_budget / 0.002)} calls"
         )
     
+    # Provider-reported quota, as read by the odds ingestion planner
+    ingestion = odds_ingestion.get_stats()
+    if ingestion['quota_remaining'] is not None:
+        interval = ingestion['refresh_interval']
+        st.caption(
+            f"📡 Odds API quota: {ingestion['quota_remaining']} requests left ({ingestion['quota_used']} used) · "
+            + (f"refreshing every {interval / 60:.0f} min" if interval else "refreshes paused to keep the reserve")
+            + f" · {ingestion['indexed_events']} games indexed"
+        )
+    
     # Usage controls
     st.markdown("---")
     st.markdown("### ⚙️ Usage Controls")
@@ -2054,26 +2058,26 @@ def show_odds_usage_dashboard():
         st.markdown("#### 🔄 Cache Management")
         
         # Cache stats
-        cache_dir = ".local/odds_cache"
-        if os.path.exists(cache_dir):
-            cache_files = [f for f in os.listdir(cache_dir) if f.endswith('.json')]
-            cache_size = sum(os.path.getsize(os.path.join(cache_dir, f)) for f in cache_files)
-            
-            st.info(f"📦 {len(cache_files)} cached games ({cache_size/1024:.1f} KB)")
+        odds_cache_stats = local_store.get_stats('odds')
+        if odds_cache_stats['entries']:
+            st.info(f"📦 {odds_cache_stats['entries']} cached games ({odds_cache_stats['total_size']/1024:.1f} KB)")
         else:
             st.info("📦 No odds cache found")
-        
+
+        http_stats = http_cache.get_stats()
+        if http_stats['requests']:
+            st.caption(
+                f"🌐 HTTP cache: {http_stats['hit_ratio']:.0%} of {http_stats['requests']} requests served without a download "
+                f"({http_stats['revalidated']} revalidated), {http_stats['bytes_saved']/1024/1024:.1f} MB saved, "
+                f"{http_stats['bytes_downloaded']/1024/1024:.1f} MB downloaded"
+            )
+
         col_a, col_b = st.columns(2)
         
         with col_a:
             if st.button("🧹 Clear Cache"):
-                try:
-                    if os.path.exists(cache_dir):
-                        for f in os.listdir(cache_dir):
-                            os.remove(os.path.join(cache_dir, f))
-                    st.success("Cache cleared!")
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
+                local_store.clear('odds')
+                st.success("Cache cleared!")
         
         with col_b:
             if st.button("🔄 Reset Usage"):
@@ -2250,11 +2254,7 @@ def show_todays_top_predictions():
                 # Clear cache and regenerate
                 date_str = today.strftime('%Y-%m-%d')
                 cache_key = get_cache_key(date_str, all_sports)
-                cache_dir = ".local/predictions_cache"
-                cache_file = os.path.join(cache_dir, f"{cache_key}.json")
-                
-                if os.path.exists(cache_file):
-                    os.remove(cache_file)
+                local_store.delete('predictions', cache_key)
                 
                 # Restore cache setting before rerun
                 st.session_state.show_cache_notifications = original_cache_setting
@@ -2727,8 +2727,7 @@ def check_api_status():
     
     # ESPN API
     try:
-        response = requests.get("https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard", timeout=5)
-        status['ESPN'] = response.status_code == 200
+        status['ESPN'] = espn_scoreboard.get_scoreboard('football', 'nfl', timeout=5) is not None
     except:
         status['ESPN'] = False
     
@@ -3664,109 +3663,121 @@ def show_unified_picks_and_odds(pick_date, sports, max_picks, min_confidence, so
                         pass
                     return game, None
             
-            # Run AI analysis in parallel (max 3 concurrent to avoid API limits)
-            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-                future_to_game = {executor.submit(analyze_single_game, game): game for game in games[:max_picks]}
-                
-                completed = 0
-                for future in concurrent.futures.as_completed(future_to_game, timeout=60):
-                    completed += 1
-                    progress = completed / min(len(games), max_picks)
-                    progress_bar.progress(progress)
-                    try:
-                        game, consensus = future.result()
-                        # Process results
-                        if consensus and 'error' not in consensus:
-                            normalized = {
-                                'pick': consensus.get('consensus_pick', 'NO_PICK'),
-                                'confidence': consensus.get('consensus_confidence', 0.0),
-                                'edge': consensus.get('success_metrics', {}).get('edge_score', 0.0),
-                                'reasoning': consensus.get('pick_reasoning', []),
-                                'provider': 'DualAIConsensus',
-                                # Pass through enhanced data
-                                'analysis_type': consensus.get('analysis_type', 'Standard AI'),
-                                'data_quality_score': consensus.get('data_quality_score', 0.0),
-                                'quantitative_baseline': consensus.get('quantitative_baseline', {}),
-                                'real_time_summary': consensus.get('real_time_summary', ''),
-                                'weather_data': consensus.get('weather_data', {}),
-                                'injury_data': consensus.get('injury_data', {}),
-                                'team_stats': consensus.get('team_stats', {})
-                            }
-                            game['ai_analysis'] = normalized
-                            game['full_consensus'] = consensus
+            # Run AI analysis for the whole slate in parallel; API pressure is bounded
+            # by the per-provider rate limits in the shared analysis scheduler
+            from utils.analysis_scheduler import analysis_scheduler
+            
+            slate = games[:max_picks]
+            completed = 0
+            timed_out = []
+            for slate_game, result in analysis_scheduler.analyze_slate(slate, analyze_single_game, timeout=90):
+                completed += 1
+                progress = completed / len(slate)
+                progress_bar.progress(progress)
+                if result is None:
+                    # Still running when the slate timeout hit (or the worker itself raised)
+                    timed_out.append(slate_game)
+                    if st.session_state.get('debug_mode', False):
+                        st.write(f"⏱️ Analysis timed out for {slate_game.get('away_team', {}).get('name', 'Away')} @ {slate_game.get('home_team', {}).get('name', 'Home')}")
+                    continue
+                try:
+                    game, consensus = result
+                    # Process results
+                    if consensus and 'error' not in consensus:
+                        normalized = {
+                            'pick': consensus.get('consensus_pick', 'NO_PICK'),
+                            'confidence': consensus.get('consensus_confidence', 0.0),
+                            'edge': consensus.get('success_metrics', {}).get('edge_score', 0.0),
+                            'reasoning': consensus.get('pick_reasoning', []),
+                            'provider': 'DualAIConsensus',
+                            # Pass through enhanced data
+                            'analysis_type': consensus.get('analysis_type', 'Standard AI'),
+                            'data_quality_score': consensus.get('data_quality_score', 0.0),
+                            'quantitative_baseline': consensus.get('quantitative_baseline', {}),
+                            'confidence_calibration': consensus.get('confidence_calibration'),
+                            'real_time_summary': consensus.get('real_time_summary', ''),
+                            'weather_data': consensus.get('weather_data', {}),
+                            'injury_data': consensus.get('injury_data', {}),
+                            'team_stats': consensus.get('team_stats', {})
+                        }
+                        game['ai_analysis'] = normalized
+                        game['full_consensus'] = consensus
                             
-                            # DEBUG: Show analysis results
-                            if st.session_state.get('debug_mode', False):
-                                st.write(f"🔍 Analysis for {game.get('away_team', {}).get('name', 'Away')} @ {game.get('home_team', {}).get('name', 'Home')}")
-                                st.write(f"   Pick: {normalized['pick']}")
-                                st.write(f"   Confidence: {normalized['confidence']:.1%}")
-                                st.write(f"   Min Required: {min_confidence:.1%}")
-                                st.write(f"   Meets Threshold: {normalized['confidence'] >= min_confidence and normalized['pick'] != 'NO_PICK'}")
+                        # DEBUG: Show analysis results
+                        if st.session_state.get('debug_mode', False):
+                            st.write(f"🔍 Analysis for {game.get('away_team', {}).get('name', 'Away')} @ {game.get('home_team', {}).get('name', 'Home')}")
+                            st.write(f"   Pick: {normalized['pick']}")
+                            st.write(f"   Confidence: {normalized['confidence']:.1%}")
+                            st.write(f"   Min Required: {min_confidence:.1%}")
+                            st.write(f"   Meets Threshold: {normalized['confidence'] >= min_confidence and normalized['pick'] != 'NO_PICK'}")
                                 
-                                # Show enhanced data debug info
-                                st.write("   **Enhanced Data Debug:**")
-                                st.write(f"     Analysis Type: {normalized.get('analysis_type', 'N/A')}")
-                                st.write(f"     Data Quality: {normalized.get('data_quality_score', 0.0):.2f}/1.0")
+                            # Show enhanced data debug info
+                            st.write("   **Enhanced Data Debug:**")
+                            st.write(f"     Analysis Type: {normalized.get('analysis_type', 'N/A')}")
+                            st.write(f"     Data Quality: {normalized.get('data_quality_score', 0.0):.2f}/1.0")
                                 
-                                weather_data = normalized.get('weather_data', {})
-                                if weather_data:
-                                    st.write(f"     Weather: {weather_data.get('temperature', 'N/A')}°F, {weather_data.get('conditions', 'N/A')}")
-                                    st.write(f"     Wind: {weather_data.get('wind_speed', 'N/A')} mph")
+                            weather_data = normalized.get('weather_data', {})
+                            if weather_data:
+                                st.write(f"     Weather: {weather_data.get('temperature', 'N/A')}°F, {weather_data.get('conditions', 'N/A')}")
+                                st.write(f"     Wind: {weather_data.get('wind_speed', 'N/A')} mph")
                                 
-                                quant_baseline = normalized.get('quantitative_baseline', {})
-                                if quant_baseline:
-                                    st.write(f"     Home Win Prob: {quant_baseline.get('home_win_probability', 0.5):.1%}")
-                                    st.write(f"     Weather Factor: {quant_baseline.get('weather_factor', 0.0):+.3f}")
-                                    st.write(f"     Injury Factor: {quant_baseline.get('injury_factor', 0.0):+.3f}")
+                            quant_baseline = normalized.get('quantitative_baseline', {})
+                            if quant_baseline:
+                                st.write(f"     Home Win Prob: {quant_baseline.get('home_win_probability', 0.5):.1%}")
+                                st.write(f"     Weather Factor: {quant_baseline.get('weather_factor', 0.0):+.3f}")
+                                st.write(f"     Injury Factor: {quant_baseline.get('injury_factor', 0.0):+.3f}")
                                 
-                                injury_data = normalized.get('injury_data', {})
-                                if injury_data and injury_data.get('reports'):
-                                    st.write(f"     Injuries: {len(injury_data['reports'])} reports")
-                                    for report in injury_data['reports'][:2]:  # Show first 2
-                                        st.write(f"       - {report.get('team', 'Unknown')}: {report.get('status', 'Unknown')}")
+                            injury_data = normalized.get('injury_data', {})
+                            if injury_data and injury_data.get('reports'):
+                                st.write(f"     Injuries: {len(injury_data['reports'])} reports")
+                                for report in injury_data['reports'][:2]:  # Show first 2
+                                    st.write(f"       - {report.get('team', 'Unknown')}: {report.get('status', 'Unknown')}")
                                 
-                                st.write("   ---")
+                            st.write("   ---")
                             
-                            # Apply sport-specific floors and basic consensus gate
-                            sport = (game.get('sport') or '').upper()
-                            required = {
-                                'WNBA': max(min_confidence, 0.86),
-                                'NCAAF': max(min_confidence, 0.80),
-                                'NCAAB': max(min_confidence, 0.82),
-                                'MLB': max(min_confidence, 0.78),
-                            }.get(sport, min_confidence)
-
-                            # Simple consensus: prefer when both models align on winner
-                            openai_pick = consensus.get('openai_pick') if isinstance(consensus, dict) else None
-                            gemini_pick = consensus.get('gemini_pick') if isinstance(consensus, dict) else None
+                        # Apply sport-specific floors and basic consensus gate
+                        sport = (game.get('sport') or '').upper()
+                        required = {
+                            'WNBA': max(min_confidence, 0.86),
+                            'NCAAF': max(min_confidence, 0.80),
+                            'NCAAB': max(min_confidence, 0.82),
+                            'MLB': max(min_confidence, 0.78),
+                        }.get(sport, min_confidence)
+
+                        # Simple consensus: prefer when both models align on winner
+                        openai_pick = consensus.get('openai_pick') if isinstance(consensus, dict) else None
+                        gemini_pick = consensus.get('gemini_pick') if isinstance(consensus, dict) else None
+                        consensus_ok = True
+                        try:
+                            # If we have individual picks, require agreement; otherwise allow
+                            if openai_pick and gemini_pick:
+                                consensus_ok = (str(openai_pick).lower() == str(gemini_pick).lower())
+                        except Exception:
                             consensus_ok = True
-                            try:
-                                # If we have individual picks, require agreement; otherwise allow
-                                if openai_pick and gemini_pick:
-                                    consensus_ok = (str(openai_pick).lower() == str(gemini_pick).lower())
-                            except Exception:
-                                consensus_ok = True
-
-                            if normalized['confidence'] >= required and normalized['pick'] != 'NO_PICK' and consensus_ok:
-                                analyzed_games.append(game)
-                        else:
-                            # DEBUG: Show failed analysis
-                            if st.session_state.get('debug_mode', False):
-                                st.write(f"❌ Analysis failed for {game.get('away_team', {}).get('name', 'Away')} @ {game.get('home_team', {}).get('name', 'Home')}")
-                                if consensus:
-                                    st.write(f"   Error: {consensus.get('error', 'Unknown error')}")
-                                else:
-                                    st.write("   Consensus is None")
-                    except Exception as e:
+
+                        if normalized['confidence'] >= required and normalized['pick'] != 'NO_PICK' and consensus_ok:
+                            analyzed_games.append(game)
+                    else:
+                        # DEBUG: Show failed analysis
                         if st.session_state.get('debug_mode', False):
-                            st.write(f"❌ Analysis failed: {e}")
-                        continue
+                            st.write(f"❌ Analysis failed for {game.get('away_team', {}).get('name', 'Away')} @ {game.get('home_team', {}).get('name', 'Home')}")
+                            if consensus:
+                                st.write(f"   Error: {consensus.get('error', 'Unknown error')}")
+                            else:
+                                st.write("   Consensus is None")
+                except Exception as e:
+                    if st.session_state.get('debug_mode', False):
+                        st.write(f"❌ Analysis failed: {e}")
+                    continue
             
             # Clear loading elements
             loading_container.empty()
             progress_bar.empty()
             status_text.empty()
             
+            if timed_out:
+                st.warning(f"⏱️ {len(timed_out)} of {len(slate)} games didn't finish analysis in time and were skipped")
+            
             # DEBUG: Show final analysis summary
             if st.session_state.get('debug_mode', False):
                 st.write(f"🎯 **ANALYSIS SUMMARY:**")
@@ -4653,8 +4664,40 @@ def show_dedicated_parlay_section(final_games):
         st.markdown("Not enough high-confidence picks (70%+) to recommend parlay combinations. Focus on individual picks for better value.")
         return
     
+    # Legs: each pick's moneyline at its best price, whatever its individual EV
+    legs = [leg for leg in get_parlay_candidate_legs(high_conf_games, min_expected_value=float('-inf'),
+                                                     max_legs=7 * len(high_conf_games))
+            if leg['market'] == 'h2h' and backs_ai_pick(high_conf_games[leg['game_index']].get('ai_analysis'), leg['team'])]
+    
+    def show_parlay(parlay, title, expanded):
+        with st.expander(title, expanded=expanded):
+            parlay_col1, parlay_col2 = st.columns([2, 1])
+            with parlay_col1:
+                st.markdown("**Parlay Legs:**")
+                for j, leg in enumerate(parlay['legs'], 1):
+                    st.markdown(f"**{j}.** {leg['selection']} {leg['price']} ({leg['game']}) - {leg['sport']}")
+                    st.markdown(f"   *Win Probability: {leg['probability']:.1%} • Best price at {leg['book']}*")
+            with parlay_col2:
+                st.metric("Win Probability", f"{parlay['probability']:.1%}")
+                st.metric("Payout", f"{parlay['price']} ({parlay['decimal']:.2f}x)")
+                st.metric("Expected Value", f"{parlay['expected_value']:+.1%}")
+                # Risk assessment
+                if parlay['expected_value'] > 0 and parlay['probability'] >= 0.35:
+                    st.success("✅ Good Value")
+                elif parlay['probability'] >= 0.25:
+                    st.warning("⚠️ Moderate Risk")
+                else:
+                    st.error("🔴 High Risk")
+                st.markdown("**💡 Parlay Strategy:**")
+                if parlay['expected_value'] > 0:
+                    st.markdown("• Consider 0.5-1 unit stake")
+                else:
+                    st.markdown("• Use minimal stake (0.25-0.5 units)")
+                    st.markdown("• Priced below fair value: entertainment only")
+                st.markdown("• **Remember:** Each leg must win for parlay to pay")
+    
     # Create tabs for different parlay types
-    if len(high_conf_games) >= 3:
+    if len(legs) >= 3:
         tab1, tab2 = st.tabs(["2-Game Parlays", "3-Game Parlays"])
     else:
         tab1 = st.tabs(["2-Game Parlays"])[0]
@@ -4662,123 +4705,27 @@ def show_dedicated_parlay_section(final_games):
     # 2-Game Parlays Tab
     with tab1:
         st.markdown("### 🎯 **Best 2-Game Parlay Combinations**")
+        two_game = parlay_optimizer.search(legs, top_k=3, min_legs=2, max_legs=2)
+        for i, parlay in enumerate(two_game, 1):
+            show_parlay(parlay, f"🎲 **Parlay #{i}** - {parlay['probability']:.1%} to Win • {parlay['price']}", i == 1)
         
-        parlay_count = 0
-        max_parlays = 3  # Limit to top 3 combinations
-        
-        for i in range(len(high_conf_games)):
-            for j in range(i + 1, len(high_conf_games)):
-                if parlay_count >= max_parlays:
-                            break
-                
-                game1 = high_conf_games[i]
-                game2 = high_conf_games[j]
-                
-                # Calculate combined confidence
-                conf1 = game1.get('ai_analysis', {}).get('confidence', 0.75)
-                conf2 = game2.get('ai_analysis', {}).get('confidence', 0.75)
-                combined_conf = conf1 * conf2
-                
-                if combined_conf >= 0.50:  # Only show if reasonable combined confidence
-                    parlay_count += 1
-                    
-                    with st.expander(f"🎲 **Parlay #{parlay_count}** - {combined_conf:.1%} Combined Confidence", expanded=parlay_count == 1):
-                        parlay_col1, parlay_col2 = st.columns([2, 1])
-                        with parlay_col1:
-                            st.markdown("**Parlay Legs:**")
-                            # Game 1
-                            home1 = game1.get('home_team', 'Unknown')
-                            away1 = game1.get('away_team', 'Unknown')
-                            if isinstance(home1, dict):
-                                home1 = home1.get('name', 'Unknown')
-                            if isinstance(away1, dict):
-                                away1 = away1.get('name', 'Unknown')
-                            pred1 = game1.get('ai_analysis', {}).get('predicted_winner', home1)
-                            sport1 = game1.get('sport', 'Unknown')
-                            st.markdown(f"**1.** {pred1} ({away1} @ {home1}) - {sport1}")
-                            st.markdown(f"   *Confidence: {conf1:.1%}*")
-                            # Game 2
-                            home2 = game2.get('home_team', 'Unknown')
-                            away2 = game2.get('away_team', 'Unknown')
-                            if isinstance(home2, dict):
-                                home2 = home2.get('name', 'Unknown')
-                            if isinstance(away2, dict):
-                                away2 = away2.get('name', 'Unknown')
-                            pred2 = game2.get('ai_analysis', {}).get('predicted_winner', home2)
-                            sport2 = game2.get('sport', 'Unknown')
-                            st.markdown(f"**2.** {pred2} ({away2} @ {home2}) - {sport2}")
-                            st.markdown(f"   *Confidence: {conf2:.1%}*")
-                        with parlay_col2:
-                            # Parlay metrics
-                            st.metric("Combined Odds", f"{combined_conf:.1%}")
-                            # Estimate payout (conservative)
-                            payout_multiplier = (1/conf1) * (1/conf2) * 0.85  # 85% of true odds
-                            st.metric("Est. Payout", f"{payout_multiplier:.1f}x")
-                            # Risk assessment
-                            if combined_conf >= 0.60:
-                                st.success("✅ Good Value")
-                            elif combined_conf >= 0.50:
-                                st.warning("⚠️ Moderate Risk")
-                            else:
-                                st.error("🔴 High Risk")
-                            
-                            # Parlay strategy
-                            st.markdown("**💡 Parlay Strategy:**")
-                            if combined_conf >= 0.60:
-                                st.markdown("• Consider 0.5-1 unit stake")
-                                st.markdown("• Both picks have strong individual merit")
-                            else:
-                                st.markdown("• Use minimal stake (0.25-0.5 units)")
-                                st.markdown("• Entertainment value rather than investment")
-                            st.markdown("• **Remember:** Each leg must win for parlay to pay")
-            
-            if parlay_count >= max_parlays:
-                break
-        
-        if parlay_count == 0:
+        if not two_game:
             st.info("💡 **No Quality 2-Game Parlays Available** - Individual picks recommended today.")
     
-    # 3-Game Parlays Tab (if enough games)
-    if len(high_conf_games) >= 3:
+    # 3-Game Parlays Tab (if enough priced picks)
+    if len(legs) >= 3:
         with tab2:
             st.markdown("### 🎲 **3-Game Parlay Combinations (High Risk)**")
             st.warning("⚠️ **Warning:** 3+ game parlays have significantly lower success rates. Use very small stakes.")
             
             # Show only the single best 3-game combination
-            best_three = high_conf_games[:3]
-            combined_3game = 1.0
-            for game in best_three:
-                combined_3game *= game.get('ai_analysis', {}).get('confidence', 0.75)
-            
-            if combined_3game >= 0.35:  # Lower threshold for 3-game
-                with st.expander(f"🎰 **Best 3-Game Parlay** - {combined_3game:.1%} Combined Confidence", expanded=False):
-                    
-                    st.markdown("**Parlay Legs:**")
-                    for i, game in enumerate(best_three, 1):
-                        home = game.get('home_team', 'Unknown')
-                        away = game.get('away_team', 'Unknown')
-                        if isinstance(home, dict): home = home.get('name', 'Unknown')
-                        if isinstance(away, dict): away = away.get('name', 'Unknown')
-                        
-                        pred = game.get('ai_analysis', {}).get('predicted_winner', home)
-                        conf = game.get('ai_analysis', {}).get('confidence', 0.75)
-                        sport = game.get('sport', 'Unknown')
-                        
-                        st.markdown(f"**{i}.** {pred} ({away} @ {home}) - {sport} ({conf:.1%})")
-                    
-                    # 3-game metrics
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Combined Odds", f"{combined_3game:.1%}")
-                    with col2:
-                        payout_3game = (1/combined_3game) * 0.80  # Even more conservative
-                        st.metric("Est. Payout", f"{payout_3game:.1f}x")
-                    with col3:
-                        st.metric("Risk Level", "🔴 Very High")
-                    
-                    st.error("🚨 **High Risk Strategy:** Use maximum 0.25 units. This is entertainment betting only.")
+            three_game = parlay_optimizer.search(legs, top_k=1, min_legs=3, max_legs=3)
+            if three_game:
+                parlay = three_game[0]
+                show_parlay(parlay, f"🎰 **Best 3-Game Parlay** - {parlay['probability']:.1%} to Win • {parlay['price']}", False)
+                st.error("🚨 **High Risk Strategy:** Use maximum 0.25 units. This is entertainment betting only.")
             else:
-                st.info("💡 **No Quality 3-Game Parlays** - Combined confidence too low for recommendation.")
+                st.info("💡 **No Quality 3-Game Parlays** - Combined win probability too low for recommendation.")
     
     # Parlay education section
     with st.expander("📚 **Parlay Strategy Guide**", expanded=False):
@@ -5069,6 +5016,14 @@ def show_live_scores():
     total_games = sum(len(games) for games in all_scores.values())
     st.success(f"📊 Found {total_games} games across {len(all_scores)} sports")
     
+    refresh_in = live_api.suggested_refresh_seconds(all_scores)
+    if refresh_in is None:
+        st.caption("✅ All games are final - no need to refresh")
+    elif refresh_in < 60:
+        st.caption(f"⏱️ Games in progress - refresh every {refresh_in:.0f}s for live scores")
+    else:
+        st.caption(f"⏱️ Next change expected within {refresh_in / 60:.0f} min")
+    
     # Create tabs for each sport
     if len(all_scores) > 1:
         tabs = st.tabs([f"{sport} ({len(games)})" for sport, games in all_scores.items()])
@@ -5307,16 +5262,16 @@ def show_live_market_analysis(analysis_date, sports, depth):
                 st.metric("Games Analyzed", len(games))
             
             with col2:
-                favorites_covering = market_trends.get('favorites_covering_pct', 65)
-                st.metric("Favorites Covering", f"{favorites_covering}%", f"{favorites_covering-50:+d}%")
+                favorites_shortening = market_trends.get('favorites_shortening_pct')
+                st.metric("Favorites Shortening", f"{favorites_shortening}%" if favorites_shortening is not None else "N/A")
             
             with col3:
-                avg_total = market_trends.get('avg_total', 47.5)
-                st.metric("Avg Total", f"{avg_total}", f"{avg_total-45:+.1f}")
+                avg_total = market_trends.get('avg_total')
+                st.metric("Avg Total", f"{avg_total}" if avg_total is not None else "N/A")
             
             with col4:
-                line_movements = market_trends.get('significant_movements', 3)
-                st.metric("Line Movements", line_movements, f"+{line_movements}")
+                line_movements = market_trends.get('significant_movements', 0)
+                st.metric("Line Movements", line_movements)
             
             st.markdown("---")
             
@@ -5326,6 +5281,8 @@ def show_live_market_analysis(analysis_date, sports, depth):
             with col1:
                 st.markdown("#### 🔥 Hot Trends Detected")
                 hot_trends = market_trends.get('hot_trends', [])
+                if not hot_trends:
+                    st.info("No significant line movement recorded yet.")
                 
                 for trend in hot_trends:
                     confidence = trend.get('confidence', 75)
@@ -5335,14 +5292,12 @@ def show_live_market_analysis(analysis_date, sports, depth):
                     st.write(f"   • Sample: {trend['sample']}")
             
             with col2:
-                st.markdown("#### 📊 Public vs Sharp Money")
+                st.markdown("#### 📊 Line Movement (open → now)")
                 
-                public_sharp = market_trends.get('public_vs_sharp', [])
-                for analysis in public_sharp:
-                    st.markdown(f"**{analysis['game']}**")
-                    st.write(f"• Public: {analysis['public']}% on {analysis['public_side']}")
-                    st.write(f"• Sharp: Backing {analysis['sharp_side']}")
-                    st.write(f"• Recommendation: {analysis['recommendation']}")
+                for move in market_trends.get('line_moves', []):
+                    st.markdown(f"**{move['game']}**")
+                    st.write(f"• {move['summary']}")
+                    st.write(f"• Spread: {move['recent']}")
                     st.markdown("---")
         else:
             st.info("No games available for analysis on this date.")
@@ -5356,7 +5311,7 @@ def show_ai_value_detection(analysis_date, sports):
         games = get_games_for_date(analysis_date)
         
         if games:
-            value_bets = detect_value_bets(games)
+            value_bets = detect_value_bets(games, analysis_date, sports)
             
             if value_bets:
                 st.success(f"🎯 Found {len(value_bets)} potential value opportunities")
@@ -5369,16 +5324,16 @@ def show_ai_value_detection(analysis_date, sports):
                     color_map = {'High': '🟢', 'Medium': '🟡', 'Low': '🔴'}
                     color = color_map.get(value_rating, '🟡')
                     
-                    with st.expander(f"{color} #{i} Value Bet - {bet['game']} • {confidence}% Confidence", expanded=i <= 2):
+                    with st.expander(f"{color} #{i} Value Bet - {bet['game']} • EV +{bet.get('expected_value', 0.0):.1f}%", expanded=i <= 2):
                         
                         col1, col2, col3 = st.columns([2, 2, 1])
                         
                         with col1:
                             st.markdown(f"""
                             **🎯 Recommended Bet:** {bet['bet']}  
-                            **💰 Best Odds:** {bet['best_odds']}  
+                            **💰 Best Odds:** {bet['best_odds']} ({bet.get('book', 'N/A')})  
                             **📊 Value Rating:** {value_rating}  
-                            **🤖 AI Confidence:** {confidence}%
+                            **🤖 Model Confidence:** {confidence}%
                             """)
                         
                         with col2:
@@ -5394,7 +5349,7 @@ def show_ai_value_detection(analysis_date, sports):
                                 st.success("Added to watchlist!")
                         
                         # AI reasoning
-                        st.markdown("#### 🤖 AI Analysis")
+                        st.markdown("#### 🤖 Why It's Value")
                         reasons = bet.get('reasons', ['Value detected by AI analysis'])
                         for reason in reasons:
                             st.write(f"• {reason}")
@@ -5729,35 +5684,22 @@ def get_espn_games_for_date(target_date, sports):
     games = []
     start_time = time.time()
     
-    # ESPN API endpoints for different sports
-    espn_endpoints = {
-        'NFL': 'https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard',
-        'NBA': 'https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard',
-        'WNBA': 'https://site.api.espn.com/apis/site/v2/sports/basketball/wnba/scoreboard',
-        'MLB': 'https://site.api.espn.com/apis/site/v2/sports/baseball/mlb/scoreboard',
-        'NHL': 'https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard',
-        'NCAAF': 'https://site.api.espn.com/apis/site/v2/sports/football/college-football/scoreboard',
-        'NCAAB': 'https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard'
-    }
-    
     def fetch_sport_games(sport):
         """Fetch games for a single sport - for parallel execution; honors target_date via ESPN 'dates' param."""
-        if sport not in espn_endpoints:
+        if not espn_scoreboard.resolve_league(sport):
             return []
 
         sport_games = []
-        base_url = espn_endpoints[sport]
-        # Try explicit date first, then fallback to base
-        date_ymd = target_date.strftime('%Y%m%d')
-        date_dash = target_date.strftime('%Y-%m-%d')
-        urls_to_try = [f"{base_url}?dates={date_ymd}", f"{base_url}?dates={date_dash}", base_url]
+        # Try explicit date first, then fallback to the current scoreboard
+        dates_to_try = [target_date, None]
 
-        for url in urls_to_try:
+        for date_param in dates_to_try:
             try:
-                response = requests.get(url, timeout=8)
-                if response.status_code != 200:
+                data = espn_scoreboard.get_league_scoreboard(sport, date_param, timeout=8)
+                if not data:
                     continue
-                data = response.json()
+                # Every scoreboard carries the season calendar; index it once per season
+                schedule_index.observe(sport, data)
                 if 'events' in data and data['events']:
                     for event in data['events']:
                         try:
@@ -5863,14 +5805,16 @@ def get_games_for_date(target_date, sports=['NFL']):
             today + timedelta(days=2),  # Day after tomorrow
         ]
         
-        for try_date in nearby_dates:
-            if try_date != target_date:  # Don't retry the same date
-                nearby_games = get_espn_games_for_date(try_date, sports)
-                if nearby_games:
-                    if st.session_state.get('debug_mode', False):
-                        st.write(f"✅ Found {len(nearby_games)} games on {try_date}")
-                    espn_games = nearby_games
-                    break
+        # Don't retry the same date; the schedule index skips dates without games and
+        # the rest are probed concurrently, keeping this preference order
+        candidate_dates = [try_date for try_date in nearby_dates if try_date != target_date]
+        try_date = schedule_index.nearest_slate(sports, candidate_dates)
+        if try_date is not None:
+            nearby_games = get_espn_games_for_date(try_date, sports)
+            if nearby_games:
+                if st.session_state.get('debug_mode', False):
+                    st.write(f"✅ Found {len(nearby_games)} games on {try_date}")
+                espn_games = nearby_games
     
     if espn_games:
         # Live odds enrichment removed per product decision; return ESPN games directly
@@ -5930,7 +5874,7 @@ def get_odds_for_game_legacy(game):
             'oddsFormat': 'american'
         }
         
-        response = requests.get(odds_url, params=params, timeout=10)
+        response = http_session.get(odds_url, params=params, timeout=10)
         if response.status_code == 200:
             data = response.json()
             
@@ -6120,7 +6064,7 @@ def get_rapidapi_odds(sport, team1, team2):
             'oddsFormat': 'american'
         }
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_session.get(url, headers=headers, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -6412,6 +6356,18 @@ def show_admin_api_usage():
     with tab1:
         st.markdown("### 🔄 Real-Time API Usage")
         
+        # Host-wide LLM response cache savings (shared across all sessions)
+        cache_stats = llm_response_cache.get_stats()
+        cache_col1, cache_col2, cache_col3, cache_col4 = st.columns(4)
+        with cache_col1:
+            st.metric("🗄️ LLM Cache Hits", f"{cache_stats['hits']:,}")
+        with cache_col2:
+            st.metric("LLM Cache Misses", f"{cache_stats['misses']:,}")
+        with cache_col3:
+            st.metric("Hit Rate", f"{cache_stats['hit_rate']:.1f}%")
+        with cache_col4:
+            st.metric("💰 Saved by Cache", f"${cache_stats['cost_saved']:.2f}")
+        
         # Get current API usage
         api_usage = get_current_api_usage()
         
@@ -6676,6 +6632,49 @@ def track_api_error(provider, error_type='general'):
     # Also save error to database
     save_api_usage_to_db(provider, 0, 0.0, success=False, error_message=error_type)
 
+# Provider labels used by the API usage accounting for LLM cache lookups
+LLM_CACHE_PROVIDER_LABELS = {
+    'openai': 'OpenAI GPT-4o',
+    'gemini': 'Google Gemini Pro',
+    'claude': 'Claude',
+}
+
+def track_llm_cache_usage(provider, hit, cost_saved=0.0):
+    """Track LLM response cache hits/misses and dollars saved alongside API usage"""
+    try:
+        today = datetime.now().date().isoformat()
+        label = LLM_CACHE_PROVIDER_LABELS.get(provider, provider)
+        
+        if 'api_usage_tracking' not in st.session_state:
+            st.session_state.api_usage_tracking = {}
+        
+        if today not in st.session_state.api_usage_tracking:
+            st.session_state.api_usage_tracking[today] = {}
+        
+        if label not in st.session_state.api_usage_tracking[today]:
+            st.session_state.api_usage_tracking[today][label] = {
+                'requests': 0,
+                'tokens': 0,
+                'cost': 0.0,
+                'errors': 0
+            }
+        
+        provider_usage = st.session_state.api_usage_tracking[today][label]
+        provider_usage.setdefault('cache_hits', 0)
+        provider_usage.setdefault('cache_misses', 0)
+        provider_usage.setdefault('cost_saved', 0.0)
+        
+        if hit:
+            provider_usage['cache_hits'] += 1
+            provider_usage['cost_saved'] += cost_saved
+        else:
+            provider_usage['cache_misses'] += 1
+    except Exception:
+        # Lookups from worker threads without a Streamlit session are still counted host-wide
+        pass
+
+llm_response_cache.add_listener(track_llm_cache_usage)
+
 def calculate_daily_api_cost():
     """Calculate total daily API costs from real usage"""
     # Try database first
@@ -6894,7 +6893,7 @@ def save_budget_settings(daily_budget, monthly_budget, alert_settings):
                 'oddsFormat': 'american'
             }
             
-            response = requests.get(odds_url, params=params, timeout=10)
+            response = http_session.get(odds_url, params=params, timeout=10)
             
             if response.status_code == 200:
                 games = response.json()
@@ -7349,99 +7348,36 @@ def get_weather_for_game(city, sport):
 def show_cross_sport_parlays(games, sports):
     """Display cross-sport parlay opportunities"""
     
-    import random
-    from itertools import combinations
-    
     if len(games) < 2:
         return
     
     st.markdown("### 🌟 AI-Recommended Cross-Sport Parlays")
     
-    # Generate cross-sport combinations
-    cross_sport_parlays = []
-    
-    # 2-leg cross-sport parlays
-    for game1, game2 in combinations(games, 2):
-        if game1.get('sport') != game2.get('sport'):  # Different sports
-            analysis1 = game1.get('ai_analysis', {})
-            analysis2 = game2.get('ai_analysis', {})
-            
-            conf1 = analysis1.get('confidence', 0.5)
-            conf2 = analysis2.get('confidence', 0.5)
-            combined_conf = (conf1 + conf2) / 2
-            
-            if combined_conf > 0.6:  # Only show high-confidence parlays
-                payout = int(((1/conf1) * (1/conf2) - 1) * 100) + random.randint(50, 150)
-                
-                cross_sport_parlays.append({
-                    'games': [game1, game2],
-                    'description': f"{analysis1.get('pick', 'TBD')} + {analysis2.get('pick', 'TBD')}",
-                    'sports': f"{game1.get('sport', 'Unknown')} × {game2.get('sport', 'Unknown')}",
-                    'confidence': combined_conf,
-                    'payout': payout,
-                    'legs': 2
-                })
-    
-    # 3+ leg parlays for high-confidence games
-    high_conf_games = [g for g in games if g.get('ai_analysis', {}).get('confidence', 0) > 0.7]
-    
-    if len(high_conf_games) >= 3:
-        for combo in combinations(high_conf_games, 3):
-            # Check if we have multiple sports
-            sport_set = set(g.get('sport', 'Unknown') for g in combo)
-            if len(sport_set) >= 2:  # At least 2 different sports
-                
-                combined_conf = sum(g.get('ai_analysis', {}).get('confidence', 0.5) for g in combo) / 3
-                if combined_conf > 0.65:
-                    
-                    picks = [g.get('ai_analysis', {}).get('pick', 'TBD') for g in combo]
-                    sports_combo = ' × '.join(sorted(sport_set))
-                    
-                    # Calculate realistic payout
-                    individual_odds = [1/g.get('ai_analysis', {}).get('confidence', 0.5) for g in combo]
-                    parlay_odds = 1
-                    for odds in individual_odds:
-                        parlay_odds *= odds
-                    payout = int((parlay_odds - 1) * 100) + random.randint(100, 300)
-                    
-                    cross_sport_parlays.append({
-                        'games': combo,
-                        'description': ' + '.join(picks),
-                        'sports': sports_combo,
-                        'confidence': combined_conf,
-                        'payout': payout,
-                        'legs': 3
-                    })
-    
-    # Sort by confidence and payout
-    cross_sport_parlays.sort(key=lambda x: (x['confidence'], x['payout']), reverse=True)
+    # Best 2-4 leg parlays by expected value, legs from at least two sports
+    legs = get_parlay_candidate_legs(games)
+    cross_sport_parlays = parlay_optimizer.search(legs, top_k=6, min_legs=2, max_legs=4, min_sports=2)
     
     if cross_sport_parlays:
         # Display top parlays
-        for i, parlay in enumerate(cross_sport_parlays[:6], 1):
+        for i, parlay in enumerate(cross_sport_parlays, 1):
             
-            with st.expander(f"🎯 Parlay #{i}: {parlay['sports']} • {parlay['confidence']:.1%} Confidence • +{parlay['payout']}", expanded=i <= 2):
+            with st.expander(f"🎯 Parlay #{i}: {' × '.join(parlay['sports'])} • {parlay['probability']:.1%} to Win • {parlay['price']}", expanded=i <= 2):
                 
                 parlay_col1, parlay_col2, parlay_col3 = st.columns([3, 2, 1])
                 
                 with parlay_col1:
                     st.markdown("**🎲 Parlay Legs:**")
-                    for j, game in enumerate(parlay['games'], 1):
-                        pick = game.get('ai_analysis', {}).get('pick', 'TBD')
-                        home = game.get('home_team', 'Unknown')
-                        away = game.get('away_team', 'Unknown')
-                        sport = game.get('sport', 'Unknown')
-                        confidence = game.get('ai_analysis', {}).get('confidence', 0)
-                        
-                        st.write(f"**Leg {j}:** {pick}")
-                        st.write(f"   ↳ {away} @ {home} ({sport}) - {confidence:.1%}")
+                    for j, leg in enumerate(parlay['legs'], 1):
+                        st.write(f"**Leg {j}:** {leg['selection']} {leg['price']} ({leg['book']})")
+                        st.write(f"   ↳ {leg['game']} ({leg['sport']}) - {leg['probability']:.1%}")
                 
                 with parlay_col2:
                     st.markdown("**📊 Parlay Stats:**")
-                    st.write(f"**Legs:** {parlay['legs']}")
-                    st.write(f"**Sports:** {len(set(g.get('sport') for g in parlay['games']))}")
-                    st.write(f"**Confidence:** {parlay['confidence']:.1%}")
-                    st.write(f"**Payout:** +{parlay['payout']}")
+                    st.write(f"**Legs:** {parlay['num_legs']}")
+                    st.write(f"**Sports:** {len(parlay['sports'])}")
+                    st.write(f"**Win Probability:** {parlay['probability']:.1%}")
+                    st.write(f"**Payout:** {parlay['price']} ({parlay['decimal']:.2f}x)")
+                    st.write(f"**Expected Value:** {parlay['expected_value']:+.1%}")
                 
                 with parlay_col3:
                     if st.button(f"🎰 Bet", key=f"parlay_bet_{i}"):
@@ -7473,7 +7409,7 @@ def show_cross_sport_parlays(games, sports):
             • Have a stop-loss strategy
             """)
     else:
-        st.info("No high-confidence cross-sport parlays available with current games. Try adjusting your confidence threshold or selecting more sports.")
+        st.info("No cross-sport parlays available: parlays need priced odds for games in at least two sports. Try selecting more sports.")
 
     # Add props-based parlays
     st.markdown("---")
@@ -7481,214 +7417,210 @@ def show_cross_sport_parlays(games, sports):
     show_props_parlays(games)
 
 def analyze_market_trends(games, depth):
-    """Analyze market trends from game data"""
-    import random
+    """Analyze market trends from recorded line movement"""
     
     try:
-        # Simulate realistic market analysis
-        num_games = len(games)
+        # Deeper analysis looks further back for recent moves and lists more of them
+        window_minutes = {'Quick': 30, 'Standard': 120, 'Deep': 360}.get(depth, 120)
+        top_moves = {'Quick': 2, 'Standard': 3, 'Deep': 5}.get(depth, 3)
+        moves = odds_ingestion.slate_movement(games, window_minutes=window_minutes)
         
-        # Calculate realistic metrics
-        favorites_pct = random.randint(58, 72)
-        avg_total = random.uniform(44.5, 49.5)
-        movements = random.randint(2, min(6, num_games))
+        if moves.empty:
+            return {
+                'favorites_shortening_pct': None,
+                'avg_total': None,
+                'significant_movements': 0,
+                'hot_trends': [],
+                'line_moves': []
+            }
         
-        # Generate hot trends based on real game data
+        spread_move = moves.get('spread_move', pd.Series(dtype=float)).fillna(0)
+        total_move = moves.get('total_move', pd.Series(dtype=float)).fillna(0)
+        probability_move = moves.get('moneyline_move', pd.Series(dtype=float)).fillna(0)
+        significant = ((spread_move.abs() >= SIGNIFICANT_SPREAD_MOVE) | (total_move.abs() >= SIGNIFICANT_TOTAL_MOVE) |
+                       (probability_move.abs() >= SIGNIFICANT_PROBABILITY_MOVE))
+        
+        # Favorites whose win probability has risen since the open
+        favorites_shortening_pct = None
+        if 'moneyline_current' in moves and moves['moneyline_current'].notna().any():
+            priced = moves[moves['moneyline_current'].notna()]
+            home_favorite = priced['moneyline_current'] > 0.5
+            shortening = (home_favorite & (priced['moneyline_move'] > 0)) | (~home_favorite & (priced['moneyline_move'] < 0))
+            favorites_shortening_pct = int(round(shortening.mean() * 100))
+        
+        avg_total = None
+        if 'total_current' in moves and moves['total_current'].notna().any():
+            avg_total = round(float(moves['total_current'].mean()), 1)
+        
+        # Biggest moves first, with spread points and probability points on one scale
+        magnitude = spread_move.abs() / SIGNIFICANT_SPREAD_MOVE + probability_move.abs() / SIGNIFICANT_PROBABILITY_MOVE
         hot_trends = []
-        team_names = []
-        
-        for game in games[:3]:
-            home = game.get('home_team', 'Home Team')
-            away = game.get('away_team', 'Away Team')
-            team_names.extend([home, away])
-        
-        if team_names:
-            trends = [
-                {
-                    'title': f'{random.choice(team_names)} Showing Value',
-                    'description': 'AI detected consistent pattern in recent matchups',
-                    'sample': f'Last 5 games covering spread at {random.randint(70, 85)}% rate',
-                    'confidence': random.randint(75, 90)
-                },
-                {
-                    'title': 'Road Teams Trending',
-                    'description': 'Away teams performing better than expected',
-                    'sample': f'Road teams {random.randint(4, 7)}-{random.randint(1, 3)} ATS this week',
-                    'confidence': random.randint(65, 80)
-                },
-                {
-                    'title': 'Under Trend Active',
-                    'description': 'Totals consistently going under projection',
-                    'sample': f'Unders hitting {random.randint(60, 75)}% in similar weather',
-                    'confidence': random.randint(70, 85)
-                }
-            ]
-            hot_trends = random.sample(trends, min(2, len(trends)))
-        
-        # Generate public vs sharp analysis
-        public_sharp = []
-        for game in games[:3]:
-            home = game.get('home_team', 'Home Team')
-            away = game.get('away_team', 'Away Team')
-            
-            public_pct = random.randint(55, 85)
-            public_side = random.choice([home, away])
-            sharp_side = away if public_side == home else home
-            
-            public_sharp.append({
-                'game': f'{away} @ {home}',
-                'public': public_pct,
-                'public_side': public_side,
-                'sharp_side': sharp_side,
-                'recommendation': f'Consider {sharp_side} for value' if public_pct > 70 else 'Balanced action'
+        for index in magnitude[significant].sort_values(ascending=False).index[:top_moves]:
+            row = moves.loc[index]
+            summary = movement_summary(row)
+            signal = movement_signal(summary)
+            side = row['home_team'] if signal['favours'] == 'home' else row['away_team']
+            market = summary.get('spread') or summary.get('moneyline')
+            hot_trends.append({
+                'title': f"{'Steam on' if signal['steam'] else 'Money moving to'} {side}",
+                'description': f"{row['away_team']} @ {row['home_team']}",
+                'sample': describe_movement(summary, row['home_team']),
+                'confidence': int(round(100 * market['books_moving'] / max(market['books'], 1)))
+            })
+        
+        line_moves = []
+        for _, row in moves.iterrows():
+            summary = movement_summary(row)
+            if not summary:
+                continue
+            line_moves.append({
+                'game': f"{row['away_team']} @ {row['home_team']}",
+                'summary': describe_movement(summary, row['home_team']),
+                'recent': f"{(summary.get('spread') or {}).get('recent_move', 0.0):+.1f} pts in the last {window_minutes} min"
             })
         
         return {
-            'favorites_covering_pct': favorites_pct,
+            'favorites_shortening_pct': favorites_shortening_pct,
             'avg_total': avg_total,
-            'significant_movements': movements,
+            'significant_movements': int(significant.sum()),
             'hot_trends': hot_trends,
-            'public_vs_sharp': public_sharp
+            'line_moves': line_moves[:top_moves * 2]
         }
         
     except Exception:
-        # Fallback data
         return {
-            'favorites_covering_pct': 65,
-            'avg_total': 47.0,
-            'significant_movements': 3,
-            'hot_trends': [
-                {
-                    'title': 'Market Analysis Active',
-                    'description': 'Real-time trend detection enabled',
-                    'sample': 'Professional analysis running',
-                    'confidence': 80
-                }
-            ],
-            'public_vs_sharp': []
+            'favorites_shortening_pct': None,
+            'avg_total': None,
+            'significant_movements': 0,
+            'hot_trends': [],
+            'line_moves': []
         }
 
-def detect_value_bets(games):
-    """AI-powered value bet detection"""
-    import random
+# Parlay candidates: outcomes priced no worse than this EV, and at most this many legs
+PARLAY_MIN_LEG_EV = -0.05
+PARLAY_CANDIDATE_LEGS = 120
+
+def refresh_slate_odds(games):
+    """Quota-paced odds refresh for the sports on a slate; a no-op while their odds are fresh"""
+    sport_keys = {LEAGUE_SPORT_KEYS.get(str(game.get('sport', '')).upper()) for game in games}
+    odds_ingestion.ensure_fresh([key for key in sport_keys if key])
+
+def get_parlay_candidate_legs(games, min_expected_value=PARLAY_MIN_LEG_EV, max_legs=PARLAY_CANDIDATE_LEGS):
+    """Every priced outcome on the slate at its best book, as parlay legs priced by the model"""
+    try:
+        refresh_slate_odds(games)
+        bets = value_engine.top_bets(games, top_k=max_legs, min_expected_value=min_expected_value)
+        return legs_from_value_bets(bets)
+    except Exception:
+        return []
+
+def detect_value_bets(games, analysis_date=None, sports=None, top_k=10):
+    """Expected-value scan of the whole slate: model probabilities against every book's prices"""
     
     value_bets = []
     
     try:
-        for i, game in enumerate(games[:4]):  # Analyze top 4 games
-            home = game.get('home_team', 'Home Team')
-            away = game.get('away_team', 'Away Team')
-            
-            # Simulate AI value detection
-            confidence = random.uniform(65, 92)
-            
-            if confidence >= 70:  # Only show high-confidence value bets
-                bet_type = random.choice(['Spread', 'Moneyline', 'Total'])
-                
-                if bet_type == 'Spread':
-                    spread = random.uniform(-7.5, 7.5)
-                    team = random.choice([home, away])
-                    bet_desc = f'{team} {spread:+.1f}'
-                    odds = random.randint(-120, -105)
-                elif bet_type == 'Moneyline':
-                    team = random.choice([home, away])
-                    bet_desc = f'{team} ML'
-                    odds = random.randint(-150, +180)
-                else:  # Total
-                    total = random.uniform(42.5, 52.5)
-                    ou = random.choice(['Over', 'Under'])
-                    bet_desc = f'{ou} {total:.1f}'
-                    odds = random.randint(-115, -105)
-                
-                value_rating = 'High' if confidence >= 85 else 'Medium' if confidence >= 75 else 'Low'
-                
-                reasons = [
-                    f'Line movement indicates sharp money on {team if bet_type != "Total" else ou}',
-                    f'Historical matchup data favors this selection',
-                    f'Market inefficiency detected by AI analysis',
-                    f'Weather/injury factors not properly priced in'
-                ]
-                
-                value_bet = {
-                    'game': f'{away} @ {home}',
-                    'bet': bet_desc,
-                    'best_odds': f'{odds:+d}' if odds > 0 else str(odds),
-                    'confidence': int(confidence),
-                    'value_rating': value_rating,
-                    'expected_value': random.uniform(3.5, 12.8),
-                    'edge': random.uniform(2.1, 8.4),
-                    'win_prob': random.uniform(52, 68),
-                    'kelly_pct': random.uniform(1.2, 4.8),
-                    'reasons': random.sample(reasons, 2),
-                    'risk_level': 'Low' if confidence >= 85 else 'Medium' if confidence >= 75 else 'High',
-                    'risk_explanation': 'Based on AI confidence and market analysis'
-                }
-                
-                value_bets.append(value_bet)
+        refresh_slate_odds(games)
+        
+        # AI consensus from the day's picks run, for games that don't carry their own analysis
+        def matchup_key(game):
+            return tuple(normalize_team_key(team.get('name', '') if isinstance(team, dict) else team or '')
+                         for team in (game.get('away_team'), game.get('home_team')))
+        
+        analyses = [game.get('ai_analysis') for game in games]
+        if analysis_date is not None and sports:
+            cached = get_cached_predictions(analysis_date.strftime('%Y-%m-%d'), sports) or []
+            by_matchup = {matchup_key(prediction): prediction.get('ai_analysis') for prediction in cached}
+            analyses = [analysis or by_matchup.get(matchup_key(game)) for analysis, game in zip(analyses, games)]
+        
+        for bet in value_engine.top_bets(games, analyses=analyses, top_k=top_k):
+            expected_value = bet['expected_value']
+            win_prob = bet['win_prob']
+            value_rating = 'High' if expected_value >= 0.05 else 'Medium' if expected_value >= 0.025 else 'Low'
+            
+            reasons = [f"Model {win_prob:.1%} vs {bet['implied_prob']:.1%} implied by {bet['price']} at {bet['book']}"]
+            if bet['market_prob'] == bet['market_prob']:  # NaN when no book hangs a complete line
+                reasons.append(f"No-vig market consensus {bet['market_prob']:.1%} across {bet['books_quoting']} books")
+            if bet['ai_home_prob'] is not None:
+                reasons.append(f"Quant baseline ({bet['quant_home_prob']:.1%} home) blended with the calibrated "
+                               f"AI consensus ({bet['ai_home_prob']:.1%} home)")
+            else:
+                reasons.append(f"Quant baseline only ({bet['quant_home_prob']:.1%} home win); no AI analysis yet")
+            
+            value_bets.append({
+                'game': bet['game'],
+                'bet': bet['selection'],
+                'book': bet['book'],
+                'best_odds': bet['price'],
+                'confidence': int(round(win_prob * 100)),
+                'value_rating': value_rating,
+                'expected_value': expected_value * 100,
+                'edge': bet['edge'] * 100,
+                'win_prob': win_prob * 100,
+                'kelly_pct': bet['kelly_stake'] * 100,
+                'reasons': reasons,
+                'risk_level': 'Low' if win_prob >= 0.6 else 'Medium' if win_prob >= 0.45 else 'High',
+                'risk_explanation': f"{bet['kelly_stake']:.1%} of bankroll at fractional Kelly, "
+                                    f"{win_prob:.0%} to win",
+                'value_bet': bet
+            })
         
-        return sorted(value_bets, key=lambda x: x['confidence'], reverse=True)
+        return value_bets
         
     except Exception:
         return []
 
 def generate_smart_alerts(games, sensitivity, min_movement):
-    """Generate smart betting alerts"""
-    import random
+    """Generate smart betting alerts from recorded line movement"""
     
     alerts = []
     
     try:
-        # Simulate different types of alerts based on games
-        for game in games[:3]:
-            home = game.get('home_team', 'Home Team')
-            away = game.get('away_team', 'Away Team')
-            
-            # Random chance of generating alerts based on sensitivity
-            alert_chance = {'Low': 0.3, 'Medium': 0.5, 'High': 0.7}.get(sensitivity, 0.5)
-            
-            if random.random() < alert_chance:
-                alert_types = [
-                    {
-                        'title': f'Line Movement - {away} @ {home}',
-                        'message': f'Spread moved {random.uniform(1.5, 3.5):.1f} points in favor of {random.choice([home, away])}',
-                        'priority': 'Important' if random.uniform(1.5, 3.5) >= 2.0 else 'Info'
-                    },
-                    {
-                        'title': f'Sharp Action - {away} @ {home}',
-                        'message': f'Professional money detected on {random.choice([home, away])} despite public backing opposite side',
-                        'priority': 'Critical'
-                    },
-                    {
-                        'title': f'Injury Update - {away} @ {home}',
-                        'message': f'Key player status change may impact {random.choice([home, away])} performance',
-                        'priority': 'Important'
-                    },
-                    {
-                        'title': f'Weather Alert - {away} @ {home}',
-                        'message': f'Weather conditions may favor Under {random.uniform(42.5, 48.5):.1f}',
-                        'priority': 'Info'
-                    }
-                ]
+        # Higher sensitivity alerts on smaller moves
+        scale = {'Low': 1.5, 'Medium': 1.0, 'High': 0.5}.get(sensitivity, 1.0)
+        point_threshold = min_movement * scale
+        # Moneyline moves in implied probability: 1.5 points ~ 3 percentage points
+        probability_threshold = min_movement * scale * SIGNIFICANT_PROBABILITY_MOVE / SIGNIFICANT_SPREAD_MOVE / 1.5
+        moves = odds_ingestion.slate_movement(games, window_minutes=60)
+        
+        for _, row in moves.iterrows():
+            summary = movement_summary(row)
+            if not summary:
+                continue
+            matchup = f"{row['away_team']} @ {row['home_team']}"
+            
+            for label, threshold, unit in (('spread', point_threshold, 'points'), ('total', point_threshold, 'points'),
+                                           ('moneyline', probability_threshold, 'win probability')):
+                market = summary.get(label)
+                if not market:
+                    continue
                 
-                alert = random.choice(alert_types)
-                alerts.append(alert)
-        
-        # Add some general market alerts
-        general_alerts = [
-            {
-                'title': 'Market Efficiency',
-                'message': 'AI detecting increased market efficiency - fewer value opportunities available',
-                'priority': 'Info'
-            },
-            {
-                'title': 'Volume Spike',
-                'message': 'Unusual betting volume detected on multiple games - monitor for line movements',
-                'priority': 'Important'
-            }
-        ]
-        
-        if random.random() < 0.4:  # 40% chance of general alerts
-            alerts.append(random.choice(general_alerts))
+                if label == 'total':
+                    direction = 'Over' if market['recent_move'] > 0 else 'Under'
+                    value = lambda v: f"{v:.1f}"
+                elif label == 'spread':
+                    direction = row['home_team'] if market['recent_move'] < 0 else row['away_team']
+                    value = lambda v: f"{v:+.1f}"
+                else:
+                    direction = row['home_team'] if market['recent_move'] > 0 else row['away_team']
+                    value = lambda v: f"{v:.0%}"
+                
+                if abs(market['recent_move']) >= threshold:
+                    steam = market['books_moving'] / max(market['books'], 1) >= STEAM_BOOK_SHARE
+                    alerts.append({
+                        'title': f"{'Steam Move' if steam else 'Line Movement'} - {matchup}",
+                        'message': (f"{label.title()} moved toward {direction} in the last hour "
+                                    f"({value(market['current'] - market['recent_move'])} → {value(market['current'])} {unit}, "
+                                    f"{market['books_moving']}/{market['books']} books)"),
+                        'priority': 'Critical' if steam else 'Important'
+                    })
+                elif abs(market['move']) >= threshold:
+                    alerts.append({
+                        'title': f"Line Movement - {matchup}",
+                        'message': (f"{label.title()} {value(market['open'])} → {value(market['current'])} {unit} "
+                                    f"since open across {market['books']} books"),
+                        'priority': 'Info'
+                    })
         
         return alerts
         
@@ -7760,14 +7692,16 @@ def get_ai_analysis(game):
                 result = get_enhanced_openai_analysis(enhanced_prompt, game, quantitative_baseline, real_time_data)
                 if result:
                     analysis_time = time.time() - start_time
-                    track_api_usage("OpenAI-Enhanced", 200, analysis_time * 0.003)
+                    if not result.get('response_cached'):
+                        track_api_usage("OpenAI-Enhanced", 200, analysis_time * 0.003)
                     return result
             
             if google_key:
                 result = get_enhanced_gemini_analysis(enhanced_prompt, game, quantitative_baseline, real_time_data)
                 if result:
                     analysis_time = time.time() - start_time
-                    track_api_usage("Gemini-Enhanced", 150, analysis_time * 0.002)
+                    if not result.get('response_cached'):
+                        track_api_usage("Gemini-Enhanced", 150, analysis_time * 0.002)
                     return result
         
     except Exception as e:
@@ -7805,30 +7739,38 @@ def get_enhanced_openai_analysis(enhanced_prompt: str, game: dict, quantitative_
         if not openai_key:
             return None
         
-        client = OpenAI(api_key=openai_key)
-        
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "user", "content": enhanced_prompt}
-            ],
-            max_tokens=800,
-            temperature=0.1,
-        )
-        
-        content = response.choices[0].message.content if response.choices else None
-        if not content:
-            return None
-        
-        # Parse JSON response
-        import json
-        content = content.strip()
-        if content.startswith('```json'):
-            content = content.replace('```json', '').replace('```', '').strip()
-        elif content.startswith('```'):
-            content = content.replace('```', '').strip()
+        # Shared on-disk response cache keyed by (provider, model, prompt)
+        data = llm_response_cache.get('openai', 'gpt-4o', enhanced_prompt)
+        if data is None:
+            client = OpenAI(api_key=openai_key)
+        
+            response = client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "user", "content": enhanced_prompt}
+                ],
+                max_tokens=800,
+                temperature=0.1,
+            )
         
-        data = json.loads(content)
+            content = response.choices[0].message.content if response.choices else None
+            if not content:
+                return None
+        
+            # Parse JSON response
+            import json
+            content = content.strip()
+            if content.startswith('```json'):
+                content = content.replace('```json', '').replace('```', '').strip()
+            elif content.startswith('```'):
+                content = content.replace('```', '').strip()
+        
+            data = json.loads(content)
+            llm_response_cache.set('openai', 'gpt-4o', enhanced_prompt, data,
+                                   ttl_seconds=llm_response_cache.ttl_for_game(game), max_output_tokens=800)
+            data['response_cached'] = False
+        else:
+            data['response_cached'] = True
         
         # Add enhanced metadata
         data['analysis_type'] = 'Enhanced OpenAI'
@@ -7861,29 +7803,37 @@ def get_enhanced_gemini_analysis(enhanced_prompt: str, game: dict, quantitative_
         if not google_key:
             return None
         
-        genai.configure(api_key=google_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        response = model.generate_content(
-            enhanced_prompt,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=800,
-                temperature=0.1,
+        # Shared on-disk response cache keyed by (provider, model, prompt)
+        data = llm_response_cache.get('gemini', 'gemini-1.5-flash', enhanced_prompt)
+        if data is None:
+            genai.configure(api_key=google_key)
+            model = genai.GenerativeModel('gemini-1.5-flash')
+        
+            response = model.generate_content(
+                enhanced_prompt,
+                generation_config=genai.types.GenerationConfig(
+                    max_output_tokens=800,
+                    temperature=0.1,
+                )
             )
-        )
         
-        if not response or not response.text:
-            return None
-        
-        # Parse JSON response
-        import json
-        content = response.text.strip()
-        if content.startswith('```json'):
-            content = content.replace('```json', '').replace('```', '').strip()
-        elif content.startswith('```'):
-            content = content.replace('```', '').strip()
-        
-        data = json.loads(content)
+            if not response or not response.text:
+                return None
+        
+            # Parse JSON response
+            import json
+            content = response.text.strip()
+            if content.startswith('```json'):
+                content = content.replace('```json', '').replace('```', '').strip()
+            elif content.startswith('```'):
+                content = content.replace('```', '').strip()
+        
+            data = json.loads(content)
+            llm_response_cache.set('gemini', 'gemini-1.5-flash', enhanced_prompt, data,
+                                   ttl_seconds=llm_response_cache.ttl_for_game(game), max_output_tokens=800)
+            data['response_cached'] = False
+        else:
+            data['response_cached'] = True
         
         # Add enhanced metadata
         data['analysis_type'] = 'Enhanced Gemini'
@@ -9127,7 +9077,7 @@ def show_daily_betting_tracker():
                         if st.button(f"Save Result", key=f"save_{bet.get('id', i)}"):
                             # Update in database if available
                             if bet.get('id'):
-                                update_bet_result(bet['id'], actual_winner, was_correct)
+                                update_bet_result(bet['id'], actual_winner, was_correct, bet.get('confidence'))
                             
                             # Update in session state
                             bet['actual_winner'] = actual_winner
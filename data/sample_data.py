@@ -3,7 +3,7 @@ import numpy as np
 from datetime import datetime, timedelta
 import random
 
-def get_sample_data(sport='football'):
+def get_sample_data(sport='football', num_matches=500):
     """Generate sample sports data for demonstration"""
     
     # Define teams for different sports
@@ -40,7 +40,7 @@ def get_sample_data(sport='football'):
     start_date = datetime.now() - timedelta(days=365 * 2)  # 2 years of data
     
     # Generate matches
-    for i in range(500):  # 500 sample matches
+    for i in range(num_matches):  # 500 sample matches by default
         # Random date in the past 2 years
         random_days = random.randint(0, 730)
         match_date = start_date + timedelta(days=random_days)
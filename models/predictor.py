@@ -6,6 +6,7 @@ from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
 from datetime import datetime, timedelta
+from models.feature_engine import TeamFeatureEngine
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -19,7 +20,18 @@ class SportsPredictor:
         self.model_type = "Random Forest"
         
     def create_features(self, data):
-        """Create features for machine learning model"""
+        """Create features for machine learning model (vectorized, O(n log n))"""
+        # Get unique teams
+        teams = list(set(data['team1'].tolist() + data['team2'].tolist()))
+        team_to_idx = {team: idx for idx, team in enumerate(teams)}
+        
+        features, targets = TeamFeatureEngine().build(data, team_to_idx)
+        self.feature_names = list(TeamFeatureEngine.FEATURE_NAMES)
+        
+        return features, targets
+    
+    def _create_features_rowwise(self, data):
+        """Row-by-row reference implementation of create_features (O(n^2), kept for benchmarks)"""
         features_list = []
         targets = []
         
@@ -82,7 +94,7 @@ class SportsPredictor:
         """Get recent performance stats for a team"""
         # Filter data before current date
         mask = (data['date'] < current_date) & ((data['team1'] == team) | (data['team2'] == team))
-        team_games = data[mask].tail(games_back)
+        team_games = data[mask].sort_values('date', kind='stable').tail(games_back)
         
         if len(team_games) == 0:
             return {'wins': 0, 'losses': 0, 'avg_score': 0, 'avg_conceded': 0}
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark the parallel slate analysis scheduler with stubbed AI providers
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import concurrent.futures
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.analysis_scheduler import AnalysisScheduler, ProviderRateLimiter
+import utils.ai_analysis as ai_analysis
+import utils.dual_ai_consensus as dual_ai_consensus
+from utils.ai_analysis import AIGameAnalyzer
+from utils.llm_response_cache import LLMResponseCache
+from utils.dual_ai_consensus import DualAIConsensusEngine
+
+# Simulated provider latencies (seconds)
+PROVIDER_LATENCY = {'openai': 0.30, 'gemini': 0.45, 'claude': 0.40}
+
+
+class StubAIAnalyzer:
+    """Stands in for AIGameAnalyzer with fixed per-provider latency"""
+
+    def _reply(self, provider, game_data):
+        time.sleep(PROVIDER_LATENCY[provider])
+        home = game_data['home_team']['name']
+        return {'predicted_winner': home, 'prediction': home, 'confidence': 0.8, 'confidence_score': 0.8}
+
+    def analyze_game_with_openai(self, game_data):
+        return self._reply('openai', game_data)
+
+    def analyze_game_with_gemini(self, game_data):
+        return self._reply('gemini', game_data)
+
+    def analyze_game_with_claude(self, game_data):
+        return self._reply('claude', game_data)
+
+
+def make_slate(num_games=15):
+    return [
+        {
+            'game_id': f'bench_{i}',
+            'home_team': {'name': f'Home Team {i}'},
+            'away_team': {'name': f'Away Team {i}'},
+            'sport': 'NBA',
+        }
+        for i in range(num_games)
+    ]
+
+
+def make_engine():
+    engine = DualAIConsensusEngine()
+    engine.ai_analyzer = StubAIAnalyzer()
+    engine.cache.get_cached_data = lambda *args, **kwargs: None
+    engine.cache.set_cached_data = lambda *args, **kwargs: None
+    return engine
+
+
+def test_slate_finishes_in_slowest_call_time():
+    """A 15-game slate should take about one slowest provider call, not the serial sum"""
+
+    print("⚡ Benchmarking 15-game slate with stubbed providers...")
+    print("=" * 60)
+
+    slate = make_slate(15)
+    engine = make_engine()
+
+    # Old pipeline: 3 game workers, providers called one after another
+    def serial_providers(game):
+        analyzer = engine.ai_analyzer
+        return (analyzer.analyze_game_with_openai(game),
+                analyzer.analyze_game_with_gemini(game),
+                analyzer.analyze_game_with_claude(game))
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        list(executor.map(serial_providers, slate))
+    old_time = time.perf_counter() - start
+    print(f"   🐌 Old (3 workers, serial providers): {old_time:.2f}s")
+
+    scheduler = AnalysisScheduler(max_game_workers=16)
+    shared_scheduler = dual_ai_consensus.analysis_scheduler
+    dual_ai_consensus.analysis_scheduler = scheduler
+    try:
+        start = time.perf_counter()
+        results = list(scheduler.analyze_slate(slate, engine.analyze_game_dual_ai, timeout=30))
+        new_time = time.perf_counter() - start
+    finally:
+        dual_ai_consensus.analysis_scheduler = shared_scheduler
+    print(f"   🚀 Scheduler (fan-out + rate limits): {new_time:.2f}s")
+    print(f"   📊 Speedup: {old_time / new_time:.1f}x")
+
+    slowest = max(PROVIDER_LATENCY.values())
+    assert len(results) == len(slate)
+    assert all(result and result.get('consensus_pick') for _, result in results)
+    assert new_time < slowest * 2.5, f"Slate took {new_time:.2f}s, slowest call is {slowest:.2f}s"
+
+
+def test_provider_rate_limit_is_enforced():
+    """A provider limited to 60 requests/min must space calls once its burst is spent"""
+
+    print("\n🚦 Checking per-provider token buckets...")
+
+    limiter = ProviderRateLimiter(requests_per_minute=60, tokens_per_minute=600000, estimated_tokens=100)
+    for _ in range(60):
+        assert limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0), "Burst beyond requests/min should be refused"
+
+    start = time.perf_counter()
+    assert limiter.acquire(timeout=5)
+    waited = time.perf_counter() - start
+    print(f"   ✅ 61st request waited {waited:.2f}s for a refill (expected ~1s)")
+    assert 0.5 < waited < 2.0
+
+    token_limiter = ProviderRateLimiter(requests_per_minute=1000, tokens_per_minute=6000)
+    assert token_limiter.acquire(tokens=6000, timeout=0)
+    assert not token_limiter.acquire(tokens=100, timeout=0), "Tokens/min budget should be exhausted"
+    print("   ✅ Tokens/min budget enforced independently of requests/min")
+
+
+class StubOpenAIClient:
+    """Stands in for the OpenAI client, counting completions"""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        self.calls += 1
+        content = json.dumps({'predicted_winner': 'Home Team 0', 'confidence': 0.7})
+        message = type('Message', (), {'content': content})()
+        return type('Response', (), {'choices': [type('Choice', (), {'message': message})()]})()
+
+
+def test_cached_responses_skip_rate_limit():
+    """Responses served from the LLM cache don't spend provider budget; only misses wait for it"""
+
+    print("\n💾 Checking that cache hits bypass the rate limiter...")
+
+    scheduler = AnalysisScheduler(provider_limits={
+        'openai': {'requests_per_minute': 1, 'tokens_per_minute': 100000, 'estimated_tokens': 100}})
+    analyzer = AIGameAnalyzer.__new__(AIGameAnalyzer)
+    analyzer.openai_client = StubOpenAIClient()
+    games = make_slate(2)
+
+    original = (ai_analysis.analysis_scheduler, ai_analysis.llm_response_cache)
+    with tempfile.TemporaryDirectory() as tmp:
+        ai_analysis.analysis_scheduler, ai_analysis.llm_response_cache = scheduler, LLMResponseCache(cache_dir=tmp)
+        try:
+            first = scheduler.run_providers({'openai': lambda: analyzer.analyze_game_with_openai(games[0])}, timeout=2)
+            start = time.perf_counter()
+            repeats = [scheduler.run_providers({'openai': lambda: analyzer.analyze_game_with_openai(games[0])},
+                                               timeout=2)['openai'] for _ in range(10)]
+            elapsed = time.perf_counter() - start
+            # A new game is a miss, and the one request this minute is already spent
+            other = scheduler.run_providers({'openai': lambda: analyzer.analyze_game_with_openai(games[1])},
+                                            timeout=0.2)['openai']
+        finally:
+            ai_analysis.analysis_scheduler, ai_analysis.llm_response_cache = original
+
+    assert first['openai']['predicted_winner'] == 'Home Team 0'
+    assert all(repeat == first['openai'] for repeat in repeats) and elapsed < 1.0
+    assert analyzer.openai_client.calls == 1
+    assert 'rate limit' in other['error'] and scheduler.stats['rate_limited'] == 1
+    print(f"   ✅ 10 cached repeats in {elapsed * 1000:.0f}ms at 1 request/min; the next miss was rate limited")
+
+
+if __name__ == "__main__":
+    test_slate_finishes_in_slowest_call_time()
+    test_provider_rate_limit_is_enforced()
+    test_cached_responses_skip_rate_limit()
+    print("\n✅ Analysis scheduler benchmark complete!")
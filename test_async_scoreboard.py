@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent ESPN scoreboard fetching against a local HTTP stand-in
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import tempfile
+
+import requests
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import utils.async_scoreboard as async_scoreboard_module
+from utils.async_scoreboard import AsyncScoreboardFetcher
+from utils.date_helper import DateBasedSportsManager
+from utils.espn_scoreboard import espn_scoreboard
+from utils.http_cache import http_cache
+from utils.local_store import LocalStore
+from utils.scoreboard_archive import scoreboard_archive
+
+LEAGUES = [('basketball', 'nba'), ('basketball', 'wnba'), ('baseball', 'mlb'), ('football', 'nfl'), ('hockey', 'nhl')]
+LATENCY_SECONDS = 0.02
+
+
+def recorded_scoreboard(path, date_param):
+    """ESPN-shaped scoreboard: three games per league-day, ids stable per (path, day)"""
+    day = datetime.strptime(date_param, '%Y%m%d') if date_param else datetime(2024, 6, 15)
+    events = []
+    for i in range(3):
+        events.append({
+            'id': f"{path.replace('/', '')}{day:%Y%m%d}{i}",
+            'name': f'Away {i} at Home {i}',
+            'shortName': f'A{i} @ H{i}',
+            'date': f'{day:%Y-%m-%d}T{17 + i}:00Z',
+            'status': {'type': {'name': 'STATUS_SCHEDULED'}},
+            'competitions': [{'competitors': [
+                {'homeAway': 'home', 'score': '0', 'team': {'displayName': f'Home {i}', 'abbreviation': f'H{i}'}},
+                {'homeAway': 'away', 'score': '0', 'team': {'displayName': f'Away {i}', 'abbreviation': f'A{i}'}},
+            ]}],
+        })
+    return {'events': events}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves /{sport}/{league}/scoreboard?dates=YYYYMMDD after a fixed network delay"""
+
+    requests_served = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path.strip('/').rsplit('/scoreboard', 1)[0]
+        date_param = parse_qs(parsed.query).get('dates', [None])[0]
+        time.sleep(LATENCY_SECONDS)
+        with StandInHandler.lock:
+            StandInHandler.requests_served += 1
+        body = json.dumps(recorded_scoreboard(path, date_param)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # The default backlog of 5 would stall a concurrent burst on SYN retries
+
+
+def start_stand_in():
+    server = StandInServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def use_temporary_archive(tmp):
+    """Point the scoreboard archive and HTTP cache at a throwaway store; returns the store to restore"""
+    original = scoreboard_archive.store
+    scoreboard_archive.store = http_cache.store = LocalStore(db_path=os.path.join(tmp, 'local_store.db'))
+    return original
+
+
+def test_month_fetch_concurrent_vs_sequential():
+    """A month of five leagues: one concurrent round versus the old day-by-day loop"""
+
+    print("📅 Fetching a month of scoreboards for 5 leagues...")
+    print("=" * 60)
+
+    server, base_url = start_stand_in()
+    espn_scoreboard.clear()
+    tmp = tempfile.TemporaryDirectory()
+    original_store = use_temporary_archive(tmp.name)
+    try:
+        days = [date(2024, 6, 1) + timedelta(days=i) for i in range(30)]
+
+        # Old behaviour: one blocking request per (league, day)
+        session = requests.Session()
+        start = time.perf_counter()
+        sequential_games = 0
+        for day in days:
+            for sport, league in LEAGUES:
+                response = session.get(f"{base_url}/{sport}/{league}/scoreboard",
+                                       params={'dates': day.strftime('%Y%m%d')}, timeout=15)
+                sequential_games += len(response.json()['events'])
+        sequential_time = time.perf_counter() - start
+        print(f"   🐌 Sequential: {len(days) * len(LEAGUES)} requests in {sequential_time * 1000:.0f}ms")
+
+        fetcher = AsyncScoreboardFetcher(max_concurrency=16, base_url=base_url)
+        manager = DateBasedSportsManager()
+        start = time.perf_counter()
+        games_df = fetcher.fetch_games(LEAGUES, days, manager.parse_espn_event, fallback_to_current=False)
+        async_time = time.perf_counter() - start
+        print(f"   🚀 Concurrent: {fetcher.stats['requests']} requests in {async_time * 1000:.0f}ms "
+              f"({sequential_time / async_time:.1f}x faster, {len(games_df)} games)")
+
+        assert len(games_df) == sequential_games == len(days) * len(LEAGUES) * 3
+        assert games_df['game_id'].is_unique
+        assert async_time < sequential_time / 3
+
+        # Scoreboards are handed to the shared client, so a second pass costs no requests
+        served = StandInHandler.requests_served
+        fetcher.fetch_games(LEAGUES, days, manager.parse_espn_event, fallback_to_current=False)
+        assert StandInHandler.requests_served == served
+        print("   ✅ Repeat pass served from the shared scoreboard cache")
+    finally:
+        scoreboard_archive.store = http_cache.store = original_store
+        tmp.cleanup()
+        server.shutdown()
+        espn_scoreboard.clear()
+
+
+def test_neighbouring_days_are_deduplicated():
+    """Yesterday/today/tomorrow for 8 leagues in one round, filtered to today, without aiohttp too"""
+
+    print("\n🔁 Checking the three-day window and the thread fallback...")
+
+    server, base_url = start_stand_in()
+    espn_scoreboard.clear()
+    tmp = tempfile.TemporaryDirectory()
+    original_store = use_temporary_archive(tmp.name)
+    original = async_scoreboard_module.AIOHTTP_AVAILABLE
+    try:
+        async_scoreboard_module.AIOHTTP_AVAILABLE = False
+        leagues = LEAGUES + [('football', 'college-football'), ('baseball', 'college-baseball'),
+                             ('basketball', 'womens-college-basketball')]
+        today = date(2024, 6, 15)
+        fetcher = AsyncScoreboardFetcher(max_concurrency=8, base_url=base_url)
+        games_df = fetcher.fetch_games(leagues, [today - timedelta(days=1), today, today + timedelta(days=1)],
+                                       DateBasedSportsManager().parse_espn_event, match_dates=[today])
+
+        assert fetcher.stats['requests'] == len(leagues) * 4
+        # The current scoreboard repeats today's games; they're dropped as duplicates
+        assert len(games_df) == len(leagues) * 3
+        assert set(games_df['date']) == {'2024-06-15'}
+        print(f"   ✅ {fetcher.stats['requests']} requests -> {len(games_df)} unique games for {today}")
+    finally:
+        async_scoreboard_module.AIOHTTP_AVAILABLE = original
+        scoreboard_archive.store = http_cache.store = original_store
+        tmp.cleanup()
+        server.shutdown()
+        espn_scoreboard.clear()
+
+
+if __name__ == "__main__":
+    test_month_fetch_concurrent_vs_sequential()
+    test_neighbouring_days_are_deduplicated()
+    print("\n✅ Async scoreboard benchmark complete!")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Team-game index: stats, form and head-to-head equal the per-team filtering they replaced, same-date ties included
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.data_processor import DataProcessor
+
+TEAMS = [f"Team {i}" for i in range(12)]
+
+
+def make_matches(n=600, seed=5):
+    """Random matches over 60 days, so most days hold several games and many teams play twice on a date"""
+    rng = np.random.default_rng(seed)
+    home = rng.choice(TEAMS, n)
+    away = np.array([rng.choice([team for team in TEAMS if team != h]) for h in home])
+    return pd.DataFrame({
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 60, n), unit='D'),
+        'sport': 'Soccer',
+        'team1': home,
+        'team2': away,
+        'team1_score': rng.integers(0, 4, n),
+        'team2_score': rng.integers(0, 4, n),
+    })
+
+
+def filtered_team_stats(data, team):
+    """get_team_stats as it was: filter the frame from each side and combine"""
+    home = data[data['team1'] == team]
+    away = data[data['team2'] == team]
+    scored = np.concatenate([home['team1_score'], away['team2_score']])
+    conceded = np.concatenate([home['team2_score'], away['team1_score']])
+    home_wins = int((home['team1_score'] > home['team2_score']).sum())
+    away_wins = int((away['team2_score'] > away['team1_score']).sum())
+    return {
+        'total_games': len(scored),
+        'wins': int((scored > conceded).sum()),
+        'losses': int((scored < conceded).sum()),
+        'draws': int((scored == conceded).sum()),
+        'avg_points_scored': scored.mean(),
+        'avg_points_conceded': conceded.mean(),
+        'home_games': len(home),
+        'away_games': len(away),
+        'home_win_rate': home_wins / len(home) if len(home) else 0,
+        'away_win_rate': away_wins / len(away) if len(away) else 0,
+    }
+
+
+def filtered_team_form(data, team, num_games):
+    """get_team_form as it was: newest games first (a stable sort, so same-date ties keep a fixed order)"""
+    games = data[(data['team1'] == team) | (data['team2'] == team)]
+    games = games.sort_values('date', ascending=False, kind='stable').head(num_games)
+    is_home = (games['team1'] == team).to_numpy()
+    scored = np.where(is_home, games['team1_score'], games['team2_score'])
+    conceded = np.where(is_home, games['team2_score'], games['team1_score'])
+    form = ''.join(np.select([scored > conceded, scored < conceded], ['W', 'L'], default='D'))
+    return form, scored.mean(), conceded.mean()
+
+
+def test_index_matches_filtering():
+    """Every team's stats and form, and every pair's head-to-head, equal the filtered versions"""
+
+    print("📊 Comparing the team-game index with per-team filtering...")
+    print("=" * 60)
+
+    processor = DataProcessor()
+    data = processor.process_data(make_matches())
+    ties = data.groupby('date').size()
+    assert (ties > 1).all(), "Every date should hold several games"
+
+    for team in TEAMS:
+        expected = filtered_team_stats(data, team)
+        stats = processor.get_team_stats(data, team)
+        for field, value in expected.items():
+            assert np.isclose(stats[field], value), (team, field, stats[field], value)
+
+        for num_games in (1, 5, 17, 1000):
+            form, scored, conceded = filtered_team_form(data, team, num_games)
+            result = processor.get_team_form(data, team, num_games)
+            assert result['form_string'] == form, (team, num_games)
+            assert np.isclose(result['avg_goals_scored'], scored) and np.isclose(result['avg_goals_conceded'], conceded)
+
+    for i, team1 in enumerate(TEAMS):
+        for team2 in TEAMS[i + 1:]:
+            h2h = processor.get_head_to_head(data, team1, team2)
+            mask = (((data['team1'] == team1) & (data['team2'] == team2)) |
+                    ((data['team1'] == team2) & (data['team2'] == team1)))
+            assert sorted(h2h.index) == sorted(data.index[mask])
+    print(f"   ✅ {len(TEAMS)} teams' stats and form, {len(TEAMS) * (len(TEAMS) - 1) // 2} head-to-heads, "
+          f"{int((ties > 1).sum())} dates with ties")
+
+    assert processor.get_team_stats(data, 'Nobody')['total_games'] == 0
+    assert processor.get_team_form(data, 'Nobody')['form_string'] == ''
+
+
+def test_index_cached_by_content():
+    """A copy with the same content reuses the index; a changed frame gets its own"""
+
+    processor = DataProcessor()
+    data = processor.process_data(make_matches())
+    index = processor._team_index
+
+    copy = data.copy()
+    start = time.perf_counter()
+    processor.get_team_stats(copy, 'Team 1')
+    assert processor._team_index is index
+    print(f"\n   ✅ Equal copy reused the index ({(time.perf_counter() - start) * 1000:.1f}ms)")
+
+    changed = data.copy()
+    changed.loc[changed.index[0], 'team1_score'] += 10
+    team = changed['team1'].iloc[0]
+    assert processor.get_team_stats(changed, team) == processor.get_team_stats(changed, team)
+    assert processor._team_index is not index
+    assert processor.get_team_stats(changed, team)['avg_points_scored'] != \
+        processor.get_team_stats(data, team)['avg_points_scored']
+
+    # Rows added in place to the indexed frame are picked up too
+    grown = data.copy()
+    processor.get_team_stats(grown, 'Team 1')
+    grown.loc[len(grown) + 10_000] = grown.iloc[0]
+    assert processor.get_team_stats(grown, grown['team1'].iloc[0])['total_games'] == \
+        filtered_team_stats(grown, grown['team1'].iloc[0])['total_games']
+
+    # A same-length edit to the indexed frame itself is picked up
+    edited = data.copy()
+    processor.get_team_stats(edited, 'Team 1')
+    edited.loc[edited.index[0], 'team1_score'] += 10
+    team = edited['team1'].iloc[0]
+    assert np.isclose(processor.get_team_stats(edited, team)['avg_points_scored'],
+                      filtered_team_stats(edited, team)['avg_points_scored'])
+    print("   ✅ Changed, grown or edited-in-place frames are re-indexed")
+
+
+def test_reordered_frame_gets_its_own_index():
+    """The same rows in another order return the right head-to-head games, not the cached positions"""
+
+    processor = DataProcessor()
+    data = processor.process_data(make_matches())
+    for reordered in (data.iloc[::-1], data.sort_values(['team1', 'date']), data.sample(frac=1, random_state=3)):
+        for team1, team2 in [('Team 0', 'Team 1'), ('Team 4', 'Team 6')]:
+            h2h = processor.get_head_to_head(reordered, team1, team2)
+            assert set(h2h['team1']) | set(h2h['team2']) == {team1, team2}
+            mask = (((reordered['team1'] == team1) & (reordered['team2'] == team2)) |
+                    ((reordered['team1'] == team2) & (reordered['team2'] == team1)))
+            assert sorted(h2h.index) == sorted(reordered.index[mask])
+        assert processor.get_team_form(reordered, 'Team 3', 5)['form_string'] == \
+            filtered_team_form(reordered, 'Team 3', 5)[0]
+    print("   ✅ Reversed, re-sorted and shuffled frames return the right head-to-head games")
+
+
+if __name__ == "__main__":
+    test_index_matches_filtering()
+    test_index_cached_by_content()
+    test_reordered_frame_gets_its_own_index()
+    print("\n✅ Data processor checks complete!")
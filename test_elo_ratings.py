@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk Elo replay and check incremental rating updates
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+import multiprocessing
+from datetime import datetime, timedelta
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.elo_ratings import EloRatingStore
+
+
+def make_season(num_teams=30, num_games=1230, season_start=datetime(2024, 10, 22), seed=7):
+    """Synthetic NBA-style season where lower-numbered teams are stronger"""
+    rng = random.Random(seed)
+    teams = [f'Team {i}' for i in range(num_teams)]
+    games = []
+    for i in range(num_games):
+        home, away = rng.sample(range(num_teams), 2)
+        strength_gap = (away - home) * 0.6
+        home_score = int(rng.gauss(112 + strength_gap / 2, 10))
+        away_score = int(rng.gauss(110 - strength_gap / 2, 10))
+        if home_score == away_score:
+            home_score += 1
+        games.append({
+            'game_id': f'g{season_start.year}_{i}',
+            'date': (season_start + timedelta(days=i * 170 // num_games)).isoformat(),
+            'home_team': {'name': teams[home]},
+            'away_team': {'name': teams[away]},
+            'home_score': home_score,
+            'away_score': away_score,
+        })
+    return games
+
+
+def test_season_replay_under_one_second():
+    """A full historical season must replay in well under a second"""
+
+    print("⚡ Replaying a full synthetic NBA season...")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EloRatingStore(path=os.path.join(tmp, 'elo.npz'))
+        season = make_season()
+
+        start = time.perf_counter()
+        applied = store.replay('NBA', season)
+        elapsed = time.perf_counter() - start
+        print(f"   🚀 {applied:,} games replayed in {elapsed * 1000:.1f}ms")
+
+        assert applied == len(season)
+        assert elapsed < 1.0, f"Season replay took {elapsed:.2f}s"
+        assert store.get_rating('NBA', 'Team 0') > store.get_rating('NBA', 'Team 29')
+
+        big_season = make_season(num_teams=350, num_games=20_000, seed=11)
+        start = time.perf_counter()
+        store.replay('NCAAB', big_season)
+        elapsed = time.perf_counter() - start
+        print(f"   🚀 {len(big_season):,} college games replayed in {elapsed * 1000:.1f}ms")
+        assert elapsed < 1.0, f"Large replay took {elapsed:.2f}s"
+
+
+def test_incremental_updates_persist_and_regress():
+    """Duplicate results are ignored, ratings round-trip to disk, new seasons regress"""
+
+    print("\n💾 Checking persistence and season regression...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'elo.npz')
+        store = EloRatingStore(path=path)
+
+        results = make_season(num_teams=8, num_games=200)
+        assert store.record_results('NBA', results) == 200
+        assert store.record_results('NBA', results) == 0, "Already-applied games must be skipped"
+
+        reloaded = EloRatingStore(path=path)
+        for team in ['Team 0', 'Team 7']:
+            assert reloaded.get_rating('NBA', team) == store.get_rating('NBA', team)
+            assert reloaded.get_games_played('NBA', team) == store.get_games_played('NBA', team)
+        print("   ✅ Ratings and applied game ids round-trip through the .npz file")
+
+        before = reloaded.get_rating('NBA', 'Team 0')
+        reloaded.update('NBA', 'Team 0', 'Team 1', 100, 100, season=2025, game_id='next_season')
+        after = reloaded.get_rating('NBA', 'Team 0')
+        regressed = 1500 + (1 - 0.20) * (before - 1500)
+        assert abs(after - 1500) < abs(before - 1500)
+        assert abs(after - regressed) < 32, "First game of a season should start from the regressed rating"
+        print(f"   ✅ New season regressed Team 0 from {before:.0f} toward 1500 ({after:.0f})")
+
+
+def test_game_ids_pruned_and_no_op_saves_skipped():
+    """Only this and last season's ids are kept; rescoring applied games leaves the file alone"""
+
+    print("\n🧹 Checking game id pruning and no-op saves...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'elo.npz')
+        store = EloRatingStore(path=path)
+        seasons = [make_season(num_teams=8, num_games=100, season_start=datetime(year, 10, 22), seed=year)
+                   for year in (2022, 2023, 2024)]
+        for games in seasons:
+            assert store.record_results('NBA', games) == 100
+        table = store._table('NBA')
+        assert table.season == 2024
+        assert len(table.game_ids) == 100 and len(table.previous_game_ids) == 100
+        print("   ✅ Three seasons recorded, two seasons of game ids kept")
+
+        mtime = os.stat(path).st_mtime_ns
+        assert store.record_results('NBA', seasons[2] + seasons[1]) == 0
+        assert store.record_results('NBA', seasons[0]) == 0, "Results from before last season are ignored"
+        assert store.record_results('NBA', [dict(game, game_id=None) for game in seasons[2]]) == 0
+        assert os.stat(path).st_mtime_ns == mtime, "Nothing applied, nothing written"
+
+        reloaded = EloRatingStore(path=path)
+        assert reloaded.record_results('NBA', seasons[1]) == 0, "Last season's ids survive a reload"
+        late = dict(seasons[1][0], game_id='late_2023')
+        assert reloaded.record_results('NBA', [late]) == 1 and reloaded.record_results('NBA', [late]) == 0
+        assert 'late_2023' in reloaded._table('NBA').previous_game_ids
+        print("   ✅ Rescores skip the save; late results from last season still count once")
+
+
+def record_batches(path, games, batch_size):
+    """One worker process grading its share of the season a few games at a time"""
+    store = EloRatingStore(path=path)
+    for start in range(0, len(games), batch_size):
+        store.record_results('NBA', games[start:start + batch_size])
+
+
+def test_concurrent_workers_keep_every_result():
+    """Four processes recording different games into one file: every result and game id survives"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'elo.npz')
+        season = make_season(num_teams=10, num_games=400)
+
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=record_batches, args=(path, season[i::4], 4)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        store = EloRatingStore(path=path)
+        table = store._table('NBA')
+        assert len(table.game_ids) == len(season)
+        assert sum(store.get_games_played('NBA', f'Team {i}') for i in range(10)) == 2 * len(season)
+        assert store.record_results('NBA', season) == 0
+        print(f"\n   ✅ 4 processes x 25 batches: {len(table.game_ids)} of {len(season)} results kept")
+
+
+if __name__ == "__main__":
+    test_season_replay_under_one_second()
+    test_incremental_updates_persist_and_regress()
+    test_game_ids_pruned_and_no_op_saves_skipped()
+    test_concurrent_workers_keep_every_result()
+    print("\n✅ Elo rating benchmark complete!")
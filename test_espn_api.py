@@ -1,7 +1,14 @@
-import requests
+import sys
+import os
 import json
 from datetime import datetime, timedelta
 
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.http_cache import http_session
+from utils.http_fixtures import http_fixtures
+
 def test_espn_api():
     print("Testing ESPN API...")
     
@@ -9,7 +16,7 @@ def test_espn_api():
     url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = http_session.get(url, timeout=10)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -57,7 +64,7 @@ def test_espn_api():
     url_with_date = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard?dates={today}"
     
     try:
-        response = requests.get(url_with_date, timeout=10)
+        response = http_session.get(url_with_date, timeout=10)
         print(f"Status Code with date: {response.status_code}")
         
         if response.status_code == 200:
@@ -69,4 +76,6 @@ def test_espn_api():
         print(f"Error with date: {e}")
 
 if __name__ == "__main__":
-    test_espn_api()
\ No newline at end of file
+    # HTTP_FIXTURES=record:<path> captures this run; replay:<path> reruns it offline
+    with http_fixtures.from_env():
+        test_espn_api()
\ No newline at end of file
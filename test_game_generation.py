@@ -9,6 +9,8 @@ from datetime import datetime, date, timedelta
 # Add the project directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from utils.http_fixtures import http_fixtures
+
 def test_game_generation():
     """Test all the main game generation functions"""
     
@@ -161,4 +163,6 @@ def test_game_generation():
     print("   - Database features require Supabase configuration")
 
 if __name__ == "__main__":
-    test_game_generation()
\ No newline at end of file
+    # HTTP_FIXTURES=record:<path> captures this run; replay:<path> reruns it offline
+    with http_fixtures.from_env():
+        test_game_generation()
\ No newline at end of file
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Check the shared HTTP cache: fresh hits, ETag/Last-Modified revalidation and freshness overrides
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.http_cache import HTTPResponseCache, create_session
+from utils.local_store import LocalStore
+
+# A scoreboard-sized body, so the byte savings are visible
+SCOREBOARD = json.dumps({'events': [{'id': str(i), 'name': f'Away {i} at Home {i}', 'notes': 'x' * 2000}
+                                    for i in range(500)]}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """/etag: max-age=0 + ETag, /fresh: max-age=60, /dated: Last-Modified only, /private: no-store"""
+
+    bodies_sent = 0
+    not_modified = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        headers = {'Content-Type': 'application/json'}
+        if self.path.startswith('/etag'):
+            headers.update({'Cache-Control': 'max-age=0', 'ETag': '"v1"'})
+            unchanged = self.headers.get('If-None-Match') == '"v1"'
+        elif self.path.startswith('/fresh'):
+            headers['Cache-Control'] = 'public, max-age=60'
+            unchanged = False
+        elif self.path.startswith('/dated'):
+            headers['Last-Modified'] = 'Tue, 05 Nov 2024 12:00:00 GMT'
+            unchanged = self.headers.get('If-Modified-Since') == headers['Last-Modified']
+        else:
+            headers['Cache-Control'] = 'no-store'
+            unchanged = False
+
+        with StandInHandler.lock:
+            if unchanged:
+                StandInHandler.not_modified += 1
+            else:
+                StandInHandler.bodies_sent += 1
+        self.send_response(304 if unchanged else 200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0' if unchanged else str(len(SCOREBOARD)))
+        self.end_headers()
+        if not unchanged:
+            self.wfile.write(SCOREBOARD)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stand_in():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_revalidation_and_freshness():
+    """Repeat GETs cost a 304 (or nothing) instead of a full download"""
+
+    print("🌐 Testing the shared HTTP response cache...")
+    print("=" * 60)
+
+    server, base_url = start_stand_in()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HTTPResponseCache(store=LocalStore(db_path=os.path.join(tmp, 'store.db')), freshness_overrides=[])
+        session = create_session(cache)
+        try:
+            for _ in range(5):
+                response = session.get(f"{base_url}/etag", params={'dates': '20241105'}, timeout=5)
+                assert response.status_code == 200 and len(response.json()['events']) == 500
+            assert StandInHandler.bodies_sent == 1 and StandInHandler.not_modified == 4
+            assert getattr(response, 'from_cache', False)
+            print(f"   🔁 ETag: 1 download + 4 x 304 ({cache.stats['bytes_saved'] / 1024:.0f} KB not re-downloaded)")
+
+            for _ in range(3):
+                session.get(f"{base_url}/dated", timeout=5)
+            assert StandInHandler.bodies_sent == 2 and StandInHandler.not_modified == 6
+            print("   📅 Last-Modified: revalidated with If-Modified-Since")
+
+            for _ in range(3):
+                session.get(f"{base_url}/fresh", timeout=5)
+            assert StandInHandler.bodies_sent == 3 and cache.stats['fresh_hits'] == 2
+            print("   ⚡ max-age=60: repeats answered without touching the network")
+
+            for _ in range(2):
+                session.get(f"{base_url}/private", timeout=5)
+            assert StandInHandler.bodies_sent == 5
+            print("   🚫 no-store: never cached")
+
+            # Per-endpoint override: an always-revalidate endpoint treated as fresh for a minute
+            cache.set_freshness(r'/etag\?dates=20241106', 60)
+            for _ in range(3):
+                session.get(f"{base_url}/etag", params={'dates': '20241106'}, timeout=5)
+            assert StandInHandler.bodies_sent == 6
+            print("   🎛️  Freshness override skipped revalidation entirely")
+
+            # A fresh session over the same store (a new process) still revalidates instead of downloading
+            other = create_session(HTTPResponseCache(store=cache.store, freshness_overrides=[]))
+            other.get(f"{base_url}/etag", params={'dates': '20241105'}, timeout=5)
+            assert StandInHandler.bodies_sent == 6
+
+            stats = cache.get_stats()
+            print(f"   📊 {stats['requests']} GETs, hit ratio {stats['hit_ratio']:.0%}, "
+                  f"{stats['bytes_downloaded'] / 1024:.0f} KB downloaded, {stats['bytes_saved'] / 1024:.0f} KB saved")
+            assert stats['hit_ratio'] > 0.6
+            assert stats['bytes_saved'] > stats['bytes_downloaded']
+        finally:
+            server.shutdown()
+
+
+def test_api_key_never_stored():
+    """Requests carrying an API key are cached under the full URL, but the stored entry has the key redacted"""
+
+    StandInHandler.bodies_sent = 0
+    server, base_url = start_stand_in()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = LocalStore(db_path=os.path.join(tmp, 'cache.db'))
+            cache = HTTPResponseCache(store=store, freshness_overrides=[(r'/etag\?dates=', 60)])
+            session = create_session(cache)
+            for _ in range(2):
+                session.get(f"{base_url}/etag", params={'apiKey': 'sekrit-123', 'dates': '20241105'}, timeout=5)
+            session.get(f"{base_url}/etag", params={'apiKey': 'other-456', 'dates': '20241105'}, timeout=5)
+            assert StandInHandler.bodies_sent == 2, "Each key has its own entry; the override keeps both fresh"
+
+            payloads = [row[0] for row in store._connect().execute("SELECT payload FROM entries")]
+            assert len(payloads) == 2
+            assert not any('sekrit-123' in payload or 'other-456' in payload for payload in payloads)
+            assert all(json.loads(payload)['url'] == f"{base_url}/etag?dates=20241105" for payload in payloads)
+            print("\n   🔑 API key kept out of the stored cache entries")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_revalidation_and_freshness()
+    test_api_key_never_stored()
+    print("\n✅ HTTP cache test complete!")
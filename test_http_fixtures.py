@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Record/replay HTTP fixtures: capture once, then benchmark slate generation offline and reproducibly
+"""
+
+import sys
+import os
+import json
+import gzip
+import time
+import tempfile
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.date_helper import DateBasedSportsManager
+from utils.espn_scoreboard import ESPN_BASE_URL
+from utils.http_fixtures import HTTPFixtures, FixtureStore, http_fixtures, isolated_caches
+from utils.llm_response_cache import llm_response_cache
+
+SLATE_DAY = date(2024, 11, 5)
+LEAGUES = [('basketball', 'nba'), ('hockey', 'nhl')]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({'path': self.path.split('?')[0], 'served_at': time.time()}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def scoreboard(path, day, games):
+    events = []
+    for i in range(games):
+        events.append({
+            'id': f"{path.replace('/', '')}{day:%Y%m%d}{i}",
+            'name': f'Away {i} at Home {i}',
+            'date': f'{day:%Y-%m-%d}T{23 - i}:00Z',
+            'status': {'type': {'name': 'STATUS_SCHEDULED'}},
+            'competitions': [{'competitors': [
+                {'homeAway': 'home', 'score': '0', 'team': {'displayName': f'{path} Home {i}', 'abbreviation': f'H{i}'}},
+                {'homeAway': 'away', 'score': '0', 'team': {'displayName': f'{path} Away {i}', 'abbreviation': f'A{i}'}},
+            ]}],
+        })
+    return {'events': events}
+
+
+def test_record_then_replay_offline():
+    """Responses recorded from a live server replay identically after it's gone; API keys never hit disk"""
+
+    print("📼 Recording from a live server, replaying with it shut down...")
+    print("=" * 60)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    session = requests.Session()
+    fixtures = HTTPFixtures(sessions=[session])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'fixtures.json.gz')
+        with fixtures.record(path):
+            recorded = [session.get(f"{base_url}/odds/{i}", params={'apiKey': 'sk-secret', 'regions': 'us'},
+                                    timeout=5).json() for i in range(10)]
+        server.shutdown()
+        server.server_close()
+
+        with gzip.open(path, 'rt') as handle:
+            assert 'sk-secret' not in handle.read()
+        print(f"   💾 10 responses in {os.path.getsize(path)} bytes, credentials redacted")
+
+        with fixtures.replay(path, latency=0.02):
+            start = time.perf_counter()
+            # Parameter order and key values don't matter for matching
+            replayed = [session.get(f"{base_url}/odds/{i}", params={'regions': 'us', 'apiKey': 'other'},
+                                    timeout=5).json() for i in range(10)]
+            elapsed = time.perf_counter() - start
+            try:
+                session.get(f"{base_url}/never-recorded", timeout=5)
+                raise AssertionError("Unrecorded request should fail like an offline network")
+            except requests.ConnectionError:
+                pass
+        assert replayed == recorded
+        assert elapsed >= 10 * 0.02
+        print(f"   ▶️  Replayed offline with 20ms injected latency: {elapsed * 1000:.0f}ms for 10 requests")
+
+        # Error injection is seeded per request, so two runs fail the same calls
+        outcomes = []
+        for _ in range(2):
+            with fixtures.replay(path, error_rate=0.3, seed=7):
+                outcomes.append([session.get(f"{base_url}/odds/{i}", params={'regions': 'us'}, timeout=5).status_code
+                                 for i in range(10) for _ in range(3)])
+        assert outcomes[0] == outcomes[1]
+        assert 0 < outcomes[0].count(503) < len(outcomes[0])
+        print(f"   🎲 30% error rate: {outcomes[0].count(503)}/30 failures, identical across runs")
+
+
+def test_slate_benchmark_replay():
+    """Schedule fetch plus per-game AI analysis replayed end to end with no network"""
+
+    print("\n🏁 Benchmarking slate generation from fixtures...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'slate.json.gz')
+        store = FixtureStore(path)
+        for sport, league in LEAGUES:
+            league_path = f"{sport}/{league}"
+            store.add_response(f"{ESPN_BASE_URL}/{league_path}/scoreboard?dates={SLATE_DAY:%Y%m%d}",
+                               scoreboard(league_path, SLATE_DAY, 6))
+            store.add_response(f"{ESPN_BASE_URL}/{league_path}/scoreboard", scoreboard(league_path, SLATE_DAY, 6))
+            for i in range(6):
+                prompt = f"Analyze {league_path} Away {i} at {league_path} Home {i}"
+                store.add_llm('openai', 'gpt-4o', prompt, {'pick': f'{league_path} Home {i}', 'confidence': 0.6})
+        store.save()
+
+        def generate_slate():
+            games = DateBasedSportsManager().get_games_for_date_range(SLATE_DAY, SLATE_DAY, LEAGUES)
+            picks = []
+            for game in games:
+                prompt = f"Analyze {game['away_team']['name']} at {game['home_team']['name']}"
+                analysis = llm_response_cache.get('openai', 'gpt-4o', prompt)
+                picks.append((game['game_id'], analysis and analysis['pick']))
+            return sorted(picks)
+
+        runs = []
+        for _ in range(2):
+            with isolated_caches(), http_fixtures.replay(path, latency=0.05, jitter=0.2, seed=1):
+                start = time.perf_counter()
+                picks = generate_slate()
+                runs.append((time.perf_counter() - start, picks))
+                stats = dict(http_fixtures.stats)
+
+        (first_time, first), (second_time, second) = runs
+        assert first == second and len(first) == 12
+        assert all(pick for _, pick in first)
+        assert stats['unmatched'] == 0 and stats['llm_replayed'] == 12
+        print(f"   ✅ {len(first)} picks, {stats['replayed']} HTTP + {stats['llm_replayed']} LLM responses replayed")
+        print(f"   ⏱️  Runs: {first_time * 1000:.0f}ms / {second_time * 1000:.0f}ms "
+              f"(scoreboards fetched concurrently under 50ms injected latency)")
+
+
+if __name__ == "__main__":
+    test_record_then_replay_offline()
+    test_slate_benchmark_replay()
+    print("\n✅ HTTP fixture tests complete!")
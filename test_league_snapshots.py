@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Check that real-time data for a whole slate costs a fixed number of ESPN calls per league
+"""
+
+import sys
+import os
+import tempfile
+from collections import Counter
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import streamlit as st
+import utils.espn_scoreboard as espn_scoreboard_module
+import utils.league_snapshots as snapshots_module
+import utils.real_time_data_engine as engine_module
+from utils.league_snapshots import league_snapshots
+from utils.team_registry import TeamRegistry
+
+NFL_TEAMS = [(str(i + 1), f'City{i} Team{i}', f'Team{i}', f'T{i:02d}') for i in range(32)]
+
+
+class StubResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class StubSession:
+    """Fake ESPN: teams, league injuries, standings and a range scoreboard, counting calls per endpoint"""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def get(self, url, params=None, timeout=None):
+        endpoint = url.rsplit('/', 1)[-1]
+        self.calls[endpoint] += 1
+        if endpoint == 'teams':
+            return StubResponse({'sports': [{'leagues': [{'teams': [
+                {'team': {'id': tid, 'displayName': display, 'name': name, 'abbreviation': abbr}}
+                for tid, display, name, abbr in NFL_TEAMS
+            ]}]}]})
+        if endpoint == 'injuries':
+            return StubResponse({'injuries': [
+                {'id': tid, 'displayName': display, 'injuries': [
+                    {'athlete': {'displayName': f'Player {tid}', 'position': {'abbreviation': 'QB'}},
+                     'status': 'Questionable', 'shortComment': 'Ankle'}
+                ]}
+                for tid, display, _, _ in NFL_TEAMS
+            ]})
+        if endpoint == 'standings':
+            return StubResponse({'children': [{'standings': {'entries': [
+                {'team': {'id': tid}, 'stats': [{'name': 'wins', 'value': 5.0}, {'name': 'losses', 'value': 3.0},
+                                                {'name': 'pointsFor', 'value': 200.0}]}
+                for tid, _, _, _ in NFL_TEAMS
+            ]}}]})
+        if endpoint == 'scoreboard':
+            events = []
+            for week in range(6):
+                for i in range(0, 32, 2):
+                    home, away = NFL_TEAMS[i][0], NFL_TEAMS[(i + 1 + week * 2) % 32][0]
+                    events.append({'date': f'2024-10-{week + 1:02d}T17:00Z',
+                                   'status': {'type': {'completed': True}},
+                                   'competitions': [{'competitors': [
+                                       {'team': {'id': home}, 'winner': True, 'score': '24'},
+                                       {'team': {'id': away}, 'winner': False, 'score': '17'}]}]})
+            return StubResponse({'events': events})
+        return StubResponse({})
+
+
+def test_slate_costs_fixed_calls_per_league():
+    """A 14-game NFL slate and a 1-game slate should hit each league endpoint once"""
+
+    print("📦 Gathering real-time data for a 14-game NFL slate...")
+    print("=" * 60)
+
+    session = StubSession()
+    original_session = espn_scoreboard_module.espn_scoreboard.session
+    original_registry = engine_module.team_registry
+    original_secrets = st.secrets
+    espn_scoreboard_module.espn_scoreboard.session = session
+    st.secrets = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            registry = TeamRegistry(path=os.path.join(tmp, 'team_registry.json'))
+            engine_module.team_registry = registry
+            snapshots_module.team_registry = registry
+            league_snapshots.invalidate()
+
+            slate = [{'home_team': NFL_TEAMS[i][1], 'away_team': NFL_TEAMS[i + 1][1], 'sport': 'NFL',
+                      'venue': 'Somewhere'} for i in range(0, 28, 2)]
+            data = [engine_module.RealTimeDataEngine().get_comprehensive_game_data(game) for game in slate]
+
+            print(f"   📡 ESPN calls for {len(slate)} games: {dict(session.calls)}")
+            assert session.calls == Counter({'teams': 1, 'injuries': 1, 'standings': 1, 'scoreboard': 1})
+
+            first = data[0]
+            assert first['team_stats']['home_stats']['wins'] == 5
+            assert len(first['recent_form']['home_form']['last_5']) == 5
+            assert any(report['player'] == 'Player 1' for report in first['injuries']['reports'])
+            print("   ✅ Injuries, standings and recent form served from league snapshots")
+
+            engine_module.RealTimeDataEngine().get_comprehensive_game_data(slate[0])
+            assert sum(session.calls.values()) == 4, "Another game in the same interval should not call ESPN"
+            print("   ✅ Extra games within the refresh interval cost no HTTP calls")
+    finally:
+        espn_scoreboard_module.espn_scoreboard.session = original_session
+        engine_module.team_registry = original_registry
+        snapshots_module.team_registry = original_registry
+        st.secrets = original_secrets
+        league_snapshots.invalidate()
+
+
+if __name__ == "__main__":
+    test_slate_costs_fixed_calls_per_league()
+    print("\n✅ League snapshot check complete!")
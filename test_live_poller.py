@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Simulate a night of games: adaptive state-driven polling versus the old fixed 5-minute / start+3h monitor
+"""
+
+import sys
+import os
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import utils.live_poller as live_poller_module
+from utils.live_poller import LivePollScheduler
+
+T0 = 1_730_844_000.0  # 2024-11-05 22:00 UTC (5pm ET)
+
+# (league, home, away, start offset seconds, duration seconds)
+SLATE = [
+    ('NBA', 'Boston Celtics', 'Miami Heat', 2 * 3600, 7913),
+    ('NBA', 'Denver Nuggets', 'Utah Jazz', 2 * 3600, 8647),
+    ('NBA', 'Los Angeles Lakers', 'Phoenix Suns', 5 * 3600, 8291),
+    ('NHL', 'New York Rangers', 'Boston Bruins', 2 * 3600, 9353),
+    ('NHL', 'Edmonton Oilers', 'Calgary Flames', 4 * 3600, 10069),
+]
+PATHS = {'NBA': 'basketball/nba', 'NHL': 'hockey/nhl'}
+
+
+class SimulatedScoreboard:
+    """ESPN-shaped scoreboards whose game states follow the simulated clock"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.requests = 0
+
+    def resolve_league(self, league):
+        return tuple(PATHS[league].split('/')) if league in PATHS else None
+
+    @staticmethod
+    def normalize_date(value):
+        return value.replace('-', '') if value else None
+
+    def get_scoreboard_by_path(self, path, date_param, fresh=False):
+        assert fresh, "Live polling must bypass the short-lived caches"
+        self.requests += 1
+        now = self.clock()
+        events = []
+        for i, (league, home, away, offset, duration) in enumerate(SLATE):
+            if PATHS[league] != path:
+                continue
+            start = T0 + offset
+            if now < start:
+                status = {'name': 'STATUS_SCHEDULED', 'state': 'pre', 'completed': False}
+            elif now < start + duration:
+                status = {'name': 'STATUS_IN_PROGRESS', 'state': 'in', 'completed': False}
+            else:
+                status = {'name': 'STATUS_FINAL', 'state': 'post', 'completed': True}
+            events.append({
+                'id': str(i),
+                'date': '',
+                'status': {'type': dict(status, detail='')},
+                'competitions': [{'competitors': [
+                    {'homeAway': 'home', 'score': '101', 'team': {'displayName': home}},
+                    {'homeAway': 'away', 'score': '99', 'team': {'displayName': away}},
+                ]}],
+            })
+        return {'events': events}
+
+
+def fixed_interval_requests(interval):
+    """Polling every watched game on a fixed interval until it's final"""
+    return sum(int((offset + duration) // interval) + 1 for _, _, _, offset, duration in SLATE)
+
+
+def old_monitor(horizon):
+    """The previous loop: every 300s, one request per game once start + 3h has passed"""
+    requests, latencies = 0, []
+    pending = {i for i in range(len(SLATE))}
+    t = T0
+    while pending and t <= T0 + horizon:
+        for i in sorted(pending):
+            _, _, _, offset, duration = SLATE[i]
+            if t > T0 + offset + 3 * 3600:
+                requests += 1
+                if t >= T0 + offset + duration:
+                    latencies.append(t - (T0 + offset + duration))
+                    pending.discard(i)
+        t += 300
+    return requests, latencies
+
+
+def test_adaptive_polling_night():
+    """Fewer requests, and finals detected within one live interval"""
+
+    print("📡 Simulating a 12-hour slate of 5 games...")
+    print("=" * 60)
+
+    now = [T0]
+    clock = lambda: now[0]
+    scoreboard = SimulatedScoreboard(clock)
+    original = live_poller_module.espn_scoreboard
+    live_poller_module.espn_scoreboard = scoreboard
+    try:
+        poller = LivePollScheduler(clock=clock)
+        for i, (league, home, away, offset, _) in enumerate(SLATE):
+            assert poller.watch(f"game{i}", league, home, away, start_time=T0 + offset, game_date='2024-11-05')
+        assert not poller.watch('finished', 'NBA', 'A', 'B', state='final')
+
+        latencies = []
+        while poller.watched() and now[0] < T0 + 12 * 3600:
+            for key, _, _ in poller.tick():
+                _, _, _, offset, duration = SLATE[int(key[4:])]
+                latencies.append(now[0] - (T0 + offset + duration))
+            # Sleep exactly until the next game is due, like the monitor thread does
+            now[0] += max(poller.seconds_until_next_poll() or 0, 1)
+
+        old_requests, old_latencies = old_monitor(12 * 3600)
+        fixed_requests = fixed_interval_requests(live_poller_module.LIVE_POLL_SECONDS)
+        print(f"   🐢 Every game every {live_poller_module.LIVE_POLL_SECONDS}s: {fixed_requests} requests")
+        print(f"   🐌 Old monitor (5-min loop after start+3h): {old_requests} requests, "
+              f"finals seen {sum(old_latencies) / len(old_latencies) / 60:.1f} min late on average "
+              f"(worst {max(old_latencies) / 60:.0f} min)")
+        print(f"   🚀 Adaptive: {scoreboard.requests} requests, "
+              f"finals seen {sum(latencies) / len(latencies):.0f}s late on average (worst {max(latencies):.0f}s)")
+
+        assert len(latencies) == len(SLATE) and not poller.watched()
+        assert max(latencies) <= live_poller_module.LIVE_POLL_SECONDS
+        assert max(old_latencies) > 15 * 60
+        assert scoreboard.requests < fixed_requests / 2
+        # Concurrent games in a league share one request per tick
+        assert poller.stats['games_updated'] > scoreboard.requests
+    finally:
+        live_poller_module.espn_scoreboard = original
+
+
+def test_poll_intervals_follow_game_state():
+    """Finished games are skipped, live games polled fast, scheduled games ramp up towards the start"""
+
+    poller = LivePollScheduler(clock=lambda: T0)
+    assert poller.interval_for('final', T0) is None
+    assert poller.interval_for('live', T0) == live_poller_module.LIVE_POLL_SECONDS
+    ramp = [poller.interval_for('scheduled', T0 + offset) for offset in (12 * 3600, 3 * 3600, 30 * 60, 5 * 60, -60)]
+    assert ramp == sorted(ramp, reverse=True) and ramp[-1] == 30
+    # ESPN's in-game flag counts as live even when the status name isn't mapped
+    event = {'status': {'type': {'name': 'STATUS_END_PERIOD', 'state': 'in', 'detail': 'End of 1st'}}}
+    assert poller.state_of(event) == 'live'
+    print(f"\n   ✅ Scheduled-game ramp: {ramp} seconds")
+
+
+if __name__ == "__main__":
+    test_adaptive_polling_night()
+    test_poll_intervals_follow_game_state()
+    print("\n✅ Live polling simulation complete!")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+LLM response cache: prompt normalization in the key, game-proximity TTLs, hit/miss/cost accounting
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.llm_response_cache import (DEFAULT_TTL_SECONDS, FAR_FUTURE_TTL_SECONDS, MODEL_COST_PER_1K,
+                                      LLMResponseCache)
+import utils.ai_analysis as ai_analysis_module
+
+
+def starting_in(hours):
+    return {'commence_time': (datetime.now(timezone.utc) + timedelta(hours=hours)).isoformat()}
+
+
+def test_keys_and_ttls():
+    """Whitespace and provider case don't change the key; model and prompt text do. TTLs shrink as the game nears"""
+
+    print("🗝️  Checking LLM cache keys and TTLs...")
+    print("=" * 60)
+
+    cache = LLMResponseCache(cache_dir=os.path.join(tempfile.gettempdir(), 'llm_cache_keys'))  # Never opened
+    key = cache.make_key('openai', 'gpt-4o', 'Who wins\n    Celtics vs Heat?')
+    assert cache.make_key('OpenAI', 'gpt-4o', '  Who wins Celtics   vs\tHeat? ') == key
+    assert cache.make_key('openai', 'gpt-4o-mini', 'Who wins Celtics vs Heat?') != key
+    assert cache.make_key('gemini', 'gpt-4o', 'Who wins Celtics vs Heat?') != key
+    assert cache.make_key('openai', 'gpt-4o', 'Who wins Celtics vs Knicks?') != key
+    print("   ✅ Re-indented prompts share a key; other models, providers and prompts don't")
+
+    tiers = [(0.5, 15 * 60), (3, 60 * 60), (12, 3 * 3600), (48, 12 * 3600), (24 * 5, FAR_FUTURE_TTL_SECONDS),
+             (-2, 15 * 60)]
+    for hours, ttl in tiers:
+        assert cache.ttl_for_game(starting_in(hours)) == ttl, hours
+    assert cache.ttl_for_game({'commence_time': '2024-11-05T23:00:00'}) == 15 * 60  # Naive times are UTC
+    assert cache.ttl_for_game({'date': (datetime.now(timezone.utc) + timedelta(days=10)).strftime('%Y-%m-%d')}) == \
+        FAR_FUTURE_TTL_SECONDS
+    assert cache.ttl_for_game({'date': 'Unknown'}) == cache.ttl_for_game(None) == DEFAULT_TTL_SECONDS
+    print(f"   ✅ {len(tiers)} proximity tiers, date-only and unknown starts")
+
+
+def test_hits_misses_and_cost_saved():
+    """Lookups are counted per provider, hits credit the stored call's cost, errors are never cached"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(cache_dir=tmp)
+        lookups = []
+        cache.add_listener(lambda provider, hit, saved: lookups.append((provider, hit, saved)))
+        prompt = 'Analyze Chiefs at Bills ' * 40
+
+        assert cache.get('openai', 'gpt-4o', prompt) is None
+        cache.set('openai', 'gpt-4o', prompt, {'pick': 'Chiefs', 'confidence': 0.62})
+        assert cache.get('openai', 'gpt-4o', ' '.join(prompt.split())) == {'pick': 'Chiefs', 'confidence': 0.62}
+        cache.set('openai', 'gpt-4o', 'Stale prompt', {'pick': 'Bills'}, ttl_seconds=-1)
+        assert cache.get('openai', 'gpt-4o', 'Stale prompt') is None
+        cache.set('claude', 'claude-3.5-sonnet-20240620', prompt, {'error': 'rate limited'})
+        assert cache.get('claude', 'claude-3.5-sonnet-20240620', prompt) is None
+
+        cost = cache.estimate_cost('gpt-4o', prompt)
+        assert abs(cost - (len(prompt) / 4 + 500) / 1000 * MODEL_COST_PER_1K['gpt-4o']) < 1e-12
+        stats = cache.get_stats()
+        assert stats['providers']['openai'] == {'hits': 1, 'misses': 2, 'cost_saved': cost}
+        assert stats['providers']['claude'] == {'hits': 0, 'misses': 1, 'cost_saved': 0.0}
+        assert stats['entries'] == 1 and abs(stats['hit_rate'] - 25.0) < 1e-9
+        assert lookups == [('openai', False, 0.0), ('openai', True, cost), ('openai', False, 0.0),
+                           ('claude', False, 0.0)]
+
+        calls = []
+        def call():
+            calls.append(1)
+            return {'pick': 'Bills'}
+        for _ in range(3):
+            assert cache.get_or_call('gemini', 'gemini-2.5-pro', 'Bills at Dolphins', call) == {'pick': 'Bills'}
+        assert len(calls) == 1 and cache.get_stats()['providers']['gemini']['hits'] == 2
+        print(f"\n   ✅ 1 hit saved ${cost:.4f}; expired and error responses miss; get_or_call called the provider once")
+
+
+class StubGenerativeModel:
+    """Stands in for genai.GenerativeModel, remembering which models were called"""
+
+    calls = []
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def generate_content(self, prompt):
+        StubGenerativeModel.calls.append(self.model_name)
+        return type('Response', (), {'text': '{"search_suggestions": []}'})()
+
+
+def test_game_discovery_cached_under_its_model():
+    """Game discovery is stored and found under gemini-2.5-flash, the model it calls, priced at that model's rate"""
+
+    original = (ai_analysis_module.llm_response_cache, ai_analysis_module.genai, ai_analysis_module.GENAI_AVAILABLE)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(cache_dir=tmp)
+        try:
+            ai_analysis_module.llm_response_cache = cache
+            ai_analysis_module.genai = type('genai', (), {'GenerativeModel': StubGenerativeModel})
+            ai_analysis_module.GENAI_AVAILABLE = True
+            StubGenerativeModel.calls = []
+            analyzer = ai_analysis_module.AIGameAnalyzer.__new__(ai_analysis_module.AIGameAnalyzer)
+
+            first = analyzer.enhanced_game_discovery('2024-11-05', 'NBA')
+            second = analyzer.enhanced_game_discovery('2024-11-05', 'NBA')
+        finally:
+            ai_analysis_module.llm_response_cache, ai_analysis_module.genai, ai_analysis_module.GENAI_AVAILABLE = original
+
+        assert first == second and first['ai_source'] == 'Gemini'
+        assert StubGenerativeModel.calls == ['gemini-2.5-flash']
+        models = [row[0] for row in cache._connect().execute("SELECT model FROM responses")]
+        assert models == ['gemini-2.5-flash']
+        stats = cache.get_stats()['providers']['gemini']
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        assert 'gemini-2.5-flash' in MODEL_COST_PER_1K
+        print("   ✅ Game discovery called gemini-2.5-flash once and was served from its cache entry after")
+
+
+if __name__ == "__main__":
+    test_keys_and_ttls()
+    test_hits_misses_and_cost_saved()
+    test_game_discovery_cached_under_its_model()
+    print("\n✅ LLM response cache checks complete!")
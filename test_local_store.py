@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Local store and LLM response cache: expired entries stay out of listings and stats, and get purged as writes come in
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.local_store import LocalStore, PURGE_EVERY_WRITES
+from utils.llm_response_cache import LLMResponseCache
+import utils.llm_response_cache as llm_response_cache_module
+
+
+def stored_rows(store):
+    """Every row on disk, expired or not"""
+    return store._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def test_expired_entries_hidden_and_purged():
+    """Listings and stats only count live entries; expired rows are deleted on the write schedule"""
+
+    print("🧹 Checking local store expiry...")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalStore(db_path=os.path.join(tmp, 'store.db'))
+        store.set('predictions', 'stale', {'picks': []}, ttl_seconds=-1)    # First write purges right away
+        assert stored_rows(store) == 0
+
+        store.set('predictions', 'live', {'picks': [1, 2]}, ttl_seconds=3600, item_count=2)
+        store.set('predictions', 'expired', {'picks': [3]}, ttl_seconds=-1)
+        assert stored_rows(store) == 2
+        assert [entry['key'] for entry in store.list_entries('predictions')] == ['live']
+        stats = store.get_stats('predictions')
+        assert stats['entries'] == 1 and stats['total_size'] == len('{"picks": [1, 2]}')
+        print("   ✅ Listing and stats leave out the expired entry")
+
+        store.set('odds', 'expired', {}, ttl_seconds=-1)
+        for i in range(PURGE_EVERY_WRITES - 5):
+            store.set('odds', f'live_{i}', {}, ttl_seconds=3600)
+        assert store.delete('odds', 'expired')                   # Not purged yet
+
+        store.set('odds', 'expired', {}, ttl_seconds=-1)         # Write PURGE_EVERY_WRITES
+        store.set('odds', 'trigger', {}, ttl_seconds=3600)       # The next one purges
+        assert not store.delete('odds', 'expired')
+        print(f"   ✅ Expired rows purged on write {PURGE_EVERY_WRITES + 1}")
+
+
+def test_llm_cache_purges_on_write():
+    """The LLM response cache clears out expired responses on its first write"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(cache_dir=tmp)
+        conn = cache._connect()
+        with conn:
+            conn.execute("INSERT INTO responses (key, provider, model, response, created_at, expires_at) "
+                         "VALUES ('old', 'openai', 'gpt-4o', '{}', 0, 1)")
+        cache.set('openai', 'gpt-4o', 'Who wins?', {'pick': 'Home'})
+        keys = [row[0] for row in conn.execute("SELECT key FROM responses")]
+        assert keys == [cache.make_key('openai', 'gpt-4o', 'Who wins?')]
+        assert cache.get_stats()['entries'] == 1
+        print(f"\n   ✅ LLM cache purged its expired response (every {llm_response_cache_module.PURGE_EVERY_WRITES} writes)")
+
+
+if __name__ == "__main__":
+    test_expired_entries_hidden_and_purged()
+    test_llm_cache_purges_on_write()
+    print("\n✅ Local store checks complete!")
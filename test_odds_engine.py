@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Odds engine: no-vig consensus, best lines, arbitrage and middles over a full multi-sport pull in one pass
+"""
+
+import sys
+import os
+import time
+import random
+
+import pandas as pd
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.odds_api import OddsAPIManager, OddsAnalyzer
+from utils.odds_engine import AWAY, HOME, OddsMatrix, market_scanner
+
+SPORTS = ['americanfootball_nfl', 'basketball_nba', 'baseball_mlb', 'icehockey_nhl', 'soccer_epl']
+BOOKS = [f"book{i}" for i in range(12)]
+
+
+def market(key, home, away, home_price, away_price, home_point=None, total=None):
+    if key == 'totals':
+        outcomes = [{'name': 'Over', 'price': home_price, 'point': total},
+                    {'name': 'Under', 'price': away_price, 'point': total}]
+    else:
+        outcomes = [{'name': home, 'price': home_price}, {'name': away, 'price': away_price}]
+        if home_point is not None:
+            outcomes[0]['point'], outcomes[1]['point'] = home_point, -home_point
+    return {'key': key, 'outcomes': outcomes}
+
+
+def full_pull(rng, games_per_sport=30):
+    """Odds API-shaped events: every book hangs -110/-110 spreads and totals and a ~4.5% moneyline"""
+    events = []
+    for sport_key in SPORTS:
+        for i in range(games_per_sport):
+            home, away = f"{sport_key} Home {i}", f"{sport_key} Away {i}"
+            favourite = rng.choice([-150, -130, -115])
+            bookmakers = []
+            for book in BOOKS:
+                shade = rng.choice([-5, 0, 5])
+                bookmakers.append({'key': book, 'title': book.title(), 'markets': [
+                    market('h2h', home, away, favourite + shade, -favourite - 20 + shade),
+                    market('spreads', home, away, -110, -110, home_point=-3.5),
+                    market('totals', home, away, -110, -110, total=220.5),
+                ]})
+            events.append({'id': f"{sport_key}-{i}", 'sport_key': sport_key, 'home_team': home, 'away_team': away,
+                           'commence_time': '2024-11-05T23:00:00Z', 'bookmakers': bookmakers})
+
+    # One stale moneyline on each side at two different books: a cross-book arbitrage
+    arb = events[3]
+    for bookmaker in arb['bookmakers']:
+        bookmaker['markets'][0] = market('h2h', arb['home_team'], arb['away_team'], -120, 100)
+    arb['bookmakers'][2]['markets'][0] = market('h2h', arb['home_team'], arb['away_team'], 130, -150)
+    arb['bookmakers'][7]['markets'][0] = market('h2h', arb['home_team'], arb['away_team'], -160, 120)
+    # Home -2.5 at one book against away +3.5 everywhere else: a one-point middle
+    middle = events[40]
+    middle['bookmakers'][5]['markets'][1] = market('spreads', middle['home_team'], middle['away_team'], -110, -110,
+                                                   home_point=-2.5)
+    return events
+
+
+def test_full_market_scan():
+    """150 games x 12 books x 3 markets scanned in under 10ms, finding the planted arbitrage and middle"""
+
+    print("🔍 Scanning a 5-sport, 12-book odds pull...")
+    print("=" * 60)
+
+    events = full_pull(random.Random(5))
+    start = time.perf_counter()
+    matrices = OddsMatrix.from_events(events)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for _ in range(20):
+        start = time.perf_counter()
+        scans = {market: market_scanner.scan(matrix) for market, matrix in matrices.items()}
+        timings.append((time.perf_counter() - start) * 1000)
+    scan_ms = sorted(timings)[len(timings) // 2]
+    print(f"   📦 Loaded {matrices['h2h'].shape} per market in {load_ms:.1f}ms")
+    print(f"   🚀 Scanned all three markets in {scan_ms:.2f}ms (median of 20)")
+    assert scan_ms < 10
+
+    # -110/-110 everywhere: a 4.76% overround and a 50/50 no-vig consensus
+    totals = scans['totals']
+    assert abs(totals['overround'][0, 0] - 1.0476) < 1e-3
+    assert abs(totals['consensus'][0, HOME] - 0.5) < 1e-9
+
+    opportunities = market_scanner.opportunities(events)
+    arbs = [item for item in opportunities if item['type'] == 'arbitrage']
+    middles = [item for item in opportunities if item['type'] == 'middle']
+    assert [item['game_id'] for item in arbs] == [events[3]['id']]
+    assert abs(arbs[0]['margin'] - (1 / (1 / 2.3 + 1 / 2.2) - 1)) < 1e-9
+    assert abs(sum(leg['stake_share'] for leg in arbs[0]['legs']) - 1) < 1e-9
+    assert {leg['book'] for leg in arbs[0]['legs']} == {'book2', 'book7'}
+    assert [(item['game_id'], item['gap']) for item in middles] == [(events[40]['id'], 1.0)]
+    legs = ', '.join(f"{leg['outcome']} {leg['price']} @ {leg['book']}" for leg in arbs[0]['legs'])
+    print(f"   💰 Arbitrage: {arbs[0]['game']} +{arbs[0]['margin']:.1%} ({legs})")
+    print(f"   🎯 Middle: {middles[0]['game']} {middles[0]['gap']:.1f} point window")
+
+
+def test_manager_and_analyzer_use_the_engine():
+    """Best prices are the best per side (with their books); the analyzer reports no-vig fair odds"""
+
+    home, away = 'Boston Celtics', 'Miami Heat'
+    bookmakers = [
+        {'key': 'a', 'title': 'Book A', 'markets': [market('h2h', home, away, -150, 130)]},
+        {'key': 'b', 'title': 'Book B', 'markets': [market('h2h', home, away, -140, 120)]},
+        {'key': 'c', 'title': 'Book C', 'markets': [market('h2h', home, away, -155, 135)]},
+    ]
+    best = OddsAPIManager().extract_best_odds(bookmakers, home, away)
+    assert best == {'home_odds': '-140', 'away_odds': '+135', 'bookmaker': 'Book B', 'away_bookmaker': 'Book C'}
+
+    analyzer = OddsAnalyzer()
+    analysis = analyzer.analyze_game_value({
+        'game_found': True, 'home_team': home, 'away_team': away,
+        'bookmakers': [{'bookmaker': 'Book A', 'odds': {home: -150, away: 130}},
+                       {'bookmaker': 'Book B', 'odds': {home: -140, away: 120}}],
+    })
+    assert analysis['best_home_odds'] == -140 and analysis['best_away_odds'] == 130
+    assert abs(analysis['home_fair_prob'] + analysis['away_fair_prob'] - 1) < 1e-9
+    assert 0 < analysis['avg_bookmaker_margin'] < 0.05
+
+    frame = pd.DataFrame({'game_name': ['A @ B', 'C @ D', 'E @ F'], 'sport': ['NBA'] * 3, 'date': ['2024-11-05'] * 3,
+                          'home_odds': ['-110', 'N/A', '-200'], 'away_odds': ['-110', '+100', '+150']})
+    value = analyzer.find_best_value_bets(frame)
+    assert [bet['game'] for bet in value] == ['A @ B', 'E @ F']
+    print(f"\n   ✅ Best prices {best['home_odds']} @ {best['bookmaker']} / {best['away_odds']} @ {best['away_bookmaker']}; "
+          f"fair {analysis['home_fair_prob']:.1%}/{analysis['away_fair_prob']:.1%}")
+
+
+if __name__ == "__main__":
+    test_full_market_scan()
+    test_manager_and_analyzer_use_the_engine()
+    print("\n✅ Odds engine tests complete!")
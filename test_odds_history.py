@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Odds history: append-only snapshots, open-vs-current and windowed movement over thousands of games
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import utils.multi_layer_analyzer as multi_layer_analyzer
+from utils.local_store import LocalStore
+from utils.odds_history import OddsHistoryStore, COMPACT_AFTER_CHUNKS, KEEP_DAYS, PRUNE_INTERVAL_SECONDS, movement_signal
+from utils.odds_ingestion import OddsIngestionPlanner
+
+T0 = 1_730_800_000.0  # 2024-11-05 09:46 UTC
+COMMENCE = '2024-11-06T00:00:00Z'
+BOOKS = ['fanduel', 'draftkings', 'betmgm', 'caesars', 'pointsbet', 'bovada']
+
+
+def event(event_id, home, away, spread, total, home_price, books=BOOKS):
+    """An Odds API event where every book posts the same lines"""
+    return {
+        'id': event_id,
+        'sport_key': 'basketball_nba',
+        'commence_time': COMMENCE,
+        'home_team': home,
+        'away_team': away,
+        'bookmakers': [{'key': book, 'title': book.title(), 'markets': [
+            {'key': 'h2h', 'outcomes': [{'name': home, 'price': home_price}, {'name': away, 'price': -home_price}]},
+            {'key': 'spreads', 'outcomes': [{'name': home, 'price': -110, 'point': spread},
+                                            {'name': away, 'price': -110, 'point': -spread}]},
+            {'key': 'totals', 'outcomes': [{'name': 'Over', 'price': -110, 'point': total},
+                                           {'name': 'Under', 'price': -110, 'point': total}]},
+        ]} for book in books],
+    }
+
+
+def test_steam_move_detected():
+    """A late move by every book shows up as recent movement and a steam signal; unchanged polls add no rows"""
+
+    print("📈 Recording a steam move...")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OddsHistoryStore(os.path.join(tmp, 'history'), clock=lambda: T0 + 7200)
+        assert store.record([event('g1', 'Boston Celtics', 'Miami Heat', -3.5, 220.5, -160)], T0) == 36
+        assert store.record([event('g1', 'Boston Celtics', 'Miami Heat', -3.5, 220.5, -160)], T0 + 1800) == 0
+        store.record([event('g1', 'Boston Celtics', 'Miami Heat', -5.0, 221.0, -200)], T0 + 6000)
+
+        summary = store.game_movement('basketball_nba', 'g1', COMMENCE, window_minutes=60)
+        assert summary['spread']['open'] == -3.5 and summary['spread']['current'] == -5.0
+        assert summary['spread']['recent_move'] == -1.5 and summary['spread']['books_moving'] == len(BOOKS)
+        assert summary['total']['move'] == 0.5
+        assert summary['moneyline']['move'] > 0.04
+        signal = movement_signal(summary)
+        assert signal['significant'] and signal['steam'] and signal['favours'] == 'home'
+
+        # Outside the window the move is only "since open"
+        quiet = store.game_movement('basketball_nba', 'g1', COMMENCE, window_minutes=10)
+        assert quiet['spread']['recent_move'] == 0 and quiet['spread']['move'] == -1.5
+        print(f"   ✅ Spread {summary['spread']['open']} → {summary['spread']['current']}, "
+              f"{summary['spread']['books_moving']}/{summary['spread']['books']} books in the last hour")
+
+        # The realtime adjuster reads the same history through the ingestion index
+        planner = OddsIngestionPlanner(api_key='test-key', store=LocalStore(os.path.join(tmp, 'store.db')),
+                                       history=store, clock=lambda: T0 + 7200)
+        planner._sports['basketball_nba'] = {'fetched_at': T0, 'events': [
+            event('g1', 'Boston Celtics', 'Miami Heat', -5.0, 221.0, -200)]}
+        planner._rebuild_index()
+        original = multi_layer_analyzer.odds_ingestion
+        multi_layer_analyzer.odds_ingestion = planner
+        try:
+            game = {'sport': 'NBA', 'home_team': {'name': 'Boston Celtics'}, 'away_team': {'name': 'Miami Heat'}}
+            adjuster = multi_layer_analyzer.RealtimeAdjuster()
+            backed = adjuster._assess_line_movement(game, 'Boston Celtics')
+            faded = adjuster._assess_line_movement(game, 'Miami Heat')
+        finally:
+            multi_layer_analyzer.odds_ingestion = original
+        assert backed['significant'] and backed['confidence_impact'] > 1
+        assert faded['confidence_impact'] < 1
+        print(f"   🧠 Adjuster: {backed['description']} x{backed['confidence_impact']}, "
+              f"{faded['description']} x{faded['confidence_impact']}")
+
+
+def test_slate_queries_in_milliseconds():
+    """2,000 games x 6 books x 8 snapshots: open-vs-current and 60-minute movement per market"""
+
+    print("\n⏱️  Querying a 2,000-game partition...")
+
+    rng = random.Random(3)
+    games = 2000
+    lines = [[rng.choice([-7.5, -3.5, -1.5, 2.5, 4.5]), rng.choice([210.5, 220.5, 230.5]),
+              rng.choice([-180, -130, 120, 150])] for _ in range(games)]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'history')
+        store = OddsHistoryStore(root, clock=lambda: T0 + 8 * 900)
+        start = time.perf_counter()
+        for snapshot in range(8):
+            for line in lines:
+                if rng.random() < 0.3:
+                    line[0] += rng.choice([-0.5, 0.5])
+                    line[2] += rng.choice([-10, 10])
+            store.record([event(f"g{i}", f"Home {i}", f"Away {i}", *line) for i, line in enumerate(lines)],
+                         T0 + snapshot * 900)
+        record_time = time.perf_counter() - start
+        rows = store.stats['rows_written']
+
+        start = time.perf_counter()
+        store.wide_movement('basketball_nba', '2024-11-05', window_minutes=60)
+        cold_ms = (time.perf_counter() - start) * 1000
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            frame = store.wide_movement('basketball_nba', '2024-11-05', window_minutes=60)
+            timings.append((time.perf_counter() - start) * 1000)
+        warm_ms = min(timings)
+
+        assert len(frame) == games
+        expected = frame['event_id'].map(lambda event_id: lines[int(event_id[1:])][0])
+        assert (frame['spread_current'].round(1) == expected.round(1)).all()
+        assert warm_ms < 100
+        print(f"   💾 {rows:,} changed lines stored from {8 * games * len(BOOKS) * 6:,} polled outcomes "
+              f"({record_time:.1f}s to record)")
+        print(f"   🚀 All three markets for {games:,} games: {cold_ms:.0f}ms first query, {warm_ms:.0f}ms after")
+
+        # Reloaded from disk, after compaction, the answers are identical
+        for extra in range(COMPACT_AFTER_CHUNKS):
+            store.record([event('late', 'Home L', 'Away L', -1.0 - extra * 0.5, 200.5, -110)], T0 + extra)
+        chunks = len(os.listdir(os.path.join(root, 'basketball_nba', '2024-11-05')))
+        reloaded = OddsHistoryStore(root, clock=lambda: T0 + 8 * 900)
+        again = reloaded.wide_movement('basketball_nba', '2024-11-05', window_minutes=60)
+        again = again[again['event_id'] != 'late'].reset_index(drop=True)
+        assert chunks <= COMPACT_AFTER_CHUNKS
+        assert again[['event_id', 'spread_open', 'spread_current', 'moneyline_move']].equals(
+            frame[['event_id', 'spread_open', 'spread_current', 'moneyline_move']])
+        print(f"   ✅ Reloaded from {chunks} chunk files after compaction with identical results")
+
+
+def test_old_days_pruned_while_recording():
+    """Recording prunes expired game days from disk and unloads past days, at most once per interval"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'history')
+        now = [T0]
+        store = OddsHistoryStore(root, clock=lambda: now[0])
+        store.record([event('g1', 'Boston Celtics', 'Miami Heat', -3.5, 220.5, -160)])
+        day_dir = os.path.join(root, 'basketball_nba', '2024-11-05')
+        assert os.path.isdir(day_dir) and ('basketball_nba', '2024-11-05') in store._partitions
+
+        # Two days on, the partition is unloaded but its history is still on disk and queryable
+        now[0] = T0 + 2 * 86400
+        store.record([])
+        assert ('basketball_nba', '2024-11-05') not in store._partitions and os.path.isdir(day_dir)
+        assert store.game_movement('basketball_nba', 'g1', COMMENCE)['spread']['current'] == -3.5
+
+        # Past the retention window it's deleted, but only once the prune interval has passed
+        now[0] = T0 + (KEEP_DAYS + 2) * 86400
+        store.record([])
+        assert not os.path.isdir(day_dir) and store.stats['pruned'] == 1
+        os.makedirs(os.path.join(root, 'basketball_nba', '2024-10-01'))
+        store.record([])
+        assert os.path.isdir(os.path.join(root, 'basketball_nba', '2024-10-01'))
+        now[0] += PRUNE_INTERVAL_SECONDS
+        store.record([])
+        assert not os.path.isdir(os.path.join(root, 'basketball_nba', '2024-10-01'))
+        print(f"\n   ✅ Game days older than {KEEP_DAYS} days pruned while recording")
+
+
+if __name__ == "__main__":
+    test_steam_move_detected()
+    test_slate_queries_in_milliseconds()
+    test_old_days_pruned_while_recording()
+    print("\n✅ Odds history tests complete!")
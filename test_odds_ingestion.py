@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Odds ingestion: one concurrent all-markets request per sport, quota-paced refreshes, network-free game lookups
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.local_store import LocalStore
+from utils.odds_history import OddsHistoryStore
+from utils.odds_ingestion import DEFAULT_SPORT_KEYS, OddsIngestionPlanner, QUOTA_RESERVE
+
+LATENCY = 0.2
+GAMES_PER_SPORT = 20
+
+
+class OddsAPIStandIn(BaseHTTPRequestHandler):
+    """Odds API lookalike: slow responses, bills markets x regions, reports the quota in headers"""
+    requests_seen = []
+    remaining = 500
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        sport_key = url.path.split('/')[-3]
+        markets = query['markets'][0].split(',')
+        with self.lock:
+            type(self).requests_seen.append((sport_key, markets))
+            type(self).remaining -= len(markets)
+            remaining = type(self).remaining
+        time.sleep(LATENCY)
+
+        events = []
+        for i in range(GAMES_PER_SPORT):
+            home, away = f"{sport_key} City {i} Hawks", f"{sport_key} Town {i} Owls"
+            events.append({
+                'id': f"{sport_key}-{i}",
+                'sport_key': sport_key,
+                'commence_time': f"2024-11-05T{i % 24:02d}:00:00Z",
+                'home_team': home,
+                'away_team': away,
+                'bookmakers': [{'key': 'book', 'title': 'Book', 'markets': [
+                    {'key': market, 'outcomes': [{'name': home, 'price': -120}, {'name': away, 'price': 100}]}
+                    for market in markets
+                ]}],
+            })
+        body = json.dumps(events).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('x-requests-remaining', str(remaining))
+        self.send_header('x-requests-used', str(500 - remaining))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_planner(tmp, base_url, clock):
+    return OddsIngestionPlanner(api_key='test-key', store=LocalStore(os.path.join(tmp, 'store.db')),
+                                session=requests.Session(), base_url=base_url,
+                                history=OddsHistoryStore(os.path.join(tmp, 'history')), clock=clock)
+
+
+def test_batched_ingestion_and_lookups():
+    """Five sports in one concurrent round, then every game answered from memory"""
+
+    print("🎯 Ingesting 5 sports x 3 markets from a 200ms stand-in...")
+    print("=" * 60)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OddsAPIStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    now = [datetime(2024, 11, 5, 12, tzinfo=timezone.utc).timestamp()]
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            planner = make_planner(tmp, base_url, lambda: now[0])
+
+            start = time.perf_counter()
+            refreshed = planner.ensure_fresh()
+            elapsed = time.perf_counter() - start
+            assert sorted(refreshed) == sorted(DEFAULT_SPORT_KEYS)
+            assert len(OddsAPIStandIn.requests_seen) == len(DEFAULT_SPORT_KEYS)
+            assert all(markets == ['h2h', 'spreads', 'totals'] for _, markets in OddsAPIStandIn.requests_seen)
+            # Sequential per-sport fetching would take 5 x latency
+            assert elapsed < 3 * LATENCY
+            print(f"   🚀 {len(refreshed)} sports in {elapsed * 1000:.0f}ms "
+                  f"(sequential: ~{len(refreshed) * LATENCY * 1000:.0f}ms), one request each")
+
+            # Per-game lookups: ESPN-style names and dict-shaped teams, no requests
+            before = len(OddsAPIStandIn.requests_seen)
+            start = time.perf_counter()
+            found = 0
+            for sport_key in DEFAULT_SPORT_KEYS:
+                for i in range(GAMES_PER_SPORT):
+                    game = {'home_team': {'name': f"{sport_key} City {i} Hawks"},
+                            'away_team': f"{sport_key.upper()} TOWN {i} OWLS"}
+                    event = planner.lookup(game['home_team']['name'], game['away_team'], sport_key)
+                    found += event is not None and len(event['bookmakers'][0]['markets']) == 3
+            lookup_ms = (time.perf_counter() - start) * 1000
+            assert found == len(DEFAULT_SPORT_KEYS) * GAMES_PER_SPORT
+            assert planner.lookup_game({'sport': 'NBA', 'home_team': 'Hawks', 'away_team': 'Owls'}) is not None
+            assert planner.lookup('Nobody', 'Nowhere') is None
+            assert len(OddsAPIStandIn.requests_seen) == before
+            print(f"   🔎 {found} game lookups in {lookup_ms:.1f}ms with no network requests")
+
+            # Within the quota-derived interval nothing is refetched
+            assert planner.ensure_fresh() == []
+            interval = planner.refresh_interval()
+            now[0] += interval
+            assert len(planner.ensure_fresh()) == len(DEFAULT_SPORT_KEYS)
+            print(f"   ⏱️  Quota {planner.quota['remaining']} left -> refresh every {interval / 60:.0f} min")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_refresh_interval_follows_quota():
+    """Less quota left means slower refreshes; at the reserve refreshing stops"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        now = datetime(2024, 11, 20, tzinfo=timezone.utc).timestamp()
+        planner = make_planner(tmp, 'http://127.0.0.1:9', lambda: now)
+        assert planner.seconds_until_reset() == 11 * 24 * 3600
+
+        intervals = []
+        for remaining in (20000, 2000, 500):
+            planner._quota = {'remaining': remaining, 'used': 0, 'seen_at': now}
+            intervals.append(planner.refresh_interval())
+        assert intervals == sorted(intervals)
+        planner._quota = {'remaining': QUOTA_RESERVE + 1, 'used': 0, 'seen_at': now}
+        assert planner.refresh_interval() is None
+        # Nothing fetched (not even attempted) while only the reserve is left
+        assert planner.ensure_fresh() == []
+        print(f"\n   ✅ Refresh every {', '.join(f'{i / 60:.0f}' for i in intervals)} min "
+              f"with 20000 / 2000 / 500 requests left; paused at the reserve")
+
+
+if __name__ == "__main__":
+    test_batched_ingestion_and_lookups()
+    test_refresh_interval_follows_quota()
+    print("\n✅ Odds ingestion tests complete!")
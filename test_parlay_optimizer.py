@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Parlay optimizer: top-k 2-6 leg parlays over 120 candidate legs without enumerating the combination space
+"""
+
+import sys
+import os
+import time
+import math
+import random
+from itertools import combinations
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.parlay_optimizer import ParlayOptimizer, legs_from_value_bets
+
+SPORTS = ['NFL', 'NBA', 'MLB', 'NHL']
+
+
+def candidate_legs(num_games=40, seed=7):
+    """Moneyline, spread and total legs per game, priced around the model with a few mispriced lines"""
+    rng = random.Random(seed)
+    legs = []
+    for g in range(num_games):
+        sport = SPORTS[g % len(SPORTS)]
+        home, away = f"{sport} Home {g}", f"{sport} Away {g}"
+        p = rng.uniform(0.3, 0.7)
+        for market, team, probability in (('h2h', home, p), ('spreads', away, rng.uniform(0.45, 0.55)),
+                                          ('totals', None, rng.uniform(0.45, 0.55))):
+            decimal = 1.0 / (probability * 1.045) * rng.uniform(0.97, 1.07)
+            legs.append({'game_id': f"g{g}", 'game': f"{away} @ {home}", 'sport': sport, 'market': market,
+                         'team': team, 'selection': f"{team or 'Over'} {market}", 'book': 'Book',
+                         'price': None, 'decimal': decimal, 'probability': probability})
+    return legs
+
+
+def brute_force(optimizer, legs, top_k, min_legs, max_legs):
+    """Every combination, priced the same way, for checking the search"""
+    results = []
+    for size in range(min_legs, max_legs + 1):
+        for combo in combinations(range(len(legs)), size):
+            factors = [optimizer.pair_factor(legs[i], legs[j]) for i, j in combinations(combo, 2)]
+            if any(factor is None for factor in factors):
+                continue
+            probability = math.prod(legs[i]['probability'] for i in combo) * math.prod(factors)
+            probability = min(probability, min(legs[i]['probability'] for i in combo))
+            if probability < optimizer.min_probability:
+                continue
+            results.append(probability * math.prod(legs[i]['decimal'] for i in combo) - 1.0)
+    return sorted(results, reverse=True)[:top_k]
+
+
+def test_parlay_search_prunes():
+    """120 candidates, 2-6 legs: best parlays found while visiting a sliver of the combinations"""
+
+    print("🎰 Searching 2-6 leg parlays over 120 candidate legs...")
+    print("=" * 60)
+
+    optimizer = ParlayOptimizer()
+    legs = candidate_legs()
+    start = time.perf_counter()
+    parlays = optimizer.search(legs, top_k=5, min_legs=2, max_legs=6)
+    elapsed = time.perf_counter() - start
+    space = sum(math.comb(len(legs), size) for size in range(2, 7))
+    print(f"   ⚡ {elapsed * 1000:.0f}ms, {optimizer.stats['nodes']:,} nodes visited of {space:,} combinations")
+    for parlay in parlays:
+        print(f"   🎯 {parlay['num_legs']} legs {parlay['price']}: win {parlay['probability']:.1%}, "
+              f"EV {parlay['expected_value']:+.1%}")
+
+    assert len(parlays) == 5
+    assert optimizer.stats['nodes'] < space / 1000
+    assert [p['expected_value'] for p in parlays] == sorted((p['expected_value'] for p in parlays), reverse=True)
+    for parlay in parlays:
+        assert 2 <= parlay['num_legs'] <= 6 and parlay['probability'] >= optimizer.min_probability
+        assert abs(parlay['probability'] * parlay['decimal'] - 1 - parlay['expected_value']) < 1e-9
+        # Same-game pairs only where the rules allow them (a side with the total, or opposite sides)
+        for a, b in combinations(parlay['legs'], 2):
+            assert optimizer.relation(a, b) not in ('conflicting', 'same_game_same_side')
+
+    # Exactly the brute-force answer on a pool small enough to enumerate
+    small = candidate_legs(num_games=6, seed=3)
+    found = [p['expected_value'] for p in optimizer.search(small, top_k=8, min_legs=2, max_legs=4)]
+    expected = brute_force(optimizer, small, 8, 2, 4)
+    assert len(found) == len(expected) and all(abs(a - b) < 1e-12 for a, b in zip(found, expected))
+    print(f"   ✅ Matches brute force on {len(small)} legs (top EV {found[0]:+.1%})")
+
+
+def test_positive_correlation_matches_brute_force():
+    """Boosted legs (same team, side with total) still give exactly the brute-force top-k"""
+
+    rng = random.Random(11)
+    mismatches = 0
+    for rho in (0.1, 0.4):
+        optimizer = ParlayOptimizer(correlation_rules={'same_game_total': rho, 'same_team': rho})
+        for seed in range(25):
+            legs = candidate_legs(num_games=4, seed=seed)
+            # A second game for some teams, so same-team pairs across games are boosted too
+            for leg in rng.sample([leg for leg in legs if leg['team']], 3):
+                legs.append(dict(leg, game_id=f"{leg['game_id']}b", market='h2h',
+                                 probability=rng.uniform(0.4, 0.7), decimal=rng.uniform(1.6, 2.6)))
+            found = [p['expected_value'] for p in optimizer.search(legs, top_k=6, min_legs=2, max_legs=4)]
+            expected = brute_force(optimizer, legs, 6, 2, 4)
+            if len(found) != len(expected) or any(abs(a - b) > 1e-12 for a, b in zip(found, expected)):
+                mismatches += 1
+    assert mismatches == 0
+    print(f"\n   ✅ Positively correlated slates match brute force at rho 0.1 and 0.4")
+
+
+def test_correlation_rules():
+    """Opposite same-game sides lower the joint probability; configured positive correlation raises it"""
+
+    leg = lambda market, team, p: {'game_id': 'g1', 'game': 'Away @ Home', 'sport': 'NBA', 'market': market,
+                                   'team': team, 'selection': f"{team} {market}", 'decimal': 2.0, 'probability': p}
+    moneyline, opponent_spread, own_spread = leg('h2h', 'Home', 0.6), leg('spreads', 'Away', 0.5), leg('spreads', 'Home', 0.5)
+    other_game = dict(leg('h2h', 'Other', 0.5), game_id='g2')
+
+    default = ParlayOptimizer()
+    assert default.pair_factor(moneyline, dict(moneyline, team='Away')) is None          # Both sides of one market
+    assert default.pair_factor(moneyline, own_spread) is None                            # Blocked by default
+    assert default.pair_factor(moneyline, opponent_spread) < 1.0
+    assert default.pair_factor(moneyline, other_game) == 1.0
+
+    sgp = ParlayOptimizer(correlation_rules={'same_game_same_side': 0.6})
+    parlay = sgp.search([moneyline, own_spread], top_k=1)[0]
+    assert parlay['probability'] > parlay['independent_probability'] and parlay['probability'] <= 0.5
+    assert default.search([moneyline, own_spread], top_k=1) == []
+    print(f"\n   ✅ Same-game moneyline + spread: {parlay['independent_probability']:.1%} independent, "
+          f"{parlay['probability']:.1%} with correlation")
+
+    # Value engine bets convert straight to legs
+    bet = {'event_id': 'e1', 'game': 'A @ B', 'sport': 'NBA', 'market': 'h2h', 'team': 'B', 'selection': 'B ML',
+           'book': 'Book1', 'price': '+110', 'decimal': 2.1, 'win_prob': 0.5}
+    assert legs_from_value_bets([bet])[0]['probability'] == 0.5
+
+
+if __name__ == "__main__":
+    test_parlay_search_prunes()
+    test_positive_correlation_matches_brute_force()
+    test_correlation_rules()
+    print("\n✅ Parlay optimizer checks complete!")
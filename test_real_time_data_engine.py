@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Real-time data fan-out: a slow source is cut at its own deadline, the call stays inside its budget, and what arrived is used
+"""
+
+import sys
+import os
+import time
+import concurrent.futures
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import streamlit as st
+import utils.real_time_data_engine as engine_module
+
+# Scaled-down deadlines so the fan-out finishes in well under a second
+DEADLINES = {'team_stats': 0.2, 'injuries_home': 0.6, 'injuries_away': 0.6, 'recent_form': 0.6}
+BUDGET = 0.4
+
+
+def stub_engine(delays):
+    """Engine whose sources sleep for `delays[source]` seconds and then return canned data"""
+    engine = engine_module.RealTimeDataEngine()
+
+    def injuries(team, sport):
+        time.sleep(delays['injuries'])
+        return [{'team': team, 'player': f'{team} Starter', 'status': 'Out', 'impact': 'high'}]
+
+    def team_stats(home, away, sport):
+        time.sleep(delays['team_stats'])
+        return {'home_stats': {'wins': 5}, 'away_stats': {'wins': 3}, 'source': 'Stub'}
+
+    def recent_form(home, away, sport):
+        time.sleep(delays['recent_form'])
+        return {'home_form': {'last_5': 'WWLWW'}, 'away_form': {'last_5': 'LLWLL'}, 'source': 'Stub'}
+
+    engine._fetch_espn_injuries = injuries
+    engine._get_real_team_stats = team_stats
+    engine._get_recent_form = recent_form
+    return engine
+
+
+def test_slow_sources_cut_at_deadline_and_budget():
+    """Team stats (0.2s deadline) and recent form (past the 0.4s budget) time out; injuries still count"""
+
+    print("⏱️  Fanning out to one fast and two slow sources...")
+    print("=" * 60)
+
+    original_secrets, original_deadlines = st.secrets, dict(engine_module.SOURCE_DEADLINES)
+    st.secrets = {}
+    engine_module.SOURCE_DEADLINES.clear()
+    engine_module.SOURCE_DEADLINES.update(DEADLINES)
+    try:
+        engine = stub_engine({'injuries': 0.05, 'team_stats': 0.35, 'recent_form': 1.0})
+        game = {'home_team': {'name': 'Boston Celtics'}, 'away_team': {'name': 'Miami Heat'}, 'sport': 'NBA'}
+
+        start = time.perf_counter()
+        data = engine.get_comprehensive_game_data(game, budget=BUDGET)
+        elapsed = time.perf_counter() - start
+        latency = data['source_latency']
+        print(f"   ⚡ Returned in {elapsed * 1000:.0f}ms with a {BUDGET * 1000:.0f}ms budget: "
+              + ", ".join(f"{name} {info['status']} {info['seconds']:.2f}s" for name, info in latency.items()))
+
+        # Overall budget: recent form's own deadline is later, but the call returns at the budget
+        assert BUDGET - 0.05 <= elapsed < BUDGET + 0.15
+        assert latency['recent_form']['status'] == 'timeout'
+        # Per-source deadline: team stats would finish inside the budget, but is cut at its 0.2s deadline
+        assert latency['team_stats']['status'] == 'timeout'
+        assert DEADLINES['team_stats'] - 0.05 <= latency['team_stats']['seconds'] < DEADLINES['team_stats'] + 0.1
+        assert data['missing_sources'] == ['recent_form', 'team_stats']
+
+        # Partial results: the injuries that arrived are used and scored, the rest fall back
+        assert latency['injuries_home']['status'] == latency['injuries_away']['status'] == 'ok'
+        assert [report['player'] for report in data['injuries']['reports']] == [
+            'Boston Celtics Starter', 'Miami Heat Starter']
+        assert data['team_stats']['source'] == 'Unavailable'
+        assert data['recent_form']['source'] == 'Unavailable'
+        assert abs(data['data_quality_score'] - 0.8) < 1e-9
+        print("   ✅ Slow sources reported missing; injuries used and scored")
+
+        # The same sources fetched one after another get everything, slowly
+        start = time.perf_counter()
+        full = engine.get_comprehensive_game_data(game, fan_out=False)
+        sequential = time.perf_counter() - start
+        assert sequential > 1.3
+        assert full['missing_sources'] == [] and full['team_stats']['source'] == 'Stub'
+        print(f"   🐢 Sequential fetch: every source, {sequential:.1f}s")
+    finally:
+        st.secrets = original_secrets
+        engine_module.SOURCE_DEADLINES.clear()
+        engine_module.SOURCE_DEADLINES.update(original_deadlines)
+
+
+def test_more_games_than_workers():
+    """Sources queued behind other games' fetches get their full deadline once they start"""
+
+    print("\n🧵 Fanning out 6 games on a 2-worker pool...")
+
+    original_secrets, original_deadlines, original_pool = (
+        st.secrets, dict(engine_module.SOURCE_DEADLINES), engine_module._fetch_pool)
+    st.secrets = {}
+    engine_module.SOURCE_DEADLINES.clear()
+    engine_module.SOURCE_DEADLINES.update(DEADLINES)
+    engine_module._fetch_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    games = [{'home_team': {'name': f'Home {i}'}, 'away_team': {'name': f'Away {i}'}, 'sport': 'NBA'}
+             for i in range(6)]
+    try:
+        # 24 sources of 40ms on 2 workers: about 0.5s to drain, past the 0.2s team stats deadline from submission
+        engine = stub_engine({'injuries': 0.04, 'team_stats': 0.04, 'recent_form': 0.04})
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(games)) as games_pool:
+            start = time.perf_counter()
+            slate = list(games_pool.map(lambda game: engine.get_comprehensive_game_data(game, budget=2.0), games))
+            elapsed = time.perf_counter() - start
+        print(f"   ⚡ {len(games)} games in {elapsed * 1000:.0f}ms, "
+              f"{sum(len(data['missing_sources']) for data in slate)} sources missing")
+        assert elapsed > DEADLINES['team_stats'], "The pool should have queued sources past the team stats deadline"
+        for data in slate:
+            assert data['missing_sources'] == []
+            assert all(info['status'] == 'ok' for info in data['source_latency'].values())
+
+        # With a budget shorter than the queue, sources that never start are cancelled and reported as queued
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(games)) as games_pool:
+            slate = list(games_pool.map(lambda game: engine.get_comprehensive_game_data(game, budget=0.15), games))
+        statuses = [info['status'] for data in slate for info in data['source_latency'].values()]
+        assert 'queued' in statuses and 'ok' in statuses
+        assert all(data['missing_sources'] for data in slate if any(
+            info['status'] == 'queued' for info in data['source_latency'].values()))
+        start = time.perf_counter()
+        engine_module._fetch_pool.submit(lambda: None).result()
+        assert time.perf_counter() - start < 0.2, "Cancelled sources must not hold up the pool"
+        print(f"   ✅ Every source ran to completion; under a short budget {statuses.count('queued')} "
+              f"queued sources were cancelled")
+    finally:
+        engine_module._fetch_pool.shutdown(wait=True)
+        st.secrets = original_secrets
+        engine_module.SOURCE_DEADLINES.clear()
+        engine_module.SOURCE_DEADLINES.update(original_deadlines)
+        engine_module._fetch_pool = original_pool
+
+
+if __name__ == "__main__":
+    test_slow_sources_cut_at_deadline_and_budget()
+    test_more_games_than_workers()
+    print("\n✅ Real-time data engine checks complete!")
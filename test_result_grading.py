@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Check that batch result grading fetches one scoreboard per league-day
+"""
+
+import sys
+import os
+import time
+import random
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import utils.result_scorer as result_scorer
+from utils.result_scorer import ResultScorer
+
+SPORTS = {'NBA': 'basketball/nba', 'NHL': 'hockey/nhl', 'MLB': 'baseball/mlb'}
+DATES = [f'2024-11-{day:02d}' for day in range(1, 8)]
+
+
+class StubScoreboard:
+    """Stands in for the ESPN client: 15 final games per league-day, counting requests"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_scoreboard_by_path(self, path, target_date=None, timeout=None):
+        self.calls += 1
+        time.sleep(0.002)  # Simulated network round trip
+        events = []
+        for i in range(15):
+            events.append({
+                'id': f'{path}_{target_date}_{i}',
+                'date': f'{target_date}T23:00Z',
+                'status': {'type': {'name': 'STATUS_FINAL'}},
+                'competitions': [{'competitors': [
+                    {'homeAway': 'home', 'score': str(100 + i),
+                     'team': {'displayName': f'{path} Home {i}', 'name': f'Home{i}', 'abbreviation': f'H{i}'}},
+                    {'homeAway': 'away', 'score': str(90 + i),
+                     'team': {'displayName': f'{path} Away {i}', 'name': f'Away{i}', 'abbreviation': f'A{i}'}},
+                ]}],
+            })
+        return {'events': events}
+
+
+def make_pending(num_picks=500, seed=5):
+    rng = random.Random(seed)
+    picks = []
+    for _ in range(num_picks):
+        sport = rng.choice(list(SPORTS))
+        game_date = rng.choice(DATES)
+        i = rng.randrange(15)
+        picks.append({
+            'sport': sport.lower(),
+            'date': game_date,
+            'home_team': f'{SPORTS[sport]} Home {i}',
+            'away_team': rng.choice([f'{SPORTS[sport]} Away {i}', f'Away{i}']),
+        })
+    return picks
+
+
+def test_grading_fetches_once_per_league_day():
+    """500 open picks should cost one scoreboard request per distinct (sport, date)"""
+
+    print("🏆 Grading 500 pending picks...")
+    print("=" * 60)
+
+    stub = StubScoreboard()
+    original = result_scorer.espn_scoreboard
+    original_record = result_scorer.elo_ratings.record_results
+    result_scorer.espn_scoreboard = stub
+    result_scorer.elo_ratings.record_results = lambda *args, **kwargs: 0
+    try:
+        picks = make_pending()
+        league_days = {(p['sport'], p['date']) for p in picks}
+
+        start = time.perf_counter()
+        matches = ResultScorer().grade_pending(picks)
+        elapsed = time.perf_counter() - start
+    finally:
+        result_scorer.espn_scoreboard = original
+        result_scorer.elo_ratings.record_results = original_record
+
+    print(f"   📡 {stub.calls} scoreboard requests for {len(league_days)} league-days "
+          f"({len(picks)} picks) in {elapsed * 1000:.0f}ms")
+
+    assert stub.calls == len(league_days)
+    assert all(match is not None for match in matches), "Every pick should find its final"
+    for pick, match in zip(picks, matches):
+        assert match['home_team']['name'] == pick['home_team']
+        assert match['home_score'] > match['away_score']
+    print("   ✅ Every pick matched via the (home, away) index, nicknames included")
+
+
+if __name__ == "__main__":
+    test_grading_fetches_once_per_league_day()
+    print("\n✅ Result grading check complete!")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Check nearest-slate discovery: concurrent probing while cold, lookups once the schedule index is warm
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from datetime import date, timedelta
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import utils.schedule_index as schedule_index_module
+from utils.local_store import LocalStore
+from utils.schedule_index import ScheduleIndex
+
+TODAY = date(2024, 11, 5)
+GAME_DAYS = {TODAY + timedelta(days=1), TODAY + timedelta(days=2)}
+
+
+class StubScoreboard:
+    """Dated NBA scoreboards after a 0.3s delay, each carrying the season calendar"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_league_scoreboard(self, league, day, timeout=None):
+        with self.lock:
+            self.calls.append(day)
+        time.sleep(0.3)
+        return {
+            'leagues': [{'calendar': [f'{d.isoformat()}T07:00Z' for d in sorted(GAME_DAYS)],
+                         'season': {'endDate': '2025-04-14T06:59Z'}}],
+            'events': [{'id': '1'}] if day in GAME_DAYS else [],
+        }
+
+
+def test_cold_probes_concurrently_then_warm_lookup():
+    """Cold: all candidates probed at once. Warm: the nearest slate is a lookup with no requests"""
+
+    print("🗓️  Finding the nearest slate from an empty date...")
+    print("=" * 60)
+
+    stub = StubScoreboard()
+    original = schedule_index_module.espn_scoreboard
+    schedule_index_module.espn_scoreboard = stub
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = ScheduleIndex(store=LocalStore(db_path=os.path.join(tmp, 'store.db')))
+            candidates = [TODAY - timedelta(days=1), TODAY + timedelta(days=1), TODAY + timedelta(days=2)]
+
+            start = time.perf_counter()
+            found = index.nearest_slate(['NBA'], candidates)
+            elapsed = time.perf_counter() - start
+            print(f"   🔍 Cold index: {len(stub.calls)} concurrent probes, {found} in {elapsed * 1000:.0f}ms "
+                  f"(sequential would take ~{0.3 * 2 * 1000:.0f}ms+)")
+            assert found == TODAY + timedelta(days=1), "Preference order must win, not the fastest probe"
+            assert elapsed < 0.5
+
+            stub.calls.clear()
+            start = time.perf_counter()
+            found = index.nearest_slate(['NBA'], candidates)
+            elapsed = time.perf_counter() - start
+            print(f"   ⚡ Warm index: {len(stub.calls)} requests, {found} in {elapsed * 1000:.1f}ms")
+            assert found == TODAY + timedelta(days=1)
+            assert stub.calls == []
+
+            # Off-season window: every candidate is ruled out without any request
+            assert index.nearest_slate(['NBA'], [TODAY + timedelta(days=30)]) is None
+            assert stub.calls == []
+
+            # A fresh process reads the persisted calendar
+            reloaded = ScheduleIndex(store=index.store)
+            assert reloaded.has_games('NBA', TODAY + timedelta(days=2)) is True
+            assert reloaded.has_games('NBA', TODAY) is False
+            print("   ✅ Off-season dates skipped without requests; calendar persists across instances")
+    finally:
+        schedule_index_module.espn_scoreboard = original
+
+
+def test_weekly_calendar_still_probes():
+    """Week ranges (NFL) can't pin the day, so dates inside them stay 'maybe'"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = ScheduleIndex(store=LocalStore(db_path=os.path.join(tmp, 'store.db')))
+        index.observe('NFL', {'leagues': [{'calendar': [{'label': 'Regular Season', 'entries': [
+            {'label': 'Week 10', 'startDate': '2024-11-06T08:00Z', 'endDate': '2024-11-13T07:59Z'}]}]}]})
+        assert index.has_games('NFL', date(2024, 11, 8)) is None
+        assert index.has_games('NFL', date(2024, 12, 25)) is False
+        print("\n   ✅ Weekly calendars mark in-season days for probing and rule out the rest")
+
+
+if __name__ == "__main__":
+    test_cold_probes_concurrently_then_warm_lookup()
+    test_weekly_calendar_still_probes()
+    print("\n✅ Schedule index check complete!")
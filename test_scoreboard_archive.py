@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Check the scoreboard archive: finished days are never refetched, month counts need no payloads
+"""
+
+import sys
+import os
+import tempfile
+from datetime import date, timedelta
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from test_async_scoreboard import StandInHandler, start_stand_in, use_temporary_archive
+from utils.async_scoreboard import async_scoreboard
+from utils.espn_scoreboard import espn_scoreboard
+from utils.live_games import LiveGamesManager, CALENDAR_SPORTS
+from utils.local_store import LocalStore
+from utils.scoreboard_archive import scoreboard_archive, ScoreboardArchive, PERMANENT_TTL, TODAY_TTL, FUTURE_TTL, UNSETTLED_PAST_TTL, EMPTY_PAST_TTL
+
+
+def test_past_month_is_fetched_once():
+    """A past month's calendar costs one download per (league, day), then none on reruns"""
+
+    print("🗄️  Rendering a past month's calendar counts twice...")
+    print("=" * 60)
+
+    server, base_url = start_stand_in()
+    tmp = tempfile.TemporaryDirectory()
+    original_store = use_temporary_archive(tmp.name)
+    original_base_url = async_scoreboard.base_url
+    async_scoreboard.base_url = base_url
+    espn_scoreboard.clear()
+    try:
+        manager = LiveGamesManager()
+        served = StandInHandler.requests_served
+        counts = manager.get_monthly_game_counts(2024, 6)
+        first_pass = StandInHandler.requests_served - served
+        print(f"   📡 First render: {first_pass} scoreboard downloads")
+        assert first_pass == 30 * len(CALENDAR_SPORTS)
+        assert counts['2024-06-01'] == 3 * len(CALENDAR_SPORTS)
+        assert len(counts) == 30
+
+        # A rerun (button click) with the in-memory cache gone still downloads nothing
+        espn_scoreboard.clear()
+        served = StandInHandler.requests_served
+        assert manager.get_monthly_game_counts(2024, 6) == counts
+        assert StandInHandler.requests_served == served
+        print("   ✅ Rerun served entirely from the archive's per-day counts")
+
+        assert manager.get_monthly_game_counts(2024, 6, sport_filter='hockey')['2024-06-10'] == 3
+        print("   ✅ Sport filter counts only that league")
+    finally:
+        async_scoreboard.base_url = original_base_url
+        scoreboard_archive.store = original_store
+        tmp.cleanup()
+        server.shutdown()
+        espn_scoreboard.clear()
+
+
+def test_only_today_and_future_expire():
+    """TTL policy: settled past days are permanent, today and later are short-lived"""
+
+    today = date(2024, 6, 15)
+    final = [{'status': {'type': {'completed': True}}}]
+    unsettled = [{'status': {'type': {'completed': False}}}]
+
+    assert ScoreboardArchive.ttl_for(today - timedelta(days=1), final, today) == PERMANENT_TTL
+    assert ScoreboardArchive.ttl_for(today - timedelta(days=1), unsettled, today) == UNSETTLED_PAST_TTL
+    assert ScoreboardArchive.ttl_for(today - timedelta(days=5), unsettled, today) == PERMANENT_TTL
+    assert ScoreboardArchive.ttl_for(today, final, today) == TODAY_TTL
+    assert ScoreboardArchive.ttl_for(today + timedelta(days=1), [], today) == FUTURE_TTL
+    # An empty past day is never archived for good: the download may have failed
+    assert ScoreboardArchive.ttl_for(today - timedelta(days=1), [], today) == EMPTY_PAST_TTL
+    assert ScoreboardArchive.ttl_for(today - timedelta(days=30), [], today) == EMPTY_PAST_TTL
+    print("\n   ✅ Finished days are permanent; today, future and empty past dates expire")
+
+
+def test_evening_games_counted_on_their_day():
+    """Night games whose UTC start is already the next date still count toward the scoreboard's day"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = ScoreboardArchive(store=LocalStore(db_path=os.path.join(tmp, 'store.db')))
+        final = {'type': {'completed': True}}
+        archive.put('basketball/nba', '20240614', {'events': [
+            {'id': '1', 'date': '2024-06-14T23:00Z', 'status': final},
+            {'id': '2', 'date': '2024-06-15T02:30Z', 'status': final},   # 10:30 PM Eastern on the 14th
+        ]})
+        assert archive.game_counts(['basketball/nba'], date(2024, 6, 14), date(2024, 6, 15)) == {'2024-06-14': 2}
+        print("   ✅ A 10:30 PM Eastern tip-off counts on its own day")
+
+
+if __name__ == "__main__":
+    test_past_month_is_fetched_once()
+    test_only_today_and_future_expire()
+    test_evening_games_counted_on_their_day()
+    print("\n✅ Scoreboard archive check complete!")
@@ -11,6 +11,8 @@ from datetime import datetime
 # Add the project directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from utils.http_fixtures import http_fixtures
+
 def test_analysis_speed():
     """Test the speed of AI analysis functions"""
     
@@ -181,20 +183,22 @@ def test_game_processing_speed():
         return False
 
 if __name__ == "__main__":
-    print("🚀 Starting AI Analysis Speed Tests...")
-    
-    # Test individual analysis speed
-    speed_test_success = test_analysis_speed()
-    
-    # Test game processing speed
-    processing_test_success = test_game_processing_speed()
-    
-    if speed_test_success and processing_test_success:
-        print(f"\n" + "="*60)
-        print(f"🎉 SPEED OPTIMIZATION TEST COMPLETE!")
-        print(f"✅ Individual analysis optimized")
-        print(f"✅ Game processing streamlined")
-        print(f"🚀 Users should see significantly faster picks!")
-        print(f"="*60)
-    else:
-        print(f"\n❌ Some speed tests failed")
\ No newline at end of file
+    # HTTP_FIXTURES=record:<path> captures this run; replay:<path> reruns it offline
+    with http_fixtures.from_env():
+        print("🚀 Starting AI Analysis Speed Tests...")
+    
+        # Test individual analysis speed
+        speed_test_success = test_analysis_speed()
+    
+        # Test game processing speed
+        processing_test_success = test_game_processing_speed()
+    
+        if speed_test_success and processing_test_success:
+            print(f"\n" + "="*60)
+            print(f"🎉 SPEED OPTIMIZATION TEST COMPLETE!")
+            print(f"✅ Individual analysis optimized")
+            print(f"✅ Game processing streamlined")
+            print(f"🚀 Users should see significantly faster picks!")
+            print(f"="*60)
+        else:
+            print(f"\n❌ Some speed tests failed")
\ No newline at end of file
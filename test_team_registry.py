@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Check the shared ESPN team registry: one download per league, persisted, O(1) lookups
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import utils.team_registry as team_registry_module
+from utils.team_registry import TeamRegistry
+
+NBA_TEAMS = [
+    ('13', 'Los Angeles Lakers', 'Lakers', 'Lakers', 'Los Angeles', 'LAL'),
+    ('12', 'LA Clippers', 'Clippers', 'Clippers', 'LA', 'LAC'),
+    ('2', 'Boston Celtics', 'Celtics', 'Celtics', 'Boston', 'BOS'),
+    ('25', 'Oklahoma City Thunder', 'Thunder', 'Thunder', 'Oklahoma City', 'OKC'),
+] + [(str(100 + i), f'City{i} Team{i}', f'Team{i}', f'Team{i}', f'City{i}', f'T{i:02d}') for i in range(300)]
+
+
+NCAAF_TEAMS = [
+    ('194', 'Ohio State Buckeyes', 'Ohio State', 'Buckeyes', 'Ohio State', 'OSU'),
+    ('213', 'Penn State Nittany Lions', 'Penn State', 'Nittany Lions', 'Penn State', 'PSU'),
+    ('2306', 'Kansas State Wildcats', 'Kansas St', 'Wildcats', 'Kansas State', 'KSU'),
+    ('2628', 'TCU Horned Frogs', 'TCU', 'Horned Frogs', 'TCU', 'TCU'),
+]
+
+
+class StubResponse:
+    status_code = 200
+
+    def __init__(self, teams=NBA_TEAMS):
+        self.teams = teams
+
+    def json(self):
+        return {'sports': [{'leagues': [{'teams': [
+            {'team': {'id': tid, 'displayName': display, 'shortDisplayName': short, 'name': name,
+                      'location': location, 'abbreviation': abbr}}
+            for tid, display, short, name, location, abbr in self.teams
+        ]}]}]}
+
+
+class StubSession:
+    """Stands in for the pooled ESPN session, counting /teams downloads"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return StubResponse()
+
+
+def test_registry_downloads_once_and_resolves_in_constant_time():
+    """Every name form resolves, a second process reads the file instead of ESPN"""
+
+    print("📇 Checking the ESPN team registry...")
+    print("=" * 60)
+
+    session = StubSession()
+    original = team_registry_module.espn_scoreboard.session
+    team_registry_module.espn_scoreboard.session = session
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'team_registry.json')
+            registry = TeamRegistry(path=path)
+
+            for name in ['Los Angeles Lakers', 'Lakers', 'LAL', 'LA Lakers', 'los angeles lakers']:
+                assert registry.resolve_id('NBA', name) == '13', name
+            assert registry.resolve_id('basketball/nba', 'LA Clippers') == '12'
+            assert registry.resolve_id('NBA', 'OKC Thunder') == '25'
+            assert registry.canonical_name('NBA', 'Celtics') == 'Boston Celtics'
+            assert registry.resolve_id('NBA', 'Springfield Isotopes') is None
+            assert session.calls == 1, "The league should be downloaded once"
+            print("   ✅ Display name, nickname, abbreviation and 'LA Lakers' all resolve")
+
+            start = time.perf_counter()
+            for i in range(20_000):
+                registry.resolve_id('NBA', f'Team{i % 300}')
+            elapsed = time.perf_counter() - start
+            print(f"   🚀 20,000 nickname lookups over {len(NBA_TEAMS)} teams in {elapsed * 1000:.0f}ms")
+            assert elapsed < 1.0
+
+            reloaded = TeamRegistry(path=path)
+            assert reloaded.resolve_id('NBA', 'Celtics') == '2'
+            assert session.calls == 1, "A fresh registry should load the persisted file"
+            print("   ✅ A new registry instance reads the persisted index instead of ESPN")
+
+            stale = TeamRegistry(path=path, refresh_seconds=0)
+            stale.resolve_id('NBA', 'Celtics')
+            assert session.calls == 2, "An expired league should be downloaded again"
+            print("   ✅ Expired leagues are refreshed")
+    finally:
+        team_registry_module.espn_scoreboard.session = original
+
+
+class SlowCollegeSession:
+    """NBA answers at once; the college football download takes half a second"""
+
+    def get(self, url, params=None, timeout=None):
+        if 'college-football' in url:
+            time.sleep(0.5)
+            return StubResponse(NCAAF_TEAMS)
+        return StubResponse()
+
+
+def test_shared_suffixes_and_unlocked_downloads():
+    """Suffixes several teams share resolve to nobody; a slow download doesn't block other leagues"""
+
+    original = team_registry_module.espn_scoreboard.session
+    team_registry_module.espn_scoreboard.session = SlowCollegeSession()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            registry = TeamRegistry(path=os.path.join(tmp, 'team_registry.json'))
+            assert registry.resolve_id('NBA', 'Celtics') == '2'
+
+            downloading = threading.Thread(target=registry.resolve_id, args=('NCAAF', 'Buckeyes'))
+            downloading.start()
+            time.sleep(0.05)
+            start = time.perf_counter()
+            assert registry.resolve_id('NBA', 'Lakers') == '13'
+            waited = time.perf_counter() - start
+            downloading.join()
+            assert waited < 0.2, f"NBA lookup waited {waited:.2f}s on the NCAAF download"
+            print(f"\n   ✅ NBA lookup took {waited * 1000:.0f}ms during a 500ms NCAAF download")
+
+            assert registry.resolve_id('NCAAF', 'Buckeyes') == '194'
+            assert registry.resolve_id('NCAAF', 'Nittany Lions') == '213'
+            assert registry.resolve_id('NCAAF', 'Penn State') == '213'
+            for shared in ['State', 'Texas State', 'Boise State']:
+                assert registry.resolve_id('NCAAF', shared) is None, shared
+            print("   ✅ 'State' no longer resolves to whichever State school was indexed first")
+    finally:
+        team_registry_module.espn_scoreboard.session = original
+
+
+if __name__ == "__main__":
+    test_registry_downloads_once_and_resolves_in_constant_time()
+    test_shared_suffixes_and_unlocked_downloads()
+    print("\n✅ Team registry check complete!")
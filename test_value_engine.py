@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Value engine: EV, edge and Kelly over a 300-game, 20-book slate against the model's probabilities
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+
+import numpy as np
+
+# Add the project directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import utils.elo_ratings as elo_ratings_module
+from utils.elo_ratings import EloRatingStore
+from utils.odds_engine import decimal_to_american
+from utils.reliability_curves import ReliabilityCurveCalibrator
+from utils.value_engine import MAX_KELLY_STAKE, ValueBetEngine, kelly_stake, normal_cdf
+
+SPORTS = {'NBA': ('basketball_nba', 224.5), 'NFL': ('americanfootball_nfl', 44.5),
+          'MLB': ('baseball_mlb', 8.5), 'NHL': ('icehockey_nhl', 6.5)}
+BOOKS = [f"book{i}" for i in range(20)]
+VIG = 1.045
+
+
+def vig_price(probability):
+    """American price for a probability with the book's margin on top"""
+    return float(np.round(decimal_to_american(1.0 / (probability * VIG))))
+
+
+def make_slate(engine, num_games=300, seed=11):
+    """ESPN-style games and Odds API events whose every price is fair-plus-vig against the engine's model"""
+    rng = random.Random(seed)
+    games = []
+    for i in range(num_games):
+        sport = list(SPORTS)[i % len(SPORTS)]
+        games.append({'sport': sport, 'home_team': {'name': f"{sport} Home {i}"}, 'away_team': {'name': f"{sport} Away {i}"},
+                      'game_id': f"g{i}"})
+    home_prob = engine.model_probabilities(games)['home']
+
+    events = []
+    for game, p in zip(games, home_prob):
+        sport_key, total = SPORTS[game['sport']]
+        home, away = game['home_team']['name'], game['away_team']['name']
+        bookmakers = []
+        for book in BOOKS:
+            shade = rng.choice([-0.01, 0.0, 0.01])
+            bookmakers.append({'key': book, 'title': book.title(), 'markets': [
+                {'key': 'h2h', 'outcomes': [{'name': home, 'price': vig_price(p + shade)},
+                                            {'name': away, 'price': vig_price(1 - p - shade)}]},
+                {'key': 'totals', 'outcomes': [{'name': 'Over', 'price': -110, 'point': total},
+                                               {'name': 'Under', 'price': -110, 'point': total}]},
+            ]})
+        events.append({'id': game['game_id'], 'sport_key': sport_key, 'home_team': home, 'away_team': away,
+                       'commence_time': '2024-11-05T23:00:00Z', 'bookmakers': bookmakers})
+    return games, events, home_prob
+
+
+def test_slate_scoring_speed():
+    """Whole-slate EV scoring well under a second, surfacing exactly the planted mispricings"""
+
+    print("💰 Scoring a 300-game, 20-book slate...")
+    print("=" * 60)
+
+    engine = ValueBetEngine()
+    games, events, home_prob = make_slate(engine)
+
+    # A stale NFL home moneyline at one book, and an NBA total hung 12 points off the market at another
+    stale = events[17]
+    stale['bookmakers'][4]['markets'][0]['outcomes'][0]['price'] = vig_price(home_prob[17] * 0.75)
+    off_market = events[40]
+    off_market['bookmakers'][9]['markets'][1]['outcomes'][0]['point'] = 212.5
+
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        bets = engine.top_bets(games, events, top_k=10)
+        timings.append(time.perf_counter() - start)
+    print(f"   ⚡ Scored {len(games)} games x {len(BOOKS)} books in {min(timings) * 1000:.1f}ms "
+          f"(median {sorted(timings)[2] * 1000:.1f}ms)")
+    for bet in bets:
+        print(f"   🎯 {bet['selection']} {bet['price']} @ {bet['book']}: EV {bet['expected_value']:+.1%}, "
+              f"edge {bet['edge']:+.1%}, Kelly {bet['kelly_stake']:.2%}")
+
+    assert max(timings) < 1.0
+    assert [bet['game_index'] for bet in bets] == [40, 17] or [bet['game_index'] for bet in bets] == [17, 40]
+    by_game = {bet['game_index']: bet for bet in bets}
+    assert by_game[17]['selection'] == 'NFL Home 17 ML' and by_game[17]['book'] == 'Book4'
+    assert by_game[40]['selection'] == 'Over 212.5' and by_game[40]['book'] == 'Book9'
+    assert by_game[40]['books_quoting'] == len(BOOKS)
+    assert bets[0]['expected_value'] >= bets[1]['expected_value']
+    for bet in bets:
+        assert bet['edge'] > 0 and 0 < bet['kelly_stake'] <= MAX_KELLY_STAKE
+        assert abs(bet['win_prob'] * bet['decimal'] - 1 - bet['expected_value']) < 1e-9
+
+
+def test_ai_consensus_blend():
+    """A calibrated AI pick moves the model probability; unmatched picks and missing analyses leave the baseline"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = ValueBetEngine(calibrator=ReliabilityCurveCalibrator(artifact_path=os.path.join(tmp, 'curve.json')))
+        games = [{'sport': 'NBA', 'home_team': {'name': 'Boston Celtics'}, 'away_team': {'name': 'Miami Heat'}}
+                 for _ in range(4)]
+        analyses = [
+            None,
+            {'pick': 'Miami Heat', 'confidence': 0.70, 'confidence_calibration': {'calibrated_confidence': 0.70}},
+            {'pick': 'Celtics', 'confidence': 0.80},
+            {'pick': 'Denver Nuggets', 'confidence': 0.90},
+        ]
+        model = engine.model_probabilities(games, analyses)
+
+    quant = model['quant'][0]
+    assert np.isnan(model['ai'][0]) and model['home'][0] == quant
+    assert abs(model['home'][1] - (0.5 * quant + 0.5 * 0.30)) < 1e-12
+    # Uncalibrated confidence goes through the reliability curve and comes out shrunk
+    assert 0.5 < model['ai'][2] < 0.80 and model['home'][2] > quant
+    assert np.isnan(model['ai'][3])
+    print(f"\n   ✅ Baseline {quant:.1%}, with AI fade {model['home'][1]:.1%}, with AI backing {model['home'][2]:.1%}")
+
+    # Pricing helpers
+    assert abs(normal_cdf(0.0) - 0.5) < 1e-9 and abs(normal_cdf(1.96) - 0.975) < 1e-4
+    assert kelly_stake(0.5, 1.9) == 0.0 and kelly_stake(0.7, 2.0) == MAX_KELLY_STAKE
+
+
+def lopsided_slate():
+    """Two heavy favourites at -600/+450 across five books"""
+    games, events = [], []
+    for i, (sport, sport_key, home, away) in enumerate([('NFL', 'americanfootball_nfl', 'Kansas City Chiefs', 'Carolina Panthers'),
+                                                        ('NBA', 'basketball_nba', 'Boston Celtics', 'Detroit Pistons')]):
+        games.append({'sport': sport, 'home_team': {'name': home}, 'away_team': {'name': away}, 'game_id': f"g{i}"})
+        bookmakers = [{'key': book, 'title': book.title(), 'markets': [
+            {'key': 'h2h', 'outcomes': [{'name': home, 'price': -600 - 10 * b}, {'name': away, 'price': 450 - 5 * b}]}]}
+            for b, book in enumerate(BOOKS[:5])]
+        events.append({'id': f"g{i}", 'sport_key': sport_key, 'home_team': home, 'away_team': away,
+                       'commence_time': '2024-11-05T23:00:00Z', 'bookmakers': bookmakers})
+    return games, events
+
+
+def test_uninformed_model_defers_to_market():
+    """With no rating history the baseline is the no-vig consensus, so a lopsided line offers no longshot value"""
+
+    original_ratings = elo_ratings_module.elo_ratings
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            elo_ratings_module.elo_ratings = EloRatingStore(path=os.path.join(tmp, 'elo.npz'))
+            engine = ValueBetEngine()
+            games, events = lopsided_slate()
+
+            assert engine.top_bets(games, events) == []
+            model = engine.model_probabilities(games, market_home=[0.84, 0.84])
+            assert np.all(model['trust'] == 0.0) and np.allclose(model['home'], 0.84)
+            assert model['quant'].max() < 0.7, "The uninformed baseline sits near a coin flip"
+            print(f"\n   ✅ No rating history: baseline {model['quant'][0]:.0%} deferred to the market, no bets on -600/+450")
+
+            # Once both teams have played a full history on even terms, the model's own view counts again
+            for game in games:
+                home, away = game['home_team']['name'], game['away_team']['name']
+                for n in range(20):
+                    winner, loser = (home, away) if n % 2 else (away, home)
+                    elo_ratings_module.elo_ratings.update(game['sport'], winner, loser, 3, 2, game_id=f"{home}{n}")
+            bets = engine.top_bets(games, events)
+            assert {bet['selection'] for bet in bets} == {'Carolina Panthers ML', 'Detroit Pistons ML'}
+            assert all(bet['market_home_prob'] > 0.8 for bet in bets)
+        finally:
+            elo_ratings_module.elo_ratings = original_ratings
+
+
+if __name__ == "__main__":
+    test_slate_scoring_speed()
+    test_ai_consensus_blend()
+    test_uninformed_model_defers_to_market()
+    print("\n✅ Value engine checks complete!")
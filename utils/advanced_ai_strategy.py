@@ -7,6 +7,9 @@ import requests
 import json
 import time
 
+from utils.odds_history import describe_movement, movement_signal
+from utils.odds_ingestion import odds_ingestion
+
 class AdvancedAIStrategy:
     """
     Advanced AI Strategy for High-Accuracy Sports Predictions
@@ -205,18 +208,13 @@ class AdvancedAIStrategy:
             return "Indoor venue - Weather not a factor"
 
     def _get_line_movement(self, game_data: Dict) -> str:
-        """Track betting line movements"""
-        import random
-        
-        movements = [
-            "Line moved 1.5 points toward home team - Sharp money detected",
-            "Total moved from 45.5 to 47 - Public hammering Over",
-            "Moneyline tightened - Respected money on underdog",
-            "No significant line movement - Market consensus",
-            "Reverse line movement - Fade the public opportunity"
-        ]
-        
-        return random.choice(movements)
+        """Track betting line movements (from the recorded odds history)"""
+        summary = odds_ingestion.line_movement(game_data)
+        description = describe_movement(summary, game_data.get('home_team', {}).get('name', 'home'))
+        signal = movement_signal(summary)
+        if signal['steam']:
+            description += " - Steam move in the last hour"
+        return description
 
     def _get_news_sentiment(self, game_data: Dict) -> str:
         """Analyze recent news sentiment"""
@@ -258,7 +256,7 @@ class AdvancedAIStrategy:
         return sum(weighted_scores) / total_weight
 
     def apply_kelly_criterion(self, prediction: Dict, odds: float = None) -> Dict:
-        """Apply Kelly Criterion for optimal bet sizing"""
+        """Apply Kelly Criterion for optimal bet sizing of a single bet (a day's picks are staked together by kelly_portfolio)"""
         confidence = prediction.get('confidence', 0.5)
         
         if not odds:
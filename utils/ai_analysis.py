@@ -5,6 +5,8 @@ from datetime import datetime, date
 from typing import Dict, List, Optional
 import pandas as pd
 import streamlit as st
+from utils.analysis_scheduler import analysis_scheduler
+from utils.llm_response_cache import llm_response_cache
 
 # OpenAI integration
 from openai import OpenAI
@@ -136,6 +138,14 @@ class AIGameAnalyzer:
             }}
             """
             
+            # Shared on-disk cache: identical prompts are served across sessions and restarts
+            cached = llm_response_cache.get('openai', 'gpt-4o', prompt)
+            if cached is not None:
+                return cached
+            # Only a cache miss spends OpenAI rate limit budget
+            if not analysis_scheduler.acquire('openai'):
+                return {"error": "openai rate limit wait exceeded", "ai_source": "OpenAI GPT-4o"}
+            
             # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
             # do not change this unless explicitly requested by the user
             response = self.openai_client.chat.completions.create(
@@ -152,6 +162,8 @@ class AIGameAnalyzer:
             if content:
                 result = json.loads(content)
                 result['ai_source'] = 'OpenAI GPT-4o'
+                llm_response_cache.set('openai', 'gpt-4o', prompt, result,
+                                       ttl_seconds=llm_response_cache.ttl_for_game(game_data), max_output_tokens=1000)
                 return result
             else:
                 return {"error": "Empty response from OpenAI", "ai_source": "OpenAI GPT-4o"}
@@ -193,6 +205,11 @@ class AIGameAnalyzer:
             
             if not GENAI_AVAILABLE:
                 return {"error": "Gemini SDK not available"}
+            cached = llm_response_cache.get('gemini', 'gemini-2.5-pro', prompt)
+            if cached is not None:
+                return cached
+            if not analysis_scheduler.acquire('gemini'):
+                return {"error": "gemini rate limit wait exceeded", "ai_source": "Google Gemini"}
             model = genai.GenerativeModel(model_name="gemini-2.5-pro", system_instruction="You are an expert sports analyst specializing in game predictions and team analysis.")
             response = model.generate_content(prompt)
             
@@ -200,6 +217,8 @@ class AIGameAnalyzer:
             if response_text:
                 result = json.loads(response_text)
                 result['ai_source'] = 'Google Gemini'
+                llm_response_cache.set('gemini', 'gemini-2.5-pro', prompt, result,
+                                       ttl_seconds=llm_response_cache.ttl_for_game(game_data))
                 return result
             else:
                 return {"error": "Empty response from Gemini", "ai_source": "Google Gemini"}
@@ -234,6 +253,12 @@ class AIGameAnalyzer:
                 "}"
             )
 
+            cached = llm_response_cache.get('claude', 'claude-3.5-sonnet-20240620', prompt)
+            if cached is not None:
+                return cached
+            if not analysis_scheduler.acquire('claude'):
+                return {"error": "claude rate limit wait exceeded", "ai_source": "Claude"}
+
             msg = self.claude_client.messages.create(
                 model="claude-3.5-sonnet-20240620",
                 max_tokens=700,
@@ -253,6 +278,8 @@ class AIGameAnalyzer:
                     result = {"error": "Claude returned non-JSON"}
                 if 'error' not in result:
                     result['ai_source'] = 'Claude 3.5 Sonnet'
+                    llm_response_cache.set('claude', 'claude-3.5-sonnet-20240620', prompt, result,
+                                           ttl_seconds=llm_response_cache.ttl_for_game(game_data), max_output_tokens=700)
                 return result
             return {"error": "Empty response from Claude", "ai_source": "Claude"}
         except Exception as e:
@@ -348,13 +375,20 @@ class AIGameAnalyzer:
             
             if not GENAI_AVAILABLE:
                 return {"error": "Gemini SDK not available"}
+            cached = llm_response_cache.get('gemini', 'gemini-2.5-flash', prompt)
+            if cached is not None:
+                return cached
+            if not analysis_scheduler.acquire('gemini'):
+                return {"error": "gemini rate limit wait exceeded", "ai_source": "Gemini"}
             model = genai.GenerativeModel(model_name="gemini-2.5-flash")
             response = model.generate_content(prompt)
             
             response_text = response.text if response.text else ""
             if response_text:
                 # Parse response (may not be perfect JSON)
-                return {"suggestions": response_text, "ai_source": "Gemini"}
+                result = {"suggestions": response_text, "ai_source": "Gemini"}
+                llm_response_cache.set('gemini', 'gemini-2.5-flash', prompt, result)
+                return result
             else:
                 return {"suggestions": "No specific suggestions available", "ai_source": "Gemini"}
                 
@@ -0,0 +1,196 @@
+"""
+Analysis Scheduler - Parallel multi-game LLM analysis with per-provider rate limits
+Fans provider calls out concurrently and throttles each provider with token buckets
+"""
+
+import os
+import threading
+import time
+import concurrent.futures
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Per-provider limits (requests/min, tokens/min) and the token estimate used per call
+DEFAULT_PROVIDER_LIMITS = {
+    'openai': {'requests_per_minute': 500, 'tokens_per_minute': 200000, 'estimated_tokens': 2000},
+    'gemini': {'requests_per_minute': 300, 'tokens_per_minute': 1000000, 'estimated_tokens': 1500},
+    'claude': {'requests_per_minute': 50, 'tokens_per_minute': 40000, 'estimated_tokens': 1500},
+}
+
+
+class TokenBucket:
+    """Token bucket that refills continuously up to its capacity (callers hold the lock)"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_per_second)
+        self.last_refill = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they already are)"""
+        amount = min(float(amount), self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def take(self, amount: float):
+        self.tokens -= min(float(amount), self.capacity)
+
+
+class ProviderRateLimiter:
+    """Requests/min and tokens/min limits for a single LLM provider"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, estimated_tokens: int = 1000):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self.estimated_tokens = estimated_tokens
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """Block until both a request slot and the token budget are available"""
+        tokens = tokens or self.estimated_tokens
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            # Both buckets are checked and charged together so a call never holds one while starving on the other
+            with self._lock:
+                self.requests.refill()
+                self.tokens.refill()
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if wait == 0.0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return True
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(min(wait, 1.0))
+
+
+class AnalysisScheduler:
+    """
+    Runs a slate of game analyses concurrently.
+
+    Games are spread over a bounded worker pool, each game's provider calls
+    (OpenAI, Gemini, Claude) run at the same time on a separate pool, and every
+    provider request passes through that provider's rate limiter. The limit is
+    charged by the provider function itself, through acquire(), once the LLM
+    response cache has missed, so cached responses never spend provider budget.
+    """
+
+    def __init__(self, max_game_workers: Optional[int] = None, max_provider_workers: Optional[int] = None,
+                 provider_limits: Optional[Dict[str, Dict]] = None):
+        self.max_game_workers = max_game_workers or int(os.environ.get('ANALYSIS_MAX_GAME_WORKERS', 16))
+        self.max_provider_workers = max_provider_workers or self.max_game_workers * 3
+
+        limits = dict(DEFAULT_PROVIDER_LIMITS)
+        limits.update(provider_limits or {})
+        self.limiters = {name: ProviderRateLimiter(**config) for name, config in limits.items()}
+
+        self._provider_pool = None
+        self._pool_lock = threading.Lock()
+        # (provider, tokens, timeout) of the call_provider running on this thread
+        self._current = threading.local()
+        self.stats = {'games': 0, 'provider_calls': 0, 'provider_errors': 0, 'rate_limited': 0}
+
+    def _get_provider_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._provider_pool is None:
+                self._provider_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_provider_workers, thread_name_prefix='llm-provider'
+                )
+            return self._provider_pool
+
+    def acquire(self, provider: str, tokens: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a provider's rate limit; unknown providers are not throttled.
+        Inside call_provider, tokens and timeout default to that call's.
+        """
+        limiter = self.limiters.get(provider)
+        if limiter is None:
+            return True
+        current = getattr(self._current, 'call', None)
+        if current is not None and current[0] == provider:
+            tokens = tokens if tokens is not None else current[1]
+            timeout = timeout if timeout is not None else current[2]
+        acquired = limiter.acquire(tokens, timeout=timeout)
+        if not acquired:
+            self.stats['rate_limited'] += 1
+        return acquired
+
+    def call_provider(self, provider: str, func: Callable[[], Dict], tokens: Optional[int] = None,
+                      timeout: Optional[float] = None) -> Dict:
+        """
+        Run one provider call, turning failures into error dicts. `func` calls
+        acquire(provider) right before its network request (after a cache
+        miss), which waits with this call's `tokens` and `timeout`.
+        """
+        self.stats['provider_calls'] += 1
+        self._current.call = (provider, tokens, timeout)
+        try:
+            return func()
+        except Exception as e:
+            self.stats['provider_errors'] += 1
+            return {'error': f'{provider} analysis failed: {str(e)}'}
+        finally:
+            self._current.call = None
+
+    def run_providers(self, provider_calls: Dict[str, Callable[[], Dict]], timeout: float = 45,
+                      tokens: Optional[Dict[str, int]] = None) -> Dict[str, Dict]:
+        """Run all provider calls for one game concurrently and collect their results"""
+        tokens = tokens or {}
+        pool = self._get_provider_pool()
+        futures = {
+            name: pool.submit(self.call_provider, name, func, tokens.get(name), timeout)
+            for name, func in provider_calls.items()
+        }
+
+        results = {}
+        deadline = time.monotonic() + timeout
+        for name, future in futures.items():
+            try:
+                results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except concurrent.futures.TimeoutError:
+                results[name] = {'error': f'{name} timed out after {timeout:.0f}s'}
+            except Exception as e:
+                results[name] = {'error': f'{name} analysis failed: {str(e)}'}
+        return results
+
+    def analyze_slate(self, games: List[Dict], analyze_fn: Callable[[Dict], Any],
+                      timeout: float = 90) -> Iterator[Tuple[Dict, Any]]:
+        """
+        Analyze every game concurrently, yielding (game, result) as each finishes.
+
+        Games still running when the overall timeout expires are yielded with a
+        None result so callers can keep their progress accounting simple.
+        """
+        if not games:
+            return
+
+        workers = max(1, min(self.max_game_workers, len(games)))
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='slate-game')
+        future_to_game = {executor.submit(analyze_fn, game): game for game in games}
+        self.stats['games'] += len(games)
+
+        try:
+            for future in concurrent.futures.as_completed(future_to_game, timeout=timeout):
+                game = future_to_game.pop(future)
+                try:
+                    yield game, future.result()
+                except Exception:
+                    yield game, None
+        except concurrent.futures.TimeoutError:
+            for future, game in list(future_to_game.items()):
+                future.cancel()
+                yield game, None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global scheduler shared by all analysis entry points
+analysis_scheduler = AnalysisScheduler()
@@ -0,0 +1,174 @@
+"""
+Async Scoreboard - Concurrent ESPN scoreboard fetches across many leagues and dates
+Issues every (league, date) request at once under a concurrency cap
+"""
+
+import asyncio
+import os
+import concurrent.futures
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    # Falls back to the pooled requests session on worker threads
+
+from utils.espn_scoreboard import ESPN_BASE_URL, espn_scoreboard
+from utils.http_fixtures import http_fixtures
+
+ScoreboardKey = Tuple[str, Optional[str]]
+
+
+class AsyncScoreboardFetcher:
+    """
+    Fetches many ESPN scoreboards concurrently.
+
+    Each request is keyed by (league path, YYYYMMDD date or None for the
+    current scoreboard). Responses the shared scoreboard client fetched in the
+    last few seconds are reused, and everything fetched here is handed back to
+    that client, so sequential code later in the same render hits its cache.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: float = 15, base_url: str = ESPN_BASE_URL):
+        self.max_concurrency = max_concurrency or int(os.environ.get('ESPN_MAX_CONCURRENCY', 16))
+        self.timeout = timeout
+        self.base_url = base_url
+        self.stats = {'requests': 0, 'cached': 0, 'errors': 0}
+
+    @staticmethod
+    def make_key(path: str, target_date=None) -> ScoreboardKey:
+        return path.strip('/'), espn_scoreboard.normalize_date(target_date)
+
+    def fetch(self, keys: Iterable[ScoreboardKey]) -> Dict[ScoreboardKey, Optional[Dict]]:
+        """Fetch every (path, date) scoreboard concurrently; failed requests map to None"""
+        keys = list(dict.fromkeys(self.make_key(path, target_date) for path, target_date in keys))
+        results: Dict[ScoreboardKey, Optional[Dict]] = {}
+        missing = []
+        for key in keys:
+            cached = espn_scoreboard.peek(*key)
+            if cached is not None:
+                self.stats['cached'] += 1
+                results[key] = cached
+            else:
+                missing.append(key)
+
+        if missing:
+            fetched = self._run(self.fetch_async(missing))
+            for key, data in fetched.items():
+                espn_scoreboard.prime(key[0], key[1], data)
+            results.update(fetched)
+        return results
+
+    def _run(self, coroutine):
+        """Run a coroutine to completion from synchronous code (Streamlit scripts have no loop)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # Already inside an event loop: run ours on a worker thread instead
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coroutine).result()
+
+    async def fetch_async(self, keys: Sequence[ScoreboardKey]) -> Dict[ScoreboardKey, Optional[Dict]]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Recorded/replayed runs must go through the shared requests sessions the fixtures are mounted on
+        if AIOHTTP_AVAILABLE and not http_fixtures.active:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers=dict(espn_scoreboard.session.headers)) as session:
+                responses = await asyncio.gather(*(self._fetch_one(session, semaphore, key) for key in keys))
+        else:
+            responses = await asyncio.gather(*(self._fetch_one(None, semaphore, key) for key in keys))
+        return dict(zip(keys, responses))
+
+    async def _fetch_one(self, session, semaphore: asyncio.Semaphore, key: ScoreboardKey) -> Optional[Dict]:
+        path, date_param = key
+        url = f"{self.base_url}/{path}/scoreboard"
+        params = {'dates': date_param} if date_param else None
+
+        async with semaphore:
+            self.stats['requests'] += 1
+            try:
+                if session is None:
+                    return await asyncio.to_thread(self._fetch_blocking, url, params)
+                async with session.get(url, params=params) as response:
+                    if response.status != 200:
+                        self.stats['errors'] += 1
+                        return None
+                    return await response.json(content_type=None)
+            except Exception:
+                self.stats['errors'] += 1
+                return None
+
+    def _fetch_blocking(self, url: str, params: Optional[Dict]) -> Optional[Dict]:
+        response = espn_scoreboard.session.get(url, params=params, timeout=self.timeout)
+        if response.status_code != 200:
+            self.stats['errors'] += 1
+            return None
+        return response.json()
+
+    def fetch_games(self, leagues: Sequence[Tuple[str, str]], dates: Sequence[Union[date, datetime, str]],
+                    parse_event: Callable[[Dict, str, str], Optional[Dict]],
+                    match_dates: Optional[Iterable[Union[date, datetime, str]]] = None,
+                    fallback_to_current: bool = True) -> pd.DataFrame:
+        """
+        Games for every (sport, league) on the given dates as one de-duplicated DataFrame.
+
+        Each event is parsed with `parse_event(event, sport, league)` and kept
+        when its 'date' falls in `match_dates` (default: `dates`). With
+        `fallback_to_current`, leagues with no dated games fall back to the
+        current scoreboard, which is fetched in the same concurrent round.
+        """
+        wanted = {self._iso_date(d) for d in (match_dates if match_dates is not None else dates)}
+        date_params = [espn_scoreboard.normalize_date(d) for d in dates]
+        if fallback_to_current:
+            date_params.append(None)
+        responses = self.fetch((f"{sport}/{league}", d) for sport, league in leagues for d in date_params)
+
+        games: List[Dict] = []
+        for sport, league in leagues:
+            path = f"{sport}/{league}"
+            league_games = self._matching_games(responses, path, date_params[:len(dates)], sport, league,
+                                                parse_event, wanted)
+            if not league_games and fallback_to_current:
+                league_games = self._matching_games(responses, path, [None], sport, league, parse_event, wanted)
+            games.extend(league_games)
+
+        if not games:
+            return pd.DataFrame()
+        frame = pd.DataFrame(games)
+        subset = ['game_id'] if 'game_id' in frame.columns else ['game_name', 'date']
+        return frame.drop_duplicates(subset=subset, keep='first').reset_index(drop=True)
+
+    @staticmethod
+    def _matching_games(responses: Dict[ScoreboardKey, Optional[Dict]], path: str, date_params: List[Optional[str]],
+                        sport: str, league: str, parse_event: Callable, wanted: set) -> List[Dict]:
+        games = []
+        for date_param in date_params:
+            for event in (responses.get((path, date_param)) or {}).get('events', []):
+                game = parse_event(event, sport, league)
+                if game and str(game.get('date', ''))[:10] in wanted:
+                    games.append(game)
+        return games
+
+    @staticmethod
+    def _iso_date(value) -> str:
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+        value = str(value)
+        if len(value) == 8 and value.isdigit():
+            return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+        return value[:10]
+
+
+# Global async fetcher shared by the schedule and calendar views
+async_scoreboard = AsyncScoreboardFetcher()
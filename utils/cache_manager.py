@@ -155,20 +155,15 @@ class OptimizedDataLoader:
         
         # Load fresh odds
         from utils.odds_api import OddsAPIManager
+        from utils.odds_ingestion import odds_ingestion
         odds_manager = OddsAPIManager()
         
         try:
             if sport_keys:
                 # Load specific sports only
-                all_odds = []
-                for sport_key in sport_keys:
-                    odds_data = odds_manager.get_odds_for_sport(sport_key)
-                    for game in odds_data:
-                        # Process game data
-                        processed_game = self._process_odds_game(game, sport_key)
-                        all_odds.append(processed_game)
-                
-                odds_df = pd.DataFrame(all_odds) if all_odds else pd.DataFrame()
+                # One concurrent refresh for every requested sport, then one scan of the index
+                odds_ingestion.ensure_fresh(sport_keys, api_key=odds_manager.api_key)
+                odds_df = odds_manager.build_odds_frame(sport_keys)
             else:
                 # Load comprehensive odds
                 odds_df = odds_manager.get_comprehensive_odds()
@@ -180,45 +175,6 @@ class OptimizedDataLoader:
         except Exception as e:
             st.error(f"Error loading odds: {str(e)}")
             return pd.DataFrame()
-    
-    def _process_odds_game(self, game: Dict, sport_key: str) -> Dict:
-        """Process individual odds game data"""
-        from utils.odds_api import OddsAPIManager
-        odds_manager = OddsAPIManager()
-        
-        home_team = game.get('home_team', 'Unknown')
-        away_team = game.get('away_team', 'Unknown')
-        commence_time = game.get('commence_time', '')
-        
-        # Parse commence time
-        game_date = 'TBD'
-        game_time = 'TBD'
-        
-        if commence_time:
-            try:
-                dt = datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
-                game_date = dt.strftime('%Y-%m-%d')
-                game_time = dt.strftime('%I:%M %p ET')
-            except:
-                pass
-        
-        # Get best odds
-        best_odds = odds_manager.extract_best_odds(game.get('bookmakers', []))
-        
-        return {
-            'game_id': game.get('id', ''),
-            'sport': odds_manager.sports_mapping.get(sport_key, sport_key),
-            'home_team': home_team,
-            'away_team': away_team,
-            'game_name': f"{away_team} @ {home_team}",
-            'date': game_date,
-            'time': game_time,
-            'commence_time': commence_time,
-            'home_odds': best_odds.get('home_odds', 'N/A'),
-            'away_odds': best_odds.get('away_odds', 'N/A'),
-            'best_bookmaker': best_odds.get('bookmaker', 'N/A'),
-            'source': 'The Odds API'
-        }
 
 class BatchAnalysisManager:
     """Manage batch analysis operations efficiently"""
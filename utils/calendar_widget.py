@@ -38,17 +38,13 @@ class SportsCalendarWidget:
                 st.session_state['calendar_date'] = new_date
                 st.rerun()
         
-        # Get monthly games data
-        monthly_games = self.games_manager.get_monthly_calendar_games(
+        # Games count by date, read from the scoreboard archive's per-day counts
+        # (finished days are never downloaded again, so reruns don't refetch the month)
+        games_by_date = self.games_manager.get_monthly_game_counts(
             selected_date.year, 
             selected_date.month
         )
         
-        # Create games count by date
-        games_by_date = {}
-        if len(monthly_games) > 0:
-            games_by_date = monthly_games.groupby('date').size().to_dict()
-        
         # Generate calendar grid
         cal = calendar.monthcalendar(selected_date.year, selected_date.month)
         
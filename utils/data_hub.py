@@ -7,6 +7,8 @@ from typing import Dict, Any
 from datetime import datetime
 import hashlib
 
+from utils.elo_ratings import elo_ratings
+
 def get_game_features(game: Dict[str, Any]) -> Dict[str, Any]:
     """Aggregate multi-sport features for baseline modeling.
     This is a lightweight hub designed to be extended. It returns a
@@ -28,9 +30,9 @@ def get_game_features(game: Dict[str, Any]) -> Dict[str, Any]:
         "away_team": away,
         "game_time_utc": game_dt.isoformat(),
         
-        # Team quality priors (placeholder Elo-like ratings 1400–1700, deterministic by name)
-        "home_rating": _name_seed_rating(home),
-        "away_rating": _name_seed_rating(away),
+        # Team quality priors (Elo ratings learned from final scores, 1500 = average)
+        "home_rating": _team_rating(home, sport),
+        "away_rating": _team_rating(away, sport),
         
         # Home field advantage (sport-specific)
         "home_edge": _get_home_advantage(sport),
@@ -73,15 +75,11 @@ def _safe_team_name(team_obj) -> str:
     else:
         return "Unknown"
 
-def _name_seed_rating(team_name: str) -> float:
-    """Generate deterministic rating based on team name (1400-1700 range)"""
+def _team_rating(team_name: str, sport: str) -> float:
+    """Current Elo rating for a team (1500 until it has played)"""
     if not team_name or team_name == "Unknown":
         return 1500.0
-    
-    # Use hash for deterministic but varied ratings
-    hash_val = int(hashlib.md5(team_name.encode()).hexdigest()[:8], 16)
-    normalized = (hash_val % 300) + 1400  # Range 1400-1700
-    return float(normalized)
+    return elo_ratings.get_rating(sport, team_name)
 
 def _get_home_advantage(sport: str) -> float:
     """Get sport-specific home field advantage"""
@@ -1,10 +1,17 @@
+import hashlib
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+# Columns the team-game index is built from, and so the ones its cache key covers
+INDEX_COLUMNS = ['date', 'team1', 'team2', 'team1_score', 'team2_score']
+
 class DataProcessor:
     def __init__(self):
-        pass
+        # Team-game index for the most recently processed frame, keyed by that frame's content
+        self._index_key = None
+        self._team_index = None
     
     def process_data(self, data, date_range=None, selected_sports=None):
         """Process and clean the uploaded data"""
@@ -42,7 +49,7 @@ class DataProcessor:
             processed_data['team2'] = processed_data['team2'].str.strip().str.title()
             
             # Add derived columns
-            processed_data['winner'] = processed_data.apply(self._determine_winner, axis=1)
+            processed_data['winner'] = self._determine_winners(processed_data)
             processed_data['total_score'] = processed_data['team1_score'] + processed_data['team2_score']
             processed_data['score_difference'] = abs(processed_data['team1_score'] - processed_data['team2_score'])
             processed_data['month'] = processed_data['date'].dt.month
@@ -52,39 +59,115 @@ class DataProcessor:
             # Sort by date
             processed_data = processed_data.sort_values('date')
             
+            # Build the team-game table once so per-team lookups don't rescan the data
+            self._build_team_index(processed_data)
+            
             return processed_data
             
         except Exception as e:
             print(f"Error processing data: {str(e)}")
             return data  # Return original data if processing fails
     
-    def _determine_winner(self, row):
-        """Determine the winner of a match"""
-        if row['team1_score'] > row['team2_score']:
-            return row['team1']
-        elif row['team1_score'] < row['team2_score']:
-            return row['team2']
-        else:
-            return 'Draw'
+    def _determine_winners(self, data):
+        """Vectorized _determine_winner for every row"""
+        score1 = data['team1_score'].to_numpy()
+        score2 = data['team2_score'].to_numpy()
+        return np.select(
+            [score1 > score2, score1 < score2],
+            [data['team1'].to_numpy(), data['team2'].to_numpy()],
+            default='Draw'
+        )
+    
+    @staticmethod
+    def _content_key(data):
+        """Cache key for a frame's team-game index: its shape and a hash of the indexed columns, row order included"""
+        hashed = pd.util.hash_pandas_object(data[INDEX_COLUMNS], index=True).to_numpy()
+        return len(data), tuple(data.columns), hashlib.sha1(hashed.tobytes()).hexdigest()
+    
+    def _build_team_index(self, data, key=None):
+        """
+        Build the long-format team-game table and per-team aggregates for data.
+        
+        Every match appears twice, once from each team's side. Team totals come
+        from a single grouped aggregation, each team's games are a contiguous
+        slice ordered by date, and head-to-head matches are indexed by pair.
+        """
+        n = len(data)
+        team1 = data['team1'].to_numpy()
+        team2 = data['team2'].to_numpy()
+        score1 = data['team1_score'].to_numpy(dtype=float)
+        score2 = data['team2_score'].to_numpy(dtype=float)
+        rows = np.arange(n)
+        
+        team_games = pd.DataFrame({
+            'team': np.concatenate([team1, team2]),
+            'opponent': np.concatenate([team2, team1]),
+            'team_score': np.concatenate([score1, score2]),
+            'opponent_score': np.concatenate([score2, score1]),
+            'is_home': np.concatenate([np.ones(n, dtype=bool), np.zeros(n, dtype=bool)]),
+            'row': np.concatenate([rows, rows]),
+        })
+        team_games['win'] = team_games['team_score'] > team_games['opponent_score']
+        team_games['loss'] = team_games['team_score'] < team_games['opponent_score']
+        team_games['draw'] = team_games['team_score'] == team_games['opponent_score']
+        
+        # Per team, oldest to newest; ties on date put later rows first so a
+        # reversed tail matches a stable newest-first sort
+        team_codes, team_names = pd.factorize(team_games['team'], sort=True)
+        date_codes = pd.factorize(np.concatenate([data['date'].to_numpy()] * 2), sort=True)[0]
+        order = np.lexsort((-team_games['row'].to_numpy(), date_codes, team_codes))
+        team_games = team_games.iloc[order].reset_index(drop=True)
+        team_codes = team_codes[order]
+        
+        bounds = np.searchsorted(team_codes, np.arange(len(team_names) + 1))
+        slices = {team: (bounds[i], bounds[i + 1]) for i, team in enumerate(team_names)}
+        
+        home = team_games['is_home']
+        totals = pd.DataFrame({
+            'total_games': 1,
+            'wins': team_games['win'],
+            'losses': team_games['loss'],
+            'draws': team_games['draw'],
+            'points_scored': team_games['team_score'],
+            'points_conceded': team_games['opponent_score'],
+            'home_games': home,
+            'away_games': ~home,
+            'home_wins': team_games['win'] & home,
+            'away_wins': team_games['win'] & ~home,
+        }).groupby(team_games['team'], sort=False).sum()
+        
+        # Head-to-head: original row positions of every match, keyed by the unordered pair
+        pair_low = np.where(team1 <= team2, team1, team2)
+        pair_high = np.where(team1 <= team2, team2, team1)
+        pairs = pd.Series(rows).groupby([pair_low, pair_high], sort=False).indices if n else {}
+        
+        self._index_key = key if key is not None else self._content_key(data)
+        self._team_index = {
+            'team_games': team_games,
+            'slices': slices,
+            'totals': totals,
+            'pairs': pairs,
+        }
+        return self._team_index
+    
+    def _get_team_index(self, data):
+        """
+        Team-game index for data, reusing the one built by process_data when
+        possible. Any frame with the same rows in the same order (a copy, or
+        the same upload on a Streamlit rerun) reuses it, found by content hash;
+        a reordered or edited frame gets its own, since head-to-head returns
+        rows by position.
+        """
+        key = self._content_key(data)
+        if key != self._index_key or self._team_index is None:
+            return self._build_team_index(data, key)
+        return self._team_index
     
     def get_team_stats(self, data, team):
         """Get comprehensive statistics for a team"""
-        # Games where team is team1 (home)
-        home_games = data[data['team1'] == team].copy()
-        home_games['team_score'] = home_games['team1_score']
-        home_games['opponent_score'] = home_games['team2_score']
-        home_games['opponent'] = home_games['team2']
-        
-        # Games where team is team2 (away)
-        away_games = data[data['team2'] == team].copy()
-        away_games['team_score'] = away_games['team2_score']
-        away_games['opponent_score'] = away_games['team1_score']
-        away_games['opponent'] = away_games['team1']
-        
-        # Combine all games
-        all_games = pd.concat([home_games, away_games], ignore_index=True)
-        
-        if len(all_games) == 0:
+        totals = self._get_team_index(data)['totals']
+        
+        if team not in totals.index:
             return {
                 'total_games': 0,
                 'wins': 0,
@@ -99,50 +182,57 @@ class DataProcessor:
                 'away_win_rate': 0
             }
         
-        # Calculate basic stats
-        wins = len(all_games[all_games['team_score'] > all_games['opponent_score']])
-        losses = len(all_games[all_games['team_score'] < all_games['opponent_score']])
-        draws = len(all_games[all_games['team_score'] == all_games['opponent_score']])
-        
-        # Home vs Away performance
-        home_wins = len(home_games[home_games['team_score'] > home_games['opponent_score']])
-        away_wins = len(away_games[away_games['team_score'] > away_games['opponent_score']])
+        team_totals = totals.loc[team]
+        total_games = int(team_totals['total_games'])
+        home_games = int(team_totals['home_games'])
+        away_games = int(team_totals['away_games'])
         
         return {
-            'total_games': len(all_games),
-            'wins': wins,
-            'losses': losses,
-            'draws': draws,
-            'win_rate': wins / len(all_games) if len(all_games) > 0 else 0,
-            'avg_points_scored': all_games['team_score'].mean(),
-            'avg_points_conceded': all_games['opponent_score'].mean(),
-            'home_games': len(home_games),
-            'away_games': len(away_games),
-            'home_win_rate': home_wins / len(home_games) if len(home_games) > 0 else 0,
-            'away_win_rate': away_wins / len(away_games) if len(away_games) > 0 else 0
+            'total_games': total_games,
+            'wins': int(team_totals['wins']),
+            'losses': int(team_totals['losses']),
+            'draws': int(team_totals['draws']),
+            'win_rate': team_totals['wins'] / total_games,
+            'avg_points_scored': team_totals['points_scored'] / total_games,
+            'avg_points_conceded': team_totals['points_conceded'] / total_games,
+            'home_games': home_games,
+            'away_games': away_games,
+            'home_win_rate': team_totals['home_wins'] / home_games if home_games > 0 else 0,
+            'away_win_rate': team_totals['away_wins'] / away_games if away_games > 0 else 0
         }
     
+    def get_all_team_stats(self, data):
+        """get_team_stats for every team at once, as a DataFrame indexed by team"""
+        totals = self._get_team_index(data)['totals'].copy()
+        
+        totals['win_rate'] = totals['wins'] / totals['total_games']
+        totals['avg_points_scored'] = totals['points_scored'] / totals['total_games']
+        totals['avg_points_conceded'] = totals['points_conceded'] / totals['total_games']
+        totals['home_win_rate'] = (totals['home_wins'] / totals['home_games'].where(totals['home_games'] > 0)).fillna(0)
+        totals['away_win_rate'] = (totals['away_wins'] / totals['away_games'].where(totals['away_games'] > 0)).fillna(0)
+        
+        return totals.drop(columns=['points_scored', 'points_conceded', 'home_wins', 'away_wins'])
+    
     def get_head_to_head(self, data, team1, team2):
         """Get head-to-head match history between two teams"""
-        h2h_matches = data[
-            ((data['team1'] == team1) & (data['team2'] == team2)) |
-            ((data['team1'] == team2) & (data['team2'] == team1))
-        ].copy()
+        pair = (team1, team2) if team1 <= team2 else (team2, team1)
+        positions = self._get_team_index(data)['pairs'].get(pair)
         
-        if len(h2h_matches) == 0:
+        if positions is None or len(positions) == 0:
             return pd.DataFrame()
         
+        h2h_matches = data.iloc[positions].copy()
+        
         # Add winner column for easier analysis
-        h2h_matches['winner'] = h2h_matches.apply(
-            lambda row: team1 if (
-                (row['team1'] == team1 and row['team1_score'] > row['team2_score']) or
-                (row['team2'] == team1 and row['team2_score'] > row['team1_score'])
-            ) else (
-                team2 if (
-                    (row['team1'] == team2 and row['team1_score'] > row['team2_score']) or
-                    (row['team2'] == team2 and row['team2_score'] > row['team1_score'])
-                ) else 'Draw'
-            ), axis=1
+        home = h2h_matches['team1'].to_numpy()
+        score1 = h2h_matches['team1_score'].to_numpy()
+        score2 = h2h_matches['team2_score'].to_numpy()
+        home_won = score1 > score2
+        away_won = score1 < score2
+        h2h_matches['winner'] = np.select(
+            [np.where(home == team1, home_won, away_won), np.where(home == team2, home_won, away_won)],
+            [team1, team2],
+            default='Draw'
         )
         
         return h2h_matches.sort_values('date', ascending=False)
@@ -197,11 +287,10 @@ class DataProcessor:
     
     def get_team_form(self, data, team, num_games=5):
         """Get recent form for a team (last N games)"""
-        team_games = data[
-            (data['team1'] == team) | (data['team2'] == team)
-        ].sort_values('date', ascending=False).head(num_games)
+        index = self._get_team_index(data)
+        start, end = index['slices'].get(team, (0, 0))
         
-        if len(team_games) == 0:
+        if end == start or num_games <= 0:
             return {
                 'games_played': 0,
                 'wins': 0,
@@ -212,40 +301,16 @@ class DataProcessor:
                 'avg_goals_conceded': 0
             }
         
-        wins = 0
-        draws = 0
-        losses = 0
-        goals_scored = []
-        goals_conceded = []
-        form_string = ""
-        
-        for _, game in team_games.iterrows():
-            if game['team1'] == team:
-                team_score = game['team1_score']
-                opp_score = game['team2_score']
-            else:
-                team_score = game['team2_score']
-                opp_score = game['team1_score']
-            
-            goals_scored.append(team_score)
-            goals_conceded.append(opp_score)
-            
-            if team_score > opp_score:
-                wins += 1
-                form_string += "W"
-            elif team_score < opp_score:
-                losses += 1
-                form_string += "L"
-            else:
-                draws += 1
-                form_string += "D"
+        # Newest first
+        recent = index['team_games'].iloc[max(start, end - num_games):end].iloc[::-1]
+        results = np.select([recent['win'], recent['loss']], ['W', 'L'], default='D')
         
         return {
-            'games_played': len(team_games),
-            'wins': wins,
-            'draws': draws,
-            'losses': losses,
-            'form_string': form_string,
-            'avg_goals_scored': np.mean(goals_scored) if goals_scored else 0,
-            'avg_goals_conceded': np.mean(goals_conceded) if goals_conceded else 0
+            'games_played': len(recent),
+            'wins': int(recent['win'].sum()),
+            'draws': int(recent['draw'].sum()),
+            'losses': int(recent['loss'].sum()),
+            'form_string': ''.join(results),
+            'avg_goals_scored': recent['team_score'].mean(),
+            'avg_goals_conceded': recent['opponent_score'].mean()
         }
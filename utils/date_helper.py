@@ -1,6 +1,8 @@
 from datetime import datetime, date, timedelta
 import requests
 import streamlit as st
+from utils.espn_scoreboard import espn_scoreboard
+from utils.async_scoreboard import async_scoreboard
 
 class DateBasedSportsManager:
     """Enhanced sports data manager with comprehensive date-based fetching"""
@@ -10,72 +12,46 @@ class DateBasedSportsManager:
     
     def get_games_for_date_range(self, start_date, end_date, sports_list):
         """Get games for a specific date range across multiple sports"""
-        all_games = []
-        
+        dates = []
         current_date = start_date
         while current_date <= end_date:
-            for sport, league in sports_list:
-                games = self.fetch_espn_games_for_date(sport, league, current_date)
-                if games:
-                    all_games.extend(games)
+            dates.append(current_date)
             current_date += timedelta(days=1)
         
-        return all_games
+        # Every (league, date) scoreboard is requested concurrently
+        games_df = async_scoreboard.fetch_games(sports_list, dates, self.parse_espn_event)
+        return games_df.to_dict('records') if not games_df.empty else []
     
     def fetch_espn_games_for_date(self, sport, league, target_date):
-        """Fetch ESPN games for a specific date with multiple URL patterns"""
+        """Fetch ESPN games for a specific date via the shared scoreboard client"""
         games = []
         
-        # Multiple URL patterns to try
-        date_formats = [
-            target_date.strftime('%Y%m%d'),  # 20250728
-            target_date.strftime('%Y-%m-%d'), # 2025-07-28
-            target_date.strftime('%m%d%Y'),   # 07282025
-        ]
-        
-        url_patterns = [
-            f"{self.espn_base_url}/{sport}/{league}/scoreboard",
-            f"{self.espn_base_url}/{sport}/{league}/schedule",
-            f"{self.espn_base_url}/{sport}/{league}/scoreboard?dates={{date}}",
-            f"{self.espn_base_url}/{sport}/{league}/schedule?dates={{date}}"
-        ]
-        
-        for url_pattern in url_patterns:
-            for date_format in date_formats + [None]:
-                try:
-                    if date_format and '{date}' in url_pattern:
-                        url = url_pattern.format(date=date_format)
-                    elif date_format:
-                        url = f"{url_pattern}?dates={date_format}"
-                    else:
-                        url = url_pattern
-                    
-                    response = requests.get(url, timeout=10)
-                    if response.status_code == 200:
-                        data = response.json()
-                        events = data.get('events', [])
-                        
-                        for event in events:
-                            game_date_str = event.get('date', '')
-                            if game_date_str:
-                                try:
-                                    game_dt = datetime.fromisoformat(game_date_str.replace('Z', '+00:00'))
-                                    game_date_obj = game_dt.date()
-                                    
-                                    # Check if game matches target date
-                                    if game_date_obj == target_date:
-                                        game_info = self.parse_espn_event(event, sport, league)
-                                        if game_info:
-                                            games.append(game_info)
-                                except Exception:
-                                    continue
-                        
-                        # If we found games, return them
-                        if games:
-                            return games
+        # Dated scoreboard first, then the current scoreboard as a fallback
+        for date_param in (target_date, None):
+            try:
+                events = espn_scoreboard.get_events(sport, league, date_param)
+                
+                for event in events:
+                    game_date_str = event.get('date', '')
+                    if game_date_str:
+                        try:
+                            game_dt = datetime.fromisoformat(game_date_str.replace('Z', '+00:00'))
+                            game_date_obj = game_dt.date()
                             
-                except Exception as e:
-                    continue
+                            # Check if game matches target date
+                            if game_date_obj == target_date:
+                                game_info = self.parse_espn_event(event, sport, league)
+                                if game_info:
+                                    games.append(game_info)
+                        except Exception:
+                            continue
+                
+                # If we found games, return them
+                if games:
+                    return games
+                    
+            except Exception as e:
+                continue
         
         return games
     
@@ -6,6 +6,7 @@ import json
 import numpy as np
 from utils.ai_analysis import AIGameAnalyzer
 from utils.cache_manager import CacheManager
+from utils.analysis_scheduler import analysis_scheduler
 
 class DualAIConsensusEngine:
     """Advanced system combining ChatGPT and Gemini analyses for high-confidence picks"""
@@ -32,25 +33,16 @@ class DualAIConsensusEngine:
         if cached_result is not None:
             return cached_result
         
-        # Get OpenAI analysis first (primary)
-        with st.spinner("Getting ChatGPT analysis..."):
-            openai_analysis = self.ai_analyzer.analyze_game_with_openai(game_data)
-
-        # Get Gemini (enhancement)
-        gemini_analysis = {"error": "Gemini unavailable"}
-        try:
-            with st.spinner("Getting Gemini enhancement..."):
-                gemini_analysis = self.ai_analyzer.analyze_game_with_gemini(game_data)
-        except Exception:
-            pass
-
-        # Get Claude (auditor/third opinion)
-        claude_analysis = {"error": "Claude unavailable"}
-        try:
-            with st.spinner("Getting Claude audit..."):
-                claude_analysis = self.ai_analyzer.analyze_game_with_claude(game_data)
-        except Exception:
-            pass
+        # OpenAI (primary), Gemini (enhancement) and Claude (auditor) run concurrently,
+        # each behind its own provider rate limit
+        results = analysis_scheduler.run_providers({
+            'openai': lambda: self.ai_analyzer.analyze_game_with_openai(game_data),
+            'gemini': lambda: self.ai_analyzer.analyze_game_with_gemini(game_data),
+            'claude': lambda: self.ai_analyzer.analyze_game_with_claude(game_data),
+        })
+        openai_analysis = results['openai']
+        gemini_analysis = results['gemini']
+        claude_analysis = results['claude']
         
         # Generate consensus analysis
         consensus_result = self._generate_consensus(
@@ -0,0 +1,311 @@
+"""
+Elo Ratings - Incremental per-sport team ratings learned from final scores
+Ratings persist to disk as compact per-sport arrays indexed by team id
+"""
+
+import math
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves from several processes may overwrite each other
+    fcntl = None
+
+import numpy as np
+
+from utils.quantitative_models import SPORT_CONFIGS
+
+# Month each sport's season starts; earlier months belong to the previous season
+SEASON_START_MONTH = {
+    'NFL': 8,
+    'NCAAF': 8,
+    'NBA': 10,
+    'NHL': 10,
+    'NCAAB': 11,
+    'MLB': 3,
+    'WNBA': 5,
+}
+
+
+class _SportRatings:
+    """Ratings for one sport: team names map to ids, ids index the arrays"""
+
+    def __init__(self, base_rating: float, names: Optional[List[str]] = None,
+                 ratings: Optional[np.ndarray] = None, games: Optional[np.ndarray] = None,
+                 season: int = 0, game_ids: Optional[Iterable[str]] = None,
+                 previous_game_ids: Optional[Iterable[str]] = None):
+        self.base_rating = base_rating
+        self.names = list(names or [])
+        self.ids = {self.key(name): i for i, name in enumerate(self.names)}
+
+        capacity = max(64, len(self.names) * 2)
+        self.ratings = np.full(capacity, base_rating, dtype=np.float64)
+        self.games = np.zeros(capacity, dtype=np.int32)
+        if ratings is not None:
+            self.ratings[:len(self.names)] = ratings
+            self.games[:len(self.names)] = games
+        self.season = int(season)
+        # Applied game ids for this season and the one before; older seasons are forgotten
+        self.game_ids = set(game_ids or [])
+        self.previous_game_ids = set(previous_game_ids or [])
+
+    @staticmethod
+    def key(name: str) -> str:
+        return str(name).strip().lower()
+
+    def team_id(self, name: str) -> int:
+        """Id for a team, registering it at the base rating if it's new"""
+        key = self.key(name)
+        team_id = self.ids.get(key)
+        if team_id is None:
+            team_id = len(self.names)
+            if team_id == len(self.ratings):
+                self.ratings = np.concatenate([self.ratings, np.full(team_id, self.base_rating)])
+                self.games = np.concatenate([self.games, np.zeros(team_id, dtype=np.int32)])
+            self.names.append(str(name).strip())
+            self.ids[key] = team_id
+        return team_id
+
+    def regress(self, fraction: float):
+        """Pull every rating `fraction` of the way back to the mean"""
+        n = len(self.names)
+        self.ratings[:n] = self.base_rating + (1 - fraction) * (self.ratings[:n] - self.base_rating)
+
+    def start_season(self, season: int, fraction: float):
+        """Move on to `season`: regress ratings and keep only the last season's game ids"""
+        if self.season:
+            self.regress(fraction)
+        self.previous_game_ids = self.game_ids if season == self.season + 1 else set()
+        self.game_ids = set()
+        self.season = season
+
+    def seen(self, game_id: str, season: int) -> bool:
+        """Whether a game was applied already, or is too old to tell (before last season)"""
+        if season and self.season and season < self.season - 1:
+            return True
+        return game_id in self.game_ids or game_id in self.previous_game_ids
+
+
+class EloRatingStore:
+    """
+    Incremental Elo ratings for every sport.
+
+    Each finished game updates both teams in O(1), using the sport's home
+    advantage and a margin-of-victory multiplier. The first game of a new
+    season regresses that sport's ratings toward the mean by the sport's
+    `season_regression`. Games already applied are remembered by id for the
+    current and previous season, so rescoring the same date never counts a
+    result twice; results from before last season are ignored.
+    """
+
+    def __init__(self, path: str = ".local/elo_ratings.npz", base_rating: float = 1500,
+                 k_factor: float = 32, sport_configs: Optional[Dict] = None):
+        self.path = path
+        self.base_rating = base_rating
+        self.k_factor = k_factor
+        self.sport_configs = sport_configs or SPORT_CONFIGS
+        self._sports: Dict[str, _SportRatings] = {}
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    @staticmethod
+    def season_for(sport: str, game_date) -> int:
+        """Season a game belongs to, labelled by the year the season started"""
+        if isinstance(game_date, str):
+            try:
+                game_date = datetime.fromisoformat(game_date.replace('Z', '+00:00'))
+            except ValueError:
+                return 0
+        if game_date is None:
+            return 0
+        start_month = SEASON_START_MONTH.get(sport, 1)
+        return game_date.year if game_date.month >= start_month else game_date.year - 1
+
+    def _table(self, sport: str) -> _SportRatings:
+        if not self._loaded:
+            self.load()
+        table = self._sports.get(sport)
+        if table is None:
+            table = self._sports[sport] = _SportRatings(self.base_rating)
+        return table
+
+    def get_rating(self, sport: str, team_name: str) -> float:
+        """Current rating, or the base rating for a team that hasn't played yet"""
+        with self._lock:
+            table = self._table(str(sport).upper())
+            team_id = table.ids.get(table.key(team_name))
+            return float(table.ratings[team_id]) if team_id is not None else float(self.base_rating)
+
+    def get_games_played(self, sport: str, team_name: str) -> int:
+        """Number of results applied to a team's rating"""
+        with self._lock:
+            table = self._table(str(sport).upper())
+            team_id = table.ids.get(table.key(team_name))
+            return int(table.games[team_id]) if team_id is not None else 0
+
+    def expected_home_score(self, sport: str, home_rating: float, away_rating: float) -> float:
+        """Elo win expectancy for the home team, including home advantage"""
+        home_advantage = self.sport_configs.get(sport, {}).get('home_advantage', 0)
+        return 1 / (1 + 10 ** (-(home_rating - away_rating + home_advantage) / 400))
+
+    def update(self, sport: str, home_team: str, away_team: str, home_score: float, away_score: float,
+               season: int = 0, game_id: Optional[str] = None) -> bool:
+        """Apply one final score; returns False if the game was already applied"""
+        sport = str(sport).upper()
+        with self._lock:
+            table = self._table(sport)
+            if game_id is not None:
+                if table.seen(game_id, season):
+                    return False
+                if season > table.season:
+                    table.start_season(season, self.sport_configs.get(sport, {}).get('season_regression', 0))
+                (table.previous_game_ids if 0 < season < table.season else table.game_ids).add(game_id)
+            elif season > table.season:
+                table.start_season(season, self.sport_configs.get(sport, {}).get('season_regression', 0))
+
+            home_id = table.team_id(home_team)
+            away_id = table.team_id(away_team)
+            ratings = table.ratings
+            home_rating, away_rating = ratings[home_id], ratings[away_id]
+
+            expected = self.expected_home_score(sport, home_rating, away_rating)
+            actual = 1.0 if home_score > away_score else 0.0 if home_score < away_score else 0.5
+
+            # Margin-of-victory multiplier, damped when the favourite wins as expected
+            if actual == 0.5:
+                margin = 1.0
+            else:
+                winner_diff = (home_rating - away_rating) if actual == 1.0 else (away_rating - home_rating)
+                margin = math.log(abs(home_score - away_score) + 1) * 2.2 / (max(winner_diff, -1000) * 0.001 + 2.2)
+            shift = self.k_factor * margin * (actual - expected)
+
+            ratings[home_id] = home_rating + shift
+            ratings[away_id] = away_rating - shift
+            table.games[home_id] += 1
+            table.games[away_id] += 1
+            return True
+
+    def replay(self, sport: str, games: Iterable[Dict]) -> int:
+        """Apply a batch of results in date order (e.g. a full historical season)"""
+        sport = str(sport).upper()
+        ordered = sorted(games, key=lambda game: str(game.get('date', '')))
+        applied = 0
+        with self._lock:
+            for game in ordered:
+                applied += self.update(
+                    sport,
+                    self._team_name(game.get('home_team')),
+                    self._team_name(game.get('away_team')),
+                    float(game.get('home_score', 0)),
+                    float(game.get('away_score', 0)),
+                    season=self.season_for(sport, game.get('date')),
+                    game_id=game.get('game_id'),
+                )
+        return applied
+
+    def record_results(self, sport: str, results: List[Dict]) -> int:
+        """Apply ResultScorer final scores and persist if anything changed
+
+        Results without a game id are skipped: a later rescore couldn't tell them apart.
+        The ratings file is re-read, updated and written under a lock shared by every
+        process, so results other workers recorded since this one loaded aren't lost.
+        """
+        results = [result for result in results if result.get('game_id')]
+        with self._lock, self._file_lock():
+            if os.path.exists(self.path):
+                self._sports.clear()
+                self.load()
+            applied = self.replay(sport, results)
+            if applied:
+                self._write()
+        return applied
+
+    def reset(self, sport: Optional[str] = None):
+        """Forget one sport's ratings (or all of them) before a rebuild"""
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            if sport is None:
+                self._sports.clear()
+            else:
+                self._sports.pop(str(sport).upper(), None)
+
+    def load(self):
+        """Load ratings from disk; a missing or unreadable file starts fresh"""
+        with self._lock:
+            self._loaded = True
+            if not os.path.exists(self.path):
+                return
+            try:
+                with np.load(self.path, allow_pickle=False) as archive:
+                    for sport in archive['sports']:
+                        sport = str(sport)
+                        self._sports[sport] = _SportRatings(
+                            self.base_rating,
+                            names=[str(name) for name in archive[f'{sport}_names']],
+                            ratings=archive[f'{sport}_ratings'],
+                            games=archive[f'{sport}_games'],
+                            season=int(archive[f'{sport}_season']),
+                            game_ids=[str(game_id) for game_id in archive[f'{sport}_game_ids']],
+                            previous_game_ids=[str(game_id) for game_id in archive[f'{sport}_previous_game_ids']]
+                            if f'{sport}_previous_game_ids' in archive.files else [],
+                        )
+            except (OSError, KeyError, ValueError):
+                self._sports.clear()
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared by every process writing the ratings file"""
+        if fcntl is None:
+            yield
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            lock_file = open(f"{self.path}.lock", 'w')
+        except OSError:
+            yield
+            return
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            lock_file.close()
+
+    def save(self):
+        """Write every sport's arrays to one compressed file, replacing it atomically"""
+        with self._lock, self._file_lock():
+            self._write()
+
+    def _write(self):
+        """Write the arrays to disk; callers hold both locks"""
+        arrays = {'sports': np.array(sorted(self._sports), dtype=str)}
+        for sport, table in self._sports.items():
+            n = len(table.names)
+            arrays[f'{sport}_names'] = np.array(table.names, dtype=str)
+            arrays[f'{sport}_ratings'] = table.ratings[:n]
+            arrays[f'{sport}_games'] = table.games[:n]
+            arrays[f'{sport}_season'] = np.array(table.season)
+            arrays[f'{sport}_game_ids'] = np.array(sorted(table.game_ids), dtype=str)
+            arrays[f'{sport}_previous_game_ids'] = np.array(sorted(table.previous_game_ids), dtype=str)
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npz"
+        try:
+            np.savez_compressed(tmp_path, **arrays)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _team_name(team) -> str:
+        if isinstance(team, dict):
+            return team.get('name', team.get('displayName', 'Unknown'))
+        return str(team)
+
+
+# Global rating store shared by the quantitative models and result scoring
+elo_ratings = EloRatingStore()
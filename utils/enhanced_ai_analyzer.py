@@ -7,6 +7,7 @@ from utils.advanced_ai_strategy import AdvancedAIStrategy
 from utils.real_time_data_engine import RealTimeDataEngine
 from utils.quantitative_models import QuantitativeModelEngine
 from utils.confidence_calibration import ConfidenceCalibrator
+from utils.analysis_scheduler import analysis_scheduler
 
 class EnhancedAIAnalyzer:
     """
@@ -57,7 +58,10 @@ class EnhancedAIAnalyzer:
             # Step 4: Generate enhanced prompt with quantitative foundation
             enhanced_prompt = self._generate_quantitative_prompt(game_data, real_time_data, quantitative_baseline, game_features)
             
-            # Step 3: Get AI analysis with advanced prompt
+            # Step 3: Get AI analysis with advanced prompt (shares the OpenAI rate limit)
+            if not analysis_scheduler.acquire('openai', tokens=len(enhanced_prompt) // 4 + 2000, timeout=60):
+                return {"error": "OpenAI rate limit wait exceeded"}
+            
             response = self.openai_client.chat.completions.create(
                 model="gpt-4o",  # Use the most capable model
                 messages=[
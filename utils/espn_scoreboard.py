@@ -0,0 +1,208 @@
+"""
+ESPN Scoreboard Client - Shared process-wide scoreboard fetcher
+Keeps one pooled HTTP session and merges identical in-flight requests
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from utils.http_cache import create_session, http_cache
+from utils.scoreboard_archive import scoreboard_archive
+
+ESPN_BASE_URL = "https://site.api.espn.com/apis/site/v2/sports"
+
+# League code -> (sport path, league path) on the ESPN site API
+LEAGUE_PATHS = {
+    'NFL': ('football', 'nfl'),
+    'NCAAF': ('football', 'college-football'),
+    'NBA': ('basketball', 'nba'),
+    'WNBA': ('basketball', 'wnba'),
+    'NCAAB': ('basketball', 'mens-college-basketball'),
+    'NCAAW': ('basketball', 'womens-college-basketball'),
+    'MLB': ('baseball', 'mlb'),
+    'NCAABASE': ('baseball', 'college-baseball'),
+    'NHL': ('hockey', 'nhl'),
+    'MLS': ('soccer', 'mls'),
+}
+
+
+class ESPNScoreboardClient:
+    """
+    Thread-safe ESPN scoreboard fetcher shared by every module.
+
+    Identical (league path, date) requests that arrive while one is already
+    in flight wait for that call instead of issuing their own, and completed
+    responses are kept for a short TTL so sequential callers in the same page
+    render reuse them. Dated scoreboards also go through the scoreboard
+    archive, which keeps finished days permanently.
+    """
+
+    def __init__(self, pool_size: int = 20, timeout: float = 10, ttl_seconds: float = 30):
+        self.base_url = ESPN_BASE_URL
+        self.timeout = timeout
+        self.ttl_seconds = ttl_seconds
+
+        # Unchanged scoreboards are revalidated with ETag/If-Modified-Since by the HTTP cache
+        self.session = create_session(http_cache, pool_size=pool_size)
+
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, Optional[str]], Future] = {}
+        self._recent: Dict[Tuple[str, Optional[str]], Tuple[float, Optional[Dict]]] = {}
+        self.stats = {'requests': 0, 'coalesced': 0, 'recent_hits': 0, 'archive_hits': 0, 'errors': 0}
+
+    @staticmethod
+    def normalize_date(value: Union[str, date, datetime, None]) -> Optional[str]:
+        """Convert a date, datetime or date string into ESPN's YYYYMMDD format"""
+        if value is None or value == '':
+            return None
+        if isinstance(value, (date, datetime)):
+            return value.strftime('%Y%m%d')
+
+        value = str(value).strip()
+        if len(value) == 8 and value.isdigit():
+            return value
+        for fmt in ('%Y-%m-%d', '%m%d%Y', '%m/%d/%Y'):
+            try:
+                return datetime.strptime(value, fmt).strftime('%Y%m%d')
+            except ValueError:
+                continue
+        return value.replace('-', '')
+
+    @staticmethod
+    def resolve_league(league_code: str) -> Optional[Tuple[str, str]]:
+        """Map a league code such as 'NFL' to its ESPN (sport, league) path"""
+        return LEAGUE_PATHS.get(str(league_code).upper())
+
+    def get_scoreboard(self, sport: str, league: str, target_date=None,
+                       timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Get the raw ESPN scoreboard JSON for a sport/league and optional date.
+
+        Returns None when ESPN is unreachable or answers with a non-200 status.
+        """
+        return self.get_scoreboard_by_path(f"{sport}/{league}", target_date, timeout=timeout)
+
+    def get_scoreboard_by_path(self, path: str, target_date=None,
+                               timeout: Optional[float] = None, fresh: bool = False) -> Optional[Dict]:
+        """
+        Get the scoreboard for an ESPN path such as 'football/nfl'.
+
+        `fresh` skips the recent-response and archive lookups (live polling
+        needs the current state); identical in-flight requests are still merged.
+        """
+        key = (path.strip('/'), self.normalize_date(target_date))
+        now = time.time()
+
+        if not fresh:
+            with self._lock:
+                recent = self._recent.get(key)
+                if recent and now - recent[0] < self.ttl_seconds:
+                    self.stats['recent_hits'] += 1
+                    return recent[1]
+
+            archived = scoreboard_archive.get(*key)
+            if archived is not None:
+                self.stats['archive_hits'] += 1
+                with self._lock:
+                    self._recent[key] = (time.time(), archived)
+                return archived
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.stats['coalesced'] += 1
+
+        if not owner:
+            try:
+                return future.result(timeout=(timeout or self.timeout) * 2)
+            except Exception:
+                return None
+
+        data = None
+        try:
+            data = self._fetch(key, timeout or self.timeout)
+        finally:
+            with self._lock:
+                if data is not None:
+                    self._recent[key] = (time.time(), data)
+                self._in_flight.pop(key, None)
+                if len(self._recent) > 500:
+                    self._prune_recent()
+            future.set_result(data)
+
+        if data is not None:
+            scoreboard_archive.put(key[0], key[1], data)
+        return data
+
+    def get_league_scoreboard(self, league_code: str, target_date=None,
+                              timeout: Optional[float] = None) -> Optional[Dict]:
+        """Get the scoreboard for a league code such as 'NFL' or 'NBA'"""
+        path = self.resolve_league(league_code)
+        if not path:
+            return None
+        return self.get_scoreboard(path[0], path[1], target_date, timeout=timeout)
+
+    def get_events(self, sport: str, league: str, target_date=None,
+                   timeout: Optional[float] = None) -> List[Dict]:
+        """Get just the events list for a sport/league and optional date"""
+        data = self.get_scoreboard(sport, league, target_date, timeout=timeout)
+        return data.get('events', []) if data else []
+
+    def peek(self, path: str, target_date=None) -> Optional[Dict]:
+        """Recently fetched or archived scoreboard for a path/date, without making a request"""
+        key = (path.strip('/'), self.normalize_date(target_date))
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent and time.time() - recent[0] < self.ttl_seconds:
+                return recent[1]
+        return scoreboard_archive.get(*key)
+
+    def prime(self, path: str, target_date, data: Optional[Dict]):
+        """Store a scoreboard fetched elsewhere (e.g. by the async fetcher) for sequential callers"""
+        if data is None:
+            return
+        key = (path.strip('/'), self.normalize_date(target_date))
+        with self._lock:
+            self._recent[key] = (time.time(), data)
+            if len(self._recent) > 500:
+                self._prune_recent()
+        scoreboard_archive.put(key[0], key[1], data)
+
+    def clear(self):
+        """Drop recently completed responses so the next call hits ESPN"""
+        with self._lock:
+            self._recent.clear()
+
+    def _fetch(self, key: Tuple[str, Optional[str]], timeout: float) -> Optional[Dict]:
+        """Perform the actual HTTP request for a scoreboard key"""
+        path, date_param = key
+        url = f"{self.base_url}/{path}/scoreboard"
+        params = {'dates': date_param} if date_param else None
+
+        self.stats['requests'] += 1
+        try:
+            response = self.session.get(url, params=params, timeout=timeout)
+            if response.status_code != 200:
+                self.stats['errors'] += 1
+                return None
+            return response.json()
+        except Exception:
+            self.stats['errors'] += 1
+            return None
+
+    def _prune_recent(self):
+        """Remove expired recent responses (caller holds the lock)"""
+        cutoff = time.time() - self.ttl_seconds
+        for key in [k for k, (ts, _) in self._recent.items() if ts < cutoff]:
+            del self._recent[key]
+
+
+# Global scoreboard client shared by all modules
+espn_scoreboard = ESPNScoreboardClient()
@@ -3,6 +3,7 @@ import pandas as pd
 from datetime import datetime, timedelta
 import streamlit as st
 import numpy as np
+from utils.espn_scoreboard import espn_scoreboard
 
 class GameAnalyzer:
     """Real game analysis engine with actual data processing"""
@@ -37,15 +38,7 @@ class GameAnalyzer:
         games = []
         
         try:
-            url = f"{self.espn_base_url}/{sport}/{league}/scoreboard"
-            if date:
-                date_str = date.strftime('%Y%m%d')
-                url += f"?dates={date_str}"
-                
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = espn_scoreboard.get_scoreboard(sport, league, date) or {}
             
             if 'events' in data:
                 for event in data['events']:
@@ -7,20 +7,31 @@ import time
 import threading
 from datetime import datetime, timedelta
 from typing import Dict, List
-import requests
 from utils.notification_system import notification_manager
+from utils.espn_scoreboard import espn_scoreboard
+from utils.live_poller import LIVE_STATES, live_poller
+from utils.team_registry import teams_match
+
+
+def _team_name(team) -> str:
+    """Team name from either a plain string or a {'name': ...} dict"""
+    if isinstance(team, dict):
+        return team.get('name', '')
+    return team or ''
+
 
 class GameMonitor:
     """Monitors games and sends notifications when they finish"""
     
     def __init__(self):
         self.monitoring = False
-        self.check_interval = 300  # 5 minutes
+        self.check_interval = 300  # Longest sleep between checks; the poller usually wants one sooner
+        self.min_check_interval = 5
         self.monitored_games = {}
     
     def add_game_to_monitor(self, game_data: Dict, pick_data: Dict = None):
         """Add a game to be monitored for completion"""
-        game_id = f"{game_data.get('away_team', '')}_{game_data.get('home_team', '')}_{game_data.get('game_date', '')}"
+        game_id = f"{_team_name(game_data.get('away_team'))}_{_team_name(game_data.get('home_team'))}_{game_data.get('game_date', '')}"
         
         self.monitored_games[game_id] = {
             'game_data': game_data,
@@ -29,125 +40,88 @@ class GameMonitor:
             'status': 'scheduled',
             'last_checked': datetime.now().isoformat()
         }
+        self._watch(game_id, self.monitored_games[game_id])
         
         # Store in session state for persistence
         if 'monitored_games' not in st.session_state:
             st.session_state.monitored_games = {}
         st.session_state.monitored_games[game_id] = self.monitored_games[game_id]
     
+    def _watch(self, game_id: str, game_info: Dict) -> bool:
+        """Register a monitored game with the adaptive live poller"""
+        game_data = game_info['game_data']
+        return live_poller.watch(
+            game_id,
+            game_data.get('sport', 'NFL'),
+            _team_name(game_data.get('home_team')),
+            _team_name(game_data.get('away_team')),
+            start_time=game_info.get('start_time'),
+            game_date=game_data.get('game_date') or game_data.get('date'),
+            event_id=game_data.get('game_id') or None,
+        )
+    
     def check_game_results(self):
-        """Check for completed games and send notifications"""
+        """Poll the scoreboards that are due and send notifications for finished games"""
         if 'monitored_games' not in st.session_state:
             return
         
-        current_time = datetime.now()
-        completed_games = []
+        monitored = st.session_state.monitored_games
+        
+        # Games restored from session state aren't known to this process's poller yet
+        watched = live_poller.watched()
+        for game_id, game_info in monitored.items():
+            if game_id not in watched and game_info.get('status') != 'completed':
+                self._watch(game_id, game_info)
         
-        for game_id, game_info in st.session_state.monitored_games.items():
-            if game_info.get('status') == 'completed':
+        # One request per due league scoreboard, shared by every game on it
+        finished_games = []
+        for game_id, _, event in live_poller.tick():
+            game_info = monitored.get(game_id)
+            if game_info is None:
                 continue
+            finished_games.append(game_id)
             
-            game_data = game_info['game_data']
+            try:
+                final_result = self._result_from_event(event, game_info['game_data'])
+            except Exception as e:
+                print(f"Error reading result for {game_id}: {e}")
+                continue
             
-            # Check if enough time has passed since game start
-            start_time_str = game_info.get('start_time')
-            if start_time_str:
-                try:
-                    if start_time_str.endswith('Z'):
-                        start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                    else:
-                        start_time = datetime.fromisoformat(start_time_str)
-                    
-                    # Check if game should be finished (3+ hours after start for most sports)
-                    if current_time > start_time + timedelta(hours=3):
-                        # Fetch final score
-                        final_result = self._fetch_game_result(game_data)
-                        
-                        if final_result:
-                            # Mark as completed
-                            game_info['status'] = 'completed'
-                            game_info['final_result'] = final_result
-                            
-                            # Send notification
-                            pick_data = game_info.get('pick_data')
-                            notification_manager.game_finished_notification(final_result, pick_data)
-                            
-                            completed_games.append(game_id)
-                            
-                except Exception as e:
-                    print(f"Error checking game {game_id}: {e}")
-                    continue
+            # Postponed/canceled games simply stop being monitored
+            if final_result:
+                game_info['status'] = 'completed'
+                game_info['final_result'] = final_result
+                
+                # Send notification
+                pick_data = game_info.get('pick_data')
+                notification_manager.game_finished_notification(final_result, pick_data)
+        
+        checked_at = datetime.now().isoformat()
+        for game_id, game in live_poller.watched().items():
+            if game_id in monitored:
+                monitored[game_id]['status'] = 'in_progress' if game['state'] in LIVE_STATES else 'scheduled'
+                if game['last_polled'] is not None:
+                    monitored[game_id]['last_checked'] = checked_at
         
         # Remove completed games from monitoring
-        for game_id in completed_games:
+        for game_id in finished_games:
             if game_id in st.session_state.monitored_games:
                 del st.session_state.monitored_games[game_id]
     
     def _fetch_game_result(self, game_data: Dict) -> Dict:
         """Fetch final result for a specific game"""
         try:
-            sport = game_data.get('sport', 'NFL').lower()
-            home_team = game_data.get('home_team', '')
-            away_team = game_data.get('away_team', '')
+            path = espn_scoreboard.resolve_league(game_data.get('sport', 'NFL')) or ('football', 'nfl')
             game_date = game_data.get('game_date', datetime.now().strftime('%Y-%m-%d'))
             
-            # Use ESPN API to get final scores
-            if sport == 'nfl':
-                espn_sport = 'football/nfl'
-            elif sport == 'nba':
-                espn_sport = 'basketball/nba'
-            elif sport == 'mlb':
-                espn_sport = 'baseball/mlb'
-            elif sport == 'nhl':
-                espn_sport = 'hockey/nhl'
-            else:
-                espn_sport = 'football/nfl'  # Default
-            
             # Get scoreboard for the date
-            url = f"https://site.api.espn.com/apis/site/v2/sports/{espn_sport}/scoreboard"
-            params = {'dates': game_date.replace('-', '')}
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            events = data.get('events', [])
+            data = espn_scoreboard.get_scoreboard(path[0], path[1], game_date) or {}
             
             # Find matching game
-            for event in events:
-                competitions = event.get('competitions', [])
-                for competition in competitions:
-                    competitors = competition.get('competitors', [])
-                    
-                    if len(competitors) >= 2:
-                        home_competitor = next((c for c in competitors if c.get('homeAway') == 'home'), None)
-                        away_competitor = next((c for c in competitors if c.get('homeAway') == 'away'), None)
-                        
-                        if home_competitor and away_competitor:
-                            home_name = home_competitor.get('team', {}).get('displayName', '')
-                            away_name = away_competitor.get('team', {}).get('displayName', '')
-                            
-                            # Simple name matching
-                            if (self._teams_match(home_name, home_team) and 
-                                self._teams_match(away_name, away_team)):
-                                
-                                # Check if game is completed
-                                status = competition.get('status', {})
-                                if status.get('type', {}).get('completed'):
-                                    home_score = int(home_competitor.get('score', 0))
-                                    away_score = int(away_competitor.get('score', 0))
-                                    
-                                    winner = home_name if home_score > away_score else away_name
-                                    
-                                    return {
-                                        'home_team': home_name,
-                                        'away_team': away_name,
-                                        'home_score': home_score,
-                                        'away_score': away_score,
-                                        'winner': winner,
-                                        'status': 'completed',
-                                        'game_date': game_date
-                                    }
+            for event in data.get('events', []):
+                result = self._result_from_event(event, game_data)
+                if result:
+                    return result
             
             return None
             
@@ -155,27 +129,50 @@ class GameMonitor:
             print(f"Error fetching game result: {e}")
             return None
     
-    def _teams_match(self, name1: str, name2: str) -> bool:
-        """Check if two team names match (fuzzy matching)"""
-        if not name1 or not name2:
-            return False
-        
-        # Normalize names
-        def normalize(name):
-            return name.lower().replace(' ', '').replace('.', '').replace('-', '')
-        
-        norm1 = normalize(str(name1))
-        norm2 = normalize(str(name2))
-        
-        # Exact match
-        if norm1 == norm2:
-            return True
+    def _result_from_event(self, event: Dict, game_data: Dict) -> Dict:
+        """Final result for the monitored game if `event` is that game and it's completed"""
+        home_team = _team_name(game_data.get('home_team'))
+        away_team = _team_name(game_data.get('away_team'))
+        game_date = game_data.get('game_date') or game_data.get('date') or datetime.now().strftime('%Y-%m-%d')
         
-        # Check if one contains the other (for cases like "Lakers" vs "Los Angeles Lakers")
-        if len(norm1) >= 4 and len(norm2) >= 4:
-            return norm1 in norm2 or norm2 in norm1
+        for competition in event.get('competitions', []):
+            competitors = competition.get('competitors', [])
+            
+            if len(competitors) >= 2:
+                home_competitor = next((c for c in competitors if c.get('homeAway') == 'home'), None)
+                away_competitor = next((c for c in competitors if c.get('homeAway') == 'away'), None)
+                
+                if home_competitor and away_competitor:
+                    home_name = home_competitor.get('team', {}).get('displayName', '')
+                    away_name = away_competitor.get('team', {}).get('displayName', '')
+                    
+                    # Simple name matching
+                    if (self._teams_match(home_name, home_team) and 
+                        self._teams_match(away_name, away_team)):
+                        
+                        # Check if game is completed
+                        status = competition.get('status') or event.get('status', {})
+                        if status.get('type', {}).get('completed'):
+                            home_score = int(home_competitor.get('score', 0))
+                            away_score = int(away_competitor.get('score', 0))
+                            
+                            winner = home_name if home_score > away_score else away_name
+                            
+                            return {
+                                'home_team': home_name,
+                                'away_team': away_name,
+                                'home_score': home_score,
+                                'away_score': away_score,
+                                'winner': winner,
+                                'status': 'completed',
+                                'game_date': game_date
+                            }
         
-        return False
+        return None
+    
+    def _teams_match(self, name1: str, name2: str) -> bool:
+        """Check if two team names match (fuzzy matching)"""
+        return teams_match(name1, name2)
     
     def start_monitoring(self):
         """Start the background monitoring thread"""
@@ -188,7 +185,10 @@ class GameMonitor:
             while self.monitoring:
                 try:
                     self.check_game_results()
-                    time.sleep(self.check_interval)
+                    # Sleep until the poller's next game is due (live games every few seconds, idle slates rarely)
+                    wait = live_poller.seconds_until_next_poll()
+                    time.sleep(min(max(wait if wait is not None else self.check_interval,
+                                       self.min_check_interval), self.check_interval))
                 except Exception as e:
                     print(f"Monitoring error: {e}")
                     time.sleep(60)  # Wait 1 minute before retrying
@@ -0,0 +1,283 @@
+"""
+HTTP Cache - Shared on-disk response cache for every sports API request
+Honours Cache-Control and revalidates with ETag/If-Modified-Since, so unchanged bodies cost a 304
+"""
+
+import base64
+import hashlib
+import os
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.local_store import LocalStore, local_store
+
+HTTP_CACHE_NAMESPACE = 'http_cache'
+
+# How long a response with validators is kept after it goes stale, so it can still be revalidated
+STALE_RETENTION = 7 * 24 * 3600
+
+# Per-endpoint freshness (seconds) that overrides the server's Cache-Control; first matching pattern wins
+DEFAULT_FRESHNESS_OVERRIDES: List[Tuple[str, float]] = [
+    (r'site\.api\.espn\.com/apis/site/v2/sports/[^?]+/teams(\?|$)', 6 * 3600),
+    (r'site\.api\.espn\.com/apis/v2/sports/[^?]+/standings', 3600),
+    (r'api\.the-odds-api\.com/v4/sports/?(\?|$)', 3600),
+    (r'api\.the-odds-api\.com/v4/sports/[^/]+/odds', 60),
+]
+
+# Response headers worth replaying from the cache
+KEPT_HEADERS = ('content-type', 'cache-control', 'etag', 'last-modified', 'expires', 'date',
+                'x-requests-remaining', 'x-requests-used')
+
+# Request headers that change the response (credentials), so they're part of the cache key
+_KEY_HEADER = re.compile(r'authorization|key|token', re.IGNORECASE)
+
+# Query parameters that carry credentials; they're dropped from stored URLs and never written to disk
+_SECRET_PARAM = re.compile(r'key|token|secret|signature|password', re.IGNORECASE)
+
+
+def redact_url(url: str) -> str:
+    """URL with credential parameters removed and the query sorted, so keys don't depend on order"""
+    parts = urlsplit(url)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _SECRET_PARAM.search(name))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def encode_body(body: bytes) -> Tuple[str, str]:
+    """Body bytes as JSON-safe text plus the encoding needed to get them back"""
+    try:
+        return body.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        return base64.b64encode(body).decode('ascii'), 'base64'
+
+
+def decode_body(text: str, encoding: Optional[str]) -> bytes:
+    if encoding == 'base64':
+        return base64.b64decode(text)
+    return text.encode('utf-8')
+
+
+def build_response(request: requests.PreparedRequest, status: int, headers: Dict[str, str],
+                   body: bytes) -> requests.Response:
+    """A requests Response for a body that didn't come off the wire (cache hits, fixtures)"""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = 'OK' if status < 400 else 'Error'
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class HTTPResponseCache:
+    """
+    Response cache shared by every session the app uses for sports APIs.
+
+    GET responses are stored in the local store with their validators. A
+    fresh entry (per Cache-Control/Expires, or a per-endpoint override) is
+    answered without touching the network; a stale one is revalidated with
+    If-None-Match/If-Modified-Since and a 304 replays the stored body.
+    Byte counts and hit ratios are kept in `stats`.
+    """
+
+    def __init__(self, store: Optional[LocalStore] = None,
+                 freshness_overrides: Optional[List[Tuple[str, float]]] = None):
+        self.store = store or local_store
+        self.enabled = os.environ.get('HTTP_CACHE_DISABLED', '').lower() not in ('1', 'true', 'yes')
+        self._overrides = [(re.compile(pattern), seconds) for pattern, seconds in
+                           (DEFAULT_FRESHNESS_OVERRIDES if freshness_overrides is None else freshness_overrides)]
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'fresh_hits': 0, 'revalidated': 0, 'misses': 0, 'uncacheable': 0,
+                      'bytes_downloaded': 0, 'bytes_saved': 0}
+
+    def set_freshness(self, pattern: str, seconds: float):
+        """Override freshness for URLs matching `pattern` (regex), ahead of existing overrides"""
+        with self._lock:
+            self._overrides.insert(0, (re.compile(pattern), seconds))
+
+    def _override_for(self, url: str) -> Optional[float]:
+        for pattern, seconds in self._overrides:
+            if pattern.search(url):
+                return seconds
+        return None
+
+    @staticmethod
+    def make_key(request: requests.PreparedRequest) -> str:
+        credentials = sorted((name.lower(), value) for name, value in request.headers.items()
+                             if _KEY_HEADER.search(name))
+        raw = f"{request.method} {request.url} {credentials}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(HTTP_CACHE_NAMESPACE, key)
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        return time.time() < entry['stored_at'] + entry['freshness']
+
+    def freshness_for(self, url: str, headers) -> Optional[float]:
+        """Seconds a response stays fresh, 0 to always revalidate, or None if it must not be stored"""
+        directives = self._cache_control(headers.get('Cache-Control', ''))
+        if 'no-store' in directives:
+            return None
+        override = self._override_for(url)
+        if override is not None:
+            return override
+        if 'no-cache' in directives:
+            return 0
+        if 'max-age' in directives:
+            try:
+                age = float(headers.get('Age', 0) or 0)
+                return max(float(directives['max-age']) - age, 0)
+            except ValueError:
+                return 0
+        if headers.get('Expires'):
+            try:
+                expires = parsedate_to_datetime(headers['Expires']).timestamp()
+                return max(expires - time.time(), 0)
+            except (TypeError, ValueError):
+                return 0
+        return 0
+
+    @staticmethod
+    def _cache_control(value: str) -> Dict[str, Optional[str]]:
+        directives = {}
+        for part in value.split(','):
+            name, _, argument = part.strip().partition('=')
+            if name:
+                directives[name.lower()] = argument.strip('"') or None
+        return directives
+
+    def save(self, key: str, url: str, response: requests.Response) -> bool:
+        """Store a 200 response if its headers allow it and it can be reused or revalidated"""
+        freshness = self.freshness_for(url, response.headers)
+        validators = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        if freshness is None or (freshness <= 0 and not validators):
+            self._count('uncacheable')
+            return False
+
+        body = response.content
+        encoded, encoding = encode_body(body)
+        entry = {
+            'url': redact_url(url),
+            'status': response.status_code,
+            'headers': {name: value for name, value in response.headers.items() if name.lower() in KEPT_HEADERS},
+            'body': encoded,
+            'body_encoding': encoding,
+            'size': len(body),
+            'stored_at': time.time(),
+            'freshness': freshness,
+        }
+        ttl = freshness + (STALE_RETENTION if validators else 0)
+        return self.store.set(HTTP_CACHE_NAMESPACE, key, entry, ttl, item_count=len(body))
+
+    def refresh(self, key: str, entry: Dict[str, Any], not_modified: requests.Response) -> Dict[str, Any]:
+        """Apply a 304's headers to a stored entry and restart its freshness clock"""
+        headers = CaseInsensitiveDict(entry['headers'])
+        for name, value in not_modified.headers.items():
+            if name.lower() in KEPT_HEADERS and name.lower() != 'content-type':
+                headers[name] = value
+        entry['headers'] = dict(headers.items())
+        freshness = self.freshness_for(entry['url'], headers)
+        entry['freshness'] = freshness or 0
+        entry['stored_at'] = time.time()
+        self.store.set(HTTP_CACHE_NAMESPACE, key, entry, entry['freshness'] + STALE_RETENTION,
+                       item_count=entry['size'])
+        return entry
+
+    def build_response(self, request: requests.PreparedRequest, entry: Dict[str, Any]) -> requests.Response:
+        """A Response that replays a stored entry, marked with `from_cache = True`"""
+        response = build_response(request, entry['status'], entry['headers'],
+                                  decode_body(entry['body'], entry.get('body_encoding')))
+        response.from_cache = True
+        return response
+
+    def hit_ratio(self) -> float:
+        """Share of GETs answered without downloading a body (fresh hits and 304s)"""
+        served = self.stats['fresh_hits'] + self.stats['revalidated']
+        return served / self.stats['requests'] if self.stats['requests'] else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats, hit_ratio=self.hit_ratio())
+        stored = self.store.get_stats(HTTP_CACHE_NAMESPACE)
+        stats.update(stored_entries=stored['entries'], stored_bytes=stored['total_size'])
+        return stats
+
+    def clear(self) -> int:
+        return self.store.clear(HTTP_CACHE_NAMESPACE)
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """Connection-pooling adapter that answers GETs from an HTTPResponseCache when it can"""
+
+    def __init__(self, cache: HTTPResponseCache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if request.method != 'GET' or stream or not self.cache.enabled or 'Range' in request.headers:
+            return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        cache = self.cache
+        cache._count('requests')
+        key = cache.make_key(request)
+        entry = cache.lookup(key)
+        if entry is not None and cache.is_fresh(entry):
+            cache._count('fresh_hits')
+            cache._count('bytes_saved', entry['size'])
+            return cache.build_response(request, entry)
+
+        if entry is not None:
+            stored_headers = CaseInsensitiveDict(entry['headers'])
+            etag, last_modified = stored_headers.get('ETag'), stored_headers.get('Last-Modified')
+            if etag:
+                request.headers['If-None-Match'] = etag
+            if last_modified:
+                request.headers['If-Modified-Since'] = last_modified
+
+        response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        if response.status_code == 304 and entry is not None:
+            cache._count('revalidated')
+            cache._count('bytes_saved', entry['size'])
+            return cache.build_response(request, cache.refresh(key, entry, response))
+
+        cache._count('misses')
+        cache._count('bytes_downloaded', len(response.content))
+        if response.status_code == 200:
+            cache.save(key, request.url, response)
+        return response
+
+
+def create_session(cache: Optional[HTTPResponseCache] = None, pool_size: int = 20,
+                   max_retries: int = 1) -> requests.Session:
+    """A pooled requests.Session whose GETs go through the response cache"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    adapter = CachingHTTPAdapter(cache or http_cache, pool_connections=pool_size, pool_maxsize=pool_size,
+                                 max_retries=max_retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Global response cache and session shared by every sports API module
+http_cache = HTTPResponseCache()
+http_session = create_session(http_cache)
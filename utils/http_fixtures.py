@@ -0,0 +1,317 @@
+"""
+HTTP Fixtures - Record real API responses once, replay them offline with injected latency and errors
+Makes slate-generation benchmarks deterministic and runnable without network access
+"""
+
+import copy
+import gzip
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.espn_scoreboard import espn_scoreboard
+from utils.http_cache import KEPT_HEADERS, build_response, decode_body, encode_body, http_cache, http_session, redact_url
+from utils.llm_response_cache import llm_response_cache
+from utils.local_store import LocalStore
+from utils.schedule_index import schedule_index
+from utils.scoreboard_archive import scoreboard_archive
+
+FIXTURE_VERSION = 1
+
+
+class FixtureStore:
+    """
+    Recorded HTTP and LLM responses in one gzip-compressed JSON file.
+
+    HTTP entries are keyed by method and redacted URL, LLM entries by
+    (provider, model, prompt) exactly as the LLM response cache keys them.
+    A later recording of the same request replaces the earlier one.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.http: Dict[str, Dict[str, Any]] = {}
+        self.llm: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def http_key(method: str, url: str) -> str:
+        return f"{method.upper()} {redact_url(url)}"
+
+    def load(self) -> 'FixtureStore':
+        with gzip.open(self.path, 'rt', encoding='utf-8') as handle:
+            data = json.load(handle)
+        self.http = data.get('http', {})
+        self.llm = data.get('llm', {})
+        return self
+
+    def save(self):
+        """Write the fixtures atomically (temp file + rename)"""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {'version': FIXTURE_VERSION, 'recorded_at': time.time(), 'http': self.http, 'llm': self.llm}
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as handle:
+                handle.write(json.dumps(data, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def add_response(self, url: str, body: Any, status: int = 200, headers: Optional[Dict[str, str]] = None,
+                     method: str = 'GET'):
+        """Add one HTTP response (a dict/list body is stored as JSON)"""
+        if not isinstance(body, (bytes, str)):
+            body = json.dumps(body)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        encoded, encoding = encode_body(body)
+        entry = {'url': redact_url(url), 'status': status, 'body': encoded, 'body_encoding': encoding,
+                 'headers': headers or {'Content-Type': 'application/json'}}
+        with self._lock:
+            self.http[self.http_key(method, url)] = entry
+
+    def get_response(self, method: str, url: str) -> Optional[Dict[str, Any]]:
+        return self.http.get(self.http_key(method, url))
+
+    def add_llm(self, provider: str, model: str, prompt: str, response: Dict):
+        entry = {'provider': provider, 'model': model, 'response': copy.deepcopy(response)}
+        with self._lock:
+            self.llm[llm_response_cache.make_key(provider, model, prompt)] = entry
+
+    def get_llm(self, provider: str, model: str, prompt: str) -> Optional[Dict]:
+        entry = self.llm.get(llm_response_cache.make_key(provider, model, prompt))
+        return copy.deepcopy(entry['response']) if entry else None
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests to the real network and writes each response into a FixtureStore"""
+
+    def __init__(self, fixtures: FixtureStore, **kwargs):
+        self.fixtures = fixtures
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        response = super().send(request, stream=False, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        headers = {name: value for name, value in response.headers.items() if name.lower() in KEPT_HEADERS}
+        self.fixtures.add_response(request.url, response.content, response.status_code, headers, request.method)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Answers requests from a FixtureStore without touching the network"""
+
+    def __init__(self, engine: 'HTTPFixtures', **kwargs):
+        self.engine = engine
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        engine = self.engine
+        key = FixtureStore.http_key(request.method, request.url)
+        delay, fail = engine.injected(key)
+        if delay:
+            time.sleep(delay if timeout is None else min(delay, self._timeout_seconds(timeout)))
+
+        entry = engine.store.get_response(request.method, request.url)
+        if entry is None:
+            engine.count('unmatched')
+            raise requests.ConnectionError(f"No recorded fixture for {key}", request=request)
+        if fail:
+            engine.count('injected_errors')
+            return build_response(request, engine.error_status, {'Content-Type': 'text/plain'}, b'injected error')
+        engine.count('replayed')
+        return build_response(request, entry['status'], entry['headers'],
+                              decode_body(entry['body'], entry.get('body_encoding')))
+
+    @staticmethod
+    def _timeout_seconds(timeout) -> float:
+        if isinstance(timeout, tuple):
+            return sum(part for part in timeout if part is not None)
+        return float(timeout)
+
+
+class HTTPFixtures:
+    """
+    Record/replay switch for the app's shared HTTP sessions and LLM response cache.
+
+    `record(path)` mounts a recording adapter on the shared sessions (the
+    HTTP response cache is bypassed so real bodies are captured) and saves
+    every response, plus every LLM response the pipeline stores or reuses,
+    to `path` on exit. `replay(path, ...)` serves those responses back with
+    injected latency and error rates; requests with no fixture fail like an
+    offline network. Injection is seeded per request and call count, so a
+    replay is reproducible whatever order concurrent requests run in.
+
+        with http_fixtures.replay('fixtures/nba_slate.json.gz', latency=0.15, error_rate=0.05):
+            games = DateBasedSportsManager().get_games_for_date_range(day, day, leagues)
+    """
+
+    def __init__(self, sessions: Optional[List[requests.Session]] = None):
+        self._sessions = sessions
+        self.store: Optional[FixtureStore] = None
+        self.mode: Optional[str] = None
+        self.latency = 0.0
+        self.jitter = 0.0
+        self.error_rate = 0.0
+        self.error_status = 503
+        self.seed = 0
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {'replayed': 0, 'unmatched': 0, 'injected_errors': 0, 'llm_replayed': 0, 'llm_unmatched': 0}
+
+    @property
+    def sessions(self) -> List[requests.Session]:
+        return self._sessions if self._sessions is not None else [http_session, espn_scoreboard.session]
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def injected(self, key: str):
+        """(latency seconds, inject an error?) for the next call of a request key"""
+        with self._lock:
+            call = self._calls.get(key, 0)
+            self._calls[key] = call + 1
+        digest = hashlib.sha256(f"{self.seed}|{key}|{call}".encode('utf-8')).hexdigest()
+        rng = random.Random(int(digest[:16], 16))
+        delay = max(self.latency * (1 + rng.uniform(-self.jitter, self.jitter)), 0.0)
+        return delay, rng.random() < self.error_rate
+
+    @contextmanager
+    def record(self, path: str) -> Iterator[FixtureStore]:
+        """Capture real HTTP and LLM responses made inside the block into `path`"""
+        store = FixtureStore(path)
+        if os.path.exists(path):
+            store.load()
+        with self._activated('record', store, lambda: RecordingAdapter(store)):
+            yield store
+        store.save()
+
+    @contextmanager
+    def replay(self, path: str, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+               error_status: int = 503, seed: int = 0) -> Iterator[FixtureStore]:
+        """
+        Serve HTTP and LLM calls inside the block from the fixtures at `path`.
+
+        Each HTTP request waits `latency` seconds (+/- `jitter` as a fraction)
+        and fails with `error_status` with probability `error_rate`.
+        Provider API keys are set to placeholders when missing so code paths
+        that check for a key still reach the LLM response cache.
+        """
+        store = FixtureStore(path).load()
+        self.latency, self.jitter, self.error_rate = latency, jitter, error_rate
+        self.error_status, self.seed = error_status, seed
+        placeholder_keys = [name for name in ('OPENAI_API_KEY', 'GOOGLE_API_KEY', 'ANTHROPIC_API_KEY')
+                            if not os.environ.get(name)]
+        for name in placeholder_keys:
+            os.environ[name] = 'fixture-replay'
+        try:
+            with self._activated('replay', store, lambda: ReplayAdapter(self)):
+                yield store
+        finally:
+            for name in placeholder_keys:
+                os.environ.pop(name, None)
+
+    def from_env(self):
+        """
+        record()/replay() as configured by HTTP_FIXTURES=record:<path> or
+        replay:<path> (plus HTTP_FIXTURES_LATENCY, _JITTER, _ERROR_RATE and
+        _SEED for replays); does nothing when HTTP_FIXTURES is unset.
+        """
+        mode, _, path = os.environ.get('HTTP_FIXTURES', '').partition(':')
+        if mode == 'record' and path:
+            return self.record(path)
+        if mode == 'replay' and path:
+            return self.replay(path,
+                               latency=float(os.environ.get('HTTP_FIXTURES_LATENCY', 0)),
+                               jitter=float(os.environ.get('HTTP_FIXTURES_JITTER', 0)),
+                               error_rate=float(os.environ.get('HTTP_FIXTURES_ERROR_RATE', 0)),
+                               seed=int(os.environ.get('HTTP_FIXTURES_SEED', 0)))
+        return nullcontext()
+
+    @contextmanager
+    def _activated(self, mode: str, store: FixtureStore, make_adapter):
+        if self.active:
+            raise RuntimeError(f"HTTP fixtures are already {self.mode}ing")
+        self.mode, self.store = mode, store
+        self._calls.clear()
+        self.stats = dict.fromkeys(self.stats, 0)
+        mounted = []
+        for session in self.sessions:
+            originals = {prefix: session.adapters[prefix] for prefix in ('https://', 'http://')}
+            adapter = make_adapter()
+            for prefix in originals:
+                session.mount(prefix, adapter)
+            mounted.append((session, originals))
+        llm_response_cache.fixtures = self
+        try:
+            yield
+        finally:
+            llm_response_cache.fixtures = None
+            for session, originals in mounted:
+                for prefix, adapter in originals.items():
+                    session.mount(prefix, adapter)
+            self.mode = None
+
+    def record_llm(self, provider: str, model: str, prompt: str, response: Dict):
+        if self.mode == 'record' and self.store is not None:
+            self.store.add_llm(provider, model, prompt, response)
+
+    def replay_llm(self, provider: str, model: str, prompt: str) -> Optional[Dict]:
+        key = f"LLM {llm_response_cache.make_key(provider, model, prompt)}"
+        delay, fail = self.injected(key)
+        response = self.store.get_llm(provider, model, prompt) if self.store is not None else None
+        if response is None or fail:
+            self.count('llm_unmatched')
+            return None
+        if delay:
+            time.sleep(delay)
+        self.count('llm_replayed')
+        return response
+
+
+@contextmanager
+def isolated_caches() -> Iterator[LocalStore]:
+    """
+    Point the store-backed caches (HTTP cache, scoreboard archive, schedule
+    index) at a throwaway store and clear the scoreboard client's recent
+    responses, so a benchmark measures the pipeline rather than leftovers
+    from earlier runs.
+    """
+    holders = [http_cache, scoreboard_archive, schedule_index]
+    originals = [holder.store for holder in holders]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalStore(db_path=os.path.join(tmp, 'local_store.db'))
+        for holder in holders:
+            holder.store = store
+        espn_scoreboard.clear()
+        try:
+            yield store
+        finally:
+            for holder, original in zip(holders, originals):
+                holder.store = original
+            espn_scoreboard.clear()
+
+
+# Global fixture switch for benchmark and test scripts
+http_fixtures = HTTPFixtures()
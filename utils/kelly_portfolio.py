@@ -0,0 +1,157 @@
+"""
+Kelly Portfolio - Simultaneous growth-optimal stakes for a slate of concurrent bets
+Every stake is solved for at once under bankroll and per-bet caps, instead of adding up single-bet Kelly fractions
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.value_engine import KELLY_FRACTION, MAX_KELLY_STAKE
+
+# Most of the bankroll a day's bets may have at risk together (after the Kelly fraction)
+MAX_DAILY_EXPOSURE = 0.25
+
+# Up to 2^12 joint outcomes are enumerated exactly; bigger slates are sampled
+EXACT_OUTCOME_LIMIT = 12
+SCENARIOS = 8192
+
+# Full-Kelly stakes never add up to the whole bankroll, so wealth stays positive when everything loses
+MAX_FULL_KELLY_TOTAL = 0.99
+
+
+def single_kelly(probability, decimal):
+    """Full Kelly fraction for each bet on its own: (p d - 1) / (d - 1), 0 without an edge"""
+    probability = np.asarray(probability, dtype=np.float64)
+    decimal = np.asarray(decimal, dtype=np.float64)
+    return np.clip((probability * decimal - 1.0) / (decimal - 1.0), 0.0, None)
+
+
+def project_capped(x: np.ndarray, upper: np.ndarray, total: float, iterations: int = 60) -> np.ndarray:
+    """Closest point to `x` with 0 <= f <= upper and sum(f) <= total (bisection on the sum's shift)"""
+    f = np.clip(x, 0.0, upper)
+    if f.sum() <= total:
+        return f
+    low, high = 0.0, float(x.max())
+    for _ in range(iterations):
+        shift = 0.5 * (low + high)
+        if np.clip(x - shift, 0.0, upper).sum() > total:
+            low = shift
+        else:
+            high = shift
+    return np.clip(x - high, 0.0, upper)
+
+
+class KellyPortfolioAllocator:
+    """
+    Stakes a slate of independent bets to maximize expected log bankroll growth.
+
+    The objective, sum over joint outcomes of P(outcome) * log(1 + returns . f),
+    is evaluated over every win/lose combination for small slates and over a
+    fixed set of sampled scenarios for bigger ones. Projected gradient ascent
+    with a backtracking step solves for full-Kelly stakes within the caps
+    (scaled up by the Kelly fraction), which are then scaled down by the
+    fraction. Single-bet Kelly sizes each bet as if it were the only one;
+    summed over a busy slate that stakes more than the bankroll can carry.
+    """
+
+    def __init__(self, fraction: float = KELLY_FRACTION, max_stake: float = MAX_KELLY_STAKE,
+                 max_exposure: float = MAX_DAILY_EXPOSURE, scenarios: int = SCENARIOS, seed: int = 0,
+                 max_iterations: int = 500, tolerance: float = 1e-8):
+        self.fraction = fraction
+        self.max_stake = max_stake
+        self.max_exposure = max_exposure
+        self.scenarios = scenarios
+        self.seed = seed
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    def outcomes(self, probabilities: np.ndarray):
+        """(wins, weights): one row per joint outcome, exact for small slates, sampled otherwise"""
+        n = len(probabilities)
+        if n <= EXACT_OUTCOME_LIMIT:
+            wins = ((np.arange(2 ** n)[:, None] >> np.arange(n)) & 1).astype(bool)
+            weights = np.where(wins, probabilities, 1.0 - probabilities).prod(axis=1)
+            return wins, weights
+        # Seeded, so the same slate always gets the same stakes
+        rng = np.random.default_rng(self.seed)
+        wins = rng.random((self.scenarios, n)) < probabilities
+        return wins, np.full(self.scenarios, 1.0 / self.scenarios)
+
+    def allocate(self, probabilities: Sequence[float], decimals: Sequence[float], bankroll: Optional[float] = None) -> Dict:
+        """
+        Bankroll fractions for bets with win `probabilities` at `decimals`
+        odds: 'fractions' (and 'stakes' given a bankroll), alongside the
+        single-bet Kelly fractions for comparison, expected log growth and
+        return, total exposure and solver diagnostics.
+        """
+        p = np.asarray(probabilities, dtype=np.float64)
+        d = np.asarray(decimals, dtype=np.float64)
+        n = len(p)
+        independent = np.minimum(single_kelly(p, d) * self.fraction, self.max_stake) if n else np.zeros(0)
+        result = {'fractions': np.zeros(n), 'independent_fractions': independent, 'expected_growth': 0.0,
+                  'expected_return': 0.0, 'exposure': 0.0, 'iterations': 0, 'converged': True}
+
+        # Bets without an edge never get a stake; they only add outcomes to average over
+        active = np.flatnonzero((p * d > 1.0) & (p > 0.0) & (d > 1.0))
+        if len(active):
+            fractions, iterations, converged = self._solve(p[active], d[active])
+            result['fractions'][active] = fractions * self.fraction
+            result['iterations'], result['converged'] = iterations, converged
+            wins, weights = self.outcomes(p[active])
+            returns = np.where(wins, d[active] - 1.0, -1.0)
+            result['expected_growth'] = float(weights @ np.log1p(returns @ result['fractions'][active]))
+
+        result['expected_return'] = float(result['fractions'] @ (p * d - 1.0)) if n else 0.0
+        result['exposure'] = float(result['fractions'].sum())
+        if bankroll is not None:
+            result['stakes'] = np.round(result['fractions'] * bankroll, 2)
+        return result
+
+    def _solve(self, p: np.ndarray, d: np.ndarray):
+        """Full-Kelly stakes maximizing expected log growth, within caps scaled up by the Kelly fraction"""
+        wins, weights = self.outcomes(p)
+        returns = np.where(wins, d - 1.0, -1.0)
+        upper = np.full(len(p), min(self.max_stake / self.fraction, MAX_FULL_KELLY_TOTAL))
+        total = min(self.max_exposure / self.fraction, MAX_FULL_KELLY_TOTAL)
+
+        def growth(f):
+            return float(weights @ np.log1p(returns @ f))
+
+        # Start from single-bet Kelly squeezed into the caps, with a step from the curvature at zero stakes
+        f = project_capped(single_kelly(p, d), upper, total)
+        value = growth(f)
+        curvature = np.linalg.eigvalsh((returns * weights[:, None]).T @ returns)[-1]
+        step = 1.0 / max(curvature, 1e-12)
+
+        for iteration in range(1, self.max_iterations + 1):
+            wealth = 1.0 + returns @ f
+            gradient = returns.T @ (weights / wealth)
+            while True:
+                candidate = project_capped(f + step * gradient, upper, total)
+                move = candidate - f
+                candidate_value = growth(candidate) if np.all(1.0 + returns @ candidate > 0) else -np.inf
+                # Sufficient increase for a concave objective, otherwise halve the step
+                if candidate_value >= value + gradient @ move - (move @ move) / (2 * step) or step < 1e-12:
+                    break
+                step *= 0.5
+            if np.abs(move).max() < self.tolerance:
+                return candidate, iteration, True
+            f, value = candidate, candidate_value
+            step *= 1.5
+        return f, self.max_iterations, False
+
+    def allocate_bets(self, bets: Sequence[Dict], bankroll: float) -> List[Dict]:
+        """Value engine bets with 'stake_fraction' and 'stake' filled in from one simultaneous solve"""
+        bets = [dict(bet) for bet in bets]
+        if not bets:
+            return bets
+        result = self.allocate([bet['win_prob'] for bet in bets], [bet['decimal'] for bet in bets], bankroll)
+        for bet, fraction, stake in zip(bets, result['fractions'], result['stakes']):
+            bet['stake_fraction'] = float(fraction)
+            bet['stake'] = float(stake)
+        return bets
+
+
+# Global allocator for the daily picks
+kelly_portfolio = KellyPortfolioAllocator()
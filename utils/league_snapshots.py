@@ -0,0 +1,209 @@
+"""
+League Snapshots - League-wide ESPN injuries, standings and recent results
+Each snapshot is one HTTP call per league per refresh interval, indexed by team id
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.espn_scoreboard import ESPN_BASE_URL, espn_scoreboard
+from utils.team_registry import team_registry
+
+# Seconds a snapshot is served before it's fetched again
+SNAPSHOT_TTLS = {
+    'injuries': 3600,
+    'standings': 6 * 3600,
+    'results': 3 * 3600,
+}
+
+# Days of finals kept per league for recent form (NFL plays weekly, so it needs a longer window)
+RESULTS_LOOKBACK_DAYS = {
+    'football/nfl': 49,
+    'football/college-football': 49,
+}
+DEFAULT_RESULTS_LOOKBACK_DAYS = 21
+
+ESPN_STANDINGS_URL = "https://site.api.espn.com/apis/v2/sports"
+
+
+class _Snapshot:
+    """One league-wide response, already indexed by ESPN team id"""
+
+    def __init__(self, by_team: Dict[str, Any], fetched_at: float):
+        self.by_team = by_team
+        self.fetched_at = fetched_at
+
+
+class LeagueSnapshotStore:
+    """
+    Process-wide league snapshots shared by every game analysis.
+
+    Injuries, standings and recent finals are each downloaded once per league
+    per `SNAPSHOT_TTLS` interval and indexed by team id, so a slate costs the
+    same few HTTP calls whether it has one game or fifty. Concurrent callers
+    wait for the fetch already in progress; a failed refresh keeps serving the
+    previous snapshot and isn't retried for `retry_seconds`.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, retry_seconds: float = 300, timeout: float = 8):
+        self.ttls = dict(SNAPSHOT_TTLS)
+        self.ttls.update(ttls or {})
+        self.retry_seconds = retry_seconds
+        self.timeout = timeout
+        self._snapshots: Dict[tuple, _Snapshot] = {}
+        self._failed_at: Dict[tuple, float] = {}
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {'fetches': 0, 'fetch_errors': 0, 'lookups': 0}
+
+        self._builders: Dict[str, Callable[[str], Optional[Dict[str, Any]]]] = {
+            'injuries': self._fetch_injuries,
+            'standings': self._fetch_standings,
+            'results': self._fetch_results,
+        }
+
+    def _lock_for(self, key: tuple) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _snapshot(self, league: str, kind: str) -> Optional[_Snapshot]:
+        """Current snapshot for a league, fetching it if it has expired"""
+        path = team_registry.league_path(league)
+        if not path:
+            return None
+        key = (path, kind)
+        self.stats['lookups'] += 1
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and time.time() - snapshot.fetched_at < self.ttls[kind]:
+            return snapshot
+
+        # One fetch per league and kind; concurrent callers wait and reuse it
+        with self._lock_for(key):
+            snapshot = self._snapshots.get(key)
+            now = time.time()
+            if snapshot is not None and now - snapshot.fetched_at < self.ttls[kind]:
+                return snapshot
+            if now - self._failed_at.get(key, 0) < self.retry_seconds:
+                return snapshot
+
+            self.stats['fetches'] += 1
+            try:
+                by_team = self._builders[kind](path)
+            except Exception:
+                by_team = None
+            if by_team is None:
+                self.stats['fetch_errors'] += 1
+                self._failed_at[key] = now
+                return snapshot
+
+            snapshot = self._snapshots[key] = _Snapshot(by_team, now)
+            self._failed_at.pop(key, None)
+            return snapshot
+
+    def get_injuries(self, league: str, team_id: str) -> List[Dict]:
+        """Raw ESPN injury entries for one team"""
+        snapshot = self._snapshot(league, 'injuries')
+        return snapshot.by_team.get(str(team_id), []) if snapshot else []
+
+    def get_standings(self, league: str, team_id: str) -> Dict[str, float]:
+        """Standings stats (wins, losses, pointsFor, ...) for one team"""
+        snapshot = self._snapshot(league, 'standings')
+        return snapshot.by_team.get(str(team_id), {}) if snapshot else {}
+
+    def get_recent_results(self, league: str, team_id: str, limit: int = 5) -> List[Dict]:
+        """A team's latest finals, oldest first: {'date', 'opponent_id', 'won', 'score', 'opponent_score'}"""
+        snapshot = self._snapshot(league, 'results')
+        return snapshot.by_team.get(str(team_id), [])[-limit:] if snapshot else []
+
+    def invalidate(self, league: Optional[str] = None):
+        """Drop snapshots (for one league, or all) so the next lookup refetches"""
+        path = team_registry.league_path(league) if league else None
+        for key in list(self._snapshots):
+            if path is None or key[0] == path:
+                self._snapshots.pop(key, None)
+                self._failed_at.pop(key, None)
+
+    def _get_json(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        response = espn_scoreboard.session.get(url, params=params, timeout=self.timeout)
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    def _fetch_injuries(self, path: str) -> Optional[Dict[str, List[Dict]]]:
+        data = self._get_json(f"{ESPN_BASE_URL}/{path}/injuries")
+        if data is None:
+            return None
+        by_team = {}
+        for entry in data.get('injuries', []):
+            team_id = entry.get('id') or (entry.get('team') or {}).get('id')
+            if team_id is None and entry.get('displayName'):
+                team_id = team_registry.resolve_id(path, entry['displayName'])
+            if team_id is not None:
+                by_team[str(team_id)] = entry.get('injuries', [])
+        return by_team
+
+    def _fetch_standings(self, path: str) -> Optional[Dict[str, Dict[str, float]]]:
+        data = self._get_json(f"{ESPN_STANDINGS_URL}/{path}/standings")
+        if data is None:
+            return None
+
+        by_team = {}
+
+        # Standings are nested by conference/division; entries can sit at any depth
+        def walk(node):
+            if isinstance(node, dict):
+                for entry in (node.get('standings') or {}).get('entries', []):
+                    team_id = (entry.get('team') or {}).get('id')
+                    if team_id is None:
+                        continue
+                    stats = {}
+                    for stat in entry.get('stats', []):
+                        name = stat.get('name') or stat.get('type')
+                        if name and isinstance(stat.get('value'), (int, float)):
+                            stats[name] = float(stat['value'])
+                    by_team[str(team_id)] = stats
+                for child in node.get('children', []):
+                    walk(child)
+
+        walk(data)
+        return by_team
+
+    def _fetch_results(self, path: str) -> Optional[Dict[str, List[Dict]]]:
+        today = datetime.now()
+        start = today - timedelta(days=RESULTS_LOOKBACK_DAYS.get(path, DEFAULT_RESULTS_LOOKBACK_DAYS))
+        data = self._get_json(
+            f"{ESPN_BASE_URL}/{path}/scoreboard",
+            params={'dates': f"{start:%Y%m%d}-{today:%Y%m%d}", 'limit': 1000},
+        )
+        if data is None:
+            return None
+
+        by_team: Dict[str, List[Dict]] = {}
+        for event in sorted(data.get('events', []), key=lambda e: e.get('date', '')):
+            if not ((event.get('status') or {}).get('type') or {}).get('completed'):
+                continue
+            competitors = ((event.get('competitions') or [{}])[0]).get('competitors', [])
+            if len(competitors) != 2:
+                continue
+            for team, opponent in (competitors, competitors[::-1]):
+                team_id = (team.get('team') or {}).get('id')
+                if team_id is None:
+                    continue
+                by_team.setdefault(str(team_id), []).append({
+                    'date': event.get('date', ''),
+                    'opponent_id': str((opponent.get('team') or {}).get('id', '')),
+                    'won': team.get('winner') is True,
+                    'score': team.get('score'),
+                    'opponent_score': opponent.get('score'),
+                })
+        return by_team
+
+
+# Global snapshots shared by every RealTimeDataEngine instance
+league_snapshots = LeagueSnapshotStore()
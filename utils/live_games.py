@@ -1,10 +1,23 @@
-import requests
+import calendar
 import pandas as pd
 from datetime import datetime, timedelta, date
 import streamlit as st
 import json
 from .date_helper import DateBasedSportsManager
 from utils.performance_cache import performance_cache
+from utils.espn_scoreboard import espn_scoreboard
+from utils.http_cache import http_session
+from utils.async_scoreboard import async_scoreboard
+from utils.scoreboard_archive import scoreboard_archive
+
+# Leagues shown on the monthly calendar
+CALENDAR_SPORTS = [
+    ('basketball', 'nba'),
+    ('basketball', 'wnba'),
+    ('baseball', 'mlb'),
+    ('football', 'nfl'),
+    ('hockey', 'nhl')
+]
 
 class LiveGamesManager:
     """Manager for fetching and displaying live/upcoming games with detailed information"""
@@ -34,16 +47,9 @@ class LiveGamesManager:
             league_key = league_mapping.get(sport, "nfl")
             
             # Add date parameter for specific dates - ESPN uses YYYYMMDD format
-            url = f"{self.espn_base_url}/{sport_key}/{league_key}/scoreboard"
-            if date:
-                # Ensure date is in correct format and add proper parameter
-                if len(date) == 8 and date.isdigit():
-                    url += f"?dates={date}"
-            
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
+            date_param = date if date and len(date) == 8 and date.isdigit() else None
             
-            data = response.json()
+            data = espn_scoreboard.get_scoreboard(sport_key, league_key, date_param, timeout=15) or {}
             games = []
             
             # Debug: log the API response structure
@@ -170,12 +176,6 @@ class LiveGamesManager:
         yesterday = target_datetime - timedelta(days=1)
         tomorrow = target_datetime + timedelta(days=1)
         
-        dates_to_check = [
-            yesterday.strftime('%Y%m%d'),
-            target_datetime.strftime('%Y%m%d'),
-            tomorrow.strftime('%Y%m%d')
-        ]
-        
         # ESPN Sports - Focus on working endpoints
         espn_sports = [
             # Basketball (Working)
@@ -199,42 +199,48 @@ class LiveGamesManager:
         if sport_filter:
             espn_sports = [(s, l) for s, l in espn_sports if s == sport_filter]
         
-        # Enhanced date-based fetching using DateBasedSportsManager
+        # Every league's scoreboard for yesterday/today/tomorrow (plus the current one) in one concurrent round;
+        # neighbouring days catch games whose UTC date falls on the target date
+        espn_games_df = async_scoreboard.fetch_games(
+            espn_sports, [yesterday, target_datetime, tomorrow], self.date_manager.parse_espn_event,
+            match_dates=[target_date]
+        )
+        if not espn_games_df.empty:
+            all_games.extend(espn_games_df.to_dict('records'))
+        found_leagues = set(espn_games_df['league']) if not espn_games_df.empty else set()
+        
         for sport, league in espn_sports:
+            if league.upper() in found_leagues:
+                if st.session_state.get('debug_mode', False):
+                    league_count = int((espn_games_df['league'] == league.upper()).sum())
+                    st.write(f"✅ Found {league_count} {sport}/{league} games for {target_date}")
+                continue
             try:
-                # Use enhanced date manager for specific date fetching
-                date_games = self.date_manager.fetch_espn_games_for_date(sport, league, target_date)
+                # Fallback to original method (the scoreboards are already cached from the concurrent round)
+                games_found = []
+                date_attempts = [
+                    target_datetime.strftime('%Y%m%d'),  # YYYYMMDD format
+                    target_datetime.strftime('%Y-%m-%d'), # YYYY-MM-DD format
+                    None  # Current games fallback
+                ]
+                
+                for date_str in date_attempts:
+                    try:
+                        games = self.get_espn_live_schedule(sport, league, date_str)
+                        if games and len(games) > 0:
+                            filtered_games = self.filter_games_by_date(games, target_date)
+                            if filtered_games:
+                                games_found.extend(filtered_games)
+                                break
+                    except Exception:
+                        continue
                 
-                if date_games:
-                    all_games.extend(date_games)
+                if games_found:
+                    all_games.extend(games_found)
                     if st.session_state.get('debug_mode', False):
-                        st.write(f"✅ Found {len(date_games)} {sport}/{league} games for {target_date}")
-                else:
-                    # Fallback to original method
-                    games_found = []
-                    date_attempts = [
-                        target_datetime.strftime('%Y%m%d'),  # YYYYMMDD format
-                        target_datetime.strftime('%Y-%m-%d'), # YYYY-MM-DD format
-                        None  # Current games fallback
-                    ]
-                    
-                    for date_str in date_attempts:
-                        try:
-                            games = self.get_espn_live_schedule(sport, league, date_str)
-                            if games and len(games) > 0:
-                                filtered_games = self.filter_games_by_date(games, target_date)
-                                if filtered_games:
-                                    games_found.extend(filtered_games)
-                                    break
-                        except Exception:
-                            continue
-                    
-                    if games_found:
-                        all_games.extend(games_found)
-                        if st.session_state.get('debug_mode', False):
-                            st.write(f"✅ Found {len(games_found)} {sport}/{league} games for {target_date} (fallback)")
-                    elif st.session_state.get('debug_mode', False):
-                        st.write(f"⚠️ No {sport}/{league} games found for {target_date}")
+                        st.write(f"✅ Found {len(games_found)} {sport}/{league} games for {target_date} (fallback)")
+                elif st.session_state.get('debug_mode', False):
+                    st.write(f"⚠️ No {sport}/{league} games found for {target_date}")
                     
             except Exception as e:
                 if st.session_state.get('debug_mode', False):
@@ -283,11 +289,9 @@ class LiveGamesManager:
         if (not sport_filter or sport_filter == 'basketball'):
             try:
                 # Directly fetch current WNBA games
-                wnba_url = "https://site.api.espn.com/apis/site/v2/sports/basketball/wnba/scoreboard"
-                response = requests.get(wnba_url, timeout=10)
+                data = espn_scoreboard.get_scoreboard('basketball', 'wnba')
                 
-                if response.status_code == 200:
-                    data = response.json()
+                if data:
                     events = data.get('events', [])
                     
                     for event in events:
@@ -357,13 +361,7 @@ class LiveGamesManager:
         """Get all games for a specific month for calendar view"""
         try:
             # Define sports to fetch
-            all_sports = [
-                ('basketball', 'nba'),
-                ('basketball', 'wnba'),
-                ('baseball', 'mlb'),
-                ('football', 'nfl'),
-                ('hockey', 'nhl')
-            ]
+            all_sports = CALENDAR_SPORTS
             
             if sport_filter:
                 all_sports = [(s, l) for s, l in all_sports if s == sport_filter]
@@ -389,6 +387,25 @@ class LiveGamesManager:
         else:
             return pd.DataFrame()
     
+    def get_monthly_game_counts(self, year, month, sport_filter=None):
+        """Games per day (YYYY-MM-DD) for the calendar grid, counted from the scoreboard archive"""
+        all_sports = CALENDAR_SPORTS
+        if sport_filter:
+            all_sports = [(s, l) for s, l in all_sports if s == sport_filter]
+        paths = [f"{sport}/{league}" for sport, league in all_sports]
+        days = [date(year, month, day) for day in range(1, calendar.monthrange(year, month)[1] + 1)]
+        
+        try:
+            # Only days not yet archived (or expired: today and later) are downloaded
+            missing = scoreboard_archive.missing(paths, days)
+            if missing:
+                async_scoreboard.fetch(missing)
+        except Exception as e:
+            if st.session_state.get('debug_mode', False):
+                st.write(f"⚠️ Monthly game count error: {str(e)}")
+        
+        return scoreboard_archive.game_counts(paths, days[0], days[-1])
+    
     def get_sportsdb_league_specific(self, league_id):
         """Get games from a specific TheSportsDB league"""
         try:
@@ -403,7 +420,7 @@ class LiveGamesManager:
             
             for url in urls:
                 try:
-                    response = requests.get(url, timeout=10)
+                    response = http_session.get(url, timeout=10)
                     if response.status_code == 200:
                         data = response.json()
                         if data.get('events'):
@@ -500,10 +517,10 @@ class LiveGamesManager:
                     next_url = f"{self.sportsdb_base_url}/eventsnextleague.php?id={league_id}"
                     
                     # Try past events first
-                    response = requests.get(past_url, timeout=10)
+                    response = http_session.get(past_url, timeout=10)
                     
                     # Also try upcoming events
-                    upcoming_response = requests.get(next_url, timeout=10)
+                    upcoming_response = http_session.get(next_url, timeout=10)
                     
                     # Process both past and upcoming events
                     events_to_process = []
@@ -616,7 +633,7 @@ class LiveGamesManager:
             url = f"{self.espn_base_url}/{sport}/{league}/summary"
             params = {'event': game_id}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -0,0 +1,204 @@
+"""
+Live Poller - Adaptive scoreboard polling driven by each watched game's state
+Polls live games often, ramps up near start time, and drops finished games
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytz
+
+from utils.espn_scoreboard import espn_scoreboard
+from utils.live_scores_api import LiveScoresAPI
+from utils.schedule_index import parse_start
+from utils.team_registry import teams_match
+
+# Seconds between polls for games that are under way
+LIVE_POLL_SECONDS = 20
+DELAYED_POLL_SECONDS = 120
+
+# (seconds until the scheduled start, poll interval) - the closer the start, the faster the polling
+PRE_GAME_POLL_SECONDS = [
+    (0, 30),            # Past the scheduled start but not live yet
+    (15 * 60, 60),
+    (60 * 60, 5 * 60),
+    (6 * 3600, 15 * 60),
+]
+FAR_FUTURE_POLL_SECONDS = 60 * 60
+UNKNOWN_START_POLL_SECONDS = 15 * 60
+
+# Stop watching a game whose scoreboard still doesn't list it this long after its start
+ABANDON_AFTER_SECONDS = 12 * 3600
+
+# States that never change again; these games are dropped instead of polled
+TERMINAL_STATES = {'final', 'postponed', 'canceled'}
+LIVE_STATES = {'live', 'halftime', 'overtime'}
+
+WatchKey = str
+ScoreboardKey = Tuple[str, Optional[str]]
+
+
+class LivePollScheduler:
+    """
+    Decides when each watched game's scoreboard is next needed and polls it.
+
+    Every game is polled according to its state: finished games are never
+    polled, live games every LIVE_POLL_SECONDS, and scheduled games on a
+    ramp that tightens as the start time approaches. A tick fetches each
+    (league, date) scoreboard at most once, however many of its games are
+    due, and updates every watched game on it from that one response.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._games: Dict[WatchKey, Dict] = {}
+        self._lock = threading.Lock()
+        self._states = LiveScoresAPI()
+        self.stats = {'ticks': 0, 'scoreboard_requests': 0, 'games_updated': 0, 'finished': 0, 'abandoned': 0}
+
+    def watch(self, key: WatchKey, league: str, home_team: str, away_team: str, start_time=None,
+              game_date: Optional[str] = None, event_id: Optional[str] = None,
+              state: str = 'scheduled') -> bool:
+        """Start watching a game; returns False for unknown leagues or already finished games"""
+        path = espn_scoreboard.resolve_league(league)
+        if path is None or state in TERMINAL_STATES:
+            return False
+        start = parse_start(start_time)
+        if game_date is None and start is not None:
+            # ESPN's scoreboard days are US Eastern
+            game_date = datetime.fromtimestamp(start, pytz.timezone('US/Eastern')).strftime('%Y-%m-%d')
+        with self._lock:
+            self._games[key] = {
+                'scoreboard': (f"{path[0]}/{path[1]}", espn_scoreboard.normalize_date(game_date)),
+                'home_team': home_team,
+                'away_team': away_team,
+                'event_id': str(event_id) if event_id else None,
+                'start': start,
+                'state': state,
+                'last_polled': None,
+                'event': None,
+            }
+        return True
+
+    def unwatch(self, key: WatchKey):
+        with self._lock:
+            self._games.pop(key, None)
+
+    def watched(self) -> Dict[WatchKey, Dict]:
+        with self._lock:
+            return {key: dict(game) for key, game in self._games.items()}
+
+    def interval_for(self, state: str, start: Optional[float], now: Optional[float] = None) -> Optional[float]:
+        """Seconds between polls for a game in `state`, or None if it never needs polling again"""
+        if state in TERMINAL_STATES:
+            return None
+        if state in LIVE_STATES:
+            return LIVE_POLL_SECONDS
+        if state == 'delayed':
+            return DELAYED_POLL_SECONDS
+        if start is None:
+            return UNKNOWN_START_POLL_SECONDS
+        until_start = start - (self.clock() if now is None else now)
+        for horizon, interval in PRE_GAME_POLL_SECONDS:
+            if until_start <= horizon:
+                return interval
+        return FAR_FUTURE_POLL_SECONDS
+
+    def next_poll_at(self, game: Dict, now: Optional[float] = None) -> Optional[float]:
+        now = self.clock() if now is None else now
+        interval = self.interval_for(game['state'], game['start'], now)
+        if interval is None:
+            return None
+        if game['last_polled'] is None:
+            return now
+        due = game['last_polled'] + interval
+        # A scheduled game's first poll after the start shouldn't wait out a long pre-game interval
+        if game['state'] == 'scheduled' and game['start'] is not None and game['last_polled'] < game['start']:
+            due = min(due, game['start'])
+        return due
+
+    def seconds_until_next_poll(self) -> Optional[float]:
+        """How long until any watched game is due (None when nothing is watched)"""
+        now = self.clock()
+        with self._lock:
+            due = [self.next_poll_at(game, now) for game in self._games.values()]
+        due = [when for when in due if when is not None]
+        return max(min(due) - now, 0.0) if due else None
+
+    def due_scoreboards(self, now: Optional[float] = None) -> List[ScoreboardKey]:
+        now = self.clock() if now is None else now
+        with self._lock:
+            due = {game['scoreboard'] for game in self._games.values()
+                   if (self.next_poll_at(game, now) or float('inf')) <= now}
+        return sorted(due, key=lambda key: (key[0], key[1] or ''))
+
+    def tick(self) -> List[Tuple[WatchKey, Dict, Dict]]:
+        """
+        Poll every due scoreboard once and update the games on it.
+
+        Returns (key, game, event) for games that reached a final (or other
+        terminal) state this tick; they are no longer watched afterwards.
+        """
+        self.stats['ticks'] += 1
+        finished, abandoned = [], []
+        for scoreboard in self.due_scoreboards():
+            self.stats['scoreboard_requests'] += 1
+            data = espn_scoreboard.get_scoreboard_by_path(scoreboard[0], scoreboard[1], fresh=True)
+            polled_at = self.clock()
+            events = (data or {}).get('events', [])
+
+            with self._lock:
+                games = [(key, game) for key, game in self._games.items() if game['scoreboard'] == scoreboard]
+            for key, game in games:
+                game['last_polled'] = polled_at
+                event = self._find_event(game, events)
+                if event is None:
+                    if game['start'] is not None and polled_at - game['start'] > ABANDON_AFTER_SECONDS:
+                        abandoned.append(key)
+                    continue
+                self.stats['games_updated'] += 1
+                game['event'] = event
+                game['event_id'] = game['event_id'] or str(event.get('id', ''))
+                game['state'] = self.state_of(event)
+                if event.get('date') and game['start'] is None:
+                    game['start'] = parse_start(event['date'])
+                if game['state'] in TERMINAL_STATES:
+                    finished.append((key, dict(game), event))
+
+        for key in [key for key, _, _ in finished] + abandoned:
+            self.unwatch(key)
+        self.stats['finished'] += len(finished)
+        self.stats['abandoned'] += len(abandoned)
+        return finished
+
+    def state_of(self, event: Dict) -> str:
+        """Standardized game state from an ESPN event, via LiveScoresAPI's status mapping"""
+        status = event.get('status') or (event.get('competitions') or [{}])[0].get('status') or {}
+        status_type = status.get('type') or {}
+        if status_type.get('completed'):
+            return 'final'
+        state = self._states._determine_game_state(status_type.get('name', ''), status_type.get('detail', ''))
+        # ESPN's coarse pre/in/post flag covers statuses the name mapping doesn't know (end of period, etc.)
+        if state == 'scheduled' and status_type.get('state') == 'in':
+            return 'live'
+        return state
+
+    @staticmethod
+    def _find_event(game: Dict, events: List[Dict]) -> Optional[Dict]:
+        for event in events:
+            if game['event_id'] and str(event.get('id')) == game['event_id']:
+                return event
+        for event in events:
+            competitors = ((event.get('competitions') or [{}])[0]).get('competitors', [])
+            home = next((c for c in competitors if c.get('homeAway') == 'home'), {})
+            away = next((c for c in competitors if c.get('homeAway') == 'away'), {})
+            if (teams_match(home.get('team', {}).get('displayName', ''), game['home_team']) and
+                    teams_match(away.get('team', {}).get('displayName', ''), game['away_team'])):
+                return event
+        return None
+
+
+# Global scheduler shared by the game monitor and the live scores page
+live_poller = LivePollScheduler()
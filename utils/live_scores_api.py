@@ -4,11 +4,12 @@ Fetches actual live scores and game status from ESPN APIs
 """
 
 import streamlit as st
-import requests
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import pytz
+from utils.espn_scoreboard import espn_scoreboard
+from utils.http_cache import http_session
 
 class LiveScoresAPI:
     """
@@ -17,10 +18,7 @@ class LiveScoresAPI:
     
     def __init__(self):
         self.espn_base = "https://site.api.espn.com/apis/site/v2/sports"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.session = http_session
         
         # Sport endpoint mappings
         self.sport_endpoints = {
@@ -58,18 +56,12 @@ class LiveScoresAPI:
             return []
         
         try:
-            # ESPN scoreboard URL with date
-            url = f"{self.espn_base}/{endpoint}/scoreboard"
+            # Shared ESPN scoreboard client (ESPN uses YYYYMMDD format)
+            data = espn_scoreboard.get_scoreboard_by_path(endpoint, date_str)
             
-            # Add date parameter
-            params = {'dates': date_str.replace('-', '')}  # ESPN uses YYYYMMDD format
-            
-            response = self.session.get(url, params=params, timeout=10)
-            
-            if response.status_code != 200:
+            if not data:
                 return []
             
-            data = response.json()
             games = []
             
             # Parse ESPN scoreboard response
@@ -187,6 +179,7 @@ class LiveScoresAPI:
                 'away_team': away_team,
                 'status': game_state,
                 'status_detail': status_short_detail,
+                'start_time': date_str,
                 'game_time': game_time,
                 'venue': venue_name,
                 'period_info': period_info,
@@ -201,10 +194,21 @@ class LiveScoresAPI:
                 st.write(f"Debug: Error parsing ESPN game: {e}")
             return None
 
+    def suggested_refresh_seconds(self, all_scores: Dict[str, List[Dict]]) -> Optional[float]:
+        """Seconds until these scores are worth refreshing, using the live poller's per-state intervals"""
+        from utils.live_poller import live_poller
+        from utils.schedule_index import parse_start
+
+        intervals = [live_poller.interval_for(game.get('status', 'scheduled'), parse_start(game.get('start_time')))
+                     for games in all_scores.values() for game in games]
+        intervals = [interval for interval in intervals if interval is not None]
+        return min(intervals) if intervals else None
+
     def _determine_game_state(self, status_name: str, status_detail: str) -> str:
         """Determine standardized game state from ESPN status"""
         
-        status_lower = status_name.lower()
+        # ESPN names look like STATUS_IN_PROGRESS
+        status_lower = status_name.lower().replace('_', ' ')
         detail_lower = status_detail.lower()
         
         if 'final' in status_lower:
@@ -0,0 +1,262 @@
+"""
+LLM Response Cache - Persistent content-addressed cache for AI provider responses
+Shared by every session and worker on a host through a local SQLite file
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# Approximate $ per 1K tokens, matching the track_api_usage pricing
+MODEL_COST_PER_1K = {
+    'gpt-4o': 0.06,
+    'gpt-4o-mini': 0.0006,
+    'gemini-2.5-pro': 0.002,
+    'gemini-1.5-flash': 0.002,
+    'gemini-2.5-flash': 0.002,
+    'claude-3.5-sonnet-20240620': 0.015,
+}
+
+# (hours until the game starts, TTL in seconds) - the closer the game, the shorter the TTL
+GAME_PROXIMITY_TTLS = [
+    (1, 15 * 60),
+    (6, 60 * 60),
+    (24, 3 * 60 * 60),
+    (72, 12 * 60 * 60),
+]
+DEFAULT_TTL_SECONDS = 60 * 60
+FAR_FUTURE_TTL_SECONDS = 24 * 60 * 60
+
+# Expired responses are purged on the first write and then every this many writes
+PURGE_EVERY_WRITES = 200
+
+
+class LLMResponseCache:
+    """
+    Disk-backed LLM response cache keyed by hash(provider, model, normalized prompt).
+
+    Only successful responses are stored. Every lookup updates host-wide
+    hit/miss/dollars-saved counters and notifies registered listeners so the
+    app's API usage accounting can record cache savings.
+    """
+
+    def __init__(self, cache_dir: str = ".local/llm_cache"):
+        self.cache_dir = cache_dir
+        self.db_path = os.path.join(cache_dir, "responses.db")
+        self._local = threading.local()
+        self._listeners: List[Callable[[str, bool, float], None]] = []
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        self._writes = 0
+        # Set by the HTTP fixture engine while recording or replaying provider responses
+        self.fixtures = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread SQLite connection (WAL mode lets several processes share the file)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._schema_ready:
+            with self._schema_lock:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        provider TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        expires_at REAL NOT NULL,
+                        est_cost REAL NOT NULL DEFAULT 0
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses (expires_at);
+                    CREATE TABLE IF NOT EXISTS stats (
+                        provider TEXT PRIMARY KEY,
+                        hits INTEGER NOT NULL DEFAULT 0,
+                        misses INTEGER NOT NULL DEFAULT 0,
+                        cost_saved REAL NOT NULL DEFAULT 0
+                    );
+                """)
+                self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """Collapse whitespace so indentation changes don't defeat the cache"""
+        return re.sub(r'\s+', ' ', str(prompt)).strip()
+
+    def make_key(self, provider: str, model: str, prompt: str) -> str:
+        """Content address for a (provider, model, prompt) triple"""
+        payload = f"{provider.lower()}\x1f{model}\x1f{self.normalize_prompt(prompt)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def estimate_cost(model: str, prompt: str, max_output_tokens: int = 500) -> float:
+        """Rough $ cost of one call: ~4 characters per prompt token plus the output budget"""
+        tokens = len(str(prompt)) / 4 + max_output_tokens
+        return tokens / 1000 * MODEL_COST_PER_1K.get(model, 0.01)
+
+    @staticmethod
+    def ttl_for_game(game_data: Optional[Dict]) -> int:
+        """Pick a TTL from how far away the game is; near or live games go stale fastest"""
+        start = LLMResponseCache._game_start(game_data or {})
+        if start is None:
+            return DEFAULT_TTL_SECONDS
+
+        hours_until = (start - datetime.now(timezone.utc)).total_seconds() / 3600
+        for max_hours, ttl in GAME_PROXIMITY_TTLS:
+            if hours_until < max_hours:
+                return ttl
+        return FAR_FUTURE_TTL_SECONDS
+
+    @staticmethod
+    def _game_start(game_data: Dict) -> Optional[datetime]:
+        """Best-effort game start time from commence_time or date fields"""
+        commence = game_data.get('commence_time')
+        if commence:
+            try:
+                start = datetime.fromisoformat(str(commence).replace('Z', '+00:00'))
+                return start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+            except ValueError:
+                pass
+
+        game_date = game_data.get('date')
+        if game_date and game_date != 'Unknown':
+            try:
+                # Date only: assume an evening start (23:00 UTC ~ 7 PM ET)
+                return datetime.strptime(str(game_date)[:10], '%Y-%m-%d').replace(hour=23, tzinfo=timezone.utc)
+            except ValueError:
+                pass
+        return None
+
+    def add_listener(self, callback: Callable[[str, bool, float], None]):
+        """Register callback(provider, hit, cost_saved) invoked on every lookup"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def get(self, provider: str, model: str, prompt: str) -> Optional[Dict]:
+        """Return the cached response, or None on a miss or expired entry"""
+        fixtures = self.fixtures
+        if fixtures is not None and fixtures.replaying:
+            return fixtures.replay_llm(provider, model, prompt)
+
+        key = self.make_key(provider, model, prompt)
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT response, est_cost FROM responses WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        hit = row is not None
+        saved = row[1] if hit else 0.0
+        self._record_lookup(provider, hit, saved)
+        if not hit:
+            return None
+        response = json.loads(row[0])
+        if fixtures is not None:
+            fixtures.record_llm(provider, model, prompt, response)
+        return response
+
+    def set(self, provider: str, model: str, prompt: str, response: Dict,
+            ttl_seconds: int = DEFAULT_TTL_SECONDS, max_output_tokens: int = 500):
+        """Store a successful response; error payloads are never cached"""
+        if not isinstance(response, dict) or 'error' in response:
+            return
+        fixtures = self.fixtures
+        if fixtures is not None:
+            if fixtures.replaying:
+                return
+            fixtures.record_llm(provider, model, prompt, response)
+
+        now = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, provider, model, response, created_at, expires_at, est_cost) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self.make_key(provider, model, prompt), provider, model,
+                     json.dumps(response, default=str), now, now + ttl_seconds,
+                     self.estimate_cost(model, prompt, max_output_tokens))
+                )
+        except (sqlite3.Error, TypeError, ValueError):
+            return
+        self._writes += 1
+        if self._writes % PURGE_EVERY_WRITES == 1:
+            self.purge_expired()
+
+    def get_or_call(self, provider: str, model: str, prompt: str, call: Callable[[], Dict],
+                    ttl_seconds: int = DEFAULT_TTL_SECONDS, max_output_tokens: int = 500) -> Dict:
+        """Serve from cache, or run the provider call and cache a successful result"""
+        cached = self.get(provider, model, prompt)
+        if cached is not None:
+            return cached
+        result = call()
+        self.set(provider, model, prompt, result, ttl_seconds, max_output_tokens)
+        return result
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed"""
+        try:
+            conn = self._connect()
+            with conn:
+                return conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),)).rowcount
+        except sqlite3.Error:
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Host-wide hit/miss counts and dollars saved, per provider and in total"""
+        stats = {'providers': {}, 'hits': 0, 'misses': 0, 'cost_saved': 0.0, 'entries': 0}
+        try:
+            conn = self._connect()
+            for provider, hits, misses, cost_saved in conn.execute(
+                    "SELECT provider, hits, misses, cost_saved FROM stats"):
+                stats['providers'][provider] = {'hits': hits, 'misses': misses, 'cost_saved': cost_saved}
+                stats['hits'] += hits
+                stats['misses'] += misses
+                stats['cost_saved'] += cost_saved
+            stats['entries'] = conn.execute(
+                "SELECT COUNT(*) FROM responses WHERE expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+        except sqlite3.Error:
+            pass
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] / lookups * 100) if lookups else 0
+        return stats
+
+    def _record_lookup(self, provider: str, hit: bool, cost_saved: float):
+        """Update the shared counters and notify listeners"""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO stats (provider, hits, misses, cost_saved) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(provider) DO UPDATE SET hits = hits + excluded.hits, "
+                    "misses = misses + excluded.misses, cost_saved = cost_saved + excluded.cost_saved",
+                    (provider, int(hit), int(not hit), cost_saved)
+                )
+        except sqlite3.Error:
+            pass
+
+        for callback in list(self._listeners):
+            try:
+                callback(provider, hit, cost_saved)
+            except Exception:
+                continue
+
+
+# Global response cache shared by all AI entry points
+llm_response_cache = LLMResponseCache()
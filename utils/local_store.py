@@ -0,0 +1,233 @@
+"""
+Local Store - Single indexed on-disk store for the app's prediction and odds caches
+Replaces the JSON-file-per-key cache directories with one SQLite file
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+# Expired entries are purged on the first write and then every this many writes
+PURGE_EVERY_WRITES = 500
+
+
+class LocalStore:
+    """
+    Namespaced key/value store backed by one SQLite file.
+
+    Every entry carries its own expiry, payload size and a few metadata
+    columns (date, sports, item count) so listing and stats queries never
+    have to deserialize payloads. Per-namespace totals are kept in a summary
+    table by triggers, which keeps the stats query O(1) however many
+    entries have accumulated.
+    """
+
+    def __init__(self, db_path: str = ".local/local_store.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread SQLite connection (WAL mode lets several processes share the file)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # REPLACE only fires delete triggers with recursive triggers enabled
+            conn.execute("PRAGMA recursive_triggers=ON")
+            self._local.conn = conn
+        if not self._schema_ready:
+            with self._schema_lock:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS entries (
+                        namespace TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        expires_at REAL NOT NULL,
+                        date TEXT,
+                        sports TEXT,
+                        item_count INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (namespace, key)
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_entries_created ON entries (namespace, created_at);
+                    CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries (namespace, expires_at);
+                    CREATE INDEX IF NOT EXISTS idx_entries_date ON entries (namespace, date);
+
+                    CREATE TABLE IF NOT EXISTS namespace_stats (
+                        namespace TEXT PRIMARY KEY,
+                        entries INTEGER NOT NULL DEFAULT 0,
+                        total_size INTEGER NOT NULL DEFAULT 0,
+                        last_write REAL NOT NULL DEFAULT 0
+                    );
+                    CREATE TRIGGER IF NOT EXISTS trg_entries_insert AFTER INSERT ON entries BEGIN
+                        INSERT INTO namespace_stats (namespace, entries, total_size, last_write)
+                        VALUES (NEW.namespace, 1, NEW.size, NEW.created_at)
+                        ON CONFLICT(namespace) DO UPDATE SET
+                            entries = entries + 1,
+                            total_size = total_size + NEW.size,
+                            last_write = MAX(last_write, NEW.created_at);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS trg_entries_delete AFTER DELETE ON entries BEGIN
+                        UPDATE namespace_stats
+                        SET entries = entries - 1, total_size = total_size - OLD.size
+                        WHERE namespace = OLD.namespace;
+                    END;
+                """)
+                self._schema_ready = True
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the stored payload, or None if missing or expired"""
+        try:
+            row = self._connect().execute(
+                "SELECT payload FROM entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, time.time())
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, payload: Any, ttl_seconds: float,
+            date: Optional[str] = None, sports: Optional[List[str]] = None, item_count: int = 0) -> bool:
+        """Write (or replace) one entry atomically"""
+        try:
+            encoded = json.dumps(payload, default=str)
+        except (TypeError, ValueError):
+            return False
+
+        now = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                # INSERT OR REPLACE deletes the old row first, so the triggers keep totals exact
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(namespace, key, payload, size, created_at, expires_at, date, sports, item_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (namespace, key, encoded, len(encoded.encode('utf-8')), now, now + ttl_seconds,
+                     date, ', '.join(sports) if sports else None, int(item_count))
+                )
+        except sqlite3.Error:
+            return False
+        self._writes += 1
+        if self._writes % PURGE_EVERY_WRITES == 1:
+            self.purge_expired()
+        return True
+
+    def delete(self, namespace: str, key: str) -> bool:
+        """Remove one entry; returns True if it existed"""
+        try:
+            conn = self._connect()
+            with conn:
+                return conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+                ).rowcount > 0
+        except sqlite3.Error:
+            return False
+
+    def clear(self, namespace: str, older_than_seconds: Optional[float] = None) -> int:
+        """Delete a namespace's entries (optionally only those written before the cutoff)"""
+        query = "DELETE FROM entries WHERE namespace = ?"
+        params: List[Any] = [namespace]
+        if older_than_seconds is not None:
+            query += " AND created_at < ?"
+            params.append(time.time() - older_than_seconds)
+        try:
+            conn = self._connect()
+            with conn:
+                return conn.execute(query, params).rowcount
+        except sqlite3.Error:
+            return 0
+
+    def purge_expired(self, namespace: Optional[str] = None) -> int:
+        """Delete expired entries and return how many were removed"""
+        query = "DELETE FROM entries WHERE expires_at <= ?"
+        params: List[Any] = [time.time()]
+        if namespace is not None:
+            query += " AND namespace = ?"
+            params.append(namespace)
+        try:
+            conn = self._connect()
+            with conn:
+                return conn.execute(query, params).rowcount
+        except sqlite3.Error:
+            return 0
+
+    def get_stats(self, namespace: str) -> Dict[str, Any]:
+        """Unexpired entry count, total payload bytes and last write time from the summary table"""
+        stats = {'entries': 0, 'total_size': 0, 'last_write': None}
+        # Drop the namespace's expired entries first so the trigger-kept totals only count live ones
+        self.purge_expired(namespace)
+        try:
+            row = self._connect().execute(
+                "SELECT entries, total_size, last_write FROM namespace_stats WHERE namespace = ?",
+                (namespace,)
+            ).fetchone()
+        except sqlite3.Error:
+            return stats
+        if row and row[0] > 0:
+            stats.update({'entries': row[0], 'total_size': row[1], 'last_write': row[2]})
+        return stats
+
+    def live_keys(self, namespace: str, keys: List[str]) -> Set[str]:
+        """Which of `keys` have an unexpired entry (checks the index only, no payloads)"""
+        present: Set[str] = set()
+        now = time.time()
+        try:
+            conn = self._connect()
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT key FROM entries WHERE namespace = ? AND expires_at > ? "
+                    f"AND key IN ({', '.join('?' * len(chunk))})",
+                    [namespace, now, *chunk]
+                ).fetchall()
+                present.update(row[0] for row in rows)
+        except sqlite3.Error:
+            return set()
+        return present
+
+    def sum_item_counts(self, namespace: str, date_from: str, date_to: str,
+                        sports: Optional[List[str]] = None) -> Dict[str, int]:
+        """Total item_count per date for unexpired entries in a date range (optionally only some sports)"""
+        query = ("SELECT date, SUM(item_count) FROM entries "
+                 "WHERE namespace = ? AND date BETWEEN ? AND ? AND expires_at > ?")
+        params: List[Any] = [namespace, date_from, date_to, time.time()]
+        if sports:
+            query += f" AND sports IN ({', '.join('?' * len(sports))})"
+            params.extend(sports)
+        try:
+            rows = self._connect().execute(query + " GROUP BY date", params).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {day: int(total) for day, total in rows if total}
+
+    def list_entries(self, namespace: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Newest unexpired entries' metadata (never the payloads)"""
+        try:
+            rows = self._connect().execute(
+                "SELECT key, date, sports, item_count, size, created_at, expires_at FROM entries "
+                "WHERE namespace = ? AND expires_at > ? ORDER BY created_at DESC LIMIT ?",
+                (namespace, time.time(), limit)
+            ).fetchall()
+        except sqlite3.Error:
+            return []
+        return [
+            {'key': key, 'date': date, 'sports': sports, 'item_count': item_count, 'size': size,
+             'created_at': created_at, 'expires_at': expires_at}
+            for key, date, sports, item_count, size, created_at, expires_at in rows
+        ]
+
+
+# Global store shared by the prediction and odds caches
+local_store = LocalStore()
@@ -9,6 +9,9 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import streamlit as st
 
+from utils.odds_history import movement_signal
+from utils.odds_ingestion import odds_ingestion
+
 class MultiLayerAnalyzer:
     """Advanced multi-layer analysis: Quantitative → Real-time → LLM → Final"""
     
@@ -259,10 +262,10 @@ class RealtimeAdjuster:
             adjustments.append(f"Weather factor: {weather_impact['description']}")
         
         # Line movement adjustments
-        line_movement = self._assess_line_movement(game_data)
+        line_movement = self._assess_line_movement(game_data, baseline_analysis.get('predicted_winner'))
         if line_movement['significant']:
             confidence_modifier *= line_movement['confidence_impact']
-            adjustments.append(f"Sharp money: {line_movement['description']}")
+            adjustments.append(f"Line movement: {line_movement['description']}")
         
         # News sentiment adjustments
         news_impact = self._assess_news_sentiment(game_data)
@@ -338,27 +341,22 @@ class RealtimeAdjuster:
         
         return {'significant': False}
     
-    def _assess_line_movement(self, game_data: Dict) -> Dict:
-        """Assess betting line movement patterns"""
+    def _assess_line_movement(self, game_data: Dict, predicted_winner: Optional[str] = None) -> Dict:
+        """Assess recorded line movement for or against the predicted side"""
         
-        # Simulate line movement analysis
-        movement_significance = np.random.random()
+        signal = movement_signal(odds_ingestion.line_movement(game_data))
+        if not signal['significant'] or signal['favours'] is None:
+            return {'significant': False}
         
-        if movement_significance > 0.6:  # 40% chance of significant movement
-            direction = np.random.choice(['sharp_money', 'public_fade', 'steam_move'])
-            
-            impact_map = {
-                'sharp_money': {'confidence_impact': 1.08, 'description': 'Sharp money moving line'},
-                'public_fade': {'confidence_impact': 1.05, 'description': 'Contrarian opportunity detected'},
-                'steam_move': {'confidence_impact': 1.12, 'description': 'Steam move indicating strong consensus'}
-            }
-            
-            return {
-                'significant': True,
-                **impact_map[direction]
-            }
+        side = game_data.get(f"{signal['favours']}_team", {}).get('name', signal['favours'])
+        supports_pick = predicted_winner is not None and side == predicted_winner
+        strength = 'Steam move' if signal['steam'] else 'Line moved'
         
-        return {'significant': False}
+        return {
+            'significant': True,
+            'confidence_impact': (1.08 if signal['steam'] else 1.04) if supports_pick else (0.90 if signal['steam'] else 0.95),
+            'description': f"{strength} toward {side}" + ("" if supports_pick else " (against the pick)")
+        }
     
     def _assess_news_sentiment(self, game_data: Dict) -> Dict:
         """Assess news sentiment impact"""
@@ -1,10 +1,13 @@
 import os
-import requests
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
 from typing import Dict, List, Optional
 import streamlit as st
-from utils.performance_cache import performance_cache
+from utils.http_cache import http_session
+from utils.odds_engine import AWAY, HOME, OddsMatrix, decimal_to_american, format_american, market_scanner
+from utils.odds_history import implied_probability
+from utils.odds_ingestion import DEFAULT_SPORT_KEYS, odds_ingestion
 
 class OddsAPIManager:
     """Manager for The Odds API integration"""
@@ -30,7 +33,7 @@ class OddsAPIManager:
                 'apiKey': self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 sports_data = response.json()
@@ -43,9 +46,13 @@ class OddsAPIManager:
                 st.write(f"⚠️ Sports API error: {str(e)}")
             return []
     
-    @performance_cache.cached_function(max_age=300)  # Cache for 5 minutes
     def get_odds_for_sport(self, sport_key: str, regions: str = "us", markets: str = "h2h") -> List[Dict]:
         """Get odds for a specific sport"""
+        # Markets the ingestion planner already fetches come from its index
+        if set(markets.split(',')) <= set(odds_ingestion.markets) and regions == ','.join(odds_ingestion.regions):
+            odds_ingestion.ensure_fresh([sport_key], api_key=self.api_key)
+            return odds_ingestion.events_for(sport_key)
+
         try:
             url = f"{self.base_url}/sports/{sport_key}/odds/"
             params = {
@@ -56,7 +63,7 @@ class OddsAPIManager:
                 'dateFormat': 'iso'
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            response = http_session.get(url, params=params, timeout=15)
             
             if response.status_code == 200:
                 odds_data = response.json()
@@ -73,145 +80,122 @@ class OddsAPIManager:
     
     def get_comprehensive_odds(self) -> pd.DataFrame:
         """Get odds for all major sports"""
-        all_odds = []
+        # Major sports, fetched concurrently with every market in one request each
+        sports_to_fetch = DEFAULT_SPORT_KEYS
+        odds_ingestion.ensure_fresh(sports_to_fetch, api_key=self.api_key)
+        return self.build_odds_frame(sports_to_fetch)
+    
+    def build_odds_frame(self, sport_keys: List[str]) -> pd.DataFrame:
+        """One row per indexed game with its best moneyline prices, priced in a single scan"""
+        events = []
+        for sport_key in sport_keys:
+            events.extend(dict(event, sport_key=event.get('sport_key', sport_key))
+                          for event in odds_ingestion.events_for(sport_key))
+        if not events:
+            return pd.DataFrame()
         
-        # Major sports to fetch
-        sports_to_fetch = [
-            'americanfootball_nfl',
-            'basketball_nba', 
-            'basketball_wnba',
-            'baseball_mlb',
-            'icehockey_nhl'
-        ]
+        result = market_scanner.scan_events(events, markets=['h2h'])['h2h']
+        matrix, scan = result['matrix'], result['scan']
+        all_odds = []
         
-        for sport_key in sports_to_fetch:
-            try:
-                odds_data = self.get_odds_for_sport(sport_key)
-                
-                for game in odds_data:
-                    # Parse game data
-                    home_team = game.get('home_team', 'Unknown')
-                    away_team = game.get('away_team', 'Unknown')
-                    commence_time = game.get('commence_time', '')
-                    
-                    # Parse commence time
-                    game_date = 'TBD'
-                    game_time = 'TBD'
-                    
-                    if commence_time:
-                        try:
-                            dt = datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
-                            game_date = dt.strftime('%Y-%m-%d')
-                            game_time = dt.strftime('%I:%M %p ET')
-                        except:
-                            pass
-                    
-                    # Get best odds from bookmakers
-                    best_odds = self.extract_best_odds(game.get('bookmakers', []))
-                    
-                    game_odds = {
-                        'game_id': game.get('id', ''),
-                        'sport': self.sports_mapping.get(sport_key, sport_key),
-                        'home_team': home_team,
-                        'away_team': away_team,
-                        'game_name': f"{away_team} @ {home_team}",
-                        'date': game_date,
-                        'time': game_time,
-                        'commence_time': commence_time,
-                        'home_odds': best_odds.get('home_odds', 'N/A'),
-                        'away_odds': best_odds.get('away_odds', 'N/A'),
-                        'best_bookmaker': best_odds.get('bookmaker', 'N/A'),
-                        'source': 'The Odds API'
-                    }
-                    
-                    all_odds.append(game_odds)
-                    
-            except Exception as e:
-                continue
+        for g, game in enumerate(matrix.games):
+            home_team = game.get('home_team') or 'Unknown'
+            away_team = game.get('away_team') or 'Unknown'
+            commence_time = game.get('commence_time') or ''
+            
+            # Parse commence time
+            game_date = 'TBD'
+            game_time = 'TBD'
+            
+            if commence_time:
+                try:
+                    dt = datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
+                    game_date = dt.strftime('%Y-%m-%d')
+                    game_time = dt.strftime('%I:%M %p ET')
+                except:
+                    pass
+            
+            has_home = np.isfinite(scan['best_decimal'][g, HOME])
+            has_away = np.isfinite(scan['best_decimal'][g, AWAY])
+            all_odds.append({
+                'game_id': game.get('id') or '',
+                'sport': self.sports_mapping.get(game['sport_key'], game['sport_key']),
+                'home_team': home_team,
+                'away_team': away_team,
+                'game_name': f"{away_team} @ {home_team}",
+                'date': game_date,
+                'time': game_time,
+                'commence_time': commence_time,
+                'home_odds': format_american(scan['best_price'][g, HOME]),
+                'away_odds': format_american(scan['best_price'][g, AWAY]),
+                'best_bookmaker': matrix.book_titles[scan['best_book'][g, HOME]] if has_home else 'N/A',
+                'away_bookmaker': matrix.book_titles[scan['best_book'][g, AWAY]] if has_away else 'N/A',
+                'home_fair_prob': scan['consensus'][g, HOME],
+                'away_fair_prob': scan['consensus'][g, AWAY],
+                'source': 'The Odds API'
+            })
         
-        if all_odds:
-            return pd.DataFrame(all_odds)
-        else:
-            return pd.DataFrame()
+        return pd.DataFrame(all_odds)
     
-    def extract_best_odds(self, bookmakers: List[Dict]) -> Dict:
-        """Extract best odds from bookmakers"""
+    def extract_best_odds(self, bookmakers: List[Dict], home_team: Optional[str] = None,
+                          away_team: Optional[str] = None) -> Dict:
+        """Extract best moneyline odds (and the book offering each) from bookmakers"""
         if not bookmakers:
             return {'home_odds': 'N/A', 'away_odds': 'N/A', 'bookmaker': 'N/A'}
         
-        best_home = None
-        best_away = None
-        best_bookmaker = 'N/A'
+        if home_team is None or away_team is None:
+            # Without team names, the first book's outcome order decides home/away
+            names = [outcome.get('name', '') for bookmaker in bookmakers for market in bookmaker.get('markets', [])
+                     if market.get('key') == 'h2h' for outcome in market.get('outcomes', [])
+                     if outcome.get('name', '').lower() != 'draw']
+            home_team = home_team or (names[0] if names else '')
+            away_team = away_team or next((name for name in names if name != home_team), '')
         
-        for bookmaker in bookmakers:
-            bookmaker_name = bookmaker.get('title', 'Unknown')
-            markets = bookmaker.get('markets', [])
-            
-            for market in markets:
-                if market.get('key') == 'h2h':
-                    outcomes = market.get('outcomes', [])
-                    
-                    for outcome in outcomes:
-                        team_name = outcome.get('name', '')
-                        odds = outcome.get('price', 0)
-                        
-                        # Convert to American odds if needed
-                        if isinstance(odds, (int, float)) and odds > 0:
-                            if odds >= 2.0:
-                                american_odds = f"+{int((odds - 1) * 100)}"
-                            else:
-                                american_odds = f"-{int(100 / (odds - 1))}"
-                        else:
-                            american_odds = str(odds)
-                        
-                        # Track best odds (highest positive, lowest negative)
-                        if team_name and odds:
-                            if not best_home:
-                                best_home = american_odds
-                                best_bookmaker = bookmaker_name
-                            if not best_away:
-                                best_away = american_odds
+        result = market_scanner.scan_events([{'home_team': home_team, 'away_team': away_team,
+                                              'bookmakers': bookmakers}], markets=['h2h'])['h2h']
+        matrix, scan = result['matrix'], result['scan']
+        if not np.isfinite(scan['best_decimal'][0, HOME]):
+            return {'home_odds': 'N/A', 'away_odds': 'N/A', 'bookmaker': 'N/A'}
         
         return {
-            'home_odds': best_home or 'N/A',
-            'away_odds': best_away or 'N/A', 
-            'bookmaker': best_bookmaker
+            'home_odds': format_american(scan['best_price'][0, HOME]),
+            'away_odds': format_american(scan['best_price'][0, AWAY]),
+            'bookmaker': matrix.book_titles[scan['best_book'][0, HOME]],
+            'away_bookmaker': matrix.book_titles[scan['best_book'][0, AWAY]]
+                              if np.isfinite(scan['best_decimal'][0, AWAY]) else 'N/A'
         }
     
     def get_odds_for_game(self, home_team: str, away_team: str, sport_key: str) -> Dict:
-        """Get specific odds for a particular game"""
+        """Get specific odds for a particular game (from the ingestion index, no request)"""
         try:
-            odds_data = self.get_odds_for_sport(sport_key)
+            game = odds_ingestion.lookup(home_team, away_team, sport_key)
             
-            for game in odds_data:
-                if (game.get('home_team', '').lower() == home_team.lower() and 
-                    game.get('away_team', '').lower() == away_team.lower()):
+            if game is not None:
+                # Return detailed odds information
+                bookmakers_info = []
+                for bookmaker in game.get('bookmakers', []):
+                    bookmaker_name = bookmaker.get('title', 'Unknown')
                     
-                    # Return detailed odds information
-                    bookmakers_info = []
-                    for bookmaker in game.get('bookmakers', []):
-                        bookmaker_name = bookmaker.get('title', 'Unknown')
-                        
-                        for market in bookmaker.get('markets', []):
-                            if market.get('key') == 'h2h':
-                                outcomes = {}
-                                for outcome in market.get('outcomes', []):
-                                    team = outcome.get('name', '')
-                                    price = outcome.get('price', 0)
-                                    outcomes[team] = price
-                                
-                                bookmakers_info.append({
-                                    'bookmaker': bookmaker_name,
-                                    'odds': outcomes
-                                })
-                    
-                    return {
-                        'game_found': True,
-                        'home_team': game.get('home_team', ''),
-                        'away_team': game.get('away_team', ''),
-                        'commence_time': game.get('commence_time', ''),
-                        'bookmakers': bookmakers_info
-                    }
+                    for market in bookmaker.get('markets', []):
+                        if market.get('key') == 'h2h':
+                            outcomes = {}
+                            for outcome in market.get('outcomes', []):
+                                team = outcome.get('name', '')
+                                price = outcome.get('price', 0)
+                                outcomes[team] = price
+                            
+                            bookmakers_info.append({
+                                'bookmaker': bookmaker_name,
+                                'odds': outcomes
+                            })
+                
+                return {
+                    'game_found': True,
+                    'home_team': game.get('home_team', ''),
+                    'away_team': game.get('away_team', ''),
+                    'commence_time': game.get('commence_time', ''),
+                    'bookmakers': bookmakers_info
+                }
             
             return {'game_found': False, 'message': 'Game not found in odds data'}
             
@@ -225,7 +209,7 @@ class OddsAPIManager:
             url = f"{self.base_url}/sports/"
             params = {'apiKey': self.api_key}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 remaining_requests = response.headers.get('x-requests-remaining', 'Unknown')
@@ -257,7 +241,7 @@ class OddsAnalyzer:
         self.odds_manager = OddsAPIManager()
     
     def analyze_game_value(self, odds_data: Dict) -> Dict:
-        """Analyze betting value for a game"""
+        """Analyze betting value for a game: best prices, no-vig fair odds and book margins"""
         if not odds_data.get('game_found', False):
             return {'error': 'No odds data available'}
         
@@ -266,28 +250,34 @@ class OddsAnalyzer:
             if not bookmakers:
                 return {'error': 'No bookmaker data available'}
             
-            # Calculate average odds and find best value
-            home_odds = []
-            away_odds = []
+            home_team = odds_data.get('home_team', '')
+            away_team = odds_data.get('away_team', '')
+            matrix = OddsMatrix.from_prices(home_team, away_team, [
+                (bookmaker.get('bookmaker', ''), bookmaker.get('odds', {}).get(home_team, np.nan),
+                 bookmaker.get('odds', {}).get(away_team, np.nan))
+                for bookmaker in bookmakers
+            ])
+            scan = market_scanner.scan(matrix)
+            home_odds = matrix.price[0, :, HOME]
+            away_odds = matrix.price[0, :, AWAY]
             
-            for bookmaker in bookmakers:
-                odds = bookmaker.get('odds', {})
-                home_team = odds_data.get('home_team', '')
-                away_team = odds_data.get('away_team', '')
-                
-                if home_team in odds:
-                    home_odds.append(odds[home_team])
-                if away_team in odds:
-                    away_odds.append(odds[away_team])
+            def average(outcome):
+                decimal = scan['decimal'][0, :, outcome]
+                decimal = decimal[np.isfinite(decimal)]
+                return float(decimal_to_american(decimal.mean())) if len(decimal) else None
             
             analysis = {
-                'home_team': odds_data.get('home_team', ''),
-                'away_team': odds_data.get('away_team', ''),
+                'home_team': home_team,
+                'away_team': away_team,
                 'total_bookmakers': len(bookmakers),
-                'best_home_odds': max(home_odds) if home_odds else None,
-                'best_away_odds': max(away_odds) if away_odds else None,
-                'avg_home_odds': sum(home_odds) / len(home_odds) if home_odds else None,
-                'avg_away_odds': sum(away_odds) / len(away_odds) if away_odds else None,
+                'best_home_odds': float(np.nanmax(home_odds)) if np.isfinite(home_odds).any() else None,
+                'best_away_odds': float(np.nanmax(away_odds)) if np.isfinite(away_odds).any() else None,
+                'avg_home_odds': average(HOME),
+                'avg_away_odds': average(AWAY),
+                'home_fair_prob': float(scan['consensus'][0, HOME]),
+                'away_fair_prob': float(scan['consensus'][0, AWAY]),
+                'avg_bookmaker_margin': float(np.nanmean(scan['overround'][0]) - 1) if scan['books_used'][0] else None,
+                'arbitrage_margin': float(scan['arbitrage_margin'][0]),
                 'odds_variance': self.calculate_odds_variance(home_odds, away_odds)
             }
             
@@ -297,19 +287,19 @@ class OddsAnalyzer:
             return {'error': f'Analysis failed: {str(e)}'}
     
     def calculate_odds_variance(self, home_odds: List[float], away_odds: List[float]) -> str:
-        """Calculate variance in odds across bookmakers"""
+        """Calculate variance in odds across bookmakers (spread of implied probabilities)"""
         try:
-            if not home_odds or not away_odds:
+            home = implied_probability(np.asarray(home_odds, dtype=np.float64))
+            away = implied_probability(np.asarray(away_odds, dtype=np.float64))
+            home, away = home[np.isfinite(home)], away[np.isfinite(away)]
+            if not len(home) or not len(away):
                 return "Insufficient data"
             
-            home_range = max(home_odds) - min(home_odds) if len(home_odds) > 1 else 0
-            away_range = max(away_odds) - min(away_odds) if len(away_odds) > 1 else 0
-            
-            avg_range = (home_range + away_range) / 2
+            avg_range = (np.ptp(home) + np.ptp(away)) / 2
             
-            if avg_range < 0.1:
+            if avg_range < 0.01:
                 return "Low variance - consistent odds"
-            elif avg_range < 0.3:
+            elif avg_range < 0.03:
                 return "Medium variance - some differences"
             else:
                 return "High variance - shop around for best odds"
@@ -318,41 +308,27 @@ class OddsAnalyzer:
             return "Unable to calculate variance"
     
     def find_best_value_bets(self, odds_df: pd.DataFrame) -> List[Dict]:
-        """Find games with potentially good betting value"""
+        """Find games with potentially good betting value (lowest combined margin on the best prices)"""
         if len(odds_df) == 0:
             return []
         
-        value_bets = []
+        # Parse every row's prices at once; 'N/A' and malformed strings become NaN
+        home = pd.to_numeric(odds_df['home_odds'].astype(str).str.replace('+', '', regex=False), errors='coerce')
+        away = pd.to_numeric(odds_df['away_odds'].astype(str).str.replace('+', '', regex=False), errors='coerce')
+        margin = (implied_probability(home.to_numpy()) + implied_probability(away.to_numpy()) - 1) * 100
+        priced = np.isfinite(margin)
+        margin = np.maximum(margin[priced], 0)  # Bookmaker margin
         
-        for idx, game in odds_df.iterrows():
-            home_odds = game.get('home_odds', 'N/A')
-            away_odds = game.get('away_odds', 'N/A')
-            
-            # Simple value analysis (this would be more sophisticated in production)
-            if home_odds != 'N/A' and away_odds != 'N/A':
-                try:
-                    # Convert American odds to implied probability
-                    home_prob = self.american_odds_to_probability(home_odds)
-                    away_prob = self.american_odds_to_probability(away_odds)
-                    
-                    total_prob = home_prob + away_prob
-                    margin = max(0, total_prob - 100)  # Bookmaker margin
-                    
-                    value_bet = {
-                        'game': game.get('game_name', ''),
-                        'sport': game.get('sport', ''),
-                        'date': game.get('date', ''),
-                        'bookmaker_margin': f"{margin:.1f}%",
-                        'value_rating': 'Low' if margin > 10 else 'Medium' if margin > 5 else 'High'
-                    }
-                    
-                    value_bets.append(value_bet)
-                    
-                except Exception:
-                    continue
+        value_bets = pd.DataFrame({
+            'game': odds_df['game_name'].to_numpy()[priced] if 'game_name' in odds_df else '',
+            'sport': odds_df['sport'].to_numpy()[priced] if 'sport' in odds_df else '',
+            'date': odds_df['date'].to_numpy()[priced] if 'date' in odds_df else '',
+            'margin': margin,
+            'value_rating': np.select([margin > 10, margin > 5], ['Low', 'Medium'], 'High'),
+        }).sort_values('margin', kind='stable').head(5)
         
-        # Sort by margin (lower is better)
-        return sorted(value_bets, key=lambda x: float(x['bookmaker_margin'].replace('%', '')))[:5]
+        value_bets['bookmaker_margin'] = value_bets.pop('margin').map(lambda value: f"{value:.1f}%")
+        return value_bets[['game', 'sport', 'date', 'bookmaker_margin', 'value_rating']].to_dict('records')
     
     def american_odds_to_probability(self, odds_str: str) -> float:
         """Convert American odds to implied probability"""
@@ -0,0 +1,231 @@
+"""
+Odds Engine - Vectorized no-vig consensus, best lines, arbitrage and middles across bookmakers
+An odds pull is loaded once into games x books x outcomes arrays and scanned in a single pass
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+MARKETS = ('h2h', 'spreads', 'totals')
+
+# Outcome columns: home team / Over, away team / Under, draw (three-way soccer moneylines only)
+HOME, AWAY, DRAW = 0, 1, 2
+OUTCOME_LABELS = {
+    'h2h': ('home', 'away', 'draw'),
+    'spreads': ('home', 'away'),
+    'totals': ('over', 'under'),
+}
+
+
+def american_to_decimal(price):
+    """Decimal odds for American prices (scalars or arrays; NaN stays NaN)"""
+    price = np.asarray(price, dtype=np.float64)
+    magnitude = np.abs(price)
+    return np.where(price > 0, 1.0 + magnitude / 100.0, 1.0 + 100.0 / magnitude)
+
+
+def decimal_to_american(decimal):
+    """American prices for decimal odds (scalars or arrays)"""
+    decimal = np.asarray(decimal, dtype=np.float64)
+    profit = decimal - 1.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(decimal >= 2.0, profit * 100.0, -100.0 / profit)
+
+
+def format_american(price) -> str:
+    """'+150' / '-110' for a price, 'N/A' for a missing one"""
+    if price is None or not np.isfinite(price):
+        return 'N/A'
+    return f"{int(round(price)):+d}"
+
+
+class OddsMatrix:
+    """
+    One market of an odds pull as arrays: `price` and `point` are shaped
+    games x books x outcomes (American prices, NaN where a book has no line).
+    """
+
+    def __init__(self, market: str, games: List[Dict], books: List[str], price: np.ndarray, point: np.ndarray,
+                 book_titles: Optional[List[str]] = None):
+        self.market = market
+        self.games = games
+        self.books = books
+        self.book_titles = book_titles or list(books)
+        self.price = price
+        self.point = point
+
+    @property
+    def shape(self):
+        return self.price.shape
+
+    @classmethod
+    def from_events(cls, events: Sequence[Dict], markets: Iterable[str] = MARKETS) -> Dict[str, 'OddsMatrix']:
+        """Odds API events (with `bookmakers`) to one matrix per market, in a single pass over the payload"""
+        events = list(events)
+        markets = list(markets)
+        books: Dict[str, int] = {}
+        titles: List[str] = []
+        for event in events:
+            for bookmaker in event.get('bookmakers', []):
+                key = bookmaker.get('key') or bookmaker.get('title', '')
+                if key not in books:
+                    books[key] = len(books)
+                    titles.append(bookmaker.get('title') or key)
+
+        shapes = {market: (len(events), len(books), len(OUTCOME_LABELS[market])) for market in markets}
+        prices = {market: np.full(shape, np.nan) for market, shape in shapes.items()}
+        points = {market: np.full(shape, np.nan) for market, shape in shapes.items()}
+        games = []
+        for g, event in enumerate(events):
+            home, away = event.get('home_team', ''), event.get('away_team', '')
+            games.append({'id': event.get('id'), 'sport_key': event.get('sport_key'), 'home_team': home,
+                          'away_team': away, 'commence_time': event.get('commence_time')})
+            for bookmaker in event.get('bookmakers', []):
+                b = books[bookmaker.get('key') or bookmaker.get('title', '')]
+                for market in bookmaker.get('markets', []):
+                    key = market.get('key')
+                    if key not in prices:
+                        continue
+                    for outcome in market.get('outcomes', []):
+                        o = cls._outcome_column(key, outcome.get('name', ''), home, away)
+                        if o is None or outcome.get('price') is None:
+                            continue
+                        prices[key][g, b, o] = outcome['price']
+                        if outcome.get('point') is not None:
+                            points[key][g, b, o] = outcome['point']
+
+        book_names = list(books)
+        return {market: cls(market, games, book_names, prices[market], points[market], titles) for market in markets}
+
+    @classmethod
+    def from_prices(cls, home_team: str, away_team: str, book_prices: Sequence[tuple]) -> 'OddsMatrix':
+        """A one-game moneyline matrix from (book, home price, away price) rows"""
+        price = np.full((1, len(book_prices), 3), np.nan)
+        for b, (_, home_price, away_price) in enumerate(book_prices):
+            price[0, b, HOME], price[0, b, AWAY] = home_price, away_price
+        games = [{'id': None, 'home_team': home_team, 'away_team': away_team}]
+        return cls('h2h', games, [book for book, _, _ in book_prices], price, np.full(price.shape, np.nan))
+
+    @staticmethod
+    def _outcome_column(market: str, name: str, home: str, away: str) -> Optional[int]:
+        if market == 'totals':
+            return {'over': HOME, 'under': AWAY}.get(name.lower())
+        if name == home:
+            return HOME
+        if name == away:
+            return AWAY
+        return DRAW if market == 'h2h' and name.lower() == 'draw' else None
+
+
+class MarketScanner:
+    """
+    Prices every outcome of every game at every book in one vectorized pass.
+
+    For each matrix the scan gives implied probabilities, each book's
+    overround (vig), the no-vig consensus probability averaged over books
+    with a complete two- or three-way line, the best available line per
+    outcome, and the cross-book opportunities those best lines create:
+    arbitrage where the best prices' implied probabilities sum below 1,
+    and middles where the best spread/total lines leave a gap.
+    """
+
+    def scan(self, matrix: OddsMatrix) -> Dict[str, np.ndarray]:
+        price, point = matrix.price, matrix.point
+        quoted = ~np.isnan(price)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            decimal = american_to_decimal(price)
+            implied = 1.0 / decimal
+
+            # Outcomes a game actually has (draw only for three-way markets), and books quoting all of them
+            game_outcomes = quoted.any(axis=1)
+            complete = (quoted | ~game_outcomes[:, None, :]).all(axis=2) & quoted.any(axis=2)
+            overround = np.where(complete, np.nansum(implied, axis=2), np.nan)
+            no_vig = implied / overround[:, :, None]
+            books_used = complete.sum(axis=1)
+            consensus = np.nansum(np.where(complete[:, :, None], no_vig, 0.0), axis=1) / books_used[:, None]
+            consensus = np.where(game_outcomes & (books_used[:, None] > 0), consensus, np.nan)
+            spread = np.where(complete[:, :, None], (no_vig - consensus[:, None, :]) ** 2, 0.0)
+            dispersion = np.sqrt(spread.sum(axis=1) / books_used[:, None])
+
+            # Best line: the better point first (spreads/totals), then the longer price
+            score = np.where(quoted, decimal, -np.inf)
+            if matrix.market == 'spreads':
+                score = score + np.nan_to_num(point) * 100.0
+            elif matrix.market == 'totals':
+                score = score + np.nan_to_num(point) * np.array([-100.0, 100.0])
+            best_book = np.argmax(score, axis=1)
+            best_decimal = np.take_along_axis(decimal, best_book[:, None, :], axis=1)[:, 0, :]
+            best_point = np.take_along_axis(point, best_book[:, None, :], axis=1)[:, 0, :]
+            best_decimal = np.where(game_outcomes, best_decimal, np.nan)
+            best_edge = consensus * best_decimal - 1.0
+
+            # Cross-book opportunities from the best lines
+            inverse_sum = np.nansum(np.where(game_outcomes, 1.0 / best_decimal, 0.0), axis=1)
+            complete_game = game_outcomes[:, HOME] & game_outcomes[:, AWAY]
+            if matrix.market == 'spreads':
+                gap = best_point[:, HOME] + best_point[:, AWAY]
+            elif matrix.market == 'totals':
+                gap = best_point[:, AWAY] - best_point[:, HOME]
+            else:
+                gap = np.zeros(len(price))
+            arbitrage = complete_game & (inverse_sum < 1.0) & (gap >= 0)
+            middle = complete_game & (gap > 0)
+
+        return {
+            'decimal': decimal,
+            'implied': implied,
+            'overround': overround,
+            'no_vig': no_vig,
+            'consensus': consensus,
+            'books_used': books_used,
+            'dispersion': dispersion,
+            'best_book': best_book,
+            'best_decimal': best_decimal,
+            'best_price': decimal_to_american(best_decimal),
+            'best_point': best_point,
+            'best_edge': best_edge,
+            'inverse_sum': inverse_sum,
+            'arbitrage': arbitrage,
+            'arbitrage_margin': np.where(arbitrage, 1.0 / inverse_sum - 1.0, 0.0),
+            'middle': middle,
+            'middle_gap': np.where(middle, gap, 0.0),
+        }
+
+    def scan_events(self, events: Sequence[Dict], markets: Iterable[str] = MARKETS) -> Dict[str, Dict]:
+        """Matrices and scans for every market of an odds pull: {market: {'matrix': ..., 'scan': ...}}"""
+        return {market: {'matrix': matrix, 'scan': self.scan(matrix)}
+                for market, matrix in OddsMatrix.from_events(events, markets).items()}
+
+    def opportunities(self, events: Sequence[Dict]) -> List[Dict]:
+        """Arbitrage and middle opportunities across the pull, best first"""
+        found = []
+        for market, result in self.scan_events(events).items():
+            matrix, scan = result['matrix'], result['scan']
+            labels = OUTCOME_LABELS[market]
+            for g in np.flatnonzero(scan['arbitrage'] | scan['middle']):
+                game = matrix.games[g]
+                outcomes = [o for o in range(len(labels)) if np.isfinite(scan['best_decimal'][g, o])]
+                legs = [{
+                    'outcome': labels[o],
+                    'book': matrix.books[scan['best_book'][g, o]],
+                    'price': format_american(scan['best_price'][g, o]),
+                    'point': None if np.isnan(scan['best_point'][g, o]) else float(scan['best_point'][g, o]),
+                    # Stake share that returns the same amount whichever leg wins
+                    'stake_share': float((1.0 / scan['best_decimal'][g, o]) / scan['inverse_sum'][g]),
+                } for o in outcomes]
+                found.append({
+                    'type': 'arbitrage' if scan['arbitrage'][g] else 'middle',
+                    'market': market,
+                    'game_id': game['id'],
+                    'sport_key': game.get('sport_key'),
+                    'game': f"{game['away_team']} @ {game['home_team']}",
+                    'margin': float(scan['arbitrage_margin'][g]),
+                    'gap': float(scan['middle_gap'][g]),
+                    'legs': legs,
+                })
+        return sorted(found, key=lambda item: (item['type'] != 'arbitrage', -item['margin'], -item['gap']))
+
+
+# Global scanner shared by the odds manager and analyzer
+market_scanner = MarketScanner()
@@ -0,0 +1,471 @@
+"""
+Odds History - Append-only columnar store of odds snapshots for line-movement analysis
+One NumPy partition per sport and game day; "open vs now" and "last N minutes" are vectorized
+"""
+
+import glob
+import math
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from utils.schedule_index import parse_start
+
+ODDS_HISTORY_ROOT = ".local/odds_history"
+
+MARKETS = ('h2h', 'spreads', 'totals')
+# Outcome sides: home team / Over, away team / Under, draw
+SIDES = ('home', 'away', 'draw')
+
+# Markets in wide_movement, by column prefix (the home side; Over for totals)
+WIDE_MARKETS = (('spreads', 'spread'), ('totals', 'total'), ('h2h', 'moneyline'))
+
+# Movement worth reporting: spread/total points, moneyline implied probability
+SIGNIFICANT_SPREAD_MOVE = 1.0
+SIGNIFICANT_TOTAL_MOVE = 1.0
+SIGNIFICANT_PROBABILITY_MOVE = 0.03
+# Share of books moving together inside the window that makes a steam move
+STEAM_BOOK_SHARE = 0.75
+
+# Chunks a partition accumulates before they're merged into one file
+COMPACT_AFTER_CHUNKS = 32
+
+# Game days kept on disk, and how often recording prunes older ones (the first record always does)
+KEEP_DAYS = 30
+PRUNE_INTERVAL_SECONDS = 6 * 60 * 60
+
+COLUMNS = {
+    'event': np.int32,
+    'book': np.int32,
+    'market': np.int8,
+    'side': np.int8,
+    'ts': np.float64,
+    'price': np.float32,
+    'point': np.float32,
+}
+
+SnapshotKey = Tuple[int, int, int, int]
+
+MOVEMENT_COLUMNS = ['event_id', 'home_team', 'away_team', 'side', 'books', 'open', 'current', 'move',
+                    'recent_move', 'books_moving']
+
+
+def implied_probability(price):
+    """Implied probability of American odds (works on scalars and arrays)"""
+    price = np.asarray(price, dtype=np.float64)
+    magnitude = np.abs(price)
+    return np.where(price > 0, 100.0, magnitude) / (magnitude + 100.0)
+
+
+def game_day(commence_time) -> Optional[str]:
+    """US Eastern calendar day of a start time - the day a game's snapshots are filed under"""
+    start = parse_start(commence_time)
+    if start is None:
+        return None
+    return datetime.fromtimestamp(start, pytz.timezone('US/Eastern')).strftime('%Y-%m-%d')
+
+
+class _Partition:
+    """One sport-day: column arrays plus the event and bookmaker dictionaries their codes index"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.events: List[str] = []
+        self.event_index: Dict[str, int] = {}
+        self.event_meta: List[Tuple[str, str, str]] = []
+        self.books: List[str] = []
+        self.book_index: Dict[str, int] = {}
+        self.chunks: List[Dict[str, np.ndarray]] = []
+        self.chunk_files = 0
+        self.next_chunk = 0
+        self.last: Dict[SnapshotKey, Tuple[float, float]] = {}
+        self._sorted: Optional[Dict[str, np.ndarray]] = None
+        self._market_bounds: Optional[np.ndarray] = None
+
+    def event_code(self, event_id: str, home: str, away: str, commence: str) -> int:
+        code = self.event_index.get(event_id)
+        if code is None:
+            code = self.event_index[event_id] = len(self.events)
+            self.events.append(event_id)
+            self.event_meta.append((home, away, commence))
+        return code
+
+    def book_code(self, book: str) -> int:
+        code = self.book_index.get(book)
+        if code is None:
+            code = self.book_index[book] = len(self.books)
+            self.books.append(book)
+        return code
+
+    def load(self):
+        for chunk_path in sorted(glob.glob(os.path.join(self.path, 'chunk-*.npz'))):
+            with np.load(chunk_path) as chunk:
+                event_map = np.array([self.event_code(str(e), str(h), str(a), str(c)) for e, h, a, c in
+                                      zip(chunk['events'], chunk['homes'], chunk['aways'], chunk['commences'])],
+                                     dtype=np.int32)
+                book_map = np.array([self.book_code(str(b)) for b in chunk['books']], dtype=np.int32)
+                columns = {name: chunk[name].astype(dtype) for name, dtype in COLUMNS.items()}
+            if len(columns['ts']):
+                columns['event'] = event_map[columns['event']]
+                columns['book'] = book_map[columns['book']]
+            self.chunks.append(columns)
+            self.chunk_files += 1
+            self.next_chunk = int(os.path.basename(chunk_path)[6:12]) + 1
+        self._sorted = None
+        # Latest value per key, so unchanged lines aren't appended again after a restart
+        data = self.arrays()
+        if len(data['ts']):
+            keys = np.stack([data['event'], data['book'], data['market'], data['side']], axis=1)
+            last_rows = np.r_[np.any(keys[1:] != keys[:-1], axis=1), True]
+            for row in np.flatnonzero(last_rows):
+                self.last[tuple(int(v) for v in keys[row])] = (float(data['price'][row]), float(data['point'][row]))
+
+    def append(self, columns: Dict[str, np.ndarray]):
+        self.chunks.append(columns)
+        self._sorted = None
+
+    def save_chunk(self, columns: Dict[str, np.ndarray]):
+        os.makedirs(self.path, exist_ok=True)
+        self._write(os.path.join(self.path, f"chunk-{self.next_chunk:06d}.npz"), columns)
+        self.chunk_files += 1
+        self.next_chunk += 1
+        if self.chunk_files > COMPACT_AFTER_CHUNKS:
+            self.compact()
+
+    def _write(self, path: str, columns: Dict[str, np.ndarray]):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as handle:
+            np.savez(handle,
+                     events=np.array(self.events, dtype=str),
+                     homes=np.array([meta[0] for meta in self.event_meta], dtype=str),
+                     aways=np.array([meta[1] for meta in self.event_meta], dtype=str),
+                     commences=np.array([meta[2] for meta in self.event_meta], dtype=str),
+                     books=np.array(self.books, dtype=str),
+                     **columns)
+        os.replace(tmp_path, path)
+
+    def compact(self):
+        """Merge every chunk file into one; the merged chunk is written before the old ones go"""
+        old_chunks = glob.glob(os.path.join(self.path, 'chunk-*.npz'))
+        self._write(os.path.join(self.path, f"chunk-{self.next_chunk:06d}.npz"), self.arrays(sort=False))
+        self.next_chunk += 1
+        for chunk_path in old_chunks:
+            os.remove(chunk_path)
+        self.chunk_files = 1
+
+    def arrays(self, sort: bool = True) -> Dict[str, np.ndarray]:
+        """All rows; sorted by (market, event, book, side, time) and cached until the next append"""
+        if not sort:
+            return {name: np.concatenate([chunk[name] for chunk in self.chunks]) if self.chunks
+                    else np.empty(0, dtype) for name, dtype in COLUMNS.items()}
+        if self._sorted is None:
+            data = self.arrays(sort=False)
+            order = np.lexsort((data['ts'], data['side'], data['book'], data['event'], data['market']))
+            self._sorted = {name: values[order] for name, values in data.items()}
+            self._market_bounds = np.searchsorted(self._sorted['market'], np.arange(len(MARKETS) + 1))
+        return self._sorted
+
+    def market_rows(self, market: int) -> Dict[str, np.ndarray]:
+        data = self.arrays()
+        start, end = self._market_bounds[market], self._market_bounds[market + 1]
+        return {name: values[start:end] for name, values in data.items()}
+
+
+class OddsHistoryStore:
+    """
+    Every odds snapshot the app has seen, keyed by (game, bookmaker, market, side, time).
+
+    Rows are appended as columns (event and bookmaker codes, market, side,
+    timestamp, price, point) to immutable .npz chunks, one directory per
+    sport and game day, so a game's whole history lives in one partition.
+    A row is only written when a bookmaker's line actually changed, which
+    keeps "value as of time t" exact while storing a fraction of the polls.
+    Queries sort a partition once and then answer open/current/windowed
+    movement for every game with a handful of array operations.
+    """
+
+    def __init__(self, root: str = ODDS_HISTORY_ROOT, clock=time.time):
+        self.root = root
+        self.clock = clock
+        self._partitions: Dict[Tuple[str, str], _Partition] = {}
+        self._lock = threading.Lock()
+        self._last_prune: Optional[float] = None
+        self.stats = {'snapshots': 0, 'rows_written': 0, 'rows_unchanged': 0, 'queries': 0, 'pruned': 0}
+
+    def _partition(self, sport_key: str, day: str) -> _Partition:
+        key = (sport_key, day)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = _Partition(os.path.join(self.root, sport_key, day))
+            partition.load()
+            self._partitions[key] = partition
+        return partition
+
+    def record(self, events: Iterable[Dict], observed_at: Optional[float] = None) -> int:
+        """Append the lines that changed in a batch of Odds API events; returns rows written"""
+        observed_at = self.clock() if observed_at is None else observed_at
+        rows: Dict[Tuple[str, str], Dict[str, list]] = {}
+        written = 0
+        with self._lock:
+            self.stats['snapshots'] += 1
+            for event in events:
+                day = game_day(event.get('commence_time'))
+                if day is None or not event.get('id'):
+                    continue
+                partition = self._partition(event.get('sport_key', 'unknown'), day)
+                home, away = event.get('home_team', ''), event.get('away_team', '')
+                event_code = partition.event_code(str(event['id']), home, away, event.get('commence_time', ''))
+                columns = rows.setdefault((event.get('sport_key', 'unknown'), day), {name: [] for name in COLUMNS})
+
+                for bookmaker in event.get('bookmakers', []):
+                    book_code = partition.book_code(bookmaker.get('key') or bookmaker.get('title', ''))
+                    for market in bookmaker.get('markets', []):
+                        if market.get('key') not in MARKETS:
+                            continue
+                        market_code = MARKETS.index(market['key'])
+                        ts = parse_start(market.get('last_update') or bookmaker.get('last_update')) or observed_at
+                        for outcome in market.get('outcomes', []):
+                            side = self._side(market['key'], outcome.get('name', ''), home, away)
+                            if side is None or outcome.get('price') is None:
+                                continue
+                            value = (float(outcome['price']), float(outcome.get('point', np.nan)))
+                            key = (event_code, book_code, market_code, side)
+                            previous = partition.last.get(key)
+                            if previous is not None and previous[0] == value[0] and (
+                                    previous[1] == value[1] or math.isnan(previous[1]) and math.isnan(value[1])):
+                                self.stats['rows_unchanged'] += 1
+                                continue
+                            partition.last[key] = value
+                            for name, item in zip(COLUMNS, (*key, ts, *value)):
+                                columns[name].append(item)
+
+            for (sport_key, day), columns in rows.items():
+                if not columns['ts']:
+                    continue
+                arrays = {name: np.array(columns[name], dtype=dtype) for name, dtype in COLUMNS.items()}
+                partition = self._partition(sport_key, day)
+                partition.append(arrays)
+                partition.save_chunk(arrays)
+                written += len(arrays['ts'])
+            self.stats['rows_written'] += written
+
+        now = self.clock()
+        if self._last_prune is None or now - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+            self._last_prune = now
+            self.prune()
+        return written
+
+    @staticmethod
+    def _side(market: str, name: str, home: str, away: str) -> Optional[int]:
+        if market == 'totals':
+            return {'over': 0, 'under': 1}.get(name.lower())
+        if name == home:
+            return 0
+        if name == away:
+            return 1
+        return 2 if name.lower() == 'draw' else None
+
+    def _consensus(self, sport_key: str, day: str, market: str, window_minutes: Optional[float],
+                   now: Optional[float]) -> Tuple[_Partition, Optional[Dict[str, np.ndarray]]]:
+        """Per (event, side) consensus arrays for one market, computed on the partition's sorted rows"""
+        self.stats['queries'] += 1
+        with self._lock:
+            partition = self._partition(sport_key, day)
+            rows = partition.market_rows(MARKETS.index(market))
+        now = self.clock() if now is None else now
+        visible = rows['ts'] <= now
+        ts = rows['ts'][visible]
+        if not len(ts):
+            return partition, None
+        value = implied_probability(rows['price'][visible]) if market == 'h2h' else rows['point'][visible].astype(np.float64)
+        event, book, side = rows['event'][visible], rows['book'][visible], rows['side'][visible]
+
+        # Rows are sorted by (event, book, side, time): each run is one bookmaker's line history
+        group = (event.astype(np.int64) * (len(partition.books) + 1) + book) * len(SIDES) + side
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        ends = np.r_[starts[1:], len(group)] - 1
+        opened, current = value[starts], value[ends]
+        if window_minutes:
+            # Last row at or before the cutoff; a line first posted inside the window counts from its open
+            before = np.where(ts <= now - window_minutes * 60, np.arange(len(ts)), -1)
+            then_rows = np.maximum.reduceat(before, starts)
+            then = np.where(then_rows >= starts, value[np.maximum(then_rows, 0)], opened)
+        else:
+            then = opened
+
+        # Average each (event, side) over bookmakers; runs are already in (event, side) order per event
+        consensus_key = event[starts].astype(np.int64) * len(SIDES) + side[starts]
+        keys, inverse = np.unique(consensus_key, return_inverse=True)
+        books = np.bincount(inverse)
+        mean = lambda values: np.bincount(inverse, weights=values) / books
+        open_mean, current_mean, then_mean = mean(opened), mean(current), mean(then)
+        recent = current_mean - then_mean if window_minutes else np.zeros(len(keys))
+        direction = np.sign(recent if window_minutes else current_mean - open_mean)
+        agrees = (np.sign(current - then) == direction[inverse]) & (direction[inverse] != 0)
+        return partition, {
+            'event': keys // len(SIDES),
+            'side': keys % len(SIDES),
+            'books': books,
+            'open': open_mean,
+            'current': current_mean,
+            'move': current_mean - open_mean,
+            'recent_move': recent,
+            'books_moving': np.bincount(inverse, weights=agrees.astype(np.float64)).astype(int),
+        }
+
+    def movement(self, sport_key: str, day: str, market: str = 'spreads',
+                 window_minutes: Optional[float] = None, now: Optional[float] = None) -> pd.DataFrame:
+        """
+        Consensus line per game and side: opening value, current value, and the
+        value `window_minutes` ago, averaged over bookmakers. Spreads and totals
+        move in points; moneylines in implied probability.
+
+        Columns: event_id, home_team, away_team, side, books, open, current,
+        move, recent_move (0 without a window), books_moving (bookmakers whose
+        line moved the consensus way in the window, or since open).
+        """
+        partition, consensus = self._consensus(sport_key, day, market, window_minutes, now)
+        if consensus is None:
+            return pd.DataFrame(columns=MOVEMENT_COLUMNS)
+        codes = consensus.pop('event')
+        return pd.DataFrame({
+            'event_id': [partition.events[code] for code in codes],
+            'home_team': [partition.event_meta[code][0] for code in codes],
+            'away_team': [partition.event_meta[code][1] for code in codes],
+            'side': [SIDES[code] for code in consensus.pop('side')],
+            **consensus,
+        })
+
+    def wide_movement(self, sport_key: str, day: str, window_minutes: Optional[float] = None,
+                      now: Optional[float] = None) -> pd.DataFrame:
+        """
+        One row per game with the home side of every market side by side:
+        spread_*, total_* (Over) and moneyline_* (home win probability) columns
+        for books, open, current, move, recent_move and books_moving (NaN where
+        a market has no lines).
+        """
+        results = [(label, *self._consensus(sport_key, day, market, window_minutes, now))
+                   for market, label in WIDE_MARKETS]
+        partition = results[-1][1]
+        size = len(partition.events)
+        columns, seen = {}, np.zeros(size, dtype=bool)
+        for label, _, consensus in results:
+            home = consensus['side'] == 0 if consensus is not None else None
+            for name in MOVEMENT_COLUMNS[4:]:
+                column = np.full(size, np.nan)
+                if consensus is not None:
+                    column[consensus['event'][home]] = consensus[name][home]
+                columns[f"{label}_{name}"] = column
+            if consensus is not None:
+                seen[consensus['event'][home]] = True
+
+        codes = np.flatnonzero(seen)
+        return pd.DataFrame({
+            'event_id': [partition.events[code] for code in codes],
+            'home_team': [partition.event_meta[code][0] for code in codes],
+            'away_team': [partition.event_meta[code][1] for code in codes],
+            **{name: column[codes] for name, column in columns.items()},
+        })
+
+    def game_movement(self, sport_key: str, event_id: str, commence_time,
+                      window_minutes: Optional[float] = 60) -> Optional[Dict]:
+        """Open/current/recent movement of one game's home spread, total and home moneyline"""
+        day = game_day(commence_time)
+        if day is None:
+            return None
+        frame = self.wide_movement(sport_key, day, window_minutes)
+        row = frame[frame['event_id'] == str(event_id)]
+        return movement_summary(row.iloc[0]) if len(row) else None
+
+    def prune(self, keep_days: int = KEEP_DAYS) -> int:
+        """
+        Drop partitions for game days older than `keep_days`, and unload those
+        from before yesterday (they reload from disk if queried); returns how
+        many were removed from disk
+        """
+        today = datetime.fromtimestamp(self.clock(), pytz.timezone('US/Eastern'))
+        cutoff = (today - timedelta(days=keep_days)).strftime('%Y-%m-%d')
+        # Yesterday's late games can still be running, so its partitions stay loaded
+        loaded_from = (today - timedelta(days=1)).strftime('%Y-%m-%d')
+        removed = 0
+        with self._lock:
+            for path in glob.glob(os.path.join(self.root, '*', '*')):
+                sport_key, day = path.split(os.sep)[-2:]
+                if day < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+            for key in [key for key in self._partitions if key[1] < loaded_from]:
+                del self._partitions[key]
+            self.stats['pruned'] += removed
+        return removed
+
+
+def movement_summary(row) -> Optional[Dict]:
+    """A wide_movement row as {'spread': {...}, 'total': {...}, 'moneyline': {...}}, skipping missing markets"""
+    summary = {}
+    for _, label in WIDE_MARKETS:
+        if pd.isna(row.get(f"{label}_books")):
+            continue
+        summary[label] = {'books': int(row[f"{label}_books"]), 'books_moving': int(row[f"{label}_books_moving"]),
+                          **{name: float(row[f"{label}_{name}"]) for name in ('open', 'current', 'move', 'recent_move')}}
+    return summary or None
+
+
+def movement_signal(summary: Optional[Dict]) -> Dict:
+    """
+    Reads a game_movement summary: which side the market moved towards, by
+    how much, and whether it was a steam move (most books moving together
+    inside the window).
+    """
+    if not summary:
+        return {'significant': False, 'favours': None, 'steam': False}
+    spread, total, moneyline = summary.get('spread'), summary.get('total'), summary.get('moneyline')
+    spread_move = spread['move'] if spread else 0.0
+    probability_move = moneyline['move'] if moneyline else 0.0
+    # A shrinking home spread and a rising home win probability both mean money on the home side
+    lean = probability_move if moneyline and abs(probability_move) >= 0.005 else -spread_move / 25.0
+    favours = 'home' if lean > 0 else 'away' if lean < 0 else None
+
+    steam = False
+    for market in (spread, moneyline):
+        threshold = SIGNIFICANT_SPREAD_MOVE / 2 if market is spread else SIGNIFICANT_PROBABILITY_MOVE / 2
+        if market and market['books'] and abs(market['recent_move']) >= threshold:
+            steam = steam or market['books_moving'] / market['books'] >= STEAM_BOOK_SHARE
+    return {
+        'significant': (abs(spread_move) >= SIGNIFICANT_SPREAD_MOVE or abs(probability_move) >= SIGNIFICANT_PROBABILITY_MOVE
+                        or (total is not None and abs(total['move']) >= SIGNIFICANT_TOTAL_MOVE) or steam),
+        'favours': favours,
+        'steam': steam,
+        'spread_move': spread_move,
+        'total_move': total['move'] if total else 0.0,
+        'probability_move': probability_move,
+    }
+
+
+def describe_movement(summary: Optional[Dict], home_team: str = 'home') -> str:
+    """One-line description of a game_movement summary for prompts and UI"""
+    if not summary:
+        return "No line movement history yet"
+    parts = []
+    spread = summary.get('spread')
+    if spread:
+        parts.append(f"spread {spread['open']:+.1f} → {spread['current']:+.1f} for {home_team}")
+    total = summary.get('total')
+    if total:
+        parts.append(f"total {total['open']:.1f} → {total['current']:.1f}")
+    moneyline = summary.get('moneyline')
+    if moneyline:
+        parts.append(f"{home_team} win probability {moneyline['open']:.0%} → {moneyline['current']:.0%}")
+    books = max(market['books'] for market in summary.values())
+    return f"Line movement since open ({books} books): " + ", ".join(parts)
+
+
+# Global odds history, fed by the odds ingestion planner
+odds_history = OddsHistoryStore()
@@ -0,0 +1,330 @@
+"""
+Odds Ingestion - Batched, quota-aware Odds API fetching with an in-memory per-game index
+Each sport is fetched once for every market the app needs; per-game lookups never hit the network
+"""
+
+import concurrent.futures
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import requests
+
+from utils.http_cache import http_session
+from utils.local_store import LocalStore, local_store
+from utils.odds_history import OddsHistoryStore, game_day, odds_history
+from utils.schedule_index import parse_start
+from utils.team_registry import normalize_team_key
+
+ODDS_API_BASE_URL = "https://api.the-odds-api.com/v4"
+QUOTA_NAMESPACE = 'odds_quota'
+
+# Every market the app reads; the Odds API bills markets x regions per request
+ODDS_MARKETS = ('h2h', 'spreads', 'totals')
+ODDS_REGIONS = ('us',)
+
+DEFAULT_SPORT_KEYS = [
+    'americanfootball_nfl',
+    'basketball_nba',
+    'basketball_wnba',
+    'baseball_mlb',
+    'icehockey_nhl',
+]
+
+# App league names to Odds API sport keys
+LEAGUE_SPORT_KEYS = {
+    'NFL': 'americanfootball_nfl',
+    'NBA': 'basketball_nba',
+    'WNBA': 'basketball_wnba',
+    'MLB': 'baseball_mlb',
+    'NHL': 'icehockey_nhl',
+    'NCAAF': 'americanfootball_ncaaf',
+    'NCAAB': 'basketball_ncaab',
+    'EPL': 'soccer_epl',
+}
+
+# Refresh bounds; the quota decides where in between each refresh lands
+MIN_REFRESH_SECONDS = 60
+MAX_REFRESH_SECONDS = 6 * 3600
+# Used until the first response reports the quota
+DEFAULT_REFRESH_SECONDS = 10 * 60
+# Requests held back for manual refreshes and key checks
+QUOTA_RESERVE = 25
+# Wait after a 429 before trying again
+RATE_LIMIT_BACKOFF_SECONDS = 60
+
+TeamsKey = Tuple[str, str]
+
+
+def _team_name(team) -> str:
+    if isinstance(team, dict):
+        return team.get('name') or team.get('displayName') or ''
+    return team or ''
+
+
+def _nickname_key(name: str) -> str:
+    words = str(name).split()
+    return normalize_team_key(words[-1]) if words else ''
+
+
+class OddsIngestionPlanner:
+    """
+    Keeps every tracked sport's odds in memory and decides when to refetch.
+
+    A refresh fetches each stale sport once, all markets in one request, with
+    the sports fetched concurrently. The `x-requests-remaining` header sets
+    how often refreshes can happen: the remaining requests (less a reserve)
+    are spread evenly until the quota resets, so a nearly spent quota slows
+    refreshing down instead of running out mid-month. Events are indexed by
+    id and by (home, away) team names, which is all `lookup` reads, and
+    every refresh is appended to the odds history.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, store: Optional[LocalStore] = None,
+                 session: Optional[requests.Session] = None, base_url: str = ODDS_API_BASE_URL,
+                 sport_keys: Optional[Sequence[str]] = None, markets: Sequence[str] = ODDS_MARKETS,
+                 regions: Sequence[str] = ODDS_REGIONS, reserve: int = QUOTA_RESERVE,
+                 history: Optional[OddsHistoryStore] = None, clock=time.time):
+        self.api_key = api_key
+        self.store = store or local_store
+        self.session = session or http_session
+        self.base_url = base_url
+        self.sport_keys = list(sport_keys or DEFAULT_SPORT_KEYS)
+        self.markets = tuple(markets)
+        self.regions = tuple(regions)
+        self.reserve = reserve
+        self.history = history or odds_history
+        self.clock = clock
+        self.reset_day = int(os.environ.get('ODDS_QUOTA_RESET_DAY', '1') or 1)
+
+        self._sports: Dict[str, Dict] = {}
+        self._by_id: Dict[str, Dict] = {}
+        self._by_teams: Dict[TeamsKey, List[Dict]] = {}
+        self._by_nickname: Dict[TeamsKey, List[Dict]] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._quota: Optional[Dict] = None
+        self._backoff_until = 0.0
+        self.stats = {'refreshes': 0, 'requests': 0, 'cache_hits': 0, 'errors': 0, 'skipped_quota': 0,
+                      'lookups': 0, 'lookup_hits': 0}
+
+    # Quota
+
+    @property
+    def quota(self) -> Dict:
+        """Last reported quota: remaining, used and when it was seen (persisted across restarts)"""
+        if self._quota is None:
+            self._quota = self.store.get(QUOTA_NAMESPACE, 'the-odds-api') or {}
+        return self._quota
+
+    def _record_quota(self, headers):
+        remaining, used = headers.get('x-requests-remaining'), headers.get('x-requests-used')
+        try:
+            quota = {'remaining': int(float(remaining)), 'used': int(float(used or 0)), 'seen_at': self.clock()}
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            seen = self.quota
+            # Concurrent responses can arrive out of order; the lowest remaining count is the latest
+            if seen.get('remaining') is not None and seen.get('seen_at', 0) > self.clock() - 60:
+                quota['remaining'] = min(quota['remaining'], seen['remaining'])
+                quota['used'] = max(quota['used'], seen.get('used', 0))
+            self._quota = quota
+        self.store.set(QUOTA_NAMESPACE, 'the-odds-api', quota, 40 * 24 * 3600)
+
+    def cost_per_sport(self) -> int:
+        return max(len(self.markets) * len(self.regions), 1)
+
+    def seconds_until_reset(self, now: Optional[float] = None) -> float:
+        """Seconds until the monthly quota resets (on `reset_day`, midnight UTC)"""
+        now_dt = datetime.fromtimestamp(self.clock() if now is None else now, timezone.utc)
+        day = min(self.reset_day, 28)
+        reset = now_dt.replace(day=day, hour=0, minute=0, second=0, microsecond=0)
+        if reset <= now_dt:
+            year, month = (now_dt.year + 1, 1) if now_dt.month == 12 else (now_dt.year, now_dt.month + 1)
+            reset = reset.replace(year=year, month=month)
+        return (reset - now_dt).total_seconds()
+
+    def refresh_interval(self, sport_count: Optional[int] = None) -> Optional[float]:
+        """
+        Seconds between refreshes of `sport_count` sports that the quota can sustain,
+        or None when only the reserve is left and nothing should be fetched.
+        """
+        remaining = self.quota.get('remaining')
+        if remaining is None:
+            return DEFAULT_REFRESH_SECONDS
+        spendable = remaining - self.reserve
+        refresh_cost = self.cost_per_sport() * (sport_count or len(self.sport_keys))
+        if spendable < self.cost_per_sport():
+            return None
+        refreshes_left = spendable / refresh_cost
+        interval = self.seconds_until_reset() / max(refreshes_left, 1e-9)
+        return min(max(interval, MIN_REFRESH_SECONDS), MAX_REFRESH_SECONDS)
+
+    # Fetching
+
+    def stale_sports(self, sport_keys: Optional[Iterable[str]] = None) -> List[str]:
+        sport_keys = list(sport_keys or self.sport_keys)
+        interval = self.refresh_interval(len(sport_keys))
+        now = self.clock()
+        with self._lock:
+            fetched = {key: self._sports.get(key, {}).get('fetched_at') for key in sport_keys}
+        stale = [key for key, at in fetched.items() if at is None or interval is not None and now - at >= interval]
+        if interval is None:
+            # Quota spent down to the reserve: keep serving what's indexed
+            self.stats['skipped_quota'] += len(stale)
+            return []
+        return stale
+
+    def ensure_fresh(self, sport_keys: Optional[Iterable[str]] = None, api_key: Optional[str] = None,
+                     force: bool = False) -> List[str]:
+        """Refetch the sports whose odds are older than the quota allows, concurrently; returns those refreshed"""
+        sport_keys = list(sport_keys or self.sport_keys)
+        api_key = api_key or self.api_key or os.environ.get('ODDS_API_KEY')
+        if not api_key or self.clock() < self._backoff_until:
+            return []
+
+        with self._refresh_lock:
+            stale = sport_keys if force else self.stale_sports(sport_keys)
+            if not stale:
+                return []
+            self.stats['refreshes'] += 1
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(stale)) as pool:
+                results = list(pool.map(lambda key: (key, self._fetch_sport(key, api_key)), stale))
+
+            refreshed = [key for key, events in results if events is not None]
+            for key, events in results:
+                if events:
+                    # Every refresh is a snapshot for line-movement history (unchanged lines aren't stored)
+                    self.history.record(events, observed_at=self.clock())
+            with self._lock:
+                for key, events in results:
+                    if events is not None:
+                        self._sports[key] = {'fetched_at': self.clock(), 'events': events}
+                self._rebuild_index()
+            return refreshed
+
+    def _fetch_sport(self, sport_key: str, api_key: str) -> Optional[List[Dict]]:
+        params = {
+            'apiKey': api_key,
+            'regions': ','.join(self.regions),
+            'markets': ','.join(self.markets),
+            'oddsFormat': 'american',
+            'dateFormat': 'iso',
+        }
+        try:
+            response = self.session.get(f"{self.base_url}/sports/{sport_key}/odds/", params=params, timeout=15)
+        except requests.RequestException:
+            self.stats['errors'] += 1
+            return None
+
+        if getattr(response, 'from_cache', False):
+            self.stats['cache_hits'] += 1
+        else:
+            self.stats['requests'] += 1
+            self._record_quota(response.headers)
+        if response.status_code == 429:
+            self._backoff_until = self.clock() + RATE_LIMIT_BACKOFF_SECONDS
+        if response.status_code != 200:
+            self.stats['errors'] += 1
+            return None
+        try:
+            events = response.json()
+        except ValueError:
+            self.stats['errors'] += 1
+            return None
+        for event in events:
+            event.setdefault('sport_key', sport_key)
+        return events
+
+    def _rebuild_index(self):
+        by_id, by_teams, by_nickname = {}, {}, {}
+        for sport in self._sports.values():
+            for event in sport['events']:
+                home, away = event.get('home_team', ''), event.get('away_team', '')
+                by_id[str(event.get('id'))] = event
+                by_teams.setdefault((normalize_team_key(home), normalize_team_key(away)), []).append(event)
+                by_nickname.setdefault((_nickname_key(home), _nickname_key(away)), []).append(event)
+        self._by_id, self._by_teams, self._by_nickname = by_id, by_teams, by_nickname
+
+    # Lookups (memory only)
+
+    def events_for(self, sport_key: str) -> List[Dict]:
+        with self._lock:
+            return list(self._sports.get(sport_key, {}).get('events', []))
+
+    def fetched_at(self, sport_key: str) -> Optional[float]:
+        with self._lock:
+            return self._sports.get(sport_key, {}).get('fetched_at')
+
+    def lookup(self, home_team: str, away_team: str, sport_key: Optional[str] = None,
+               commence_time=None, event_id: Optional[str] = None) -> Optional[Dict]:
+        """The indexed Odds API event for a game, or None; never makes a request"""
+        self.stats['lookups'] += 1
+        with self._lock:
+            if event_id and str(event_id) in self._by_id:
+                self.stats['lookup_hits'] += 1
+                return self._by_id[str(event_id)]
+            candidates = (self._by_teams.get((normalize_team_key(home_team), normalize_team_key(away_team)))
+                          or self._by_nickname.get((_nickname_key(home_team), _nickname_key(away_team)))
+                          or [])
+        if sport_key:
+            candidates = [event for event in candidates if event.get('sport_key') == sport_key]
+        if not candidates:
+            return None
+
+        self.stats['lookup_hits'] += 1
+        start = parse_start(commence_time)
+        if start is None or len(candidates) == 1:
+            return candidates[0]
+        # Teams that meet twice (series, home-and-home) - take the nearest start
+        return min(candidates, key=lambda event: abs((parse_start(event.get('commence_time')) or 0) - start))
+
+    def lookup_game(self, game: Dict) -> Optional[Dict]:
+        """`lookup` for an app game dict (team names as strings or {'name': ...} dicts)"""
+        return self.lookup(_team_name(game.get('home_team')), _team_name(game.get('away_team')),
+                           sport_key=LEAGUE_SPORT_KEYS.get(str(game.get('sport', '')).upper()),
+                           commence_time=game.get('commence_time') or game.get('game_time'))
+
+    def line_movement(self, game: Dict, window_minutes: Optional[float] = 60) -> Optional[Dict]:
+        """Recorded spread/total/moneyline movement for an app game (see OddsHistoryStore.game_movement)"""
+        event = self.lookup_game(game)
+        if event is None:
+            return None
+        return self.history.game_movement(event.get('sport_key', ''), event.get('id'), event.get('commence_time'),
+                                          window_minutes)
+
+    def slate_movement(self, games: List[Dict], window_minutes: Optional[float] = None) -> pd.DataFrame:
+        """
+        wide_movement rows for every game in `games` that has odds history, with
+        a `game_index` column pointing back into `games`. One query per sport-day.
+        """
+        partitions: Dict[Tuple[str, str], Dict[str, int]] = {}
+        for index, game in enumerate(games):
+            event = self.lookup_game(game)
+            day = event and game_day(event.get('commence_time'))
+            if day:
+                partitions.setdefault((event.get('sport_key', ''), day), {})[str(event.get('id'))] = index
+
+        frames = []
+        for (sport_key, day), events in partitions.items():
+            frame = self.history.wide_movement(sport_key, day, window_minutes)
+            frame = frame[frame['event_id'].isin(list(events))].copy()
+            frame['game_index'] = frame['event_id'].map(events)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=['game_index'])
+        return pd.concat(frames, ignore_index=True).sort_values('game_index').reset_index(drop=True)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            indexed = sum(len(sport['events']) for sport in self._sports.values())
+        return dict(self.stats, indexed_events=indexed, quota_remaining=self.quota.get('remaining'),
+                    quota_used=self.quota.get('used'), refresh_interval=self.refresh_interval())
+
+
+# Global planner shared by the odds manager, the cache manager and the per-game odds path
+odds_ingestion = OddsIngestionPlanner()
@@ -0,0 +1,248 @@
+"""
+Parlay Optimizer - Best 2-6 leg parlays by expected value, with correlation rules and branch-and-bound pruning
+Joint win probability and payout come from each leg's model probability and real bookmaker odds
+"""
+
+import heapq
+import math
+from typing import Dict, List, Optional, Sequence
+
+from utils.odds_engine import decimal_to_american, format_american
+from utils.team_registry import normalize_team_key
+
+MIN_LEGS = 2
+MAX_LEGS = 6
+
+# Pairwise correlation between the outcomes of two legs, by how they are related. None means
+# the pair can't share a parlay (most books refuse correlated same-game legs on a standard
+# parlay). Legs on opposite sides of one market in the same game are always excluded.
+DEFAULT_CORRELATION_RULES = {
+    'same_game_same_side': None,        # A team's moneyline and its spread
+    'same_game_opposite_sides': -0.3,   # A team's moneyline and its opponent's spread
+    'same_game_total': 0.1,             # A side and the game's total
+    'same_team': 0.1,                   # The same team in different games (doubleheaders, series)
+}
+
+# Parlays less likely than this to win aren't recommended, whatever their EV
+MIN_JOINT_PROBABILITY = 0.05
+
+
+def legs_from_value_bets(bets: Sequence[Dict]) -> List[Dict]:
+    """Parlay legs from value engine bets (model probability at the outcome's best book)"""
+    return [{
+        'game_id': bet.get('event_id') or bet['game'],
+        'game_index': bet.get('game_index'),
+        'game': bet['game'],
+        'sport': bet.get('sport'),
+        'market': bet['market'],
+        'team': bet.get('team'),
+        'selection': bet['selection'],
+        'book': bet.get('book'),
+        'price': bet.get('price'),
+        'decimal': bet['decimal'],
+        'probability': bet['win_prob'],
+    } for bet in bets]
+
+
+class ParlayOptimizer:
+    """
+    Finds the top-k parlays by expected value among a pool of candidate legs.
+
+    A parlay pays the product of its legs' decimal odds. Its win probability
+    is the product of the legs' probabilities, adjusted pair by pair for
+    correlated legs (same game, same team) with the configured correlation
+    rules. The search is a depth-first branch and bound over legs sorted by
+    their best possible contribution: a branch is cut as soon as its upper
+    bound can't beat the k-th best parlay found so far, so the full
+    combination space is never enumerated.
+    """
+
+    def __init__(self, correlation_rules: Optional[Dict[str, Optional[float]]] = None,
+                 min_probability: float = MIN_JOINT_PROBABILITY):
+        self.correlation_rules = dict(DEFAULT_CORRELATION_RULES, **(correlation_rules or {}))
+        self.min_probability = min_probability
+        self.stats = {'searches': 0, 'nodes': 0, 'pruned': 0}
+
+    def relation(self, leg1: Dict, leg2: Dict) -> Optional[str]:
+        """How two legs are related: 'conflicting', a correlation rule name, or None when independent"""
+        team1 = normalize_team_key(leg1['team']) if leg1.get('team') else None
+        team2 = normalize_team_key(leg2['team']) if leg2.get('team') else None
+        if leg1['game_id'] == leg2['game_id']:
+            if leg1['market'] == leg2['market']:
+                return 'conflicting'
+            if team1 and team2:
+                return 'same_game_same_side' if team1 == team2 else 'same_game_opposite_sides'
+            return 'same_game_total'
+        if team1 and team1 == team2:
+            return 'same_team'
+        return None
+
+    def pair_factor(self, leg1: Dict, leg2: Dict) -> Optional[float]:
+        """
+        Multiplier on the product of two legs' probabilities from their
+        correlation, P(both) = p1 p2 + rho sqrt(p1 (1 - p1) p2 (1 - p2));
+        None when the pair is excluded
+        """
+        relation = self.relation(leg1, leg2)
+        if relation is None:
+            return 1.0
+        rho = None if relation == 'conflicting' else self.correlation_rules.get(relation)
+        if rho is None:
+            return None
+        p1, p2 = leg1['probability'], leg2['probability']
+        factor = 1.0 + rho * math.sqrt((1.0 - p1) * (1.0 - p2) / (p1 * p2))
+        return factor if factor > 0 else None
+
+    def search(self, legs: Sequence[Dict], top_k: int = 5, min_legs: int = MIN_LEGS, max_legs: int = MAX_LEGS,
+               min_sports: int = 1) -> List[Dict]:
+        """
+        The `top_k` parlays of `min_legs` to `max_legs` legs with the highest
+        expected value (per unit staked), best first. `min_sports` asks for
+        legs from at least that many different sports.
+        """
+        self.stats['searches'] += 1
+        legs = [leg for leg in legs if 0.0 < leg.get('probability', 0.0) < 1.0 and leg.get('decimal', 0.0) > 1.0]
+        min_legs, max_legs = max(min_legs, 1), min(max_legs, len(legs))
+        if top_k <= 0 or min_legs > max_legs:
+            return []
+
+        # Only related legs have pair factors; relations come from grouping by game and by team
+        factors: Dict[int, Dict[int, Optional[float]]] = {i: {} for i in range(len(legs))}
+        groups: Dict[tuple, List[int]] = {}
+        for i, leg in enumerate(legs):
+            groups.setdefault(('game', leg['game_id']), []).append(i)
+            if leg.get('team'):
+                groups.setdefault(('team', normalize_team_key(leg['team'])), []).append(i)
+        for members in groups.values():
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    i, j = members[a], members[b]
+                    if j not in factors[i]:
+                        factors[i][j] = factors[j][i] = self.pair_factor(legs[i], legs[j])
+
+        # A leg's most optimistic contribution: its value ratio p * d times every boost it could get
+        boost, bound = [], []
+        for i, leg in enumerate(legs):
+            product = 1.0
+            for factor in factors[i].values():
+                if factor is not None and factor > 1.0:
+                    product *= factor
+            boost.append(product)
+            bound.append(leg['probability'] * leg['decimal'] * product)
+        order = sorted(range(len(legs)), key=lambda i: -bound[i])
+        position = {leg: rank for rank, leg in enumerate(order)}
+        ranked_bound = [bound[i] for i in order]
+
+        # For a branch taking the leg at `rank` with `depth` legs already chosen: the most the next legs
+        # in bound order can multiply its value by (the leg itself and those still needed for min_legs
+        # at full bound, optional ones only if they can help)
+        n = len(order)
+        reach = []
+        for depth in range(max_legs):
+            slots, required = max_legs - depth, max(min_legs - depth, 1)
+            row = []
+            for rank in range(n):
+                product = 1.0
+                for offset in range(min(slots, n - rank)):
+                    product *= ranked_bound[rank + offset] if offset < required else max(ranked_bound[rank + offset], 1.0)
+                row.append(product)
+            reach.append(row)
+        log_reach = [[math.log(product) for product in row] for row in reach]
+
+        # Every leg spends at least -log(p * boost) of win probability, and a parlay can't fall below
+        # min_probability: the best log-bound gained per unit of log-probability spent, over legs from
+        # each rank on, caps what the remaining probability budget can buy. A leg whose boosts could
+        # outweigh its own probability would give budget back, and then neither the budget bound nor
+        # cutting a branch that is already under min_probability holds.
+        spend = [-math.log(legs[i]['probability'] * boost[i]) for i in order]
+        budgeted = self.min_probability > 0 and min(spend) > 0.0
+        ratio_from = [0.0] * (n + 1)
+        if budgeted:
+            for rank in range(n - 1, -1, -1):
+                gain = math.log(ranked_bound[rank]) / spend[rank] if ranked_bound[rank] > 1.0 else 0.0
+                ratio_from[rank] = max(ratio_from[rank + 1], gain)
+        log_floor = math.log(self.min_probability) if budgeted else 0.0
+
+        probabilities = [leg['probability'] for leg in legs]
+        decimals = [leg['decimal'] for leg in legs]
+        best: List[tuple] = []  # Min-heap of (expected value, tiebreak, legs) holding the top_k found so far
+        floor = [-math.inf]     # EV a parlay must beat to enter the top_k
+
+        def extend(chosen, probability, weakest, payout, start):
+            self.stats['nodes'] += 1
+            depth = len(chosen)
+            value = probability * payout
+            # The joint probability is capped once, for the whole parlay, by its least likely leg
+            joint = min(probability, weakest)
+            if depth >= min_legs and joint >= self.min_probability and joint * payout - 1.0 > floor[0]:
+                if min_sports <= 1 or len({legs[i].get('sport') for i in chosen}) >= min_sports:
+                    entry = (joint * payout - 1.0, tuple(sorted(chosen)), list(chosen))
+                    if len(best) < top_k:
+                        heapq.heappush(best, entry)
+                    else:
+                        heapq.heapreplace(best, entry)
+                    if len(best) >= top_k:
+                        floor[0] = best[0][0]
+            if depth == max_legs:
+                return
+
+            row, log_row = reach[depth], log_reach[depth]
+            budget = math.log(probability) - log_floor if budgeted else 0.0
+            # Branches starting past this rank can't reach min_legs
+            for rank in range(start, n - max(min_legs - depth, 1) + 1):
+                ceiling = value * row[rank]
+                if budgeted and ratio_from[rank] * budget < log_row[rank]:
+                    ceiling = value * math.exp(ratio_from[rank] * budget)
+                if ceiling - 1.0 <= floor[0]:
+                    self.stats['pruned'] += 1
+                    return  # Later ranks have smaller bounds, so every later sibling is cut too
+
+                i = order[rank]
+                product = probability * probabilities[i]
+                related = factors[i]
+                if related:
+                    excluded = False
+                    for j in chosen:
+                        factor = related.get(j, 1.0)
+                        if factor is None:
+                            excluded = True
+                            break
+                        product *= factor
+                    if excluded:
+                        continue
+                if budgeted and product < self.min_probability:
+                    continue
+                chosen.append(i)
+                extend(chosen, product, min(weakest, probabilities[i]), payout * decimals[i], rank + 1)
+                chosen.pop()
+
+        extend([], 1.0, 1.0, 1.0, 0)
+
+        parlays = []
+        for expected_value, _, chosen in sorted(best, reverse=True):
+            chosen = sorted(chosen, key=lambda i: position[i])
+            probability, payout = self._price(legs, chosen, factors)
+            parlays.append({
+                'legs': [legs[i] for i in chosen],
+                'num_legs': len(chosen),
+                'probability': probability,
+                'independent_probability': math.prod(legs[i]['probability'] for i in chosen),
+                'decimal': payout,
+                'price': format_american(float(decimal_to_american(payout))),
+                'expected_value': expected_value,
+                'sports': sorted({str(legs[i].get('sport')) for i in chosen}),
+            })
+        return parlays
+
+    def _price(self, legs: Sequence[Dict], chosen: Sequence[int], factors: Dict[int, Dict[int, Optional[float]]]):
+        """Joint probability and decimal payout of a parlay, priced the same way the search does"""
+        probability = math.prod(legs[i]['probability'] for i in chosen)
+        for a, i in enumerate(chosen):
+            for j in chosen[:a]:
+                probability *= factors[i].get(j, 1.0)
+        probability = min(probability, min(legs[i]['probability'] for i in chosen))
+        payout = math.prod(legs[i]['decimal'] for i in chosen)
+        return probability, payout
+
+# Global optimizer shared by the parlay sections
+parlay_optimizer = ParlayOptimizer()
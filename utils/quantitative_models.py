@@ -4,12 +4,87 @@ These models provide statistical foundation before LLM adjustments
 """
 
 import math
+import numpy as np
 import streamlit as st
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime, timedelta
 import hashlib
 import json
 
+# Sport-specific parameters shared with the Elo rating store
+SPORT_CONFIGS = {
+    'NFL': {
+        'home_advantage': 57,  # Points in Elo
+        'key_factors': ['rest_days', 'travel_distance', 'weather', 'injuries'],
+        'pace_factor': 1.0,
+        'variance': 0.15,
+        'season_regression': 0.25  # Regression to mean each season
+    },
+    'NBA': {
+        'home_advantage': 36,
+        'key_factors': ['pace', 'back_to_back', 'altitude', 'rest_advantage'],
+        'pace_factor': 1.2,
+        'variance': 0.12,
+        'season_regression': 0.20
+    },
+    'WNBA': {
+        'home_advantage': 40,
+        'key_factors': ['pace', 'back_to_back', 'travel'],
+        'pace_factor': 1.1,
+        'variance': 0.14,
+        'season_regression': 0.22
+    },
+    'MLB': {
+        'home_advantage': 54,
+        'key_factors': ['pitcher_matchup', 'ballpark', 'weather', 'bullpen'],
+        'pace_factor': 0.8,
+        'variance': 0.18,
+        'season_regression': 0.30
+    },
+    'NHL': {
+        'home_advantage': 55,
+        'key_factors': ['goalie', 'special_teams', 'rest', 'travel'],
+        'pace_factor': 1.0,
+        'variance': 0.16,
+        'season_regression': 0.25
+    },
+    'NCAAF': {
+        'home_advantage': 65,  # Higher for college
+        'key_factors': ['talent_gap', 'motivation', 'weather', 'travel'],
+        'pace_factor': 1.1,
+        'variance': 0.20,
+        'season_regression': 0.35
+    },
+    'NCAAB': {
+        'home_advantage': 42,
+        'key_factors': ['pace', 'experience', 'tournament_seeding'],
+        'pace_factor': 1.3,
+        'variance': 0.16,
+        'season_regression': 0.30
+    }
+}
+
+# Sport-specific model confidence multipliers
+MODEL_CONFIDENCE_MULTIPLIERS = {
+    'MLB': 0.9,    # Lower due to randomness
+    'NHL': 0.85,   # Lower due to randomness
+    'NFL': 1.0,    # Standard
+    'NBA': 1.05,   # Higher due to more games
+    'NCAAF': 0.8,  # Lower due to fewer games
+    'NCAAB': 0.9   # Tournament randomness
+}
+
+# Inputs each sport's vectorized baseline reads (everything else stays zero)
+SLATE_FACTORS = {
+    'NFL': ['travel', 'outdoor', 'nfl_weather', 'injury'],
+    'NBA': ['pace', 'altitude', 'injury'],
+    'MLB': ['has_pitchers', 'pitcher_diff', 'ballpark', 'mlb_weather', 'bullpen'],
+    'NHL': ['goalie', 'special_teams'],
+    'NCAAF': ['motivation', 'conference'],
+    'NCAAB': ['motivation', 'conference'],
+}
+
+
 class QuantitativeModelEngine:
     """
     Multi-sport quantitative modeling engine
@@ -22,91 +97,41 @@ class QuantitativeModelEngine:
         self.k_factor = 32  # Elo adjustment factor
         
         # Sport-specific parameters
-        self.sport_configs = {
-            'NFL': {
-                'home_advantage': 57,  # Points in Elo
-                'key_factors': ['rest_days', 'travel_distance', 'weather', 'injuries'],
-                'pace_factor': 1.0,
-                'variance': 0.15,
-                'season_regression': 0.25  # Regression to mean each season
-            },
-            'NBA': {
-                'home_advantage': 36,
-                'key_factors': ['pace', 'back_to_back', 'altitude', 'rest_advantage'],
-                'pace_factor': 1.2,
-                'variance': 0.12,
-                'season_regression': 0.20
-            },
-            'WNBA': {
-                'home_advantage': 40,
-                'key_factors': ['pace', 'back_to_back', 'travel'],
-                'pace_factor': 1.1,
-                'variance': 0.14,
-                'season_regression': 0.22
-            },
-            'MLB': {
-                'home_advantage': 54,
-                'key_factors': ['pitcher_matchup', 'ballpark', 'weather', 'bullpen'],
-                'pace_factor': 0.8,
-                'variance': 0.18,
-                'season_regression': 0.30
-            },
-            'NHL': {
-                'home_advantage': 55,
-                'key_factors': ['goalie', 'special_teams', 'rest', 'travel'],
-                'pace_factor': 1.0,
-                'variance': 0.16,
-                'season_regression': 0.25
-            },
-            'NCAAF': {
-                'home_advantage': 65,  # Higher for college
-                'key_factors': ['talent_gap', 'motivation', 'weather', 'travel'],
-                'pace_factor': 1.1,
-                'variance': 0.20,
-                'season_regression': 0.35
-            },
-            'NCAAB': {
-                'home_advantage': 42,
-                'key_factors': ['pace', 'experience', 'tournament_seeding'],
-                'pace_factor': 1.3,
-                'variance': 0.16,
-                'season_regression': 0.30
-            }
-        }
+        self.sport_configs = SPORT_CONFIGS
 
     @st.cache_data(ttl=3600)  # Cache for 1 hour
-    def calculate_baseline_probability(self, game_data: Dict, real_time_data: Dict = None) -> Dict:
+    def calculate_baseline_probability(_self, game_data: Dict, real_time_data: Dict = None) -> Dict:
         """Calculate quantitative baseline probability for a game"""
         
         sport = game_data.get('sport', '').upper()
-        home_team = self._safe_team_name(game_data.get('home_team'))
-        away_team = self._safe_team_name(game_data.get('away_team'))
+        home_team = _self._safe_team_name(game_data.get('home_team'))
+        away_team = _self._safe_team_name(game_data.get('away_team'))
         
-        if sport not in self.sport_configs:
-            return self._default_baseline(home_team, away_team)
+        if sport not in _self.sport_configs:
+            return _self._default_baseline(home_team, away_team)
         
         try:
             # Step 1: Get team ratings
-            home_rating = self._get_team_rating(home_team, sport)
-            away_rating = self._get_team_rating(away_team, sport)
+            home_rating = _self._get_team_rating(home_team, sport)
+            away_rating = _self._get_team_rating(away_team, sport)
             
             # Step 2: Apply sport-specific adjustments
             if sport == 'NFL':
-                baseline = self._calculate_nfl_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data)
+                baseline = _self._calculate_nfl_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data)
             elif sport == 'NBA':
-                baseline = self._calculate_nba_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data)
+                baseline = _self._calculate_nba_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data)
             elif sport == 'MLB':
-                baseline = self._calculate_mlb_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data)
+                baseline = _self._calculate_mlb_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data)
             elif sport == 'NHL':
-                baseline = self._calculate_nhl_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data)
+                baseline = _self._calculate_nhl_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data)
             elif sport in ['NCAAF', 'NCAAB']:
-                baseline = self._calculate_college_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data, sport)
+                baseline = _self._calculate_college_baseline(home_team, away_team, home_rating, away_rating, game_data, real_time_data, sport)
             else:
-                baseline = self._calculate_generic_baseline(home_team, away_team, home_rating, away_rating, sport)
+                baseline = _self._calculate_generic_baseline(home_team, away_team, home_rating, away_rating, sport)
             
             # Step 3: Add confidence metrics
-            baseline['model_confidence'] = self._calculate_model_confidence(baseline, sport)
-            baseline['key_factors_used'] = self.sport_configs[sport]['key_factors']
+            baseline['model_confidence'] = _self._calculate_model_confidence(baseline, sport)
+            baseline['key_factors_used'] = _self.sport_configs[sport]['key_factors']
             baseline['sport'] = sport
             
             return baseline
@@ -114,7 +139,251 @@ class QuantitativeModelEngine:
         except Exception as e:
             if st.session_state.get('debug_mode', False):
                 st.write(f"Debug: Quantitative model error for {sport}: {e}")
-            return self._default_baseline(home_team, away_team)
+            return _self._default_baseline(home_team, away_team)
+
+    def calculate_baseline_probabilities(self, games: List[Dict], real_time_data: Optional[List[Dict]] = None) -> Dict[str, np.ndarray]:
+        """
+        Batch version of calculate_baseline_probability for a whole slate.
+        
+        Per-game inputs (ratings, rest, travel, weather, injuries, pitchers) are
+        gathered once, then every sport's Elo difference, adjustments, bounds and
+        logistic transform run as NumPy vectors. Returns one array per numeric
+        field, aligned with `games`; the numbers match the scalar path.
+        Games in unsupported sports get the default baseline (NaN model_confidence).
+        """
+        n = len(games)
+        real_time_data = real_time_data if real_time_data is not None else [None] * n
+        f = self._slate_features(games, real_time_data)
+        
+        out = {
+            'home_win_probability': np.full(n, 0.54),
+            'base_probability': np.full(n, 0.54),
+            'home_rating': f['home_rating'].copy(),
+            'away_rating': f['away_rating'].copy(),
+            'rating_difference': np.zeros(n),
+            'pitcher_advantage': np.zeros(n),
+            'factors_analyzed': np.zeros(n, dtype=int),
+            'confidence_level': np.full(n, 0.5),
+            'model_confidence': np.full(n, np.nan),
+            'sport': f['sport'],
+            'model_type': np.full(n, 'Default', dtype=object),
+        }
+        
+        for sport in np.unique(f['sport']):
+            if sport not in self.sport_configs:
+                continue
+            idx = np.flatnonzero(f['sport'] == sport)
+            game = {key: values[idx] for key, values in f.items() if key != 'sport'}
+            if sport == 'NFL':
+                result = self._vector_nfl_baseline(game)
+            elif sport == 'NBA':
+                result = self._vector_nba_baseline(game)
+            elif sport == 'MLB':
+                result = self._vector_mlb_baseline(game)
+            elif sport == 'NHL':
+                result = self._vector_nhl_baseline(game)
+            elif sport in ['NCAAF', 'NCAAB']:
+                result = self._vector_college_baseline(game, sport)
+            else:
+                result = self._vector_generic_baseline(game, sport)
+            
+            result['model_confidence'] = self._vector_model_confidence(
+                result['factors_analyzed'], result['rating_difference'], sport)
+            for key, values in result.items():
+                out[key][idx] = values
+        
+        out['away_win_probability'] = 1 - out['home_win_probability']
+        return out
+
+    def _slate_features(self, games: List[Dict], real_time_data: List[Optional[Dict]]) -> Dict[str, np.ndarray]:
+        """Per-game model inputs as arrays, extracting only the factors each game's sport uses"""
+        from utils.elo_ratings import elo_ratings
+        
+        n = len(games)
+        sports = np.array([str(game.get('sport', '')).upper() for game in games], dtype=object)
+        home = [self._safe_team_name(game.get('home_team')) for game in games]
+        away = [self._safe_team_name(game.get('away_team')) for game in games]
+        rt = [data or {} for data in real_time_data]
+        
+        # Team-level inputs are looked up once per team
+        team_cache = {}
+        
+        def team_features(team, sport):
+            key = (team, sport)
+            if key not in team_cache:
+                rating = self.base_rating if not team or team == 'Unknown' else round(elo_ratings.get_rating(sport, team), 1)
+                team_cache[key] = (rating, self._get_rest_days(team, {}), self._is_back_to_back(team, {}))
+            return team_cache[key]
+        
+        home_teams = [team_features(team, sport) for team, sport in zip(home, sports)]
+        away_teams = [team_features(team, sport) for team, sport in zip(away, sports)]
+        features = {
+            'home_rating': np.array([t[0] for t in home_teams], dtype=float),
+            'away_rating': np.array([t[0] for t in away_teams], dtype=float),
+            'home_rest': np.array([t[1] for t in home_teams], dtype=float),
+            'away_rest': np.array([t[1] for t in away_teams], dtype=float),
+            'home_b2b': np.array([t[2] for t in home_teams], dtype=bool),
+            'away_b2b': np.array([t[2] for t in away_teams], dtype=bool),
+            'has_real_time': np.array([bool(data) for data in rt], dtype=bool),
+        }
+        
+        def pitcher_data(i):
+            lineup = rt[i].get('lineups', {}).get('lineup', {})
+            return lineup.get('probable_pitchers', {}) if lineup.get('type') == 'pitchers' else None
+        
+        extractors = {
+            'travel': lambda i: self._calculate_travel_adjustment(away[i], home[i]),
+            'outdoor': lambda i: self._is_outdoor_venue(home[i]),
+            'nfl_weather': lambda i: self._calculate_weather_adjustment(rt[i].get('weather', {}), 'NFL'),
+            'mlb_weather': lambda i: self._calculate_weather_adjustment(rt[i].get('weather', {}), 'MLB'),
+            'injury': lambda i: self._calculate_injury_adjustment(rt[i].get('injuries', {}), sports[i]),
+            'has_pitchers': lambda i: pitcher_data(i) is not None,
+            'pitcher_diff': lambda i: self._calculate_pitcher_advantage(pitcher_data(i)) if pitcher_data(i) is not None else 0.0,
+            'pace': lambda i: self._calculate_pace_adjustment(home[i], away[i], sports[i]),
+            'altitude': lambda i: self._calculate_altitude_adjustment(home[i], away[i]),
+            'ballpark': lambda i: self._calculate_ballpark_adjustment(home[i]),
+            'bullpen': lambda i: self._calculate_bullpen_adjustment(home[i], away[i]),
+            'goalie': lambda i: self._calculate_goalie_advantage(home[i], away[i]),
+            'special_teams': lambda i: self._calculate_special_teams_adjustment(home[i], away[i]),
+            'motivation': lambda i: self._calculate_motivation_adjustment(home[i], away[i], games[i]),
+            'conference': lambda i: self._calculate_conference_adjustment(home[i], away[i], sports[i]),
+        }
+        for name in extractors:
+            features[name] = np.zeros(n, dtype=bool if name in ('outdoor', 'has_pitchers') else float)
+        
+        for sport in np.unique(sports):
+            idx = np.flatnonzero(sports == sport)
+            for name in SLATE_FACTORS.get(sport, []):
+                features[name][idx] = [extractors[name](i) for i in idx]
+        
+        features['sport'] = sports
+        return features
+
+    @staticmethod
+    def _apply_adjustment(prob: np.ndarray, count: np.ndarray, adj: np.ndarray, applies: np.ndarray):
+        """Add adj where it applies and count it as an analyzed factor"""
+        return prob + np.where(applies, adj, 0.0), count + applies
+
+    def _vector_elo_to_probability(self, rating_difference: np.ndarray) -> np.ndarray:
+        return 1 / (1 + 10 ** (-rating_difference / 400))
+
+    def _vector_nfl_baseline(self, g: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        config = self.sport_configs['NFL']
+        rating_diff = g['home_rating'] - g['away_rating'] + config['home_advantage']
+        base_prob = self._vector_elo_to_probability(rating_diff)
+        prob, count = base_prob, np.zeros(len(base_prob), dtype=int)
+        
+        rest_advantage = g['home_rest'] - g['away_rest']
+        prob, count = self._apply_adjustment(prob, count, np.minimum(rest_advantage * 0.02, 0.06),
+                                             np.abs(rest_advantage) >= 3)
+        prob, count = self._apply_adjustment(prob, count, g['nfl_weather'],
+                                             g['has_real_time'] & g['outdoor'] & (np.abs(g['nfl_weather']) > 0.01))
+        prob, count = self._apply_adjustment(prob, count, g['injury'],
+                                             g['has_real_time'] & (np.abs(g['injury']) > 0.01))
+        prob, count = self._apply_adjustment(prob, count, g['travel'], np.abs(g['travel']) > 0.005)
+        
+        return self._vector_result(prob, base_prob, rating_diff, count, 'NFL Quantitative',
+                                   np.minimum(0.9, 0.6 + count * 0.05), bounds=(0.15, 0.85))
+
+    def _vector_nba_baseline(self, g: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        config = self.sport_configs['NBA']
+        rating_diff = g['home_rating'] - g['away_rating'] + config['home_advantage']
+        base_prob = self._vector_elo_to_probability(rating_diff)
+        prob, count = base_prob, np.zeros(len(base_prob), dtype=int)
+        
+        home_only = g['home_b2b'] & ~g['away_b2b']
+        away_only = g['away_b2b'] & ~g['home_b2b']
+        prob, count = self._apply_adjustment(prob, count, np.where(home_only, -0.04, 0.04), home_only | away_only)
+        
+        rest_diff = g['home_rest'] - g['away_rest']
+        prob, count = self._apply_adjustment(prob, count, np.minimum(rest_diff * 0.015, 0.045),
+                                             np.abs(rest_diff) >= 2)
+        prob, count = self._apply_adjustment(prob, count, g['pace'], np.abs(g['pace']) > 0.01)
+        prob, count = self._apply_adjustment(prob, count, g['altitude'], np.abs(g['altitude']) > 0.005)
+        prob, count = self._apply_adjustment(prob, count, g['injury'],
+                                             g['has_real_time'] & (np.abs(g['injury']) > 0.01))
+        
+        return self._vector_result(prob, base_prob, rating_diff, count, 'NBA Quantitative',
+                                   np.minimum(0.9, 0.6 + count * 0.05), bounds=(0.15, 0.85))
+
+    def _vector_mlb_baseline(self, g: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        config = self.sport_configs['MLB']
+        pitcher_diff = g['pitcher_diff']
+        count = (g['has_pitchers'] & (np.abs(pitcher_diff) > 10)).astype(int)
+        
+        rating_diff = (g['home_rating'] - g['away_rating']) * 0.6 + pitcher_diff + config['home_advantage']
+        base_prob = self._vector_elo_to_probability(rating_diff)
+        prob = base_prob
+        
+        prob, count = self._apply_adjustment(prob, count, g['ballpark'], np.abs(g['ballpark']) > 0.01)
+        prob, count = self._apply_adjustment(prob, count, g['mlb_weather'],
+                                             g['has_real_time'] & (np.abs(g['mlb_weather']) > 0.01))
+        prob, count = self._apply_adjustment(prob, count, g['bullpen'], np.abs(g['bullpen']) > 0.01)
+        
+        result = self._vector_result(prob, base_prob, rating_diff, count, 'MLB Quantitative',
+                                     np.minimum(0.9, 0.7 + count * 0.04), bounds=(0.15, 0.85))
+        result['pitcher_advantage'] = pitcher_diff
+        return result
+
+    def _vector_nhl_baseline(self, g: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        config = self.sport_configs['NHL']
+        rating_diff = g['home_rating'] - g['away_rating'] + config['home_advantage']
+        base_prob = self._vector_elo_to_probability(rating_diff)
+        prob, count = base_prob, np.zeros(len(base_prob), dtype=int)
+        
+        prob, count = self._apply_adjustment(prob, count, g['goalie'], np.abs(g['goalie']) > 0.02)
+        prob, count = self._apply_adjustment(prob, count, g['special_teams'], np.abs(g['special_teams']) > 0.01)
+        rest_diff = g['home_rest'] - g['away_rest']
+        prob, count = self._apply_adjustment(prob, count, np.minimum(rest_diff * 0.02, 0.05),
+                                             np.abs(rest_diff) >= 1)
+        
+        return self._vector_result(prob, base_prob, rating_diff, count, 'NHL Quantitative',
+                                   np.minimum(0.9, 0.65 + count * 0.05), bounds=(0.15, 0.85))
+
+    def _vector_college_baseline(self, g: Dict[str, np.ndarray], sport: str) -> Dict[str, np.ndarray]:
+        config = self.sport_configs[sport]
+        rating_diff = g['home_rating'] - g['away_rating'] + config['home_advantage']
+        base_prob = self._vector_elo_to_probability(rating_diff)
+        prob, count = base_prob, np.zeros(len(base_prob), dtype=int)
+        
+        talent_gap = np.abs(g['home_rating'] - g['away_rating'])
+        gap_adj = np.minimum(talent_gap / 200, 0.5) * 0.1
+        talent_adj = np.where(g['home_rating'] > g['away_rating'], gap_adj, -gap_adj)
+        prob, count = self._apply_adjustment(prob, count, talent_adj, talent_gap > 100)
+        prob, count = self._apply_adjustment(prob, count, g['motivation'], np.abs(g['motivation']) > 0.01)
+        prob, count = self._apply_adjustment(prob, count, g['conference'], np.abs(g['conference']) > 0.01)
+        
+        return self._vector_result(prob, base_prob, rating_diff, count, f'{sport} Quantitative',
+                                   np.minimum(0.85, 0.55 + count * 0.06), bounds=(0.10, 0.90))
+
+    def _vector_generic_baseline(self, g: Dict[str, np.ndarray], sport: str) -> Dict[str, np.ndarray]:
+        config = self.sport_configs.get(sport, self.sport_configs['NBA'])
+        rating_diff = g['home_rating'] - g['away_rating'] + config['home_advantage']
+        base_prob = self._vector_elo_to_probability(rating_diff)
+        count = np.zeros(len(base_prob), dtype=int)
+        return self._vector_result(base_prob, base_prob, rating_diff, count, f'{sport} Generic',
+                                   np.full(len(base_prob), 0.6), bounds=None)
+
+    @staticmethod
+    def _vector_result(prob, base_prob, rating_diff, count, model_type, confidence_level, bounds) -> Dict[str, np.ndarray]:
+        if bounds is not None:
+            prob = np.clip(prob, *bounds)
+        return {
+            'home_win_probability': prob,
+            'base_probability': base_prob,
+            'rating_difference': rating_diff,
+            'factors_analyzed': count,
+            'confidence_level': confidence_level,
+            'model_type': np.full(len(prob), model_type, dtype=object),
+        }
+
+    def _vector_model_confidence(self, factors: np.ndarray, rating_difference: np.ndarray, sport: str) -> np.ndarray:
+        """Vectorized _calculate_model_confidence for one sport"""
+        factor_bonus = np.minimum(factors * 0.05, 0.2)
+        rating_diff = np.abs(rating_difference)
+        rating_bonus = np.where(rating_diff > 100, np.minimum((rating_diff - 100) / 1000, 0.1), 0)
+        sport_multiplier = MODEL_CONFIDENCE_MULTIPLIERS.get(sport, 1.0)
+        return np.clip((0.7 + factor_bonus + rating_bonus) * sport_multiplier, 0.4, 0.95)
 
     def _calculate_nfl_baseline(self, home_team: str, away_team: str, home_rating: float, 
                                away_rating: float, game_data: Dict, real_time_data: Dict = None) -> Dict:
@@ -182,7 +451,7 @@ class QuantitativeModelEngine:
         config = self.sport_configs['NBA']
         
         # Base calculation with pace adjustment
-        rating_diff = home_rating - away_team + config['home_advantage']
+        rating_diff = home_rating - away_rating + config['home_advantage']
         base_prob = self._elo_to_probability(rating_diff)
         
         adjustments = []
@@ -439,25 +708,12 @@ class QuantitativeModelEngine:
             return 'Unknown'
 
     def _get_team_rating(self, team_name: str, sport: str) -> float:
-        """Get team rating (Elo-style) - currently deterministic based on name"""
+        """Get team Elo rating learned from final scores (base rating until a team has played)"""
         if not team_name or team_name == 'Unknown':
             return self.base_rating
         
-        # Use hash for deterministic but varied ratings
-        hash_val = int(hashlib.md5(f"{team_name}_{sport}".encode()).hexdigest()[:8], 16)
-        
-        # Map to rating range based on sport variance
-        config = self.sport_configs.get(sport, self.sport_configs['NBA'])
-        variance = config.get('variance', 0.15)
-        
-        # Generate rating in range [base_rating * (1-variance), base_rating * (1+variance)]
-        min_rating = self.base_rating * (1 - variance)
-        max_rating = self.base_rating * (1 + variance)
-        
-        normalized = (hash_val % 1000) / 1000.0  # 0-1
-        rating = min_rating + normalized * (max_rating - min_rating)
-        
-        return round(rating, 1)
+        from utils.elo_ratings import elo_ratings
+        return round(elo_ratings.get_rating(sport, team_name), 1)
 
     def _elo_to_probability(self, rating_difference: float) -> float:
         """Convert Elo rating difference to win probability"""
@@ -494,14 +750,7 @@ class QuantitativeModelEngine:
             rating_bonus = 0
         
         # Sport-specific confidence adjustments
-        sport_multiplier = {
-            'MLB': 0.9,    # Lower due to randomness
-            'NHL': 0.85,   # Lower due to randomness
-            'NFL': 1.0,    # Standard
-            'NBA': 1.05,   # Higher due to more games
-            'NCAAF': 0.8,  # Lower due to fewer games
-            'NCAAB': 0.9   # Tournament randomness
-        }.get(sport, 1.0)
+        sport_multiplier = MODEL_CONFIDENCE_MULTIPLIERS.get(sport, 1.0)
         
         final_confidence = (base_confidence + factor_bonus + rating_bonus) * sport_multiplier
         return min(0.95, max(0.4, final_confidence))
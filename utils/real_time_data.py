@@ -10,6 +10,9 @@ from typing import Dict, List, Optional, Any
 import json
 import time
 
+from utils.odds_history import describe_movement, movement_signal
+from utils.odds_ingestion import odds_ingestion
+
 class RealTimeDataEngine:
     """Fetches real-time sports data for accurate predictions"""
     
@@ -99,13 +102,32 @@ class RealTimeDataEngine:
             return self._fallback_weather_data(game_data)
     
     def get_line_movement(self, game_data: Dict) -> Dict:
-        """Get betting line movement data"""
+        """Get betting line movement from the recorded odds history"""
         try:
-            if not self.api_keys['odds_api']:
+            summary = odds_ingestion.line_movement(game_data)
+            if not summary:
                 return self._fallback_line_movement(game_data)
             
-            # Real odds API call would go here
-            return self._get_realistic_line_movement(game_data)
+            signal = movement_signal(summary)
+            home_team = game_data.get('home_team', {}).get('name', 'home')
+            away_team = game_data.get('away_team', {}).get('name', 'away')
+            side = {'home': home_team, 'away': away_team}.get(signal['favours'])
+            if signal['steam']:
+                sharp_money = f"Steam move toward {side} in the last hour"
+            elif signal['significant'] and side:
+                sharp_money = f"Market has moved toward {side} since open"
+            else:
+                sharp_money = 'No significant movement'
+            
+            return {
+                'movement': describe_movement(summary, home_team),
+                'sharp_money': sharp_money,
+                'public_betting': 'Unknown',
+                'spread_move': signal['spread_move'],
+                'total_move': signal['total_move'],
+                'probability_move': signal['probability_move'],
+                'history': summary
+            }
             
         except Exception as e:
             return self._fallback_line_movement(game_data)
@@ -3,13 +3,114 @@ Real-Time Data Engine for Enhanced Prediction Accuracy
 Replaces simulated data with actual API integrations
 """
 
-import requests
 import json
 import streamlit as st
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
+import os
 import re
+import threading
+import time
+import concurrent.futures
+from collections import deque
+
+from utils.http_cache import http_session
+from utils.league_snapshots import league_snapshots
+from utils.team_registry import team_registry
+
+# Per-source deadlines (seconds) for the concurrent fan-out, counted from when the source starts
+# running, and the overall budget per game. Team stats read the standings snapshot, which may need
+# a cold league download (league_snapshots times out at 8s), so it gets as long as the injuries.
+SOURCE_DEADLINES = {
+    'team_stats': 9.0,
+    'weather': 6.0,
+    'injuries_home': 9.0,
+    'injuries_away': 9.0,
+    'market_odds': 9.0,
+    'recent_form': 10.0,
+}
+# How often the fan-out checks for sources that were queued behind other games' fetches and have started
+QUEUE_POLL_SECONDS = 0.05
+DEFAULT_DATA_BUDGET = float(os.environ.get('REALTIME_DATA_BUDGET', 10.0))
+
+# ESPN league paths whose standings feed _fetch_team_season_stats
+SEASON_STATS_LEAGUES = {
+    'NFL': 'football/nfl',
+    'NBA': 'basketball/nba',
+    'MLB': 'baseball/mlb',
+}
+
+
+class SourceLatencyTracker:
+    """Rolling per-source latency samples, so the feed at the tail is easy to spot"""
+
+    def __init__(self, max_samples: int = 200):
+        self.max_samples = max_samples
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, source: str, outcome: str):
+        counts = self._counts.setdefault(source, {'ok': 0, 'error': 0, 'timeout': 0})
+        counts[outcome] += 1
+
+    def record(self, source: str, seconds: float, ok: bool = True):
+        with self._lock:
+            self._samples.setdefault(source, deque(maxlen=self.max_samples)).append(seconds)
+            self._count(source, 'ok' if ok else 'error')
+
+    def record_timeout(self, source: str):
+        with self._lock:
+            self._count(source, 'timeout')
+
+    def summary(self) -> Dict[str, Dict]:
+        """p50/p95/max latency and outcome counts per source, slowest p95 first"""
+        with self._lock:
+            rows = {}
+            for source, counts in self._counts.items():
+                samples = sorted(self._samples.get(source, ()))
+                row = dict(counts)
+                if samples:
+                    row.update({
+                        'p50': samples[len(samples) // 2],
+                        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+                        'max': samples[-1],
+                    })
+                rows[source] = row
+        return dict(sorted(rows.items(), key=lambda item: item[1].get('p95', 0.0), reverse=True))
+
+
+# Global latency samples across every engine instance
+source_latency = SourceLatencyTracker()
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
+
+def _get_fetch_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Shared worker pool for source fetches (engines are created per request)"""
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=int(os.environ.get('REALTIME_DATA_MAX_WORKERS', 24)), thread_name_prefix='rt-data'
+            )
+        return _fetch_pool
+
+
+def _timed_call(source: str, func: Callable[[], Any]) -> Tuple[Any, float, Optional[str]]:
+    """Run one source fetch, returning (value, seconds, error) and recording its latency"""
+    start = time.monotonic()
+    try:
+        value, error = func(), None
+    except Exception as e:
+        logging.error(f"Real-time source {source} failed: {e}")
+        value, error = None, str(e)
+    elapsed = time.monotonic() - start
+    source_latency.record(source, elapsed, ok=error is None)
+    return value, elapsed, error
+
 
 class RealTimeDataEngine:
     """Fetch real-time sports data to enhance prediction accuracy"""
@@ -25,8 +126,16 @@ class RealTimeDataEngine:
         self.cache = {}
         self.cache_ttl = 3600  # 1 hour
         
-    def get_comprehensive_game_data(self, game_data: Dict) -> Dict:
-        """Get comprehensive real-time data for a game"""
+    def get_comprehensive_game_data(self, game_data: Dict, fan_out: bool = True,
+                                    budget: Optional[float] = None) -> Dict:
+        """Get comprehensive real-time data for a game
+
+        With `fan_out` every source is fetched at the same time, each with its own
+        deadline from SOURCE_DEADLINES (counted from when it starts running), and
+        the whole call returns within `budget` seconds. Sources that miss their
+        deadline, or never start within the budget, are listed in
+        'missing_sources' and don't count toward 'data_quality_score'.
+        """
         
         home_team = self._extract_team_name(game_data.get('home_team', {}))
         away_team = self._extract_team_name(game_data.get('away_team', {}))
@@ -40,13 +149,33 @@ class RealTimeDataEngine:
             'timestamp': datetime.now().isoformat()
         }
         
+        sources = {
+            'injuries_home': lambda: self._fetch_espn_injuries(home_team, sport),
+            'injuries_away': lambda: self._fetch_espn_injuries(away_team, sport),
+            'team_stats': lambda: self._get_real_team_stats(home_team, away_team, sport),
+            'recent_form': lambda: self._get_recent_form(home_team, away_team, sport),
+        }
+        if sport in ['NFL', 'MLB']:
+            venue = game_data.get('venue', f'{home_team} Stadium')
+            sources['weather'] = lambda: self._get_real_weather_data(venue)
+        if sport == 'NFL' and event_id:
+            sources['market_odds'] = lambda: self._fetch_espn_odds(event_id)
+        
+        if fan_out:
+            results, latency = self._fetch_sources_concurrently(
+                sources, DEFAULT_DATA_BUDGET if budget is None else budget
+            )
+        else:
+            results, latency = self._fetch_sources_sequentially(sources)
+        comprehensive_data['source_latency'] = latency
+        comprehensive_data['missing_sources'] = sorted(name for name in sources if name not in results)
+        
         try:
-            # 1. Get weather data for outdoor sports
+            # 1. Weather for outdoor sports
             if sport in ['NFL', 'MLB']:
-                venue = game_data.get('venue', f'{home_team} Stadium')
-                weather_data = self._get_real_weather_data(venue)
+                weather_data = results.get('weather') or self._get_fallback_weather()
                 comprehensive_data['weather'] = weather_data
-                if weather_data.get('temperature'):
+                if 'weather' in results and weather_data.get('temperature'):
                     comprehensive_data['data_quality_score'] += 0.3
             else:
                 # Indoor sports - still add basic weather context
@@ -57,30 +186,39 @@ class RealTimeDataEngine:
                     'source': 'Indoor'
                 }
             
-            # 2. Get injury reports
-            injury_data = self._get_real_injury_data(home_team, away_team, sport)
+            # 2. Injury reports
+            injury_data = self._build_injury_data(
+                home_team, away_team, results.get('injuries_home'), results.get('injuries_away')
+            )
             comprehensive_data['injuries'] = injury_data
-            if injury_data.get('reports'):
+            if 'injuries_home' in results and 'injuries_away' in results and injury_data.get('reports'):
                 comprehensive_data['data_quality_score'] += 0.3
             
-            # 3. Get team statistics
-            team_stats = self._get_real_team_stats(home_team, away_team, sport)
+            # 3. Team statistics
+            team_stats = results.get('team_stats') or {
+                'home_stats': {}, 'away_stats': {}, 'source': 'Unavailable',
+                'last_updated': datetime.now().isoformat()
+            }
             comprehensive_data['team_stats'] = team_stats
             if team_stats.get('home_stats') and team_stats.get('away_stats'):
                 comprehensive_data['data_quality_score'] += 0.3
                 
-            # 4. Get recent form
-            recent_form = self._get_recent_form(home_team, away_team, sport)
+            # 4. Recent form
+            recent_form = results.get('recent_form') or {
+                'home_form': {'last_5': '', 'trend': 'neutral'},
+                'away_form': {'last_5': '', 'trend': 'neutral'},
+                'source': 'Unavailable',
+                'last_updated': datetime.now().isoformat()
+            }
             comprehensive_data['recent_form'] = recent_form
-            if recent_form.get('home_form') and recent_form.get('away_form'):
+            if 'recent_form' in results and recent_form.get('home_form') and recent_form.get('away_form'):
                 comprehensive_data['data_quality_score'] += 0.1
 
-            # 5. Get ESPN odds/market for event
-            if sport == 'NFL' and event_id:
-                odds = self._fetch_espn_odds(event_id)
-                if odds:
-                    comprehensive_data['market_odds'] = odds
-                    comprehensive_data['data_quality_score'] += 0.1
+            # 5. ESPN odds/market for event
+            odds = results.get('market_odds')
+            if odds:
+                comprehensive_data['market_odds'] = odds
+                comprehensive_data['data_quality_score'] += 0.1
             
         except Exception as e:
             logging.error(f"Error fetching comprehensive data: {e}")
@@ -88,6 +226,80 @@ class RealTimeDataEngine:
         
         return comprehensive_data
     
+    def _fetch_sources_concurrently(self, sources: Dict[str, Callable[[], Any]],
+                                    budget: float) -> Tuple[Dict[str, Any], Dict[str, Dict]]:
+        """
+        Submit every source to the shared pool and collect whatever finishes
+        before its deadline. The pool is shared by every game being analyzed,
+        so a source's deadline runs from when it starts, not from when it was
+        queued; sources still queued when the budget runs out are cancelled.
+        """
+        pool = _get_fetch_pool()
+        submitted = time.monotonic()
+        budget_end = submitted + budget
+        starts: Dict[str, float] = {}
+        
+        def run(name, func):
+            starts[name] = time.monotonic()
+            return _timed_call(name, func)
+        
+        futures = {pool.submit(run, name, func): name for name, func in sources.items()}
+        pending = set(futures)
+        results, latency = {}, {}
+        while pending:
+            now = time.monotonic()
+            deadlines = {
+                future: min(starts[futures[future]] + SOURCE_DEADLINES.get(futures[future], budget), budget_end)
+                if futures[future] in starts else budget_end
+                for future in pending
+            }
+            for future in [future for future in pending if deadlines[future] <= now and not future.done()]:
+                pending.discard(future)
+                name = futures[future]
+                # A running request keeps going in the pool and its real latency is still recorded when it lands
+                queued = future.cancel() or name not in starts
+                source_latency.record_timeout(name)
+                latency[name] = {'seconds': round(now - starts.get(name, submitted), 3),
+                                 'status': 'queued' if queued else 'timeout'}
+            if not pending:
+                break
+            wait = min(deadlines.values()) - now
+            if any(futures[future] not in starts for future in pending):
+                wait = min(wait, QUEUE_POLL_SECONDS)
+            done, _ = concurrent.futures.wait(pending, timeout=max(0.0, wait),
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                value, elapsed, error = future.result()
+                latency[futures[future]] = {'seconds': round(elapsed, 3), 'status': 'error' if error else 'ok'}
+                if error is None:
+                    results[futures[future]] = value
+        
+        self._log_latency(latency)
+        return results, latency
+    
+    def _fetch_sources_sequentially(self, sources: Dict[str, Callable[[], Any]]) -> Tuple[Dict[str, Any], Dict[str, Dict]]:
+        """Fetch sources one after another (no deadlines), still timing each one"""
+        results, latency = {}, {}
+        for name, func in sources.items():
+            value, elapsed, error = _timed_call(name, func)
+            latency[name] = {'seconds': round(elapsed, 3), 'status': 'error' if error else 'ok'}
+            if error is None:
+                results[name] = value
+        self._log_latency(latency)
+        return results, latency
+    
+    def _log_latency(self, latency: Dict[str, Dict]):
+        if not latency:
+            return
+        slowest = max(latency, key=lambda name: latency[name]['seconds'])
+        logging.info(
+            "Real-time sources: " + ", ".join(
+                f"{name}={info['seconds']:.2f}s{'' if info['status'] == 'ok' else ' (' + info['status'] + ')'}"
+                for name, info in latency.items()
+            ) + f"; slowest={slowest}"
+        )
+    
     def _extract_team_name(self, team_data) -> str:
         """Extract team name from various formats"""
         if isinstance(team_data, dict):
@@ -114,7 +326,7 @@ class RealTimeDataEngine:
                 'units': 'imperial'
             }
             
-            response = requests.get(url, params=params, timeout=5)
+            response = http_session.get(url, params=params, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 weather_info = {
@@ -151,22 +363,27 @@ class RealTimeDataEngine:
     def _get_real_injury_data(self, home_team: str, away_team: str, sport: str) -> Dict:
         """Get real injury reports (using free sources when possible)"""
         
+        home_injuries, away_injuries = [], []
+        try:
+            # Try to get injury data from ESPN (free API)
+            home_injuries = self._fetch_espn_injuries(home_team, sport)
+            away_injuries = self._fetch_espn_injuries(away_team, sport)
+        except Exception as e:
+            logging.error(f"Injury data error: {e}")
+        
+        return self._build_injury_data(home_team, away_team, home_injuries, away_injuries)
+    
+    def _build_injury_data(self, home_team: str, away_team: str, home_injuries: Optional[List[Dict]],
+                           away_injuries: Optional[List[Dict]]) -> Dict:
+        """Combine both teams' ESPN injuries into one report"""
+        
         # For now, use ESPN's injury API (free) or fallback to structured format
         injury_data = {
-            'reports': [],
+            'reports': (home_injuries or []) + (away_injuries or []),
             'last_updated': datetime.now().isoformat(),
             'source': 'ESPN/Manual'
         }
         
-        try:
-            # Try to get injury data from ESPN (free API)
-            for team in [home_team, away_team]:
-                team_injuries = self._fetch_espn_injuries(team, sport)
-                if team_injuries:
-                    injury_data['reports'].extend(team_injuries)
-        except Exception as e:
-            logging.error(f"Injury data error: {e}")
-        
         # If no real data, provide structured placeholder with team names
         if not injury_data['reports']:
             injury_data['reports'] = [
@@ -177,7 +394,7 @@ class RealTimeDataEngine:
         return injury_data
     
     def _fetch_espn_injuries(self, team: str, sport: str) -> List[Dict]:
-        """Fetch injury data from ESPN public endpoints.
+        """Fetch injury data from the league-wide ESPN injuries snapshot.
         Supports NFL, NBA, WNBA (others can be added similarly).
         Returns standardized injury dicts.
         """
@@ -196,17 +413,9 @@ class RealTimeDataEngine:
                 return []
             if not team_id:
                 return []
-            cache_key = f"espn_injuries_{team_id}_{datetime.now().strftime('%Y%m%d%H')}"
-            if cache_key in self.cache:
-                return self.cache[cache_key]
-
-            # ESPN injuries endpoint
-            url = f"https://site.web.api.espn.com/apis/common/v3/sports/{sport_key}/{league_key}/teams/{team_id}/injuries"
-            resp = requests.get(url, timeout=8)
-            if resp.status_code != 200:
-                return []
-            data = resp.json()
 
+            # League-wide injuries snapshot (one call per league per hour)
+            data = league_snapshots.get_injuries(f'{sport_key}/{league_key}', team_id)
             raw_items = self._extract_espn_injury_items(data)
             standardized: List[Dict] = []
             for item in raw_items:
@@ -233,8 +442,6 @@ class RealTimeDataEngine:
                     'note': note
                 })
 
-            # cache for the hour
-            self.cache[cache_key] = standardized
             return standardized
         except Exception as e:
             logging.error(f"ESPN injuries fetch error for {team}: {e}")
@@ -272,62 +479,8 @@ class RealTimeDataEngine:
         return self._get_espn_team_id_generic('football', 'nfl', team_name)
 
     def _get_espn_team_id_generic(self, sport_key: str, league_key: str, team_name: str) -> Optional[str]:
-        """Resolve team name to ESPN team ID by querying ESPN teams list and caching the mapping."""
-        try:
-            cache_key = f'espn_{sport_key}_{league_key}_teams_map'
-            teams_map = self.cache.get(cache_key)
-            if not teams_map:
-                url = f'https://site.api.espn.com/apis/site/v2/sports/{sport_key}/{league_key}/teams'
-                resp = requests.get(url, timeout=8)
-                if resp.status_code != 200:
-                    return None
-                payload = resp.json()
-                # ESPN responses vary slightly by sport; support both structures
-                sports_arr = payload.get('sports')
-                if isinstance(sports_arr, list) and sports_arr:
-                    teams = (((sports_arr or [{}])[0]).get('leagues') or [{}])[0].get('teams', [])
-                else:
-                    teams = payload.get('teams', [])
-                teams_map = {}
-                for t in teams:
-                    team = t.get('team', t)
-                    tid = str(team.get('id')) if team.get('id') is not None else None
-                    if not tid:
-                        continue
-                    names = set()
-                    for key in ['displayName', 'shortDisplayName', 'name', 'nickname']:
-                        if team.get(key):
-                            names.add(team[key])
-                    loc = team.get('location')
-                    nick = team.get('name')
-                    if loc and nick:
-                        names.add(f"{loc} {nick}")
-                    abbr = team.get('abbreviation')
-                    if abbr:
-                        names.add(abbr)
-                    for n in names:
-                        teams_map[self._norm(n)] = tid
-                self.cache[cache_key] = teams_map
-
-            # Try direct name, then split and try last word (nickname)
-            candidates = [team_name, team_name.replace('FC', '').replace('AFC', '').strip()]
-            for c in candidates:
-                tid = teams_map.get(self._norm(c))
-                if tid:
-                    return tid
-            # Try to match by nickname only (last word)
-            parts = re.split(r"\s+", team_name.strip())
-            if parts:
-                nick = parts[-1]
-                for k, v in teams_map.items():
-                    if k.endswith(self._norm(nick)):
-                        return v
-        except Exception:
-            return None
-        return None
-
-    def _norm(self, s: str) -> str:
-        return re.sub(r"[^a-z0-9]", "", s.lower()) if isinstance(s, str) else ""
+        """Resolve team name to ESPN team ID through the shared team registry."""
+        return team_registry.resolve_id(f'{sport_key}/{league_key}', team_name)
     
     def _get_real_team_stats(self, home_team: str, away_team: str, sport: str) -> Dict:
         """Get real team statistics"""
@@ -351,15 +504,27 @@ class RealTimeDataEngine:
         return team_stats
     
     def _fetch_team_season_stats(self, team: str, sport: str) -> Dict:
-        """Fetch season statistics for a team"""
+        """Fetch season statistics for a team (record and scoring from the standings snapshot)"""
+        
+        standings = {}
+        league = SEASON_STATS_LEAGUES.get(sport)
+        if league:
+            team_id = self._get_espn_team_id_generic(*league.split('/'), team)
+            if team_id:
+                standings = league_snapshots.get_standings(league, team_id)
+        wins = int(standings.get('wins', 0))
+        losses = int(standings.get('losses', 0))
+        games = standings.get('gamesPlayed') or (wins + losses + standings.get('ties', 0))
+        points_for = standings.get('pointsFor', 0.0)
+        points_per_game = standings.get('avgPointsFor') or (points_for / games if games else 0.0)
         
         # Sport-specific stats structure
         if sport == 'NFL':
             return {
-                'wins': 0,
-                'losses': 0,
-                'points_for': 0.0,
-                'points_against': 0.0,
+                'wins': wins,
+                'losses': losses,
+                'points_for': points_for,
+                'points_against': standings.get('pointsAgainst', 0.0),
                 'total_yards_per_game': 0.0,
                 'passing_yards_per_game': 0.0,
                 'rushing_yards_per_game': 0.0,
@@ -370,9 +535,9 @@ class RealTimeDataEngine:
             }
         elif sport == 'NBA':
             return {
-                'wins': 0,
-                'losses': 0,
-                'points_per_game': 0.0,
+                'wins': wins,
+                'losses': losses,
+                'points_per_game': points_per_game,
                 'rebounds_per_game': 0.0,
                 'assists_per_game': 0.0,
                 'field_goal_pct': 0.0,
@@ -383,9 +548,9 @@ class RealTimeDataEngine:
             }
         elif sport == 'MLB':
             return {
-                'wins': 0,
-                'losses': 0,
-                'runs_per_game': 0.0,
+                'wins': wins,
+                'losses': losses,
+                'runs_per_game': points_per_game,
                 'era': 0.0,
                 'batting_avg': 0.0,
                 'on_base_pct': 0.0,
@@ -420,33 +585,14 @@ class RealTimeDataEngine:
             logging.error(f"Recent form error: {e}")
         return form_data
 
-    def _fetch_espn_recent_form(self, team_id: str, limit: int = 5) -> Dict:
+    def _fetch_espn_recent_form(self, team_id: str, limit: int = 5, league: str = 'football/nfl') -> Dict:
+        """Last results and trend from the league-wide recent finals snapshot"""
         try:
-            url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/teams/{team_id}/schedule?limit={limit}"
-            r = requests.get(url, timeout=8)
-            if r.status_code != 200:
+            results = league_snapshots.get_recent_results(league, team_id, limit)
+            if not results:
                 return {'last_5': '', 'trend': 'neutral'}
-            data = r.json()
-            events = data.get('events', [])[-limit:]
-            last = []
-            wins = 0
-            for ev in events:
-                competitions = ev.get('competitions', [])
-                if not competitions:
-                    continue
-                comp = competitions[0]
-                competitors = comp.get('competitors', [])
-                # determine if this team was winner
-                outcome = 'L'
-                for c in competitors:
-                    team = c.get('team', {})
-                    if str(team.get('id')) == str(team_id):
-                        if c.get('winner') is True:
-                            outcome = 'W'
-                            wins += 1
-                        break
-                last.append(outcome)
-            last_5 = ''.join(last[-limit:])
+            last_5 = ''.join('W' if game['won'] else 'L' for game in results)
+            wins = last_5.count('W')
             trend = 'up' if wins >= (limit // 2 + 1) else 'down' if wins <= (limit // 2 - 1) else 'neutral'
             return {'last_5': last_5, 'trend': trend}
         except Exception:
@@ -456,7 +602,7 @@ class RealTimeDataEngine:
         """Fetch odds from ESPN event endpoint (pickcenter)."""
         try:
             url = f"https://site.web.api.espn.com/apis/common/v3/sports/football/nfl/events/{event_id}?region=us&lang=en&contentorigin=espn"
-            r = requests.get(url, timeout=8)
+            r = http_session.get(url, timeout=8)
             if r.status_code != 200:
                 return {}
             data = r.json()
@@ -495,6 +641,9 @@ class RealTimeDataEngine:
         if comprehensive_data.get('team_stats', {}).get('home_stats'):
             summary_parts.append("Team Stats: Current season statistics available")
         
+        if comprehensive_data.get('missing_sources'):
+            summary_parts.append(f"Unavailable (timed out): {', '.join(comprehensive_data['missing_sources'])}")
+        
         if summary_parts:
             return f"Real-time data available (Quality: {quality_score:.1f}/1.0): " + "; ".join(summary_parts)
         else:
@@ -3,21 +3,232 @@
 Advanced calibration system that shrinks overconfident predictions
 """
 
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: refits from several processes may overwrite each other
+    fcntl = None
+
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
-import streamlit as st
+
+# Fitted curves are kept as a small JSON artifact; bump when its layout changes
+CURVE_SCHEMA_VERSION = 2
+CURVE_BIN_EDGES = np.linspace(0.5, 1.0, 11)  # 50% to 100% in 5% increments
+HIGH_CONFIDENCE_THRESHOLD = 0.85
+
+# While the curve is still synthetic, how often (seconds) the database is asked for graded history
+HISTORY_RECHECK_SECONDS = 15 * 60
+
 
 class ReliabilityCurveCalibrator:
     """Advanced reliability curve system to shrink overconfident picks"""
     
-    def __init__(self):
-        self.calibration_data = self._load_calibration_history()
-        self.reliability_curve = self._build_reliability_curve()
-        
-    def _load_calibration_history(self) -> pd.DataFrame:
-        """Load historical prediction vs outcome data for calibration"""
+    def __init__(self, artifact_path: str = ".local/reliability_curve.json", isotonic: bool = False,
+                 history_recheck_seconds: float = HISTORY_RECHECK_SECONDS):
+        self.artifact_path = artifact_path
+        self.isotonic = isotonic
+        self.history_recheck_seconds = history_recheck_seconds
+        self._curve = None
+    
+    @property
+    def curve(self) -> Dict:
+        """
+        Fitted curve artifact, loaded (or fitted once from history) on first
+        use. A curve fitted to synthetic data is marked as such and replaced
+        by a fit to the real history once the database has some; the database
+        is checked at most every `history_recheck_seconds` until then.
+        """
+        if self._curve is None:
+            self._load_curve()
+        return self._curve
+    
+    def _load_curve(self) -> bool:
+        """Load the artifact, refitting it when missing or synthetic; True if refitted from the database"""
+        previous = self._curve = self._load_artifact()
+        if previous is not None and not previous.get('synthetic'):
+            return False
+        # The last check is kept in the artifact, so every worker shares one schedule
+        if previous is not None and time.time() - previous.get('history_checked_at', 0) < self.history_recheck_seconds:
+            return False
+        history = self._load_database_history()
+        if previous is None or history is not None:
+            self._curve = self._fit_from_history(history)
+            if previous is not None:
+                self._curve['version'] = previous['version'] + 1
+        else:
+            previous['history_checked_at'] = time.time()
+        self._save_artifact()
+        return history is not None
+    
+    @property
+    def reliability_curve(self) -> Dict[float, float]:
+        """Bin center -> calibrated accuracy"""
+        centers = self._bin_centers(np.array(self.curve['bin_edges']))
+        return dict(zip(centers.tolist(), self.curve['calibrated']))
+    
+    def _load_artifact(self) -> Optional[Dict]:
+        """Read the curve artifact if it exists and matches the current layout"""
+        try:
+            with open(self.artifact_path, 'r') as f:
+                curve = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if curve.get('schema_version') != CURVE_SCHEMA_VERSION or \
+                not np.allclose(curve.get('bin_edges', []), CURVE_BIN_EDGES):
+            return None
+        if curve.get('isotonic') != self.isotonic:
+            curve['isotonic'] = self.isotonic
+            curve['calibrated'] = self._calibrated_values(curve)
+        return curve
+    
+    def _save_artifact(self):
+        """Write the curve atomically so concurrent readers never see a partial file"""
+        try:
+            os.makedirs(os.path.dirname(self.artifact_path) or '.', exist_ok=True)
+            tmp_path = f"{self.artifact_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._curve, f)
+            os.replace(tmp_path, self.artifact_path)
+        except OSError:
+            pass
+    
+    @contextmanager
+    def _artifact_lock(self):
+        """Exclusive lock shared by every process updating the artifact"""
+        if fcntl is None:
+            yield
+            return
+        try:
+            os.makedirs(os.path.dirname(self.artifact_path) or '.', exist_ok=True)
+            lock_file = open(f"{self.artifact_path}.lock", 'w')
+        except OSError:
+            yield
+            return
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            lock_file.close()
+    
+    def _fit_from_history(self, history: Optional[pd.DataFrame]) -> Dict:
+        """Fit a fresh curve from graded prediction history (synthetic when there is none)"""
+        curve = self._empty_curve()
+        if history is None:
+            history = self._generate_synthetic_calibration_data()
+            curve['synthetic'] = True
+            curve['history_checked_at'] = time.time()
+        self._accumulate(curve, history['confidence'].to_numpy(dtype=float),
+                         history['was_correct'].to_numpy(dtype=bool))
+        curve['calibrated'] = self._calibrated_values(curve)
+        return curve
+    
+    def _empty_curve(self) -> Dict:
+        n_bins = len(CURVE_BIN_EDGES) - 1
+        return {
+            'schema_version': CURVE_SCHEMA_VERSION,
+            'version': 0,
+            'fitted_at': datetime.now().isoformat(),
+            'isotonic': self.isotonic,
+            'bin_edges': CURVE_BIN_EDGES.tolist(),
+            'counts': [0] * n_bins,
+            'wins': [0] * n_bins,
+            'calibrated': self._bin_centers(CURVE_BIN_EDGES).tolist(),
+            'total_count': 0,
+            'total_wins': 0,
+            'high_count': 0,
+            'high_wins': 0,
+            'high_confidence_sum': 0.0,
+            'synthetic': False,
+        }
+    
+    @staticmethod
+    def _bin_centers(edges: np.ndarray) -> np.ndarray:
+        return (edges[:-1] + edges[1:]) / 2
+    
+    @staticmethod
+    def _accumulate(curve: Dict, confidences: np.ndarray, outcomes: np.ndarray):
+        """Add graded predictions to the curve's per-bin sufficient statistics"""
+        valid = ~np.isnan(confidences)
+        confidences, outcomes = confidences[valid], outcomes[valid]
+        
+        edges = np.array(curve['bin_edges'])
+        n_bins = len(edges) - 1
+        bin_idx = np.searchsorted(edges, confidences, side='right') - 1
+        in_range = (bin_idx >= 0) & (bin_idx < n_bins)
+        
+        curve['counts'] = (np.array(curve['counts']) +
+                           np.bincount(bin_idx[in_range], minlength=n_bins)).tolist()
+        curve['wins'] = (np.array(curve['wins']) +
+                         np.bincount(bin_idx[in_range], weights=outcomes[in_range], minlength=n_bins)).astype(int).tolist()
+        
+        high = confidences >= HIGH_CONFIDENCE_THRESHOLD
+        curve['total_count'] += int(len(confidences))
+        curve['total_wins'] += int(outcomes.sum())
+        curve['high_count'] += int(high.sum())
+        curve['high_wins'] += int(outcomes[high].sum())
+        curve['high_confidence_sum'] += float(confidences[high].sum())
+    
+    @staticmethod
+    def _calibrated_values(curve: Dict) -> List[float]:
+        """Per-bin accuracy (bin center where a bin is empty), optionally made monotone"""
+        counts = np.array(curve['counts'], dtype=float)
+        wins = np.array(curve['wins'], dtype=float)
+        centers = ReliabilityCurveCalibrator._bin_centers(np.array(curve['bin_edges']))
+        
+        has_data = counts > 0
+        values = np.where(has_data, wins / np.where(has_data, counts, 1), centers)
+        
+        if curve.get('isotonic') and has_data.any():
+            values[has_data] = ReliabilityCurveCalibrator._isotonic_fit(values[has_data], counts[has_data])
+        return values.tolist()
+    
+    @staticmethod
+    def _isotonic_fit(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Weighted pool-adjacent-violators: the closest non-decreasing sequence"""
+        blocks = []  # [mean, weight, length]
+        for value, weight in zip(values, weights):
+            blocks.append([value, weight, 1])
+            while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+                v2, w2, n2 = blocks.pop()
+                v1, w1, n1 = blocks.pop()
+                blocks.append([(v1 * w1 + v2 * w2) / (w1 + w2), w1 + w2, n1 + n2])
+        return np.concatenate([np.full(n, v) for v, _, n in blocks])
+    
+    def record_outcomes(self, confidences, outcomes) -> int:
+        """
+        Refit the curve incrementally from newly graded picks.
+        
+        Only the per-bin counts are updated, so the cost is proportional to the
+        new picks rather than the whole history. Returns the new curve version.
+        """
+        confidences = np.atleast_1d(np.asarray(confidences, dtype=float))
+        outcomes = np.atleast_1d(np.asarray(outcomes, dtype=bool))
+        
+        # Read-modify-write under the lock, starting from the artifact on disk so
+        # counts added by other workers since this one loaded it aren't lost
+        with self._artifact_lock():
+            refitted = self._load_curve()
+            curve = self._curve
+            # A fresh fit from the database already includes these graded picks
+            if not refitted:
+                self._accumulate(curve, confidences, outcomes)
+                curve['calibrated'] = self._calibrated_values(curve)
+            curve['version'] += 1
+            curve['fitted_at'] = datetime.now().isoformat()
+            self._save_artifact()
+        return curve['version']
+    
+    def _load_database_history(self) -> Optional[pd.DataFrame]:
+        """Graded predictions from the database, or None when there are none (or no database)"""
         
         # Try to load from database
         try:
@@ -41,84 +252,39 @@ class ReliabilityCurveCalibrator:
                     return df
                     
         except Exception as e:
-            st.warning(f"⚠️ Could not load calibration history: {e}")
-        
-        # Fallback: Generate synthetic calibration data based on typical overconfidence patterns
-        return self._generate_synthetic_calibration_data()
+            # Runs on grading and analysis workers, away from the Streamlit script thread
+            logging.warning(f"Could not load calibration history: {e}")
+        return None
     
     def _generate_synthetic_calibration_data(self) -> pd.DataFrame:
         """Generate realistic overconfidence patterns for calibration"""
         
-        np.random.seed(42)  # Reproducible
+        rng = np.random.default_rng(42)  # Reproducible
         n_samples = 1000
         
         # Simulate typical AI overconfidence pattern
-        raw_confidences = np.random.beta(2, 2, n_samples)  # U-shaped distribution
-        
-        # Apply overconfidence bias - AI tends to be overconfident at high levels
-        calibrated_success_rates = []
-        
-        for conf in raw_confidences:
-            if conf >= 0.9:
-                # Very high confidence predictions are often overconfident
-                actual_rate = conf * 0.85 + np.random.normal(0, 0.05)
-            elif conf >= 0.8:
-                # High confidence has moderate overconfidence
-                actual_rate = conf * 0.9 + np.random.normal(0, 0.04)
-            elif conf >= 0.7:
-                # Medium-high confidence is fairly well calibrated
-                actual_rate = conf * 0.95 + np.random.normal(0, 0.03)
-            elif conf >= 0.6:
-                # Medium confidence is slightly underconfident
-                actual_rate = conf * 1.02 + np.random.normal(0, 0.03)
-            else:
-                # Low confidence is often underconfident
-                actual_rate = conf * 1.1 + np.random.normal(0, 0.05)
-            
-            # Clamp to valid probability range
-            actual_rate = max(0.1, min(0.95, actual_rate))
-            calibrated_success_rates.append(actual_rate)
+        raw_confidences = rng.beta(2, 2, n_samples)  # U-shaped distribution
+        
+        # Apply overconfidence bias - AI tends to be overconfident at high levels:
+        # very high confidence is often overconfident, medium-high is fairly well
+        # calibrated, medium and low confidence are underconfident
+        bands = [raw_confidences >= 0.9, raw_confidences >= 0.8, raw_confidences >= 0.7, raw_confidences >= 0.6]
+        scale = np.select(bands, [0.85, 0.9, 0.95, 1.02], default=1.1)
+        noise = np.select(bands, [0.05, 0.04, 0.03, 0.03], default=0.05)
+        
+        # Clamp to valid probability range
+        calibrated_success_rates = np.clip(raw_confidences * scale + rng.normal(0, 1, n_samples) * noise, 0.1, 0.95)
         
         # Generate outcomes based on calibrated rates
-        outcomes = [np.random.random() < rate for rate in calibrated_success_rates]
+        outcomes = rng.random(n_samples) < calibrated_success_rates
         
         return pd.DataFrame({
             'confidence': raw_confidences,
             'was_correct': outcomes,
-            'sport': np.random.choice(['NFL', 'NBA', 'MLB', 'NHL'], n_samples),
-            'created_at': [datetime.now() - timedelta(days=np.random.randint(0, 365)) for _ in range(n_samples)]
+            'sport': rng.choice(['NFL', 'NBA', 'MLB', 'NHL'], n_samples),
+            'created_at': datetime.now() - pd.to_timedelta(rng.integers(0, 365, n_samples), unit='D')
         })
     
-    def _build_reliability_curve(self) -> Dict[str, float]:
-        """Build reliability curve mapping predicted confidence to actual accuracy"""
-        
-        if self.calibration_data.empty:
-            return {}
-        
-        # Create confidence bins
-        bins = np.linspace(0.5, 1.0, 11)  # 50% to 100% in 5% increments
-        bin_centers = (bins[:-1] + bins[1:]) / 2
-        
-        reliability_curve = {}
-        
-        for i, (bin_start, bin_end) in enumerate(zip(bins[:-1], bins[1:])):
-            # Get predictions in this confidence bin
-            mask = (self.calibration_data['confidence'] >= bin_start) & \
-                   (self.calibration_data['confidence'] < bin_end)
-            
-            bin_data = self.calibration_data[mask]
-            
-            if len(bin_data) > 0:
-                actual_accuracy = bin_data['was_correct'].mean()
-                predicted_confidence = bin_centers[i]
-                
-                reliability_curve[predicted_confidence] = actual_accuracy
-            else:
-                # No data in this bin - use interpolation
-                reliability_curve[bin_centers[i]] = bin_centers[i]
-        
-        return reliability_curve
-    
     def calibrate_confidence(self, raw_confidence: float, sport: str = None, 
                            context: Dict = None) -> Dict:
         """Apply reliability curve calibration to shrink overconfident picks"""
@@ -149,34 +315,24 @@ class ReliabilityCurveCalibrator:
             'shrinkage_applied': shrinkage_factor,
             'sport_adjustment': sport_adjustment,
             'calibration_quality': self._assess_calibration_quality(final_confidence),
-            'recommendation_tier': self._get_recommendation_tier(final_confidence, reliability_score)
+            'recommendation_tier': self._get_recommendation_tier(final_confidence, reliability_score),
+            'curve_version': self.curve['version']
         }
     
     def _interpolate_reliability_curve(self, confidence: float) -> float:
-        """Interpolate the reliability curve for given confidence level"""
-        
-        if not self.reliability_curve:
-            return confidence  # No calibration data available
-        
-        # Find surrounding points for interpolation
-        conf_points = sorted(self.reliability_curve.keys())
+        """Linear interpolation on the reliability curve, clamped to its end points"""
         
-        if confidence <= conf_points[0]:
-            return self.reliability_curve[conf_points[0]]
-        elif confidence >= conf_points[-1]:
-            return self.reliability_curve[conf_points[-1]]
+        x = self._bin_centers(np.array(self.curve['bin_edges']))
+        y = np.array(self.curve['calibrated'])
         
-        # Linear interpolation between surrounding points
-        for i in range(len(conf_points) - 1):
-            if conf_points[i] <= confidence <= conf_points[i + 1]:
-                x1, x2 = conf_points[i], conf_points[i + 1]
-                y1, y2 = self.reliability_curve[x1], self.reliability_curve[x2]
-                
-                # Linear interpolation
-                weight = (confidence - x1) / (x2 - x1)
-                return y1 + weight * (y2 - y1)
+        if confidence <= x[0]:
+            return float(y[0])
+        elif confidence >= x[-1]:
+            return float(y[-1])
         
-        return confidence  # Fallback
+        i = int(np.searchsorted(x, confidence, side='right')) - 1
+        weight = (confidence - x[i]) / (x[i + 1] - x[i])
+        return float(y[i] + weight * (y[i + 1] - y[i]))
     
     def _get_sport_adjustment(self, sport: str) -> float:
         """Sport-specific reliability adjustments based on predictability"""
@@ -264,28 +420,26 @@ class ReliabilityCurveCalibrator:
     def get_calibration_stats(self) -> Dict:
         """Get statistics about the calibration system"""
         
-        if self.calibration_data.empty:
+        curve = self.curve
+        if not curve['total_count']:
             return {"status": "No calibration data available"}
         
-        total_predictions = len(self.calibration_data)
-        overall_accuracy = self.calibration_data['was_correct'].mean()
-        
-        # Analyze overconfidence by bins
-        high_conf_mask = self.calibration_data['confidence'] >= 0.85
-        high_conf_data = self.calibration_data[high_conf_mask]
-        
-        high_conf_accuracy = high_conf_data['was_correct'].mean() if len(high_conf_data) > 0 else 0
-        high_conf_predicted = high_conf_data['confidence'].mean() if len(high_conf_data) > 0 else 0
-        
-        overconfidence_gap = high_conf_predicted - high_conf_accuracy
+        high_count = curve['high_count']
+        high_conf_accuracy = curve['high_wins'] / high_count if high_count > 0 else 0
+        high_conf_predicted = curve['high_confidence_sum'] / high_count if high_count > 0 else 0
         
         return {
-            'total_predictions': total_predictions,
-            'overall_accuracy': overall_accuracy,
-            'high_confidence_predictions': len(high_conf_data),
+            'total_predictions': curve['total_count'],
+            'overall_accuracy': curve['total_wins'] / curve['total_count'],
+            'high_confidence_predictions': high_count,
             'high_confidence_accuracy': high_conf_accuracy,
             'high_confidence_predicted': high_conf_predicted,
-            'overconfidence_gap': overconfidence_gap,
-            'calibration_curve_points': len(self.reliability_curve),
-            'last_updated': datetime.now().isoformat()
+            'overconfidence_gap': high_conf_predicted - high_conf_accuracy,
+            'calibration_curve_points': len(curve['calibrated']),
+            'curve_version': curve['version'],
+            'last_updated': curve['fitted_at']
         }
+
+
+# Global calibrator; the curve artifact is loaded on first use
+reliability_calibrator = ReliabilityCurveCalibrator()
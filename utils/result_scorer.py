@@ -5,13 +5,53 @@ import streamlit as st
 import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from functools import lru_cache
 import json
+from utils.espn_scoreboard import espn_scoreboard
+from utils.elo_ratings import elo_ratings
+from utils.team_registry import team_registry
+
+# ESPN scoreboard paths by sport
+SPORT_PATHS = {
+    'NFL': 'football/nfl',
+    'NBA': 'basketball/nba',
+    'WNBA': 'basketball/wnba',
+    'MLB': 'baseball/mlb',
+    'NHL': 'hockey/nhl',
+    'NCAAF': 'football/college-football',
+    'NCAAB': 'basketball/mens-college-basketball',
+    'TENNIS': 'tennis'
+}
+
+
+@lru_cache(maxsize=8192)
+def _normalize_name(name: str) -> str:
+    """Normalize a team name for matching (cached - the same names recur on every slate)"""
+    name = name.strip().lower()
+    
+    # Remove common prefixes/suffixes
+    replacements = {
+        ' fc': '',
+        ' cf': '',
+        'the ': '',
+        ' united': '',
+        ' city': '',
+        ' town': '',
+    }
+    
+    for old, new in replacements.items():
+        name = name.replace(old, new)
+    
+    return name
+
 
 class ResultScorer:
     """Fetches game results and scores predictions"""
     
     def __init__(self):
         self.espn_base_url = "https://site.api.espn.com/apis/site/v2/sports"
+        self.stats = {'scoreboard_fetches': 0, 'predictions_graded': 0}
     
     def get_final_scores_for_date(self, date_str: str, sports: List[str]) -> Dict[str, List[Dict]]:
         """Fetch final scores for all games on a given date"""
@@ -19,7 +59,7 @@ class ResultScorer:
         
         for sport in sports:
             try:
-                sport_results = self._fetch_sport_results(sport, date_str)
+                sport_results = self._get_sport_results(sport, date_str)
                 if sport_results:
                     results[sport] = sport_results
             except Exception as e:
@@ -28,45 +68,29 @@ class ResultScorer:
         
         return results
     
+    def _get_sport_results(self, sport: str, date_str: str) -> List[Dict]:
+        """Fetch one league-day of finals and feed them into the Elo ratings"""
+        self.stats['scoreboard_fetches'] += 1
+        sport_results = self._fetch_sport_results(sport, date_str)
+        if sport_results:
+            # Already-applied games are skipped by the rating store
+            elo_ratings.record_results(sport, sport_results)
+        return sport_results
+    
     def _fetch_sport_results(self, sport: str, date_str: str) -> List[Dict]:
         """Fetch results for a specific sport and date"""
-        sport_map = {
-            'NFL': 'football/nfl',
-            'NBA': 'basketball/nba', 
-            'WNBA': 'basketball/wnba',
-            'MLB': 'baseball/mlb',
-            'NHL': 'hockey/nhl',
-            'NCAAF': 'football/college-football',
-            'NCAAB': 'basketball/mens-college-basketball',
-            'Tennis': 'tennis'
-        }
-        
-        if sport not in sport_map:
+        path = SPORT_PATHS.get(str(sport).upper())
+        if not path:
             return []
         
-        # Try multiple date formats for ESPN API
-        date_formats = [
-            datetime.strptime(date_str, '%Y-%m-%d').strftime('%Y%m%d'),
-            date_str.replace('-', ''),
-            date_str
-        ]
-        
-        for date_format in date_formats:
-            try:
-                url = f"{self.espn_base_url}/{sport_map[sport]}/scoreboard"
-                params = {'dates': date_format}
+        try:
+            data = espn_scoreboard.get_scoreboard_by_path(path, date_str)
+            if data:
+                return self._parse_espn_results(data, sport)
                 
-                response = requests.get(url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    games = self._parse_espn_results(data, sport)
-                    if games:  # Found games for this date format
-                        return games
-                        
-            except Exception as e:
-                if st.session_state.get('debug_mode', False):
-                    st.write(f"Debug: ESPN API error for {sport} on {date_format}: {e}")
-                continue
+        except Exception as e:
+            if st.session_state.get('debug_mode', False):
+                st.write(f"Debug: ESPN API error for {sport} on {date_str}: {e}")
         
         return []
     
@@ -98,9 +122,12 @@ class ResultScorer:
                 away_team = None
                 
                 for competitor in competitors:
+                    team = competitor.get('team', {})
                     team_info = {
-                        'name': competitor.get('team', {}).get('displayName', 'Unknown'),
-                        'score': int(competitor.get('score', 0))
+                        'name': team.get('displayName', 'Unknown'),
+                        'score': int(competitor.get('score', 0)),
+                        'aliases': self._team_aliases(team),
+                        'id': str(team['id']) if team.get('id') is not None else None
                     }
                     
                     if competitor.get('homeAway') == 'home':
@@ -128,9 +155,97 @@ class ResultScorer:
         
         return games
     
+    def _team_aliases(self, team: Dict) -> List[str]:
+        """Normalized names a prediction might use for an ESPN team"""
+        names = [team.get('displayName'), team.get('shortDisplayName'), team.get('name'), team.get('abbreviation')]
+        aliases = []
+        for name in names:
+            if name:
+                alias = self._normalize_team_name(name)
+                if alias and alias not in aliases:
+                    aliases.append(alias)
+        return aliases
+    
+    def build_result_index(self, results: List[Dict]) -> Dict[Tuple[str, str], Dict]:
+        """Hash index from normalized (home, away) name pairs to results"""
+        index = {}
+        for result in results:
+            home_aliases = result['home_team'].get('aliases') or [self._normalize_team_name(result['home_team']['name'])]
+            away_aliases = result['away_team'].get('aliases') or [self._normalize_team_name(result['away_team']['name'])]
+            for home in home_aliases:
+                for away in away_aliases:
+                    index.setdefault((home, away), result)
+            home_id, away_id = result['home_team'].get('id'), result['away_team'].get('id')
+            if home_id and away_id:
+                index.setdefault((f'#{home_id}', f'#{away_id}'), result)
+        return index
+    
+    def find_result(self, index: Dict[Tuple[str, str], Dict], home_team, away_team,
+                    results: Optional[List[Dict]] = None, sport: Optional[str] = None) -> Optional[Dict]:
+        """
+        Look a matchup up in a result index.
+        
+        With `sport`, a name miss is retried by ESPN team id through the team
+        registry. When `results` is given, a remaining miss falls back to
+        substring matching in either orientation (e.g. "Lakers" against
+        "Los Angeles Lakers").
+        """
+        home = self._normalize_team_name(home_team)
+        away = self._normalize_team_name(away_team)
+        result = index.get((home, away))
+        if result is None and sport in SPORT_PATHS and home and away:
+            home_id = team_registry.resolve_id(SPORT_PATHS[sport], self._raw_team_name(home_team))
+            away_id = team_registry.resolve_id(SPORT_PATHS[sport], self._raw_team_name(away_team))
+            if home_id and away_id:
+                result = index.get((f'#{home_id}', f'#{away_id}'))
+        if result is not None or not results or not home or not away:
+            return result
+        
+        for candidate in results:
+            names = (candidate['home_team']['name'].lower(), candidate['away_team']['name'].lower())
+            if any(home in name for name in names) and any(away in name for name in names):
+                return candidate
+        return None
+    
+    def grade_pending(self, predictions: List[Dict], sport_key: str = 'sport', date_key: str = 'date',
+                      partial_match: bool = False) -> List[Optional[Dict]]:
+        """
+        Find final results for a batch of predictions in one pass.
+        
+        Predictions are grouped by (sport, date) so each league-day scoreboard
+        is fetched once and indexed once; every prediction is then a hash lookup.
+        Returns the matching result (or None) for each prediction, in order.
+        """
+        groups = defaultdict(list)
+        for i, prediction in enumerate(predictions):
+            game_date = str(prediction.get(date_key) or '')[:10]
+            if game_date and game_date != 'Unknown':
+                groups[(str(prediction.get(sport_key, '')).upper(), game_date)].append(i)
+        
+        matches: List[Optional[Dict]] = [None] * len(predictions)
+        for (sport, game_date), positions in groups.items():
+            if sport not in SPORT_PATHS:
+                continue
+            try:
+                results = self._get_sport_results(sport, game_date)
+            except Exception:
+                continue
+            if not results:
+                continue
+            
+            index = self.build_result_index(results)
+            for i in positions:
+                matches[i] = self.find_result(index, predictions[i].get('home_team', ''),
+                                              predictions[i].get('away_team', ''),
+                                              results if partial_match else None, sport=sport)
+        
+        self.stats['predictions_graded'] += len(predictions)
+        return matches
+    
     def score_predictions(self, predictions: List[Dict], final_results: Dict[str, List[Dict]]) -> List[Dict]:
         """Score predictions against final results"""
         scored_predictions = []
+        indexes = {}
         
         for prediction in predictions:
             scored_pred = prediction.copy()
@@ -140,7 +255,7 @@ class ResultScorer:
             scored_pred['away_score'] = None
             
             # Find matching game result
-            game_result = self._find_matching_result(prediction, final_results)
+            game_result = self._find_matching_result(prediction, final_results, indexes)
             
             if game_result:
                 scored_pred['result'] = self._determine_prediction_result(prediction, game_result)
@@ -152,47 +267,30 @@ class ResultScorer:
         
         return scored_predictions
     
-    def _find_matching_result(self, prediction: Dict, final_results: Dict[str, List[Dict]]) -> Optional[Dict]:
-        """Find the game result that matches a prediction"""
+    def _find_matching_result(self, prediction: Dict, final_results: Dict[str, List[Dict]],
+                              indexes: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
+        """Find the game result that matches a prediction (indexes caches one index per sport)"""
         pred_sport = prediction.get('sport', '').upper()
-        pred_home = self._normalize_team_name(prediction.get('home_team', ''))
-        pred_away = self._normalize_team_name(prediction.get('away_team', ''))
         
         if pred_sport not in final_results:
             return None
         
-        for result in final_results[pred_sport]:
-            result_home = self._normalize_team_name(result['home_team']['name'])
-            result_away = self._normalize_team_name(result['away_team']['name'])
-            
-            # Match by team names
-            if (pred_home == result_home and pred_away == result_away):
-                return result
+        indexes = indexes if indexes is not None else {}
+        if pred_sport not in indexes:
+            indexes[pred_sport] = self.build_result_index(final_results[pred_sport])
         
-        return None
+        return self.find_result(indexes[pred_sport], prediction.get('home_team', ''), prediction.get('away_team', ''),
+                                sport=pred_sport)
     
     def _normalize_team_name(self, name: str) -> str:
         """Normalize team names for matching"""
-        if isinstance(name, dict):
-            name = name.get('name', '')
-        
-        # Basic normalization
-        name = str(name).strip().lower()
-        
-        # Remove common prefixes/suffixes
-        replacements = {
-            ' fc': '',
-            ' cf': '',
-            'the ': '',
-            ' united': '',
-            ' city': '',
-            ' town': '',
-        }
-        
-        for old, new in replacements.items():
-            name = name.replace(old, new)
-        
-        return name
+        return _normalize_name(self._raw_team_name(name))
+    
+    @staticmethod
+    def _raw_team_name(team) -> str:
+        if isinstance(team, dict):
+            team = team.get('name', '')
+        return str(team)
     
     def _determine_prediction_result(self, prediction: Dict, game_result: Dict) -> str:
         """Determine if prediction was correct"""
@@ -7,6 +7,8 @@ import requests
 from utils.cache_manager import CacheManager
 from utils.live_games import LiveGamesManager
 from utils.odds_api import OddsAPIManager
+from utils.espn_scoreboard import espn_scoreboard
+from utils.result_scorer import ResultScorer
 
 class GameResultTracker:
     """Track game results and analyze prediction accuracy"""
@@ -15,6 +17,7 @@ class GameResultTracker:
         self.cache = CacheManager()
         self.games_manager = LiveGamesManager()
         self.odds_manager = OddsAPIManager()
+        self.result_scorer = ResultScorer()
         
         # Initialize result storage in session state
         if 'tracked_predictions' not in st.session_state:
@@ -81,11 +84,12 @@ class GameResultTracker:
         
         results_summary['total_checked'] = len(pending_predictions)
         
-        # Check each pending prediction
+        # Grade every pending prediction in one pass (one scoreboard fetch per league-day)
+        game_results = self._fetch_game_results(pending_predictions)
+        
         for tracking_id, prediction in pending_predictions.items():
             try:
-                # Get game result
-                game_result = self._fetch_game_result(prediction)
+                game_result = game_results.get(tracking_id)
                 
                 if game_result:
                     # Update prediction with result
@@ -128,12 +132,61 @@ class GameResultTracker:
             pass
         return False
     
+    def _result_cache_key(self, prediction: Dict) -> str:
+        game_key = f"{prediction.get('away_team', '')}_{prediction.get('home_team', '')}_{prediction.get('game_date', '')}"
+        return f"game_result_{hash(game_key)}"
+    
+    def _fetch_game_results(self, predictions: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Results for many predictions at once, keyed by tracking id"""
+        results = {}
+        uncached = []
+        
+        for tracking_id, prediction in predictions.items():
+            cached_result = self.cache.get_cached_data(self._result_cache_key(prediction), ttl_minutes=60)
+            if cached_result is not None:
+                results[tracking_id] = cached_result
+            else:
+                uncached.append(tracking_id)
+        
+        if not uncached:
+            return results
+        
+        # Scoreboards are grouped by (sport, date) and indexed by (home, away)
+        matches = self.result_scorer.grade_pending(
+            [predictions[tracking_id] for tracking_id in uncached], date_key='game_date', partial_match=True
+        )
+        
+        for tracking_id, match in zip(uncached, matches):
+            if match:
+                result = self._format_scorer_result(match)
+                self.cache.set_cached_data(self._result_cache_key(predictions[tracking_id]), result)
+                results[tracking_id] = result
+        
+        return results
+    
+    def _format_scorer_result(self, match: Dict) -> Dict:
+        """Convert a ResultScorer final into this tracker's result format"""
+        home_name = match['home_team']['name']
+        away_name = match['away_team']['name']
+        home_score = match['home_score']
+        away_score = match['away_score']
+        
+        return {
+            'home_team': home_name,
+            'away_team': away_name,
+            'home_score': home_score,
+            'away_score': away_score,
+            'winner': home_name if home_score > away_score else away_name,
+            'final_score': f"{away_score}-{home_score}",
+            'source': 'ESPN',
+            'game_completed': True
+        }
+    
     def _fetch_game_result(self, prediction: Dict) -> Optional[Dict]:
         """Fetch the actual game result"""
         
         # Create cache key for game result
-        game_key = f"{prediction.get('away_team', '')}_{prediction.get('home_team', '')}_{prediction.get('game_date', '')}"
-        cache_key = f"game_result_{hash(game_key)}"
+        cache_key = self._result_cache_key(prediction)
         
         # Check cache first
         cached_result = self.cache.get_cached_data(cache_key, ttl_minutes=60)
@@ -182,13 +235,9 @@ class GameResultTracker:
             if not game_date or game_date == 'Unknown':
                 return None
             
-            url = f"https://site.api.espn.com/apis/site/v2/sports/{espn_sports[sport]}/scoreboard"
-            params = {'dates': game_date.replace('-', '')}
-            
-            response = requests.get(url, params=params, timeout=10)
+            data = espn_scoreboard.get_scoreboard_by_path(espn_sports[sport], game_date)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data:
                 games = data.get('events', [])
                 
                 # Find matching game
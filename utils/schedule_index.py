@@ -0,0 +1,200 @@
+"""
+Schedule Index - Per-league "dates with games" built from ESPN's season calendar
+Finds the nearest slate with a lookup instead of probing one date after another
+"""
+
+import concurrent.futures
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.espn_scoreboard import espn_scoreboard
+from utils.local_store import LocalStore, local_store
+
+INDEX_NAMESPACE = 'schedule_index'
+
+# How long a calendar is kept when ESPN doesn't say when the season ends
+DEFAULT_INDEX_TTL = 7 * 24 * 3600
+
+
+def parse_start(value) -> Optional[float]:
+    """Epoch seconds for an ISO start time (naive times are taken as UTC)"""
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        start = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return start.timestamp()
+
+
+class ScheduleIndex:
+    """
+    Which dates each league has games on, cached for the season.
+
+    ESPN's scoreboard response carries the league's season calendar: exact
+    game days for daily leagues (NBA, NHL, MLB, ...) and week ranges for
+    weekly ones (NFL, college football). The calendar is read from any
+    scoreboard the app already fetched and kept in the local store until the
+    season ends. For a week range the index can only say "maybe", so those
+    dates still get probed.
+    """
+
+    def __init__(self, store: Optional[LocalStore] = None, max_probe_workers: int = 8):
+        self.store = store or local_store
+        self.max_probe_workers = max_probe_workers
+        self._memory: Dict[str, Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'indexed': 0, 'lookups': 0, 'probes': 0, 'probes_skipped': 0}
+
+    def observe(self, league: str, data: Optional[Dict]) -> bool:
+        """Index a league's season calendar from a scoreboard response (no-op if already indexed)"""
+        league = str(league).upper()
+        if not data or self._get(league) is not None:
+            return False
+        entry = self._parse_calendar(data)
+        if entry is None:
+            return False
+
+        season_end = entry.get('season_end')
+        ttl = DEFAULT_INDEX_TTL
+        if season_end:
+            end = datetime.fromisoformat(season_end) + timedelta(days=1)
+            ttl = max((end - datetime.now()).total_seconds(), 24 * 3600)
+        stored = dict(entry, dates=sorted(entry['dates']))
+        self.store.set(INDEX_NAMESPACE, league, stored, ttl, item_count=len(entry['dates']) + len(entry['ranges']))
+        with self._lock:
+            self._memory[league] = (time.time() + ttl, entry)
+        self.stats['indexed'] += 1
+        return True
+
+    def _get(self, league: str) -> Optional[Dict]:
+        with self._lock:
+            cached = self._memory.get(league)
+            if cached and cached[0] > time.time():
+                return cached[1]
+        entry = self.store.get(INDEX_NAMESPACE, league)
+        if entry is not None:
+            entry['dates'] = set(entry['dates'])
+            with self._lock:
+                # Re-read from the store within the hour, so another process's refresh is picked up
+                self._memory[league] = (time.time() + 3600, entry)
+        return entry
+
+    @staticmethod
+    def _parse_calendar(data: Dict) -> Optional[Dict]:
+        league_info = (data.get('leagues') or [{}])[0]
+        calendar = league_info.get('calendar') or []
+        if not calendar:
+            return None
+
+        dates, ranges = set(), []
+        for item in calendar:
+            if isinstance(item, str):
+                # Daily leagues list every game day
+                dates.add(item[:10])
+            elif isinstance(item, dict):
+                # Weekly leagues list season types, each with week ranges
+                for week in item.get('entries') or [item]:
+                    start, end = str(week.get('startDate', ''))[:10], str(week.get('endDate', ''))[:10]
+                    if start and end:
+                        ranges.append([start, end])
+
+        season = league_info.get('season') or {}
+        season_end = str(season.get('endDate', ''))[:10] or None
+        return {'dates': dates, 'ranges': ranges, 'season_end': season_end}
+
+    def has_games(self, league: str, day: date) -> Optional[bool]:
+        """True/False from the index, or None when the index is cold or only has week ranges"""
+        self.stats['lookups'] += 1
+        entry = self._get(str(league).upper())
+        if entry is None:
+            return None
+        iso_day = day.isoformat()
+        if iso_day in entry['dates']:
+            return True
+        if any(start <= iso_day <= end for start, end in entry['ranges']):
+            return None
+        return False
+
+    def classify(self, leagues: Iterable[str], days: Iterable[date]) -> Dict[date, Optional[bool]]:
+        """Per day: True if any league has games, False if none can, None if it needs probing"""
+        leagues = list(leagues)
+        result = {}
+        for day in days:
+            answers = [self.has_games(league, day) for league in leagues]
+            result[day] = True if True in answers else None if None in answers else False
+        return result
+
+    def _probe(self, leagues: Sequence[str], day: date, timeout: float) -> bool:
+        """Does any league have games on its dated scoreboard? Warms the index as a side effect"""
+        self.stats['probes'] += 1
+        found = False
+        for league in leagues:
+            data = espn_scoreboard.get_league_scoreboard(league, day, timeout=timeout)
+            self.observe(league, data)
+            if data and data.get('events'):
+                found = True
+        return found
+
+    def nearest_slate(self, leagues: Sequence[str], candidate_dates: Sequence[date],
+                      timeout: float = 8) -> Optional[date]:
+        """
+        First candidate date (in the given preference order) with games in any league.
+
+        Dates the index rules out are skipped. The rest, up to the first date
+        the index confirms, are probed concurrently; as soon as the most
+        preferred remaining date succeeds the other probes are cancelled.
+        """
+        known = self.classify(leagues, candidate_dates)
+        to_probe: List[date] = []
+        for day in candidate_dates:
+            if known[day] is False:
+                self.stats['probes_skipped'] += 1
+                continue
+            to_probe.append(day)
+            if known[day] is True:
+                break
+        if not to_probe:
+            return None
+        if known[to_probe[0]] is True:
+            return to_probe[0]
+
+        outcome: Dict[date, bool] = {day: True for day in to_probe if known[day] is True}
+
+        def decided() -> Optional[date]:
+            # The most preferred date still in play, once everything ahead of it has failed
+            for day in to_probe:
+                if day not in outcome:
+                    return None
+                if outcome[day]:
+                    return day
+            return None
+
+        pending = [day for day in to_probe if known[day] is None]
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self.max_probe_workers, len(pending)), thread_name_prefix='slate-probe'
+        )
+        try:
+            futures = {executor.submit(self._probe, leagues, day, timeout): day for day in pending}
+            for future in concurrent.futures.as_completed(futures, timeout=timeout * 2):
+                try:
+                    outcome[futures[future]] = future.result()
+                except Exception:
+                    outcome[futures[future]] = False
+                winner = decided()
+                if winner is not None:
+                    return winner
+            return None
+        except concurrent.futures.TimeoutError:
+            return decided()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+# Global index shared by game discovery views
+schedule_index = ScheduleIndex()
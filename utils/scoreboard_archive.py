@@ -0,0 +1,105 @@
+"""
+Scoreboard Archive - Dated ESPN scoreboards kept in the local store
+Finished days are stored permanently; today and future days expire quickly
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.local_store import LocalStore, local_store
+
+ARCHIVE_NAMESPACE = 'scoreboard_archive'
+
+# Finished days never change again; ten years is "forever" for the store's expiry column
+PERMANENT_TTL = 10 * 365 * 24 * 3600
+TODAY_TTL = 60
+FUTURE_TTL = 15 * 60
+UNSETTLED_PAST_TTL = 5 * 60
+# A past day with no events may be an off day or a download that came back empty; recheck it daily
+EMPTY_PAST_TTL = 24 * 3600
+
+# Past days with games still not final (suspended, postponed) are archived anyway after this long
+SETTLE_AFTER_DAYS = 2
+
+
+class ScoreboardArchive:
+    """
+    Local archive of dated ESPN scoreboards.
+
+    A (league path, day) scoreboard is stored permanently once the day is
+    over and every game on it is final, so calendar and history views never
+    download it again. Each entry also records how many games fall on that
+    day, which lets month views count games straight from the store's
+    metadata without reading a single payload.
+    """
+
+    def __init__(self, store: Optional[LocalStore] = None):
+        self.store = store or local_store
+        self.stats = {'hits': 0, 'misses': 0, 'archived': 0}
+
+    @staticmethod
+    def make_key(path: str, date_param: str) -> str:
+        return f"{path.strip('/')}|{date_param}"
+
+    @staticmethod
+    def _day(date_param: str) -> Optional[date]:
+        try:
+            return datetime.strptime(date_param, '%Y%m%d').date()
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, path: str, date_param: Optional[str]) -> Optional[Dict]:
+        """Archived scoreboard for a league path and YYYYMMDD date, if still valid"""
+        if not date_param:
+            return None
+        data = self.store.get(ARCHIVE_NAMESPACE, self.make_key(path, date_param))
+        self.stats['hits' if data is not None else 'misses'] += 1
+        return data
+
+    def put(self, path: str, date_param: Optional[str], data: Optional[Dict]) -> bool:
+        """Archive a dated scoreboard with a TTL based on whether its day is settled"""
+        day = self._day(date_param)
+        if day is None or not isinstance(data, dict):
+            return False
+
+        # ESPN files a dated scoreboard's events under the US day asked for, even when an evening
+        # game's UTC start time falls on the next date
+        events = data.get('events', [])
+        stored = self.store.set(
+            ARCHIVE_NAMESPACE, self.make_key(path, date_param), data, self.ttl_for(day, events),
+            date=day.isoformat(), sports=[path.strip('/')], item_count=len(events)
+        )
+        if stored:
+            self.stats['archived'] += 1
+        return stored
+
+    @staticmethod
+    def ttl_for(day: date, events: List[Dict], today: Optional[date] = None) -> float:
+        today = today or date.today()
+        if day > today:
+            return FUTURE_TTL
+        if day == today:
+            return TODAY_TTL
+        if not events:
+            return EMPTY_PAST_TTL
+        all_final = all(((event.get('status') or {}).get('type') or {}).get('completed') for event in events)
+        if all_final or (today - day).days >= SETTLE_AFTER_DAYS:
+            return PERMANENT_TTL
+        return UNSETTLED_PAST_TTL
+
+    def missing(self, paths: Iterable[str], days: Iterable[date]) -> List[Tuple[str, str]]:
+        """(path, YYYYMMDD) pairs with no valid archived scoreboard"""
+        wanted = {self.make_key(path, f"{day:%Y%m%d}"): (path.strip('/'), f"{day:%Y%m%d}")
+                  for path in paths for day in days}
+        present: Set[str] = self.store.live_keys(ARCHIVE_NAMESPACE, list(wanted))
+        return [pair for key, pair in wanted.items() if key not in present]
+
+    def game_counts(self, paths: Iterable[str], start: date, end: date) -> Dict[str, int]:
+        """Games per day (YYYY-MM-DD) across the given leagues, from entry metadata only"""
+        return self.store.sum_item_counts(
+            ARCHIVE_NAMESPACE, start.isoformat(), end.isoformat(), sports=[path.strip('/') for path in paths]
+        )
+
+
+# Global archive shared by the scoreboard client and the calendar
+scoreboard_archive = ScoreboardArchive()
@@ -1,8 +1,9 @@
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import streamlit as st
 import json
+from utils.espn_scoreboard import espn_scoreboard
+from utils.http_cache import http_session
 
 class SportsAPIManager:
     """Manager class for integrating multiple sports APIs"""
@@ -32,12 +33,7 @@ class SportsAPIManager:
             sport_key = sport_mapping.get(sport, "football")
             league_key = league_mapping.get(sport, "nfl")
             
-            url = f"{self.espn_base_url}/{sport_key}/{league_key}/scoreboard"
-            
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = espn_scoreboard.get_scoreboard(sport_key, league_key) or {}
             games = []
             
             if 'events' in data:
@@ -103,7 +99,7 @@ class SportsAPIManager:
             
             # Get leagues for this sport
             leagues_url = f"{self.sportsdb_base_url}/search_all_leagues.php?s={sport_name}"
-            leagues_response = requests.get(leagues_url, timeout=10)
+            leagues_response = http_session.get(leagues_url, timeout=10)
             
             if leagues_response.status_code == 200:
                 leagues_data = leagues_response.json()
@@ -113,7 +109,7 @@ class SportsAPIManager:
                     
                     # Get recent events
                     events_url = f"{self.sportsdb_base_url}/eventspastleague.php?id={league_id}"
-                    events_response = requests.get(events_url, timeout=10)
+                    events_response = http_session.get(events_url, timeout=10)
                     
                     if events_response.status_code == 200:
                         events_data = events_response.json()
@@ -167,7 +163,7 @@ class SportsAPIManager:
                 'status': 'FT'  # Finished games only
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = http_session.get(url, headers=headers, params=params, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
@@ -224,7 +220,7 @@ class SportsAPIManager:
             season = "2024-regular"
             url = f"{base_url}/nfl/{season}/games.json"
             
-            response = requests.get(url, auth=auth, timeout=15)
+            response = http_session.get(url, auth=auth, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
@@ -367,7 +363,7 @@ class SportsAPIManager:
                 
                 # Test API status first
                 test_url = f"{self.api_football_base_url}/status"
-                test_response = requests.get(test_url, headers=headers, timeout=10)
+                test_response = http_session.get(test_url, headers=headers, timeout=10)
                 
                 if test_response.status_code == 200:
                     test_data = self.get_api_football_data(api_key)
@@ -0,0 +1,255 @@
+"""
+Team Registry - Process-wide ESPN team lists with a precomputed name index
+Each league's /teams response is fetched at most once a day and persisted to disk
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from utils.espn_scoreboard import ESPN_BASE_URL, LEAGUE_PATHS, espn_scoreboard
+
+# ESPN team fields that are indexed as names
+NAME_FIELDS = ['displayName', 'shortDisplayName', 'name', 'nickname', 'location', 'abbreviation']
+
+# Shortest name suffix indexed for nickname-only lookups ("Lakers" -> "Los Angeles Lakers")
+MIN_SUFFIX_LENGTH = 3
+
+
+def normalize_team_key(name) -> str:
+    """Lowercase alphanumerics only - the key every registry lookup uses"""
+    return re.sub(r"[^a-z0-9]", "", name.lower()) if isinstance(name, str) else ""
+
+
+def teams_match(name1: str, name2: str) -> bool:
+    """Loose team-name comparison ("Lakers" matches "Los Angeles Lakers")"""
+    if not name1 or not name2:
+        return False
+
+    def normalize(name):
+        return str(name).lower().replace(' ', '').replace('.', '').replace('-', '')
+
+    norm1, norm2 = normalize(name1), normalize(name2)
+    if norm1 == norm2:
+        return True
+    if len(norm1) >= 4 and len(norm2) >= 4:
+        return norm1 in norm2 or norm2 in norm1
+    return False
+
+
+class _LeagueTeams:
+    """One league's teams plus exact-name and suffix indexes, both keyed by normalized name"""
+
+    def __init__(self, teams: List[Dict], fetched_at: float):
+        self.teams = {team['id']: team for team in teams}
+        self.fetched_at = fetched_at
+        self.by_key: Dict[str, str] = {}
+        self.by_suffix: Dict[str, str] = {}
+
+        for team in teams:
+            for key in team['keys']:
+                self.by_key.setdefault(key, team['id'])
+        # Every suffix of every key maps to the one team that has it, so a
+        # nickname or the tail of a longer name resolves without a scan.
+        # Suffixes several teams share ("state", "city", "united") are dropped
+        # rather than handed to whichever team came first.
+        ambiguous = set()
+        for team in teams:
+            for key in team['keys']:
+                for start in range(len(key) - MIN_SUFFIX_LENGTH + 1):
+                    suffix = key[start:]
+                    if self.by_suffix.setdefault(suffix, team['id']) != team['id']:
+                        ambiguous.add(suffix)
+        for suffix in ambiguous:
+            del self.by_suffix[suffix]
+
+    def resolve(self, team_name: str) -> Optional[str]:
+        key = normalize_team_key(team_name)
+        if not key:
+            return None
+        team_id = self.by_key.get(key)
+        if team_id is None:
+            stripped = normalize_team_key(team_name.replace('AFC', '').replace('FC', ''))
+            team_id = self.by_key.get(stripped)
+        if team_id is None:
+            # Fall back to the last word, which is usually the nickname
+            nickname = normalize_team_key(team_name.strip().split()[-1]) if team_name.strip() else ''
+            team_id = self.by_suffix.get(nickname) if len(nickname) >= MIN_SUFFIX_LENGTH else None
+        return team_id
+
+
+class TeamRegistry:
+    """
+    Shared ESPN team registry, one entry per league.
+
+    A league's team list is downloaded the first time it's needed, written to
+    a JSON file with each team's normalized keys, and reused by every module
+    and every process until it's older than `refresh_seconds`. If a refresh
+    fails the stale list keeps serving, and a league that has never loaded
+    isn't retried for `retry_seconds`.
+    """
+
+    def __init__(self, path: str = ".local/team_registry.json", refresh_seconds: float = 24 * 3600,
+                 retry_seconds: float = 300, timeout: float = 8):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+        self.timeout = timeout
+        self._leagues: Dict[str, _LeagueTeams] = {}
+        self._failed_at: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._loaded = False
+        self.stats = {'fetches': 0, 'fetch_errors': 0, 'lookups': 0, 'misses': 0}
+
+    @staticmethod
+    def league_path(league: str) -> Optional[str]:
+        """Accept a league code ('NFL') or an ESPN path ('football/nfl')"""
+        league = str(league or '').strip('/')
+        if '/' in league:
+            return league
+        path = LEAGUE_PATHS.get(league.upper())
+        return f"{path[0]}/{path[1]}" if path else None
+
+    def _league(self, league: str, fetch: bool = True) -> Optional[_LeagueTeams]:
+        path = self.league_path(league)
+        if not path:
+            return None
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            teams = self._leagues.get(path)
+            if not fetch or not self._needs_fetch(path, teams):
+                return teams
+            fetch_lock = self._fetch_locks.setdefault(path, threading.Lock())
+
+        # The download runs outside the registry lock so other leagues keep resolving. One caller
+        # per league downloads; the rest wait for its result, or keep serving a stale list meanwhile.
+        if not fetch_lock.acquire(blocking=teams is None):
+            return teams
+        try:
+            with self._lock:
+                teams = self._leagues.get(path)
+                if not self._needs_fetch(path, teams):
+                    return teams
+            fetched = self._fetch(path)
+            now = time.time()
+            league = _LeagueTeams(fetched, now) if fetched is not None else None
+            with self._lock:
+                if league is not None:
+                    teams = self._leagues[path] = league
+                    self._failed_at.pop(path, None)
+                    self.save()
+                else:
+                    self._failed_at[path] = now
+                return teams
+        finally:
+            fetch_lock.release()
+
+    def _needs_fetch(self, path: str, teams: Optional[_LeagueTeams]) -> bool:
+        """Whether a league is missing or expired and hasn't failed to download recently"""
+        now = time.time()
+        stale = teams is None or now - teams.fetched_at > self.refresh_seconds
+        return stale and now - self._failed_at.get(path, 0) >= self.retry_seconds
+
+    def resolve_id(self, league: str, team_name: str, fetch: bool = True) -> Optional[str]:
+        """ESPN team id for a display name, short name, nickname or abbreviation"""
+        self.stats['lookups'] += 1
+        teams = self._league(league, fetch=fetch)
+        team_id = teams.resolve(team_name) if teams else None
+        if team_id is None:
+            self.stats['misses'] += 1
+        return team_id
+
+    def get_team(self, league: str, team_id: str, fetch: bool = True) -> Optional[Dict]:
+        """Stored names for a team id"""
+        teams = self._league(league, fetch=fetch)
+        return teams.teams.get(str(team_id)) if teams else None
+
+    def canonical_name(self, league: str, team_name: str, fetch: bool = True) -> Optional[str]:
+        """ESPN display name for any recognized form of a team's name"""
+        teams = self._league(league, fetch=fetch)
+        team_id = teams.resolve(team_name) if teams else None
+        return teams.teams[team_id].get('displayName') if team_id else None
+
+    def refresh(self, league: str) -> bool:
+        """Force a league to be downloaded again on its next lookup"""
+        path = self.league_path(league)
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            self._failed_at.pop(path, None)
+            return self._leagues.pop(path, None) is not None
+
+    def _fetch(self, path: str) -> Optional[List[Dict]]:
+        """Download a league's /teams list and precompute each team's normalized keys"""
+        self.stats['fetches'] += 1
+        try:
+            response = espn_scoreboard.session.get(
+                f"{ESPN_BASE_URL}/{path}/teams", params={'limit': 1000}, timeout=self.timeout
+            )
+            if response.status_code != 200:
+                self.stats['fetch_errors'] += 1
+                return None
+            payload = response.json()
+        except Exception:
+            self.stats['fetch_errors'] += 1
+            return None
+
+        # ESPN responses vary slightly by sport; support both structures
+        sports_arr = payload.get('sports')
+        if isinstance(sports_arr, list) and sports_arr:
+            raw_teams = ((sports_arr[0].get('leagues') or [{}])[0]).get('teams', [])
+        else:
+            raw_teams = payload.get('teams', [])
+
+        teams = []
+        for entry in raw_teams:
+            team = entry.get('team', entry)
+            if team.get('id') is None:
+                continue
+            record = {field: team[field] for field in NAME_FIELDS if team.get(field)}
+            record['id'] = str(team['id'])
+            names = [team.get(field) for field in NAME_FIELDS if field != 'location']
+            if team.get('location') and team.get('name'):
+                names.append(f"{team['location']} {team['name']}")
+            record['keys'] = sorted({normalize_team_key(name) for name in names if name} - {''})
+            teams.append(record)
+        return teams or None
+
+    def load(self):
+        """Load persisted leagues; a missing or unreadable file starts empty"""
+        with self._lock:
+            self._loaded = True
+            if not os.path.exists(self.path):
+                return
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                for path, league in data.get('leagues', {}).items():
+                    self._leagues[path] = _LeagueTeams(league['teams'], float(league['fetched_at']))
+            except (OSError, ValueError, KeyError, TypeError):
+                self._leagues.clear()
+
+    def save(self):
+        """Write every league to the JSON file, replacing it atomically"""
+        with self._lock:
+            data = {'leagues': {
+                path: {'fetched_at': league.fetched_at, 'teams': list(league.teams.values())}
+                for path, league in self._leagues.items()
+            }}
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+
+
+# Global registry shared by every module that resolves ESPN team names or ids
+team_registry = TeamRegistry()
@@ -0,0 +1,295 @@
+"""
+Value Engine - Expected value, edge and Kelly sizing for every priced outcome on a slate
+Model win probabilities (quantitative baseline blended with the calibrated AI consensus) against every book's prices
+"""
+
+import heapq
+import math
+import warnings
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.odds_engine import AWAY, HOME, MARKETS, OUTCOME_LABELS, OddsMatrix, american_to_decimal, format_american, market_scanner
+from utils.odds_ingestion import odds_ingestion
+from utils.team_registry import teams_match
+
+# Fraction of full Kelly to stake, and the most any single bet may take of the bankroll
+KELLY_FRACTION = 0.25
+MAX_KELLY_STAKE = 0.05
+
+# Weight of the calibrated AI consensus against the quantitative baseline when both exist
+AI_CONSENSUS_WEIGHT = 0.5
+
+# Games both teams need on their Elo ratings before the quantitative baseline is trusted on its own;
+# with fewer, it is shrunk toward the no-vig market consensus (all the way with no history)
+RATING_HISTORY_GAMES = 20
+
+# Model probabilities are kept off the extremes; no model is that sure
+MIN_MODEL_PROBABILITY = 0.03
+MAX_MODEL_PROBABILITY = 0.97
+
+# Bets below this expected value (per unit staked) aren't worth listing
+MIN_EXPECTED_VALUE = 0.01
+
+# Standard deviation of the final margin and of the combined score, by sport. Spreads and
+# totals are priced from a normal distribution around the model's (or market's) expectation.
+MARGIN_SD = {'NFL': 13.5, 'NCAAF': 16.0, 'NBA': 12.0, 'WNBA': 11.0, 'NCAAB': 11.0, 'MLB': 4.2, 'NHL': 2.3}
+TOTAL_SD = {'NFL': 13.0, 'NCAAF': 16.0, 'NBA': 18.0, 'WNBA': 15.0, 'NCAAB': 15.0, 'MLB': 4.3, 'NHL': 2.2}
+
+_STANDARD_NORMAL = NormalDist()
+
+
+def _team_name(team) -> str:
+    if isinstance(team, dict):
+        return team.get('name') or team.get('displayName') or ''
+    return team or ''
+
+
+def normal_cdf(x):
+    """Standard normal CDF for arrays (Abramowitz-Stegun 7.1.26, error below 1.5e-7; NaN stays NaN)"""
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def kelly_stake(probability, decimal, fraction: float = KELLY_FRACTION, cap: float = MAX_KELLY_STAKE):
+    """Fractional Kelly stake (share of bankroll) for win probabilities at decimal odds; 0 without an edge"""
+    probability = np.asarray(probability, dtype=np.float64)
+    decimal = np.asarray(decimal, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        full = (probability * decimal - 1.0) / (decimal - 1.0)
+    return np.clip(np.nan_to_num(full * fraction), 0.0, cap)
+
+
+class ValueBetEngine:
+    """
+    Scores every outcome at every book on a slate against the model's probabilities.
+
+    The model's home win probability is the quantitative baseline, shrunk
+    toward the no-vig market consensus until both teams have a rating
+    history, then blended with the AI consensus pick's calibrated
+    confidence where an analysis exists. Moneylines use it directly. Spreads use the margin it implies
+    under a normal margin distribution. Totals have no model view, so they
+    are priced around the market's median line and only off-market lines
+    show value. Expected value, edge and fractional Kelly are computed as
+    games x books x outcomes arrays. Each outcome's best book is kept, and
+    the top bets are taken with a heap.
+    """
+
+    def __init__(self, quant_engine=None, calibrator=None, ingestion=None, scanner=None):
+        self._quant_engine = quant_engine
+        self._calibrator = calibrator
+        self.ingestion = ingestion or odds_ingestion
+        self.scanner = scanner or market_scanner
+
+    @property
+    def quant_engine(self):
+        if self._quant_engine is None:
+            from utils.quantitative_models import QuantitativeModelEngine
+            self._quant_engine = QuantitativeModelEngine()
+        return self._quant_engine
+
+    @property
+    def calibrator(self):
+        if self._calibrator is None:
+            from utils.reliability_curves import reliability_calibrator
+            self._calibrator = reliability_calibrator
+        return self._calibrator
+
+    def model_probabilities(self, games: Sequence[Dict], analyses: Optional[Sequence[Optional[Dict]]] = None,
+                            market_home: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+        """
+        Home win probabilities for `games`: 'quant' (batch baseline), 'trust'
+        (how far the baseline's ratings are trusted over `market_home`, the
+        no-vig consensus), 'ai' (calibrated consensus, NaN without an
+        analysis) and the blended 'home'. `analyses` defaults to each game's
+        own `ai_analysis`; without a market probability the baseline stands.
+        """
+        games = list(games)
+        if analyses is None:
+            analyses = [game.get('ai_analysis') for game in games]
+        quant = np.asarray(self.quant_engine.calculate_baseline_probabilities(games)['home_win_probability'], dtype=np.float64)
+        trust = self.rating_trust(games)
+        market = np.full(len(games), np.nan) if market_home is None else np.asarray(market_home, dtype=np.float64)
+        baseline = np.where(np.isnan(market), quant, trust * quant + (1.0 - trust) * market)
+
+        ai = np.full(len(games), np.nan)
+        for i, (game, analysis) in enumerate(zip(games, analyses)):
+            home_prob = self._ai_home_probability(game, analysis)
+            if home_prob is not None:
+                ai[i] = home_prob
+
+        home = np.where(np.isnan(ai), baseline, (1.0 - AI_CONSENSUS_WEIGHT) * baseline + AI_CONSENSUS_WEIGHT * ai)
+        return {'quant': quant, 'trust': trust, 'ai': ai,
+                'home': np.clip(home, MIN_MODEL_PROBABILITY, MAX_MODEL_PROBABILITY)}
+
+    @staticmethod
+    def rating_trust(games: Sequence[Dict]) -> np.ndarray:
+        """Share of RATING_HISTORY_GAMES the less-played team has on its Elo rating, per game"""
+        from utils.elo_ratings import elo_ratings
+        played = [min(elo_ratings.get_games_played(str(game.get('sport', '')).upper(), _team_name(game.get(side)))
+                      for side in ('home_team', 'away_team')) for game in games]
+        return np.minimum(np.asarray(played, dtype=np.float64) / RATING_HISTORY_GAMES, 1.0)
+
+    def _ai_home_probability(self, game: Dict, analysis: Optional[Dict]) -> Optional[float]:
+        if not analysis or analysis.get('error'):
+            return None
+        pick = analysis.get('pick') or analysis.get('predicted_winner') or analysis.get('consensus_pick')
+        try:
+            confidence = float(analysis.get('confidence', analysis.get('consensus_confidence')))
+        except (TypeError, ValueError):
+            return None
+        home, away = _team_name(game.get('home_team')), _team_name(game.get('away_team'))
+        if not pick or not math.isfinite(confidence):
+            return None
+        if teams_match(pick, home):
+            picks_home = True
+        elif teams_match(pick, away):
+            picks_home = False
+        else:
+            return None
+
+        # The enhanced analyzer has already calibrated its confidence; anything else goes through the reliability curve
+        if not analysis.get('confidence_calibration'):
+            confidence = self.calibrator.calibrate_confidence(confidence, str(game.get('sport', '')).upper())['calibrated_confidence']
+        return confidence if picks_home else 1.0 - confidence
+
+    def score(self, matrices: Dict[str, OddsMatrix], home_prob: np.ndarray, sports: Sequence[str]) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Model probability, EV (per unit staked), edge over the price's implied
+        probability and Kelly stake for every games x books x outcomes cell.
+        `home_prob` and `sports` are aligned with the matrices' games.
+        """
+        home_prob = np.asarray(home_prob, dtype=np.float64)
+        margin_sd = np.array([MARGIN_SD.get(sport, np.nan) for sport in sports])
+        total_sd = np.array([TOTAL_SD.get(sport, np.nan) for sport in sports])
+        # Expected home margin implied by the win probability
+        expected_margin = margin_sd * np.array([_STANDARD_NORMAL.inv_cdf(p) for p in home_prob])
+
+        results = {}
+        for market, matrix in matrices.items():
+            price, point = matrix.price, matrix.point
+            probability = np.full(price.shape, np.nan)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                if market == 'h2h':
+                    # The models are two-way; three-way (draw) moneylines are left unpriced
+                    two_way = np.isnan(price[:, :, 2]).all(axis=1)[:, None]
+                    probability[:, :, HOME] = np.where(two_way, home_prob[:, None], np.nan)
+                    probability[:, :, AWAY] = np.where(two_way, 1.0 - home_prob[:, None], np.nan)
+                elif market == 'spreads':
+                    sd = margin_sd[:, None]
+                    probability[:, :, HOME] = normal_cdf((expected_margin[:, None] + point[:, :, HOME]) / sd)
+                    probability[:, :, AWAY] = normal_cdf((point[:, :, AWAY] - expected_margin[:, None]) / sd)
+                elif market == 'totals':
+                    lines = np.where(np.isnan(point[:, :, HOME]), point[:, :, AWAY], point[:, :, HOME])
+                    with warnings.catch_warnings():
+                        warnings.simplefilter('ignore', RuntimeWarning)  # Games without a total
+                        consensus_line = np.nanmedian(lines, axis=1)
+                    sd = total_sd[:, None]
+                    probability[:, :, HOME] = normal_cdf((consensus_line[:, None] - point[:, :, HOME]) / sd)
+                    probability[:, :, AWAY] = normal_cdf((point[:, :, AWAY] - consensus_line[:, None]) / sd)
+                probability = np.where(np.isnan(price), np.nan, probability)
+
+                decimal = american_to_decimal(price)
+                expected_value = probability * decimal - 1.0
+                edge = probability - 1.0 / decimal
+            results[market] = {
+                'probability': probability,
+                'decimal': decimal,
+                'expected_value': expected_value,
+                'edge': edge,
+                'kelly': kelly_stake(probability, decimal),
+            }
+        return results
+
+    def top_bets(self, games: Sequence[Dict], events: Optional[Sequence[Optional[Dict]]] = None,
+                 analyses: Optional[Sequence[Optional[Dict]]] = None, top_k: int = 10,
+                 min_expected_value: float = MIN_EXPECTED_VALUE, markets: Sequence[str] = MARKETS) -> List[Dict]:
+        """
+        The `top_k` highest-EV bets on the slate, one per game outcome at its
+        best book. `events` are the games' Odds API events (looked up in the
+        ingestion index when not given); games without odds are skipped.
+        """
+        games = list(games)
+        if events is None:
+            events = [self.ingestion.lookup_game(game) for game in games]
+        matched = [i for i, event in enumerate(events) if event and event.get('bookmakers')]
+        if not matched or top_k <= 0:
+            return []
+
+        slate = [games[i] for i in matched]
+        matrices = OddsMatrix.from_events([events[i] for i in matched], markets)
+        moneyline = matrices['h2h'] if 'h2h' in matrices else OddsMatrix.from_events([events[i] for i in matched], ['h2h'])['h2h']
+        scans = {'h2h': self.scanner.scan(moneyline)}
+        with np.errstate(invalid='ignore'):
+            consensus = scans['h2h']['consensus']
+            market_home = consensus[:, HOME] / (consensus[:, HOME] + consensus[:, AWAY])
+        model = self.model_probabilities(slate, None if analyses is None else [analyses[i] for i in matched], market_home)
+        sports = [str(game.get('sport', '')).upper() for game in slate]
+        scores = self.score(matrices, model['home'], sports)
+
+        # Best book per (game, outcome), then a heap over the qualifying outcomes of every market
+        candidates = []
+        best = {}
+        for market, result in scores.items():
+            ranked = np.where(np.isnan(result['expected_value']), -np.inf, result['expected_value'])
+            best_book = np.argmax(ranked, axis=1)
+            best_ev = np.take_along_axis(ranked, best_book[:, None, :], axis=1)[:, 0, :]
+            best[market] = best_book
+            for g, o in zip(*np.nonzero(best_ev >= min_expected_value)):
+                candidates.append((float(best_ev[g, o]), market, int(g), int(o)))
+        top = heapq.nlargest(top_k, candidates)
+
+        for market in {market for _, market, _, _ in top} - set(scans):
+            scans[market] = self.scanner.scan(matrices[market])
+        bets = []
+        for expected_value, market, g, o in top:
+            matrix, result, scan = matrices[market], scores[market], scans[market]
+            b = int(best[market][g, o])
+            game = matrix.games[g]
+            point = matrix.point[g, b, o]
+            bets.append({
+                'game_index': matched[g],
+                'event_id': game['id'],
+                'game': f"{game['away_team']} @ {game['home_team']}",
+                'home_team': game['home_team'],
+                'away_team': game['away_team'],
+                'sport': sports[g],
+                'market': market,
+                'outcome': OUTCOME_LABELS[market][o],
+                'team': None if market == 'totals' else (game['home_team'] if o == HOME else game['away_team']),
+                'selection': self._selection(market, o, game, point),
+                'book': matrix.book_titles[b],
+                'price': format_american(matrix.price[g, b, o]),
+                'decimal': float(result['decimal'][g, b, o]),
+                'point': None if np.isnan(point) else float(point),
+                'win_prob': float(result['probability'][g, b, o]),
+                'implied_prob': float(1.0 / result['decimal'][g, b, o]),
+                'market_prob': float(scan['consensus'][g, o]),
+                'expected_value': expected_value,
+                'edge': float(result['edge'][g, b, o]),
+                'kelly_stake': float(result['kelly'][g, b, o]),
+                'books_quoting': int((~np.isnan(matrix.price[g, :, o])).sum()),
+                'quant_home_prob': float(model['quant'][g]),
+                'market_home_prob': None if np.isnan(market_home[g]) else float(market_home[g]),
+                'ai_home_prob': None if np.isnan(model['ai'][g]) else float(model['ai'][g]),
+            })
+        return bets
+
+    @staticmethod
+    def _selection(market: str, outcome: int, game: Dict, point: float) -> str:
+        team = game['home_team'] if outcome == HOME else game['away_team']
+        if market == 'h2h':
+            return f"{team} ML"
+        if market == 'spreads':
+            return f"{team} {point:+.1f}"
+        return f"{'Over' if outcome == HOME else 'Under'} {point:.1f}"
+
+
+# Global engine shared by the value detection page and the bet allocators
+value_engine = ValueBetEngine()